@@ -33,9 +33,14 @@ Bootstrap script can be used to create initial directory structure
 and apply necessary ACL rules
 
 Usage:
-    python bootstrap.py <path to config file>
+    python bootstrap.py <path to config file> [--parallel <number of parallel commands>]
 HF should be installed before running this script
 
+With --parallel option current state of HDFS is loaded first and only missing directories
+and ACL entries are applied: directories are created by batched 'hadoop fs -mkdir -p' commands,
+all missing ACL entries of a directory are applied by a single 'hadoop fs -setfacl' command
+and commands are run in parallel.
+
 Configuration file structure
     - [acls] section describes data access model and contains access level to ACLs rules mapping
     - [hdfs] section  describes HDFS directory structure. Specific ACL rules can be specified for each directory
@@ -55,17 +60,25 @@ Configuration example:
 
 """
 import sys
+import threading
 
 from merlin.common.configurations import Configuration
+from merlin.common.exceptions import FileSystemException
 from merlin.common.logger import get_logger
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.utils import run_parallel
 from merlin.fs.hdfs import HDFS
 from merlin.fs.localfs import LocalFS
+import merlin.fs.cli.hdfs_commands as fs
 
 # ACL
 CONFIG_ACLS_KEY = 'acls'
 CONFIG_HDFS_DIRS_KEY = 'hdfs'
 CONFIG_LOCAL_FS_DIRS_KEY = 'local fs'
 
+# max number of paths passed to a single command
+BATCH_SIZE = 100
+
 
 class FsSnapshot(object):
     def __init__(self):
@@ -115,6 +128,55 @@ class FsSnapshot(object):
             if acls:
                 self.__apply_acls__(file, acls, apply_acls_command)
 
+    def diff(self, existing, acls):
+        """
+        Computes changes required to bring file system to the state described by snapshot
+        :param existing: paths which already exist
+        :param acls: dictionary of path and list of ACL entries already applied to it
+        :return: sorted list of missing paths and dictionary of path and list of missing ACL entries
+        :rtype: tuple
+        """
+        _missing = sorted(path for path in self.files if path not in existing)
+        _acls = {}
+        for path, rules in self.files.iteritems():
+            _applied = set(acls.get(path, []))
+            for rule in rules:
+                for entry in (rule or '').split(','):
+                    entry = entry.strip()
+                    if entry and entry not in _applied:
+                        _applied.add(entry)
+                        _acls.setdefault(path, []).append(entry)
+        return _missing, _acls
+
+    def apply_diff(self, existing, acls,
+                   mkdirs_command=lambda paths: True,
+                   apply_acls_command=lambda path, acls: True,
+                   batch_size=BATCH_SIZE,
+                   max_parallel=8):
+        """
+        Creates missing directories and applies missing ACL entries only.
+        Directories are created by batches, all missing ACL entries of a path are applied at once.
+        Commands are run in parallel, ACLs are applied after all directories are created
+        :param existing: paths which already exist
+        :param acls: dictionary of path and list of ACL entries already applied to it
+        :param mkdirs_command: lambda function,
+            which takes list of paths and creates directories with parents
+        :param apply_acls_command: lambda function,
+            which takes path and comma-separated list of ACL entries
+        :param batch_size: max number of paths passed to mkdirs_command
+        :param max_parallel: max number of commands running at the same time
+        :return: list of created paths and dictionary of path and list of applied ACL entries
+        :rtype: tuple
+        """
+        _missing, _acls = self.diff(existing, acls)
+        self.logger.info("{0} directories are missing, ACLs of {1} directories differ".format(
+            len(_missing), len(_acls)))
+        run_parallel([lambda batch=_missing[i:i + batch_size]: mkdirs_command(batch)
+                        for i in range(0, len(_missing), batch_size)], max_parallel)
+        run_parallel([lambda path=path, entries=entries: apply_acls_command(path, ",".join(entries))
+                        for path, entries in sorted(_acls.iteritems())], max_parallel)
+        return _missing, _acls
+
     def __apply_acls__(self, path, acls, apply_acls_command):
         if acls:
             for acl in acls:
@@ -136,6 +198,63 @@ def apply_hdfs_snapshot(config):
     )
 
 
+def load_hdfs_state(snapshot, batch_size=BATCH_SIZE, max_parallel=8,
+                    executor=execute_shell_command):
+    """
+    Loads current state of directories described by snapshot.
+    Paths are listed by batches, ACLs are loaded only for existing paths which should have ACLs
+    :param snapshot: FsSnapshot
+    :return: set of existing paths and dictionary of path and list of applied ACL entries
+    :rtype: tuple
+    """
+    _paths = sorted(snapshot.files)
+    _normalize = lambda path: path.rstrip('/') or '/'
+    _existing = set()
+    _acls = {}
+    _lock = threading.Lock()
+
+    def _list_(batch):
+        _entries = fs.listing(batch, directory=True, ignore_missing=True, executor=executor)
+        with _lock:
+            _existing.update(_normalize(entry.path) for entry in _entries)
+
+    def _getfacl_(path):
+        _entries = fs.acl_entries(path, executor=executor)
+        with _lock:
+            _acls[path] = _entries
+
+    run_parallel([lambda batch=_paths[i:i + batch_size]: _list_(batch)
+                    for i in range(0, len(_paths), batch_size)], max_parallel)
+    run_parallel([lambda path=path: _getfacl_(path)
+                    for path in _paths
+                    if _normalize(path) in _existing and any(snapshot.files[path])],
+                   max_parallel)
+    return set(path for path in _paths if _normalize(path) in _existing), _acls
+
+
+def apply_hdfs_snapshot_diff(config, batch_size=BATCH_SIZE, max_parallel=8,
+                             executor=execute_shell_command):
+    """
+    Creates missing directories on HDFS and applies missing ACL rules
+    by batched commands running in parallel
+    :return: list of created paths and dictionary of path and list of applied ACL entries
+    """
+    _hdfs_snapshot = FsSnapshot.load_from_config(config,
+                                                 fs_section=CONFIG_HDFS_DIRS_KEY,
+                                                 acl_section=CONFIG_ACLS_KEY)
+    _existing, _acls = load_hdfs_state(_hdfs_snapshot, batch_size, max_parallel, executor)
+    return _hdfs_snapshot.apply_diff(
+        _existing, _acls,
+        mkdirs_command=lambda paths: fs.mkdir_all(paths, executor=executor).if_failed_raise(
+            FileSystemException("Cannot create directories {0}".format(", ".join(paths)))),
+        apply_acls_command=lambda path, acls: fs.setfacl(
+            path, acls, executor=executor).if_failed_raise(
+                FileSystemException("Cannot apply ACLs {0} to '{1}'".format(acls, path))),
+        batch_size=batch_size,
+        max_parallel=max_parallel
+    )
+
+
 def apply_localfs_snapshot(config):
     """Creates initial directory structure on local file system"""
     _localfs_snapshot = FsSnapshot.load_from_config(
@@ -148,10 +267,13 @@ def apply_localfs_snapshot(config):
 
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print 'Usage: python bootstrap.py <config file>'
+    if len(sys.argv) not in (2, 4) or (len(sys.argv) == 4 and sys.argv[2] != '--parallel'):
+        print 'Usage: python bootstrap.py <config file> [--parallel <number of parallel commands>]'
         sys.exit(-1)
     _config_file = sys.argv[1]
     _configs = Configuration.load(_config_file)
-    apply_hdfs_snapshot(_configs)
+    if len(sys.argv) == 4:
+        apply_hdfs_snapshot_diff(_configs, max_parallel=int(sys.argv[3]))
+    else:
+        apply_hdfs_snapshot(_configs)
     apply_localfs_snapshot(_configs)
\ No newline at end of file
@@ -28,10 +28,17 @@
 # for additional information regarding copyright ownership and licensing.
 #
 
+import threading
+
+from mock import MagicMock
 from unittest2 import TestCase
 
-from bootstrap.bootstrap import FsSnapshot, CONFIG_ACLS_KEY, CONFIG_HDFS_DIRS_KEY
+from bootstrap.bootstrap import FsSnapshot, CONFIG_ACLS_KEY, CONFIG_HDFS_DIRS_KEY, apply_hdfs_snapshot_diff, \
+    load_hdfs_state
 from merlin.common.configurations import Configuration
+from merlin.common.exceptions import FileSystemException, CommandFailedError
+from merlin.common.metastores import IniFileMetaStore
+from merlin.common.shell_command_executor import build_command, Result
 
 
 class FsSnapshotTest(TestCase):
@@ -72,4 +79,90 @@ class FsSnapshotTest(TestCase):
         self.assertTrue('/raw/sales' in files,
                         'File was not added to fs snapshot')
         self.assertTrue(len(files['/raw/sales']) == 0,
-                        'ACL should be ignored for current configuration')
\ No newline at end of file
+                        'ACL should be ignored for current configuration')
+
+    def test_diff(self):
+        snapshot = FsSnapshot()
+        snapshot.attach_acls('/raw/sales', ['user:su:rwx', 'group:sales:r-x,default:group:sales:r-x'])
+        snapshot.attach_acls('/raw/hr', ['user:su:rwx'])
+        snapshot.add_file('/tmp')
+        missing, acls = snapshot.diff(existing={'/raw/sales', '/tmp'},
+                                      acls={'/raw/sales': ['user::rwx', 'group:sales:r-x']})
+        self.assertEqual(['/raw/hr'], missing)
+        self.assertEqual({'/raw/sales': ['user:su:rwx', 'default:group:sales:r-x'],
+                          '/raw/hr': ['user:su:rwx']}, acls)
+
+    def test_apply_diff(self):
+        snapshot = FsSnapshot()
+        for i in range(5):
+            snapshot.attach_acls('/data/{0}'.format(i), ['user:su:rwx', 'group:sales:r-x'])
+        created = []
+        applied = {}
+        lock = threading.Lock()
+
+        def mkdirs(paths):
+            with lock:
+                created.append(paths)
+
+        def apply_acls(path, acls):
+            with lock:
+                applied[path] = acls
+
+        snapshot.apply_diff(existing={'/data/0'}, acls={'/data/0': ['user:su:rwx', 'group:sales:r-x']},
+                            mkdirs_command=mkdirs, apply_acls_command=apply_acls, batch_size=3, max_parallel=2)
+        self.assertEqual([['/data/1', '/data/2', '/data/3'], ['/data/4']], sorted(created))
+        self.assertEqual(dict(('/data/{0}'.format(i), 'user:su:rwx,group:sales:r-x') for i in range(1, 5)), applied)
+
+    def test_apply_hdfs_snapshot_diff(self):
+        config = Configuration.create(metastore=IniFileMetaStore(), readonly=False, accepts_nulls=True)
+        config.set(section=CONFIG_ACLS_KEY, key='sales', value='group:sales:r-x')
+        config.set(section=CONFIG_HDFS_DIRS_KEY, key='/raw/sales', value='sales')
+        config.set(section=CONFIG_HDFS_DIRS_KEY, key='/raw/hr', value='sales')
+        config.set(section=CONFIG_HDFS_DIRS_KEY, key='/raw/ok', value='sales')
+        commands = []
+
+        def executor(cmd, *args):
+            _command = build_command(cmd, *args)
+            commands.append(_command)
+            _stdout = ""
+            if args[:2] == ("fs", "-ls"):
+                _stdout = "drwxr-xr-x   - hdfs supergroup 0 2015-07-01 10:00 /raw/ok\n" \
+                          "drwxr-xr-x   - hdfs supergroup 0 2015-07-01 10:00 /raw/sales\n"
+            elif args[:2] == ("fs", "-getfacl"):
+                _stdout = "# file: {0}\nuser::rwx\n".format(args[-1])
+                if args[-1] == "/raw/ok":
+                    _stdout += "group:sales:r-x\t#effective:r--\n"
+            return MagicMock(spec=Result, stdout=_stdout)
+
+        missing, acls = apply_hdfs_snapshot_diff(config, max_parallel=1, executor=executor)
+        self.assertEqual(['/raw/hr'], missing)
+        self.assertEqual({'/raw/hr': ['group:sales:r-x'], '/raw/sales': ['group:sales:r-x']}, acls)
+        self.assertEqual(["hadoop fs -ls -d /raw/hr /raw/ok /raw/sales",
+                          "hadoop fs -getfacl /raw/ok",
+                          "hadoop fs -getfacl /raw/sales",
+                          "hadoop fs -mkdir -p /raw/hr",
+                          "hadoop fs -setfacl -m group:sales:r-x /raw/hr",
+                          "hadoop fs -setfacl -m group:sales:r-x /raw/sales"], commands)
+
+    def test_load_hdfs_state_failure(self):
+        snapshot = FsSnapshot()
+        snapshot.add_file('/raw/hr')
+        snapshot.add_file('/raw/sales')
+
+        def executor(cmd, *args):
+            return MagicMock(spec=Result, stdout="", status=1, is_ok=MagicMock(return_value=False),
+                             stderr="ls: `/raw/hr': No such file or directory\n"
+                                    "ls: Permission denied: user=etl, access=READ_EXECUTE\n")
+
+        with self.assertRaises(CommandFailedError):
+            load_hdfs_state(snapshot, executor=executor)
+
+    def test_apply_diff_failure(self):
+        snapshot = FsSnapshot()
+        snapshot.add_file('/data')
+
+        def mkdirs(paths):
+            raise FileSystemException("Cannot create directories")
+
+        with self.assertRaises(FileSystemException):
+            snapshot.apply_diff(existing=set(), acls={}, mkdirs_command=mkdirs)
@@ -151,11 +151,10 @@ def load_file_from_local_to_hdfs(context):
                  on_success='end',
                  on_error='error')
 def hive_add_partition(context):
+    partitions = Hive.register_partitions(table='data', database='hive_monitoring')
     for path in context['new_pathes']:
-        Hive.load_queries_from_string(query="USE hive_monitoring; ALTER TABLE data "
-                                            "ADD PARTITION(date='{0}') "
-                                            "LOCATION '{1}';"
-                                      .format(parser_name(path), path)).run()
+        partitions.add(spec=[('date', parser_name(path))], location=path)
+    partitions.run()
 
 
 @Workflow.action(flow_name='Flow', action_name='error', on_success='end', on_error='end')
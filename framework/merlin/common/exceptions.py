@@ -102,6 +102,20 @@ class SqoopCommandError(Exception):
     pass
 
 
+class SparkJobError(Exception):
+    """
+    Exception thrown when spark application failed
+    """
+    pass
+
+
+class KafkaClientError(Exception):
+    """
+    Exception thrown when Kafka broker could not be reached or returned an error
+    """
+    pass
+
+
 class DistCpError(Exception):
     """
     Exception thrown when DistCP task failed
@@ -109,6 +123,21 @@ class DistCpError(Exception):
     pass
 
 
+class ChecksumMismatchError(Exception):
+    """
+    Exception thrown when checksum of transferred file doesn't match checksum of its source
+    """
+    pass
+
+
+class ChecksumUnavailableError(Exception):
+    """
+    Exception thrown when checksum cannot be calculated or compared,
+    e.g. HDFS doesn't support composite CRC or native CRC32C implementation is not installed
+    """
+    pass
+
+
 class FTPConnectorError(Exception):
     """
     Exception thrown when client will has problem with connection to ftp server
@@ -132,3 +161,10 @@ class FTPFileError(Exception):
 class ConfigurationError(Exception):
     """Error which indicates some inconsistency in the configuration of the service."""
     pass
+
+
+class WaitTimeoutError(Exception):
+    """
+    Exception thrown when awaited condition was not met within the given time
+    """
+    pass
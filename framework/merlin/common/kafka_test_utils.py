@@ -0,0 +1,382 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+In-memory Kafka broker for testing code built on merlin.tools.kafka_client
+
+"""
+import SocketServer
+import struct
+import threading
+
+from merlin.tools.kafka_client import KafkaProtocol, decode_message_set, _encode_message_, \
+    _Reader, _Writer
+
+
+class LocalBroker(object):
+    """
+    In-memory stand-in for Kafka broker.
+    Serves metadata, produce, fetch and list offsets requests of KafkaClient without a network,
+    or over TCP once start() was called.
+    """
+
+    def __init__(self, host='localhost', port=9092, node_id=0, auto_create_partitions=1):
+        """
+        :param host: advertised host
+        :param port: advertised port
+        :param node_id: broker id
+        :param auto_create_partitions: number of partitions of topics created on first produce.
+            Unknown topics are not created if 0
+        """
+        super(LocalBroker, self).__init__()
+        self.host = host
+        self.port = port
+        self.node_id = node_id
+        self.auto_create_partitions = auto_create_partitions
+        self.logs = {}
+        self.configs = {}
+        self.committed = {}
+        self.requests = []
+        self.acks = []
+        self._lock = threading.RLock()
+        self._server = None
+
+    def create_topic(self, name, partitions=1):
+        """
+        :rtype: LocalBroker
+        """
+        with self._lock:
+            for _partition in range(partitions):
+                self.logs.setdefault((name, _partition), [])
+        return self
+
+    def messages(self, topic, partition=None):
+        """
+        :return: values of messages stored in the topic
+        """
+        return [_value for (_topic, _partition), _log in sorted(self.logs.items())
+                for _key, _value in _log if _topic == topic and partition in (None, _partition)]
+
+    def commit(self, group, topic, partition, offset):
+        """
+        Stores offset committed by the consumer group
+        :rtype: LocalBroker
+        """
+        with self._lock:
+            self.committed[(group, topic, partition)] = offset
+        return self
+
+    def connect(self, host, port, timeout=None):
+        """
+        Connection factory for KafkaClient
+        """
+        return self
+
+    def send(self, payload):
+        self.handle(payload)
+
+    def request(self, payload):
+        return memoryview(self.handle(payload))
+
+    def close(self):
+        pass
+
+    def _topics_(self):
+        _topics = {}
+        for _topic, _partition in self.logs:
+            _topics.setdefault(_topic, []).append(_partition)
+        return _topics
+
+    def handle(self, payload):
+        """
+        Handles encoded request
+        :return: encoded response,
+            None if the request doesn't expect one (produce request with acks=0)
+        """
+        _reader = _Reader(payload)
+        _api_key, _api_version, _correlation_id = _reader.int16(), _reader.int16(), _reader.int32()
+        _reader.string()
+        _response = _Writer().int32(_correlation_id)
+        with self._lock:
+            self.requests.append(_api_key)
+            if _api_key == KafkaProtocol.METADATA and _api_version == 1:
+                self._controller_(_reader, _response)
+                return _response.getvalue()
+            {KafkaProtocol.METADATA: self._metadata_,
+             KafkaProtocol.PRODUCE: self._produce_,
+             KafkaProtocol.FETCH: self._fetch_,
+             KafkaProtocol.LIST_OFFSETS: self._list_offsets_,
+             KafkaProtocol.GROUP_COORDINATOR: self._group_coordinator_,
+             KafkaProtocol.OFFSET_FETCH: self._offset_fetch_,
+             KafkaProtocol.CREATE_TOPICS: self._create_topics_,
+             KafkaProtocol.DELETE_TOPICS: self._delete_topics_,
+             KafkaProtocol.DESCRIBE_CONFIGS: self._describe_configs_,
+             KafkaProtocol.ALTER_CONFIGS: self._alter_configs_}[_api_key](_reader, _response)
+            if _api_key == KafkaProtocol.PRODUCE and self.acks[-1] == 0:
+                return None
+        return _response.getvalue()
+
+    def _metadata_(self, reader, response):
+        _requested = reader.array(reader.string)
+        _topics = self._topics_()
+        response.int32(1).int32(self.node_id).string(self.host).int32(self.port)
+        _names = _requested if _requested else sorted(_topics)
+        response.int32(len(_names))
+        for _name in _names:
+            _partitions = sorted(_topics.get(_name, []))
+            response.int16(KafkaProtocol.ERROR_NONE if _partitions
+                           else KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION) \
+                .string(_name).int32(len(_partitions))
+            for _partition in _partitions:
+                response.int16(0).int32(_partition).int32(self.node_id) \
+                    .int32(1).int32(self.node_id) \
+                    .int32(1).int32(self.node_id)
+
+    def _produce_(self, reader, response):
+        self.acks.append(reader.int16())
+        reader.int32()
+        _results = []
+        for _ in range(reader.int32()):
+            _topic = reader.string()
+            if self.auto_create_partitions and _topic not in self._topics_():
+                self.create_topic(_topic, self.auto_create_partitions)
+            for _ in range(reader.int32()):
+                _partition, _message_set = reader.int32(), reader.bytes()
+                _log = self.logs.get((_topic, _partition))
+                if _log is None:
+                    _results.append((_topic, _partition,
+                                     KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION, -1))
+                    continue
+                _results.append((_topic, _partition, KafkaProtocol.ERROR_NONE, len(_log)))
+                _log.extend((_message.key.tobytes() if _message.key is not None else None,
+                             _message.value.tobytes())
+                            for _message in decode_message_set(_message_set))
+        self._partition_results_(response, _results, lambda _offset: response.int64(_offset))
+
+    def _fetch_(self, reader, response):
+        reader.int32()
+        reader.int32()
+        reader.int32()
+        _results = []
+        for _ in range(reader.int32()):
+            _topic = reader.string()
+            for _ in range(reader.int32()):
+                _partition, _offset, _max_bytes = reader.int32(), reader.int64(), reader.int32()
+                _log = self.logs.get((_topic, _partition))
+                if _log is None:
+                    _results.append((_topic, _partition,
+                                     KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION, (-1, "")))
+                    continue
+                if _offset > len(_log) or _offset < 0:
+                    _results.append((_topic, _partition,
+                                     KafkaProtocol.ERROR_OFFSET_OUT_OF_RANGE, (len(_log), "")))
+                    continue
+                _writer = _Writer()
+                _size = 0
+                for _position in range(_offset, len(_log)):
+                    _message = _encode_message_(*_log[_position])
+                    _size += len(_message) + 12
+                    if _size > _max_bytes:
+                        break
+                    _writer.int64(_position).bytes(_message)
+                _results.append((_topic, _partition, KafkaProtocol.ERROR_NONE,
+                                 (len(_log), _writer.getvalue())))
+        self._partition_results_(response, _results,
+                                 lambda (_high_watermark, _message_set):
+                                 response.int64(_high_watermark).bytes(_message_set))
+
+    def _list_offsets_(self, reader, response):
+        reader.int32()
+        _results = []
+        for _ in range(reader.int32()):
+            _topic = reader.string()
+            for _ in range(reader.int32()):
+                _partition, _time = reader.int32(), reader.int64()
+                reader.int32()
+                _log = self.logs.get((_topic, _partition))
+                if _log is None:
+                    _results.append((_topic, _partition,
+                                     KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION, []))
+                else:
+                    _results.append((_topic, _partition, KafkaProtocol.ERROR_NONE,
+                                     [0 if _time == KafkaProtocol.EARLIEST_OFFSET else len(_log)]))
+        self._partition_results_(response, _results,
+                                 lambda _offsets: response.array(_offsets, response.int64))
+
+    def _controller_(self, reader, response):
+        reader.array(reader.string)
+        response.int32(1).int32(self.node_id).string(self.host).int32(self.port).string(None)
+        response.int32(self.node_id).int32(0)
+
+    def _create_topics_(self, reader, response):
+        _topics = self._topics_()
+        _errors = []
+        for _ in range(reader.int32()):
+            _name, _partitions, _ = reader.string(), reader.int32(), reader.int16()
+            reader.array(lambda: (reader.int32(), reader.array(reader.int32)))
+            _configs = dict(reader.array(lambda: (reader.string(), reader.string())))
+            if _name in _topics:
+                _errors.append((_name, KafkaProtocol.ERROR_TOPIC_ALREADY_EXISTS))
+            else:
+                self.create_topic(_name, _partitions)
+                self.configs[_name] = _configs
+                _errors.append((_name, KafkaProtocol.ERROR_NONE))
+        reader.int32()
+        response.array(_errors, lambda (_name, _error): response.string(_name).int16(_error))
+
+    def _delete_topics_(self, reader, response):
+        _errors = []
+        for _name in reader.array(reader.string):
+            _keys = [_key for _key in self.logs if _key[0] == _name]
+            for _key in _keys:
+                del self.logs[_key]
+            self.configs.pop(_name, None)
+            _errors.append((_name, KafkaProtocol.ERROR_NONE if _keys
+                            else KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION))
+        reader.int32()
+        response.array(_errors, lambda (_name, _error): response.string(_name).int16(_error))
+
+    def _describe_configs_(self, reader, response):
+        _resources = reader.array(
+            lambda: (reader.int8(), reader.string(), reader.array(reader.string)))
+        _topics = self._topics_()
+        response.int32(0).int32(len(_resources))
+        for _, _name, _ in _resources:
+            _configs = sorted(self.configs.get(_name, {}).iteritems())
+            response.int16(KafkaProtocol.ERROR_NONE if _name in _topics
+                           else KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION).string(None)
+            response.int8(KafkaProtocol.RESOURCE_TOPIC).string(_name).int32(len(_configs))
+            for _key, _value in _configs:
+                response.string(_key).string(_value).int8(0).int8(0).int8(0)
+
+    def _alter_configs_(self, reader, response):
+        _resources = reader.array(
+            lambda: (reader.int8(), reader.string(),
+                     dict(reader.array(lambda: (reader.string(), reader.string())))))
+        _validate_only = reader.int8()
+        _topics = self._topics_()
+        response.int32(0).int32(len(_resources))
+        for _, _name, _configs in _resources:
+            if _name in _topics and not _validate_only:
+                self.configs[_name] = _configs
+            response.int16(KafkaProtocol.ERROR_NONE if _name in _topics
+                           else KafkaProtocol.ERROR_UNKNOWN_TOPIC_OR_PARTITION).string(None)
+            response.int8(KafkaProtocol.RESOURCE_TOPIC).string(_name)
+
+    def _group_coordinator_(self, reader, response):
+        reader.string()
+        response.int16(KafkaProtocol.ERROR_NONE).int32(self.node_id) \
+            .string(self.host).int32(self.port)
+
+    def _offset_fetch_(self, reader, response):
+        _group = reader.string()
+        _results = []
+        for _ in range(reader.int32()):
+            _topic = reader.string()
+            for _partition in reader.array(reader.int32):
+                _results.append((_topic, _partition,
+                                 self.committed.get((_group, _topic, _partition), -1)))
+        _topics = []
+        for _topic, _partition, _offset in _results:
+            if not _topics or _topics[-1][0] != _topic:
+                _topics.append((_topic, []))
+            _topics[-1][1].append((_partition, _offset))
+        response.int32(len(_topics))
+        for _topic, _partitions in _topics:
+            response.string(_topic).int32(len(_partitions))
+            for _partition, _offset in _partitions:
+                response.int32(_partition).int64(_offset).string("").int16(KafkaProtocol.ERROR_NONE)
+
+    @staticmethod
+    def _partition_results_(response, results, write):
+        _topics = []
+        for _topic, _partition, _error, _value in results:
+            if not _topics or _topics[-1][0] != _topic:
+                _topics.append((_topic, []))
+            _topics[-1][1].append((_partition, _error, _value))
+        response.int32(len(_topics))
+        for _topic, _partitions in _topics:
+            response.string(_topic).int32(len(_partitions))
+            for _partition, _error, _value in _partitions:
+                response.int32(_partition).int16(_error)
+                write(_value)
+
+    def start(self):
+        """
+        Starts serving requests over TCP in a background thread.
+        Port 0 picks a free port, the actual port is advertised in metadata
+        :rtype: LocalBroker
+        """
+        _broker = self
+
+        class _Handler(SocketServer.BaseRequestHandler):
+            def handle(self):
+                _connection = _SocketReader(self.request)
+                while True:
+                    _size = _connection.receive(4)
+                    if not _size:
+                        return
+                    _response = _broker.handle(_connection.receive(struct.unpack('>i', _size)[0]))
+                    if _response is None:
+                        continue
+                    self.request.sendall(struct.pack('>i', len(_response)) + _response)
+
+        self._server = SocketServer.ThreadingTCPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        _thread = threading.Thread(target=self._server.serve_forever)
+        _thread.daemon = True
+        _thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving requests over TCP
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _SocketReader(object):
+    def __init__(self, connection):
+        self._connection = connection
+
+    def receive(self, size):
+        _chunks = []
+        _received = 0
+        while _received < size:
+            _chunk = self._connection.recv(size - _received)
+            if not _chunk:
+                return None
+            _chunks.append(_chunk)
+            _received += len(_chunk)
+        return "".join(_chunks)
@@ -32,7 +32,11 @@
 This module handles the execution of external processes.
 
 """
+import os
+import signal
 import subprocess
+import tempfile
+import time
 
 from merlin.common.logger import get_logger, logging
 
@@ -59,11 +63,14 @@ def _process_(async):
             """
             cmd_line = build_command(command, *args)
             __log__.info("Executing {0}".format(cmd_line))
+            # asynchronous command is started in its own process group, so it can be stopped
+            # together with the processes started by the shell, e.g. when shell forks the command
             _process = subprocess.Popen(cmd_line,
                                         shell=True,
                                         stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE)
-            __result = Result(process=_process, async=async)
+                                        stderr=subprocess.PIPE,
+                                        preexec_fn=os.setsid if async else None)
+            __result = Result(process=_process, async=async, process_group=async)
             if not async:
                 __result.log(__log__)
             return __result
@@ -73,6 +80,48 @@ def _process_(async):
     return wrapper
 
 
+def execute_shell_command_streaming(command, *args):
+    """
+    Run shell command. Command output can be consumed line by line while command is running
+    without holding the whole output in memory.
+    :param command: command to call
+    :type cmd: str
+    :param args: command arguments
+    :type args: list
+    :return: result of the command execution
+    :rtype: StreamingResult
+    """
+    cmd_line = build_command(command, *args)
+    __log__.info("Executing {0}".format(cmd_line))
+    # stderr is spooled to a file so the command can not block on a full stderr pipe
+    _stderr = tempfile.TemporaryFile()
+    _process = subprocess.Popen(cmd_line,
+                                shell=True,
+                                stdout=subprocess.PIPE,
+                                stderr=_stderr)
+    return StreamingResult(process=_process, stderr=_stderr)
+
+
+def execute_shell_command_streaming_merged(command, *args):
+    """
+    Run shell command. Standard error of the command is merged into its standard output,
+    so the lines written to both streams can be consumed in the order command writes them.
+    :param command: command to call
+    :type cmd: str
+    :param args: command arguments
+    :type args: list
+    :return: result of the command execution
+    :rtype: StreamingResult
+    """
+    cmd_line = build_command(command, *args)
+    __log__.info("Executing {0}".format(cmd_line))
+    _process = subprocess.Popen(cmd_line,
+                                shell=True,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+    return StreamingResult(process=_process, stderr=None)
+
+
 @_process_(async=False)
 def execute_shell_command(command, *args):
     """
@@ -103,9 +152,10 @@ def execute_shell_command_async(command, *args):
 class Result(object):
     """ The result of the command submission."""
 
-    def __init__(self, process, async):
+    def __init__(self, process, async, process_group=False):
         self._process = process
         self._async = async
+        self._process_group = process_group
         self._stdout, self._stderr = (None, None) if async else self._process.communicate()
         self._status = self._process.poll() if async else self._process.returncode
 
@@ -116,6 +166,49 @@ class Result(object):
         """
         return self._process.poll() is None
 
+    def terminate(self, timeout=10):
+        """
+        Stops the command in case it is still running.
+        Command is killed in case it does not exit within the given time after SIGTERM.
+        Command started in its own process group is stopped together with all processes of the group
+        :param timeout: seconds to wait for command to exit
+        """
+        if self.is_running():
+            self._signal_(signal.SIGTERM)
+            _deadline = time.time() + timeout
+            while self._is_alive_() and time.time() < _deadline:
+                time.sleep(0.1)
+            if self._is_alive_():
+                __log__.warning("Command {0} did not exit within {1} second(s), killing it".format(
+                    self._process.pid, timeout))
+                self._signal_(signal.SIGKILL)
+            self._process.wait()
+            self._update_state_()
+
+    def _is_alive_(self):
+        """
+        :return: True in case the command or any process of its group is still running
+        """
+        if self._process.poll() is None:
+            return True
+        if not self._process_group:
+            return False
+        try:
+            os.killpg(self._process.pid, 0)
+            return True
+        except OSError:
+            return False
+
+    def _signal_(self, signum):
+        if not self._process_group:
+            self._process.send_signal(signum)
+            return
+        try:
+            os.killpg(self._process.pid, signum)
+        except OSError:
+            # all processes of the group have already exited
+            pass
+
     @property
     def stdout(self):
         """ Command standard output """
@@ -191,3 +284,39 @@ class Result(object):
             else:
                 raise exception
 
+
+class StreamingResult(Result):
+    """ The result of the command submission which output is consumed as a stream of lines."""
+
+    def __init__(self, process, stderr):
+        super(StreamingResult, self).__init__(process=process, async=True)
+        self._stderr_file = stderr
+
+    def lines(self):
+        """
+        Yields lines of command standard output as soon as command writes them.
+        Waits for command to complete once the output is exhausted
+        :return: generator of lines
+        """
+        for line in iter(self._process.stdout.readline, ''):
+            yield line
+        self._process.wait()
+        self._update_state_()
+
+    def terminate(self, timeout=10):
+        """
+        Stops the command in case it is still running and closes its output
+        :param timeout: seconds to wait for command to exit before it's killed
+        """
+        super(StreamingResult, self).terminate(timeout=timeout)
+        self._process.stdout.close()
+
+    def _update_state_(self):
+        """Updates status and reads standard error output of completed command"""
+        if self._status is None and not self.is_running():
+            self._status = self._process.returncode
+            if self._stderr_file:
+                self._stderr_file.seek(0)
+                self._stderr = self._stderr_file.read()
+                self._stderr_file.close()
+            self.log(logger=__log__)
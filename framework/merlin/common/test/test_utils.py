@@ -28,7 +28,10 @@
 # for additional information regarding copyright ownership and licensing.
 #
 
-from merlin.common.utils import ListUtility
+import threading
+import time
+
+from merlin.common.utils import ListUtility, run_parallel
 from merlin.fs.utils import FileDescriptor
 from unittest2 import TestCase
 
@@ -65,3 +68,21 @@ class TestUtils(TestCase):
         dictionary = ListUtility.to_dict(list_, key_extractor=FileDescriptor().name)
         self.assertTrue((FileDescriptor(name="file001"), FileDescriptor(name="file001")) in dictionary.iteritems())
         self.assertFalse((FileDescriptor(name="file001"), FileDescriptor(name="file002")) in dictionary.iteritems())
+
+    def test_run_parallel(self):
+        _running = []
+        _lock = threading.Lock()
+
+        def _task_(value):
+            with _lock:
+                _running.append(threading.current_thread())
+            time.sleep(0.01)
+            if value == 3:
+                raise ValueError(value)
+            return value * 2
+
+        self.assertEqual([0, 2, 4], run_parallel([lambda value=value: _task_(value) for value in range(3)], 2))
+        self.assertEqual(2, len(set(_running)))
+        self.assertEqual([], run_parallel([], 4))
+        with self.assertRaises(ValueError):
+            run_parallel([lambda value=value: _task_(value) for value in range(5)], 2)
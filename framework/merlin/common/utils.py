@@ -33,6 +33,7 @@ Defines a set of classes and methods that perform common,
 often re-used functions.
 
 """
+from multiprocessing.pool import ThreadPool
 
 
 class ListIterator(object):
@@ -117,3 +118,82 @@ class ListUtility(object):
         return ",".join(list_data)
 
 
+class Backoff(object):
+    """
+    Exponential backoff policy.
+    Every call to delay() returns current interval and multiplies it by the given factor
+    until the maximum interval is reached. reset() drops interval back to the initial value.
+    """
+
+    def __init__(self, initial=1.0, maximum=60.0, factor=2.0):
+        """
+        :param initial: initial interval in seconds
+        :param maximum: upper bound for the interval in seconds
+        :param factor: multiplier applied to the interval after each delay
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.current = initial
+
+    def reset(self):
+        """
+        Drops interval back to the initial value
+        """
+        self.current = self.initial
+
+    def delay(self):
+        """
+        Returns current interval and increases the next one
+        :rtype: float
+        """
+        _delay = self.current
+        self.current = min(self.current * self.factor, self.maximum)
+        return _delay
+
+
+def number_of_tasks(total_size, bytes_per_task, max_tasks=None):
+    """
+    Calculates number of tasks required to process the given amount of data
+    so that every task gets roughly bytes_per_task bytes.
+    :param total_size: total size of data in bytes
+    :param bytes_per_task: target number of bytes per task
+    :param max_tasks: upper bound for number of tasks
+    :return: number of tasks, at least 1
+    :rtype: int
+    """
+    if bytes_per_task <= 0:
+        raise ValueError("bytes_per_task should be positive : {0}".format(bytes_per_task))
+    _tasks = max(int((total_size + bytes_per_task - 1) // bytes_per_task), 1)
+    return min(_tasks, max_tasks) if max_tasks else _tasks
+
+
+def run_parallel(tasks, max_parallel):
+    """
+    Runs tasks by at most max_parallel threads
+    :param tasks: callables without arguments
+    :param max_parallel: max number of tasks running at the same time
+    :return: values returned by tasks in order of tasks
+    :rtype: list
+    :raise: error of the first failed task after all tasks are finished
+    """
+    _tasks = list(tasks)
+    if not _tasks:
+        return []
+
+    def _call_(task):
+        try:
+            return task(), None
+        except Exception as e:
+            return None, e
+
+    _pool = ThreadPool(max(1, min(max_parallel, len(_tasks))))
+    try:
+        _results = _pool.map(_call_, _tasks, chunksize=1)
+    finally:
+        _pool.close()
+        _pool.join()
+    for _, _error in _results:
+        if _error is not None:
+            raise _error
+    return [_value for _value, _ in _results]
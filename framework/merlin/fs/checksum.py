@@ -0,0 +1,346 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Checksum verification of transferred files
+
+Checksums of local files are calculated by a single streaming pass with a reused buffer,
+so files of any size are verified without loading them into memory.
+HDFS files are compared by composite CRC
+(hadoop fs -checksum with dfs.checksum.combine.mode=COMPOSITE_CRC, Hadoop 3.1+),
+which is CRC32C of the whole file content calculated by datanodes from block checksums,
+so HDFS copy is not read again.
+CRC32C of local files requires native 'crc32c' package (pip install merlin[crc32c]),
+pure Python implementation is only used for small files.
+
+CHECKSUM EXAMPLES :
+
+Calculates checksum of the local file :
+        file_checksum("/tmp/data.csv")  # 'COMPOSITE-CRC32C:e3069283'
+        file_checksum("/tmp/data.csv", algorithm="md5")  # 'MD5:62f0032f39cad26e7b8b7e5b50df85b0'
+
+Calculates checksum while file is being downloaded, so it's not read again :
+        checksum = StreamingChecksum()
+        sftp_client(host="sftp.host", path="/export/data.csv") \
+            .download_file("/tmp", checksum=checksum)
+        checksum.value()
+
+Verifies files uploaded to HDFS in background while the next file is being uploaded :
+        with ChecksumVerifier(max_parallel=4) as verifier:
+            for path in files:
+                LocalFS(path).copy_to_hdfs("/raw/data")
+                verifier.verify_hdfs(path, "/raw/data/" + os.path.basename(path))
+        # ChecksumMismatchError is raised on exit in case any copy is corrupted
+
+Verifies downloaded file against hash published by remote server :
+        verifier.verify("/tmp/data.csv", "62f0032f39cad26e7b8b7e5b50df85b0", algorithm="md5")
+
+"""
+
+import hashlib
+import Queue
+import threading
+import zlib
+
+from merlin.common.exceptions import ChecksumMismatchError, ChecksumUnavailableError
+from merlin.common.logger import get_logger
+from merlin.common.shell_command_executor import execute_shell_command
+import merlin.fs.cli.hdfs_commands as fs
+
+try:
+    import crc32c as _crc32c_module
+except ImportError:
+    _crc32c_module = None
+
+COMPOSITE_CRC32C = "COMPOSITE-CRC32C"
+COMPOSITE_CRC32 = "COMPOSITE-CRC32"
+
+BUFFER_SIZE = 4 * 1024 * 1024
+# pure Python CRC32C runs at about 10MB/s holding GIL, larger files require native implementation
+PURE_PYTHON_CRC32C_LIMIT = 16 * 1024 * 1024
+
+_CRC32C_TABLE = []
+
+
+def crc32c(data, crc=0):
+    """
+    Calculates CRC32C (Castagnoli) used by HDFS.
+    Native 'crc32c' package is used if it is installed, otherwise CRC is calculated in pure Python,
+    which copies data other than bytearray
+    :param data: str, buffer or bytearray
+    :param crc: CRC of the preceding data
+    :rtype: int
+    """
+    if _crc32c_module is not None:
+        _function = getattr(_crc32c_module, "crc32c", None) or getattr(_crc32c_module, "crc32")
+        return _function(data, crc) & 0xFFFFFFFF
+    if not _CRC32C_TABLE:
+        for _byte in range(256):
+            _value = _byte
+            for _ in range(8):
+                _value = (_value >> 1) ^ 0x82F63B78 if _value & 1 else _value >> 1
+            _CRC32C_TABLE.append(_value)
+    crc ^= 0xFFFFFFFF
+    for _byte in data if isinstance(data, bytearray) else bytearray(data):
+        crc = _CRC32C_TABLE[(crc ^ _byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+class StreamingChecksum(object):
+    """
+    Checksum calculated from data chunks in order they are read or written
+    """
+
+    def __init__(self, algorithm=COMPOSITE_CRC32C):
+        """
+        :param algorithm: 'COMPOSITE-CRC32C', 'COMPOSITE-CRC32'
+            or any algorithm supported by hashlib
+        """
+        self.algorithm = algorithm.upper()
+        self.size = 0
+        self._crc = 0
+        self._hash = None if self.algorithm in (COMPOSITE_CRC32C, COMPOSITE_CRC32) \
+            else hashlib.new(algorithm)
+
+    def update(self, data):
+        """
+        :param data: str, buffer or bytearray
+        :raise ChecksumUnavailableError: in case CRC32C of more than PURE_PYTHON_CRC32C_LIMIT bytes
+            is requested and native 'crc32c' package is not installed
+        """
+        if self._hash:
+            self._hash.update(data)
+        elif self.algorithm == COMPOSITE_CRC32C:
+            if _crc32c_module is None and self.size + len(data) > PURE_PYTHON_CRC32C_LIMIT:
+                raise ChecksumUnavailableError(
+                    "Native 'crc32c' package is required "
+                    "to calculate CRC32C of more than {0} bytes".format(PURE_PYTHON_CRC32C_LIMIT))
+            self._crc = crc32c(data, self._crc)
+        else:
+            self._crc = zlib.crc32(data, self._crc) & 0xFFFFFFFF
+        self.size += len(data)
+
+    def value(self):
+        """
+        :return: checksum in format '<algorithm>:<value>' used by hdfs_commands.checksums
+        """
+        return "{0}:{1}".format(self.algorithm, self._hash.hexdigest() if self._hash
+                                else "{0:08x}".format(self._crc))
+
+
+class ChecksumWriter(object):
+    """
+    File-like object which updates checksum with the data written to the wrapped file
+    """
+
+    def __init__(self, stream, checksum):
+        self.stream = stream
+        self.checksum = checksum
+
+    def write(self, data):
+        self.checksum.update(data)
+        self.stream.write(data)
+
+
+def file_checksum(path, algorithm=COMPOSITE_CRC32C, buffer_size=BUFFER_SIZE):
+    """
+    Calculates checksum of the local file.
+    File is read into the same buffer, hashlib, zlib and native CRC32C read chunks without copying
+    :param path: path to the local file
+    :param algorithm: see StreamingChecksum
+    :param buffer_size: size of the read buffer
+    :return: checksum in format '<algorithm>:<value>'
+    """
+    _checksum = StreamingChecksum(algorithm)
+    _buffer = bytearray(buffer_size)
+    with open(path, "rb") as _file:
+        while True:
+            _read = _file.readinto(_buffer)
+            if not _read:
+                break
+            # python 2 zlib doesn't accept memoryview, buffer is a read-only view of the same memory
+            _checksum.update(buffer(_buffer, 0, _read))
+    return _checksum.value()
+
+
+class Verification(object):
+    """
+    Result of comparison of the local file with its copy
+    """
+
+    def __init__(self, source, target, expected=None, actual=None, error=None):
+        self.source = source
+        self.target = target
+        self.expected = expected
+        self.actual = actual
+        self.error = error
+
+    def is_ok(self):
+        return self.error is None and self.expected is not None \
+            and str(self.expected).lower() == str(self.actual).lower()
+
+    def __repr__(self):
+        return "Verification(source={0}, target={1}, expected={2}, actual={3}, error={4})".format(
+            self.source, self.target, self.expected, self.actual, self.error)
+
+
+class ChecksumVerifier(object):
+    """
+    Verifies checksums of transferred files by background threads,
+    so verification of a file overlaps with transfer of the next one
+    """
+    LOG = get_logger("ChecksumVerifier")
+
+    def __init__(self, max_parallel=4, buffer_size=BUFFER_SIZE, executor=execute_shell_command):
+        """
+        :param max_parallel: max number of files verified at the same time
+        :param buffer_size: size of the read buffer of every thread
+        :param executor: the interface used to get checksums of HDFS files
+        """
+        super(ChecksumVerifier, self).__init__()
+        self.max_parallel = max_parallel
+        self.buffer_size = buffer_size
+        self.executor = executor
+        self.verifications = []
+        self._tasks = Queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def verify(self, local_path, expected, algorithm=None, target=None):
+        """
+        Compares checksum of the local file with the expected value,
+        e.g. hash published by remote server
+        :param local_path: path to the local file
+        :param expected: expected checksum in format '<algorithm>:<value>'
+            or value of the given algorithm
+        :param algorithm: see StreamingChecksum
+        :param target: description of the copy
+        :rtype: Verification
+        """
+        if algorithm:
+            expected = "{0}:{1}".format(algorithm.upper(), expected)
+        _verification = Verification(local_path, target, expected=expected)
+        return self._submit_(_verification, lambda: self._local_(_verification))
+
+    def verify_hdfs(self, local_path, hdfs_path, checksum=None):
+        """
+        Compares the local file with its copy on HDFS by composite CRC
+        :param local_path: path to the local file
+        :param hdfs_path: path to the file on HDFS
+        :param checksum: checksum of the local file calculated during transfer,
+            file isn't read if specified
+        :rtype: Verification
+        """
+        _verification = Verification(local_path, hdfs_path)
+
+        def _task_():
+            _verification.expected = fs.checksums([hdfs_path], composite=True,
+                                                  executor=self.executor).get(hdfs_path)
+            if not str(_verification.expected).startswith("COMPOSITE-"):
+                raise ChecksumUnavailableError(
+                    "Composite CRC of {0} is not available, got {1}".format(
+                        hdfs_path, _verification.expected))
+            if checksum and checksum.split(':')[0] == str(_verification.expected).split(':')[0]:
+                _verification.actual = checksum
+            else:
+                self._local_(_verification)
+
+        return self._submit_(_verification, _task_)
+
+    def wait(self, raise_on_failure=True):
+        """
+        Waits for all submitted verifications
+        :param raise_on_failure: indicates that ChecksumMismatchError should be raised
+            in case any file differs or ChecksumUnavailableError
+            in case the only failures are checksums which could not be compared
+        :return: list of Verification
+        """
+        self._tasks.join()
+        _failed = [_verification for _verification in self.verifications
+                   if not _verification.is_ok()]
+        if _failed and raise_on_failure:
+            _unavailable = all(isinstance(_verification.error, ChecksumUnavailableError)
+                               for _verification in _failed)
+            _error = ChecksumUnavailableError if _unavailable else ChecksumMismatchError
+            raise _error("{0} of {1} files failed verification : {2}".format(
+                len(_failed), len(self.verifications),
+                "; ".join(str(_verification) for _verification in _failed)))
+        return self.verifications
+
+    def __enter__(self):
+        return self
+
+    def close(self):
+        """
+        Stops background threads after all submitted verifications are finished
+        """
+        with self._lock:
+            _workers, self._workers = self._workers, []
+        for _ in _workers:
+            self._tasks.put(None)
+        for _worker in _workers:
+            _worker.join()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.wait(raise_on_failure=exc_type is None)
+        finally:
+            self.close()
+
+    def _local_(self, verification):
+        _algorithm = str(verification.expected).split(':')[0]
+        verification.actual = file_checksum(verification.source, _algorithm, self.buffer_size)
+
+    def _submit_(self, verification, task):
+        with self._lock:
+            self.verifications.append(verification)
+            if len(self._workers) < self.max_parallel:
+                _worker = threading.Thread(target=self._worker_)
+                _worker.daemon = True
+                _worker.start()
+                self._workers.append(_worker)
+        self._tasks.put((verification, task))
+        return verification
+
+    def _worker_(self):
+        while True:
+            _item = self._tasks.get()
+            if _item is None:
+                self._tasks.task_done()
+                return
+            _verification, _task = _item
+            try:
+                _task()
+            except Exception as e:
+                _verification.error = e
+            finally:
+                self._tasks.task_done()
+            if not _verification.is_ok():
+                ChecksumVerifier.LOG.error("Verification failed : {0}".format(_verification))
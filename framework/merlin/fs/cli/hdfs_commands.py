@@ -34,6 +34,7 @@ Wrapper for hadoop command line interface.
 """
 import os
 import re
+from collections import namedtuple
 
 from merlin.common.exceptions import CommandFailedError
 import merlin.common.shell_command_executor as shell
@@ -44,6 +45,97 @@ ROOT_DIR = '/'
 
 PROTECTED_FOLDERS = [ROOT_DIR]
 
+FileEntry = namedtuple('FileEntry', ['path', 'size', 'modified', 'is_dir'])
+
+SnapshotChange = namedtuple('SnapshotChange', ['type', 'path', 'target'])
+
+SNAPSHOT_CHANGE_PATTERN = re.compile(r"^([M+\-R])\s+(\.(?:/.*)?)$")
+
+# command line is passed to 'sh -c' as a single argument,
+# which length is limited by MAX_ARG_STRLEN (128K on Linux)
+MAX_COMMAND_LENGTH = 100 * 1024
+
+# error reported by hadoop fs for a path, e.g. "mkdir: `/data/a': File exists"
+PATH_ERROR_PATTERN = re.compile(r"^[\w-]+: [`']?(.+?)'?: (.+)$")
+# error reported by hadoop fs for a missing path
+NO_SUCH_FILE_ERROR = "No such file or directory"
+
+
+class BatchResult(object):
+    """
+    Result of a command run over many paths by several command lines.
+    Failures are mapped back to paths from error messages
+    """
+
+    def __init__(self):
+        self.results = []
+        self.failures = {}
+
+    def add(self, paths, result):
+        """
+        Registers result of a command line run over the given paths
+        """
+        self.results.append(result)
+        if result.is_ok():
+            return
+        _mapped = False
+        for line in str(result.stderr or '').splitlines():
+            match = PATH_ERROR_PATTERN.match(line.strip())
+            if not match:
+                continue
+            path = self._match_path_(match.group(1), paths)
+            if path is not None:
+                self.failures[path] = match.group(2)
+                _mapped = True
+        if not _mapped:
+            # the failure cannot be attributed to particular paths, e.g. the cluster is unavailable
+            for path in paths:
+                self.failures[path] = str(result.stderr or '').strip()
+
+    @staticmethod
+    def _normalize_(path):
+        # hadoop fs reports fully qualified paths, e.g. hdfs://nn:8020/data/a,
+        # for paths given as /data/a
+        _path = re.sub(r"^[a-zA-Z][\w+.-]*://[^/]*", "", path)
+        return re.sub(r"/+", "/", _path).rstrip('/') or '/'
+
+    @staticmethod
+    def _match_path_(reported, paths):
+        """
+        :return: path the error was reported for or None.
+            Relative paths are resolved against home directory,
+            so they match the end of the reported path
+        """
+        _reported = BatchResult._normalize_(reported)
+        _best = None
+        for path in paths:
+            _path = BatchResult._normalize_(path)
+            if _path == _reported:
+                return path
+            if not _path.startswith('/') and _reported.endswith('/' + _path) \
+                    and (_best is None or len(_path) > len(BatchResult._normalize_(_best))):
+                _best = path
+        return _best
+
+    def is_ok(self):
+        """
+        :return: True in case command succeeded for all paths
+        """
+        return not self.failures
+
+    def failed(self):
+        """
+        :return: sorted list of paths the command failed for
+        """
+        return sorted(self.failures)
+
+    def if_failed_raise(self, exception):
+        """
+        Raises the given exception in case command failed for any path
+        """
+        if not self.is_ok():
+            raise exception
+
 
 def mkdir(path, executor=shell.execute_shell_command):
     """
@@ -55,6 +147,98 @@ def mkdir(path, executor=shell.execute_shell_command):
     return executor("hadoop", "fs", "-mkdir", path)
 
 
+def batches(paths, command_length=0, max_length=MAX_COMMAND_LENGTH):
+    """
+    Splits paths into batches, so command line with every batch fits the length limit
+    :param paths: list of paths
+    :param command_length: length of the command line without paths
+    :param max_length: max length of the command line
+    :return: generator of lists of paths
+    """
+    _batch, _length = [], command_length
+    for path in paths:
+        if _batch and _length + len(path) + 1 > max_length:
+            yield _batch
+            _batch, _length = [], command_length
+        _batch.append(path)
+        _length += len(path) + 1
+    if _batch:
+        yield _batch
+
+
+def __run_batched__(attributes, paths, executor):
+    result = BatchResult()
+    for batch in batches(paths, len(shell.build_command(*attributes))):
+        result.add(batch, executor(*(attributes + batch)))
+    return result
+
+
+def mkdir_all(paths, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -mkdir -p <path> [<path> ...] command.
+    Creates all given directories with their parents
+    by as few commands as command line length allows, existing directories are skipped
+    :param paths: list of directory paths
+    :rtype: BatchResult
+    """
+    return __run_batched__(["hadoop", "fs", "-mkdir", "-p"], list(paths), executor)
+
+
+def rm_all(paths, recursive=True, skip_trash=True, force=False,
+           executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -rm -r -skipTrash <path> [<path> ...] command.
+    Deletes all given files by as few commands as command line length allows
+    :param paths: list of paths to delete
+    :param recursive: deletes non-empty directories
+    :param skip_trash: deletes files immediately instead of moving them to trash
+    :param force: doesn't report missing files as failures
+    :rtype: BatchResult
+    """
+    paths = list(paths)
+    for path in paths:
+        if path in PROTECTED_FOLDERS:
+            raise CommandFailedError("Cannot remove protected folder {0}".format(path))
+    attributes = ["hadoop", "fs", "-rm"]
+    if force:
+        attributes.append("-f")
+    if recursive:
+        attributes.append("-r")
+    if skip_trash:
+        attributes.append("-skipTrash")
+    return __run_batched__(attributes, paths, executor)
+
+
+def touchz_all(paths, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -touchz <path> [<path> ...] command.
+    Creates files of zero length by as few commands as command line length allows
+    :param paths: list of file paths
+    :rtype: BatchResult
+    """
+    return __run_batched__(["hadoop", "fs", "-touchz"], list(paths), executor)
+
+
+def exists_all(paths, executor=shell.execute_shell_command):
+    """
+    Checks existence of all given paths
+    by as few 'hadoop fs -ls -d' commands as command line length allows.
+    'hadoop fs -test' accepts a single path only
+    :param paths: list of paths
+    :return: dictionary of path and existence flag
+    :rtype: dict
+    :raise CommandFailedError: in case existence of some path cannot be checked,
+        e.g. permission is denied or the cluster is unavailable
+    """
+    _normalize = lambda path: path.rstrip('/') or ROOT_DIR
+    paths = list(paths)
+    _existing = set()
+    for batch in batches(paths, len("hadoop fs -ls -d")):
+        _existing.update(_normalize(entry.path) for entry in
+                         listing(batch, directory=True, ignore_missing=True, executor=executor))
+    return dict((path, _normalize(path) in _existing) for path in paths)
+
+
 def copy_to_local(path, localdst, executor=shell.execute_shell_command):
     """
     Wrapper for
@@ -158,6 +342,50 @@ def recursive_list_files(path, executor=shell.execute_shell_command):
     return files
 
 
+def __missing_only__(result):
+    """
+    :return: True in case command failed only because some paths don't exist
+    """
+    _errors = [PATH_ERROR_PATTERN.match(line.strip())
+               for line in str(result.stderr or '').splitlines()]
+    _errors = [match.group(2) for match in _errors if match]
+    return bool(_errors) and all(error == NO_SUCH_FILE_ERROR for error in _errors)
+
+
+def listing(paths, recursive=True, directory=False, ignore_missing=False,
+            executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -ls -R <path> [<path> ...] command.
+    Lists files and directories at all given paths within a single command.
+    :param paths: list of files, directories or glob patterns
+    :param recursive: lists subdirectories recursively
+    :param directory: lists directories themselves instead of their content
+    :param ignore_missing: returns entries of existing paths
+        instead of raising error in case some paths don't exist.
+        Error is still raised in case listing failed for any other reason
+    :return: list of entries with path, size in bytes,
+        modification time 'YYYY-MM-DD HH:MM' and directory flag
+    :rtype: list
+    """
+    attributes = ['hadoop', 'fs', '-ls']
+    if directory:
+        attributes.append('-d')
+    elif recursive:
+        attributes.append('-R')
+    attributes.extend(paths)
+    result = executor(*attributes)
+    if not result.is_ok() and not (ignore_missing and __missing_only__(result)):
+        raise CommandFailedError("Cannot list {0}".format(", ".join(paths)))
+    entries = []
+    for line in str(result.stdout).splitlines():
+        columns = line.split(None, 7)
+        if len(columns) == 8 and columns[4].isdigit():
+            entries.append(FileEntry(path=columns[7], size=long(columns[4]),
+                                     modified="{0} {1}".format(columns[5], columns[6]),
+                                     is_dir=columns[0].startswith('d')))
+    return entries
+
+
 def file_size(path, executor=shell.execute_shell_command):
     """
     Wrapper for hadoop fs -du <path> command.
@@ -175,6 +403,40 @@ def file_size(path, executor=shell.execute_shell_command):
     return int(str(result.stdout).split(" ")[0])
 
 
+def total_size(paths, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -du -s <path> [<path> ...] command.
+    Calculates aggregate length of files at all given paths within a single command.
+    :param paths: list of files, directories or glob patterns
+    :return: the total length of files in bytes.
+    :rtype: long
+    """
+    result = executor('hadoop', 'fs', '-du', '-s', *paths)
+    result.if_failed_raise(CommandFailedError("Cannot get size of {0}".format(", ".join(paths))))
+    return sum(long(line.split()[0]) for line in str(result.stdout).splitlines()
+               if line.strip() and line.split()[0].isdigit())
+
+
+def content_summary(paths, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -count <path> [<path> ...] command.
+    Counts files and calculates aggregate length of files at all given paths
+    within a single command.
+    :param paths: list of files, directories or glob patterns
+    :return: number of files and the total length of files in bytes.
+    :rtype: tuple
+    """
+    result = executor('hadoop', 'fs', '-count', *paths)
+    result.if_failed_raise(CommandFailedError("Cannot count files in {0}".format(", ".join(paths))))
+    _files, _size = 0, 0L
+    for line in str(result.stdout).splitlines():
+        _columns = line.split()
+        if len(_columns) >= 3 and _columns[1].isdigit() and _columns[2].isdigit():
+            _files += int(_columns[1])
+            _size += long(_columns[2])
+    return _files, _size
+
+
 def get_merge(src, local_dst, executor=shell.execute_shell_command):
     """
     Wrapper for hadoop fs -getmerge <src> <localdst> command.
@@ -277,6 +539,95 @@ def distcp(src, dest, strategy=None, num_mappers=None, executor=shell.execute_sh
     return dist.run()
 
 
+def create_snapshot(path, name, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -createSnapshot <path> <name> command.
+    Creates a snapshot of a snapshottable directory.
+    :param path: snapshottable directory
+    :param name: snapshot name
+    """
+    result = executor('hadoop', 'fs', '-createSnapshot', path, name)
+    result.if_failed_raise(CommandFailedError("Cannot create snapshot {0} of {1}".format(
+        name, path)))
+    return result
+
+
+def delete_snapshot(path, name, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -deleteSnapshot <path> <name> command.
+    :param path: snapshottable directory
+    :param name: snapshot name
+    """
+    result = executor('hadoop', 'fs', '-deleteSnapshot', path, name)
+    result.if_failed_raise(CommandFailedError("Cannot delete snapshot {0} of {1}".format(
+        name, path)))
+    return result
+
+
+def snapshots(path, executor=shell.execute_shell_command):
+    """
+    Lists snapshots of a snapshottable directory
+    :param path: snapshottable directory
+    :return: list of snapshot names
+    """
+    return [entry.path.rstrip('/').rsplit('/', 1)[-1]
+            for entry in listing(["{0}/.snapshot".format(path.rstrip('/'))],
+                                 recursive=False, executor=executor)]
+
+
+def snapshot_diff(path, from_snapshot, to_snapshot, executor=shell.execute_shell_command):
+    """
+    Wrapper for hdfs snapshotDiff <path> <from_snapshot> <to_snapshot> command.
+    Reports changes made in directory between two snapshots without listing the directory.
+    :param path: snapshottable directory
+    :param from_snapshot: name of the earlier snapshot
+    :param to_snapshot: name of the later snapshot
+    :return: list of changes with type 'M' (modified), '+' (created), '-' (deleted)
+        or 'R' (renamed), absolute path and absolute target path for renamed files
+    :rtype: list
+    """
+    result = executor('hdfs', 'snapshotDiff', path, from_snapshot, to_snapshot)
+    result.if_failed_raise(CommandFailedError(
+        "Cannot get diff of {0} between snapshots {1} and {2}".format(
+            path, from_snapshot, to_snapshot)))
+    _absolute = lambda relative: path.rstrip('/') + relative[1:]
+    changes = []
+    for line in str(result.stdout).splitlines():
+        match = SNAPSHOT_CHANGE_PATTERN.match(line.strip())
+        if match:
+            _path, _, _target = match.group(2).partition(' -> ')
+            changes.append(SnapshotChange(type=match.group(1), path=_absolute(_path),
+                                          target=_absolute(_target) if _target else None))
+    return changes
+
+
+def checksums(paths, composite=False, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -checksum <path> [<path> ...] command.
+    Gets checksums of all given files by as few commands as command line length allows.
+    Checksum is calculated by datanodes from block checksums, so files are not read by the client
+    :param paths: list of files
+    :param composite: requests composite CRC (Hadoop 3.1+), which is CRC of the whole file content
+        independent of block size, so it can be compared with checksum of a local file
+    :return: dictionary of file path and checksum in format '<algorithm>:<value>'
+    :rtype: dict
+    """
+    attributes = ['hadoop', 'fs']
+    if composite:
+        attributes.append('-Ddfs.checksum.combine.mode=COMPOSITE_CRC')
+    attributes.append('-checksum')
+    values = {}
+    for batch in batches(paths, len(shell.build_command(*attributes))):
+        result = executor(*(attributes + batch))
+        result.if_failed_raise(CommandFailedError("Cannot get checksum of {0}".format(
+            ", ".join(batch))))
+        for line in str(result.stdout).splitlines():
+            columns = line.rsplit(None, 2)
+            if len(columns) == 3:
+                values[columns[0]] = "{0}:{1}".format(columns[1], columns[2])
+    return values
+
+
 def setfacl(path, acl_spec, executor=shell.execute_shell_command):
     """
     Sets ACLs for files and directories.
@@ -294,4 +645,18 @@ def getfacl(path, executor=shell.execute_shell_command):
     :param path: The path to the file or directory to list.
     :return: list of acls
     """
-    return executor('hadoop', 'fs', '-getfacl', path)
\ No newline at end of file
+    return executor('hadoop', 'fs', '-getfacl', path)
+
+
+def acl_entries(path, executor=shell.execute_shell_command):
+    """
+    Wrapper for hadoop fs -getfacl <path> command.
+    :param path: The path to the file or directory to list.
+    :return: list of ACL entries, e.g. 'group:sales:r-x',
+        including default entries and base permissions
+    :rtype: list
+    """
+    result = getfacl(path, executor=executor)
+    result.if_failed_raise(CommandFailedError("Cannot get ACLs of {0}".format(path)))
+    return [line.split()[0] for line in str(result.stdout).splitlines()
+            if line.strip() and not line.startswith('#')]
@@ -33,6 +33,7 @@ import os
 from mock import patch, Mock
 from unittest2 import TestCase, expectedFailure
 
+from merlin.common.exceptions import CommandFailedError
 from merlin.common.shell_command_executor import build_command, Result
 import merlin.fs.cli.hdfs_commands as hdfs_client
 
@@ -254,3 +255,112 @@ class TestHdfsClient(TestCase):
 
 
 
+
+    def test_listing(self):
+        _stdout = "drwxr-xr-x   - hdfs supergroup          0 2015-07-01 10:00 /src/a\n" \
+                  "-rw-r--r--   3 hdfs supergroup       1024 2015-07-01 10:05 /src/a/file name.txt\n"
+        entries = hdfs_client.listing(["/src", "/other"],
+                                      executor=self._assert_command_generation("hadoop fs -ls -R /src /other",
+                                                                               stdout=_stdout))
+        self.assertEqual([hdfs_client.FileEntry("/src/a", 0, "2015-07-01 10:00", True),
+                          hdfs_client.FileEntry("/src/a/file name.txt", 1024, "2015-07-01 10:05", False)], entries)
+
+    def test_snapshot_diff(self):
+        _stdout = "Difference between snapshot s1 and snapshot s2 under directory /src:\n" \
+                  "M\t.\n" \
+                  "+\t./a/new file\n" \
+                  "-\t./b\n" \
+                  "R\t./c -> ./d\n"
+        changes = hdfs_client.snapshot_diff("/src/", "s1", "s2",
+                                            executor=self._assert_command_generation("hdfs snapshotDiff /src/ s1 s2",
+                                                                                     stdout=_stdout))
+        self.assertEqual([hdfs_client.SnapshotChange("M", "/src", None),
+                          hdfs_client.SnapshotChange("+", "/src/a/new file", None),
+                          hdfs_client.SnapshotChange("-", "/src/b", None),
+                          hdfs_client.SnapshotChange("R", "/src/c", "/src/d")], changes)
+
+    def test_checksums(self):
+        _stdout = "/src/a\tMD5-of-0MD5-of-512CRC32C\t000002000000000000000000aa\n" \
+                  "/src/file name\tMD5-of-0MD5-of-512CRC32C\t000002000000000000000000bb\n"
+        checksums = hdfs_client.checksums(["/src/a", "/src/file name"],
+                                          executor=self._assert_command_generation(
+                                              "hadoop fs -checksum /src/a /src/file name", stdout=_stdout))
+        self.assertEqual({"/src/a": "MD5-of-0MD5-of-512CRC32C:000002000000000000000000aa",
+                          "/src/file name": "MD5-of-0MD5-of-512CRC32C:000002000000000000000000bb"}, checksums)
+
+    def _batch_executor_(self, commands, status=0, stderr=None):
+        def executor(command, *args):
+            commands.append(build_command(command, *args))
+            return Mock(spec=Result, status=status, stdout="", stderr=stderr,
+                        is_ok=Mock(return_value=status == 0))
+
+        return executor
+
+    def test_batches(self):
+        self.assertEqual([["/a", "/bb"], ["/ccc"], ["/dddddddd"]],
+                         list(hdfs_client.batches(["/a", "/bb", "/ccc", "/dddddddd"], command_length=2, max_length=10)))
+
+    def test_mkdir_all(self):
+        commands = []
+        paths = ["/data/{0:05d}".format(i) for i in range(20000)]
+        result = hdfs_client.mkdir_all(paths, executor=self._batch_executor_(commands))
+        self.assertTrue(result.is_ok())
+        self.assertTrue(1 < len(commands) < 5)
+        self.assertTrue(all(len(command) <= hdfs_client.MAX_COMMAND_LENGTH for command in commands))
+        self.assertEqual(paths, [path for command in commands for path in command.split()[4:]])
+
+    def test_rm_all_failures(self):
+        commands = []
+        result = hdfs_client.rm_all(["/tmp/a", "/tmp/b", "/tmp/c"],
+                                    executor=self._batch_executor_(
+                                        commands, status=1,
+                                        stderr="rm: `/tmp/b': No such file or directory\n"
+                                               "rm: `hdfs://nn:8020/tmp/c': Permission denied\n"))
+        self.assertEqual(["hadoop fs -rm -r -skipTrash /tmp/a /tmp/b /tmp/c"], commands)
+        self.assertFalse(result.is_ok())
+        self.assertEqual(["/tmp/b", "/tmp/c"], result.failed())
+        self.assertEqual("No such file or directory", result.failures["/tmp/b"])
+        with self.assertRaises(CommandFailedError):
+            hdfs_client.rm_all(["/tmp/a", "/"], executor=self._batch_executor_(commands))
+
+    def test_failures_of_paths_with_common_suffix(self):
+        result = hdfs_client.touchz_all(["a", "ba", "/tmp/a", "/x/tmp/a"],
+                                        executor=self._batch_executor_(
+                                            [], status=1,
+                                            stderr="touchz: `/user/hdfs/ba': Permission denied\n"
+                                                   "touchz: `hdfs://nn:8020/x/tmp/a': Permission denied\n"))
+        self.assertEqual(["/x/tmp/a", "ba"], result.failed())
+
+    def test_touchz_all_unmapped_failure(self):
+        result = hdfs_client.touchz_all(["/tmp/a", "/tmp/b"],
+                                        executor=self._batch_executor_([], status=1,
+                                                                       stderr="Call to nn:8020 failed"))
+        self.assertEqual(["/tmp/a", "/tmp/b"], result.failed())
+        self.assertEqual("Call to nn:8020 failed", result.failures["/tmp/a"])
+
+    def test_exists_all(self):
+        _stdout = "drwxr-xr-x   - hdfs supergroup          0 2015-07-01 10:00 /tmp/a\n"
+        exists = hdfs_client.exists_all(["/tmp/a/", "/tmp/b"],
+                                        executor=self._assert_command_generation("hadoop fs -ls -d /tmp/a/ /tmp/b",
+                                                                                 status=1, stdout=_stdout))
+        self.assertEqual({"/tmp/a/": True, "/tmp/b": False}, exists)
+
+    def test_exists_all_missing_paths(self):
+        exists = hdfs_client.exists_all(["/tmp/a", "/tmp/b"],
+                                        executor=self._batch_executor_(
+                                            [], status=1,
+                                            stderr="ls: `/tmp/a': No such file or directory\n"
+                                                   "ls: `/tmp/b': No such file or directory\n"))
+        self.assertEqual({"/tmp/a": False, "/tmp/b": False}, exists)
+
+    def test_exists_all_failures(self):
+        with self.assertRaises(CommandFailedError):
+            hdfs_client.exists_all(["/tmp/a", "/tmp/b"],
+                                   executor=self._batch_executor_(
+                                       [], status=1,
+                                       stderr="ls: `/tmp/a': No such file or directory\n"
+                                              "ls: `/tmp/b': Permission denied\n"))
+        with self.assertRaises(CommandFailedError):
+            hdfs_client.exists_all(["/tmp/a"],
+                                   executor=self._batch_executor_(
+                                       [], status=1, stderr="Call to nn:8020 failed"))
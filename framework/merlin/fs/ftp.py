@@ -89,6 +89,9 @@ FTPClient has next methods for work with different ftp servers:
         ftp.download_file('/tmp/file')
         ftp.download_file('/tmp/folder')
 
+    Copies a remote file and updates checksum with the downloaded data, see merlin.fs.checksum
+        ftp.download_file('/tmp/folder', checksum=StreamingChecksum())
+
     Copies a remote directory (path) with files from the SFTP server
     to the local host into a local_path. In addition, copies inner directories
     if parameter 'recursive' is True. Filters file if predicate was given
@@ -119,6 +122,7 @@ from datetime import datetime
 
 from merlin.fs.utils import FileDescriptor
 from merlin.common.exceptions import FileNotFoundException, FTPFileError, FTPConnectorError, FTPPredicateError
+from merlin.fs.checksum import ChecksumWriter
 from merlin.fs.localfs import LocalFS
 
 
@@ -309,14 +313,16 @@ class FTPClient(object):
         """
         self.ftp_connector.upload(self.path, local_path, update)
 
-    def download_file(self, local_path):
+    def download_file(self, local_path, checksum=None):
         """
         Copies a remote file (path) from the SFTP server
         to the local host as local_path
         :param local_path: path to future file or existing directory
+        :param checksum: StreamingChecksum updated with the downloaded data,
+            so downloaded file can be verified without reading it again
         :type local_path: str
         """
-        self.ftp_connector.download_file(self.path, local_path)
+        self.ftp_connector.download_file(self.path, local_path, checksum)
 
     def download_dir(self, local_path, predicate=lambda path, connector: True, recursive=True):
         """
@@ -498,22 +504,23 @@ class FTPConnector(object):
                 "{0} is folder".format(self.get_description(path).name)
             )
 
-    def download_file(self, path, local_path):
+    def download_file(self, path, local_path, checksum=None):
         """
         Copies a remote file (path) from the SFTP server
         to the local host as local_path
         :param path: path to file on ftp
         :param local_path: path to future file or existing directory
+        :param checksum: StreamingChecksum updated with the downloaded data
         :type path: str
         :type local_path: str
         """
         self.__assert_exists(path)
         LocalFS(local_path).assert_exists()
         self.__assert_is_not_dir(path)
-        self.__ftp_driver.retrbinary("RETR {0}".format(path),
-                                     open(os.path.join(local_path,
-                                                       os.path.basename(path)),
-                                          "w+b").write)
+        with open(os.path.join(local_path, os.path.basename(path)), "w+b") as _file:
+            self.__ftp_driver.retrbinary("RETR {0}".format(path),
+                                         ChecksumWriter(_file, checksum).write if checksum
+                                         else _file.write)
 
     def __copy_file_from_local(self, local_path, path, create_parents=False):
         """
@@ -966,12 +973,13 @@ class SFTPConnector(object):
         self.upload(path, os.path.join(os.path.dirname(__file__), 'resources/zero'))
         return self
 
-    def download_file(self, path, local_path):
+    def download_file(self, path, local_path, checksum=None):
         """
         Copies a remote file (path) from the SFTP server
         to the local host as local_path
         :param path: path to file on ftp
         :param local_path: path to future file or existing directory
+        :param checksum: StreamingChecksum updated with the downloaded data
         :type path: str
         :type local_path: str
         """
@@ -983,16 +991,23 @@ class SFTPConnector(object):
         if LocalFS(local_path).exists():
             _local_dst = local_path if not LocalFS(local_path).is_directory() else \
                 os.path.join(local_path, self.__get_name(path))
-            self.__ftp_instance.get(remotepath=path, localpath=_local_dst)
+            self.__get_file(path, _local_dst, checksum)
         elif LocalFS(self.__get_basename(local_path)).exists():
             local = LocalFS(self.__get_basename(local_path))
             if local.is_directory():
-                self.__ftp_instance.get(remotepath=path, localpath=local_path)
+                self.__get_file(path, local_path, checksum)
             else:
                 raise FTPFileError("'{0}' is not directory".format(local_path))
         else:
             raise FTPFileError("'{0}' is not exists".format(local_path))
 
+    def __get_file(self, path, local_path, checksum):
+        if checksum:
+            with open(local_path, "wb") as _file:
+                self.__ftp_instance.getfo(remotepath=path, fl=ChecksumWriter(_file, checksum))
+        else:
+            self.__ftp_instance.get(remotepath=path, localpath=local_path)
+
     def download_dir(self, path, local_path, predicate=lambda path, connector: True, recursive=True):
         """
         Copies a remote directory (path) with files from the SFTP server
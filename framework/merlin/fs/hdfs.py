@@ -35,6 +35,7 @@ from merlin.fs.utils import FileDescriptor
 from merlin.common.exceptions \
     import FileSystemException, FileNotFoundException, CommandException
 from merlin.common.utils import ListIterator
+from merlin.fs.sync import ManifestSync, SnapshotSync
 import merlin.fs.cli.hdfs_commands as fs
 
 
@@ -291,6 +292,24 @@ class HDFS(object):
         """
         fs.distcp(self.path, dest, strategy, num_mappers)
 
+    def sync(self, dest, manifest=None, num_mappers=None, **kwargs):
+        """
+        Copies only changes made since the previous sync between clusters.
+        Uses HDFS snapshots of source and destination in case manifest isn't specified,
+        otherwise compares listing of source with the manifest kept in the local file.
+        :param dest: path to destination directory
+        :param manifest: path to the local manifest file
+        :param num_mappers: number of mappers
+        :param kwargs: additional options of ManifestSync
+        :type dest: str
+        :type manifest: str
+        :type num_mappers: str, int
+        :return: changes copied, see SnapshotSync.sync and ManifestSync.sync
+        """
+        if manifest:
+            return ManifestSync(self.path, dest, manifest, mappers=num_mappers, **kwargs).sync()
+        return SnapshotSync(self.path, dest, mappers=num_mappers).sync()
+
     def get_description(self):
         """
         Gets metadata of file at the given path
@@ -0,0 +1,292 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+
+"""
+Synchronization of HDFS directories by distcp jobs
+
+INCREMENTAL SYNC EXAMPLES :
+
+Copies only changes made in snapshottable source since the previous sync :
+        SnapshotSync("hdfs://nn1:8020/warehouse", "hdfs://nn2:8020/warehouse", mappers=50).sync()
+
+    Takes the new snapshot of source, lists changes by 'hdfs snapshotDiff' and copies them :
+    hadoop distcp -p -m 50 -update -diff distcp-sync-20150101000000 distcp-sync-20150102000000
+        hdfs://nn1:8020/warehouse hdfs://nn2:8020/warehouse
+    then takes the snapshot with the same name of destination and deletes the previous snapshots.
+
+
+Copies only files which were created or modified since the previous sync,
+according to the local manifest :
+        ManifestSync("hdfs://nn1:8020/warehouse", "hdfs://nn2:8020/warehouse",
+                     "/var/lib/sync/warehouse.json",
+                     verify_checksums=True, delete_missing=True, chunks=8).sync()
+
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from merlin.common.exceptions import DistCpError
+from merlin.common.logger import get_logger
+from merlin.common.shell_command_executor import execute_shell_command, \
+    execute_shell_command_streaming
+import merlin.fs.cli.hdfs_commands as fs
+from merlin.tools.distcp import DistCp, DistCpPlanner
+
+
+class SnapshotSync(object):
+    """
+    Incrementally synchronizes destination directory with source using HDFS snapshots.
+    Every sync takes a new snapshot of source, copies changes made since the previous sync
+    by 'distcp -update -diff' and takes the snapshot with the same name of destination,
+    so neither source nor destination is compared file by file.
+    The first sync copies the whole source snapshot.
+    Both source and destination must be snapshottable
+    and destination must not be changed between syncs
+    """
+    LOG = get_logger("SnapshotSync")
+    PREFIX = "distcp-sync-"
+
+    def __init__(self, source, destination, mappers=None, configure=None,
+                 executor=execute_shell_command):
+        """
+        :param source: snapshottable source directory
+        :param destination: snapshottable destination directory
+        :param mappers: number of mappers of distcp job
+        :param configure: callback which takes DistCp job to set additional options, e.g. preserve
+        :param executor: the interface used to run commands
+        """
+        super(SnapshotSync, self).__init__()
+        self.source = source.rstrip('/')
+        self.destination = destination.rstrip('/')
+        self.mappers = mappers
+        self.configure = configure
+        self.executor = executor
+
+    def last_snapshot(self):
+        """
+        :return: name of the latest snapshot taken by sync on both source and destination or None
+        """
+        _common = set(fs.snapshots(self.source, executor=self.executor)) \
+            & set(fs.snapshots(self.destination, executor=self.executor))
+        _names = sorted(_name for _name in _common if _name.startswith(SnapshotSync.PREFIX))
+        return _names[-1] if _names else None
+
+    def sync(self, name=None):
+        """
+        Copies changes made in source since the previous sync
+        :param name: name of the new snapshot. Generated from current time if not specified,
+            names must sort in order they were taken
+        :return: list of SnapshotChange or None in case the whole source was copied
+        """
+        _previous = self.last_snapshot()
+        _name = name or "{0}{1}".format(SnapshotSync.PREFIX, time.strftime("%Y%m%d%H%M%S"))
+        fs.create_snapshot(self.source, _name, executor=self.executor)
+        try:
+            _changes = self._copy_(_previous, _name)
+            fs.create_snapshot(self.destination, _name, executor=self.executor)
+        except Exception:
+            # snapshot left on source would be taken as the base of the next diff,
+            # which destination doesn't have
+            try:
+                fs.delete_snapshot(self.source, _name, executor=self.executor)
+            except Exception as e:
+                SnapshotSync.LOG.error("Cannot delete snapshot {0} of {1} : {2}".format(
+                    _name, self.source, e))
+            raise
+        if _previous:
+            fs.delete_snapshot(self.source, _previous, executor=self.executor)
+            fs.delete_snapshot(self.destination, _previous, executor=self.executor)
+        return _changes
+
+    def _copy_(self, previous, name):
+        _job = DistCp(executor=self.executor).copy_to(self.destination)
+        if previous:
+            _changes = fs.snapshot_diff(self.source, previous, name, executor=self.executor)
+            SnapshotSync.LOG.info("{0} changes in {1} since snapshot {2}".format(
+                len(_changes), self.source, previous))
+            _job.take(self.source).use_snapshot_diff(previous, name)
+        else:
+            _changes = None
+            SnapshotSync.LOG.info("No common snapshot of {0} and {1} found, "
+                                  "copying the whole source".format(self.source, self.destination))
+            _job.take("{0}/.snapshot/{1}".format(self.source, name)).update_destination()
+        if _changes is None or _changes:
+            if self.mappers:
+                _job.use(mappers=self.mappers)
+            if self.configure:
+                self.configure(_job)
+            _job.run()
+        return _changes
+
+
+class ManifestSync(object):
+    """
+    Incrementally synchronizes destination directory with source
+    using manifest of the previous sync.
+    Manifest is a local JSON file which keeps size, modification time
+    and checksum of every copied file.
+    Source is listed by a single command
+    and only new and modified files are copied by DistCpPlanner.
+    Outdated copies of modified files are deleted from destination before the copy,
+    files which are in destination but not in the manifest are not replaced,
+    so destination should be empty before the first sync.
+    Modification time is reported by HDFS with minute precision,
+    so a file rewritten with the same size within the minute it was synced in is not detected
+    """
+    LOG = get_logger("ManifestSync")
+
+    def __init__(self, source, destination, manifest, verify_checksums=False, delete_missing=False,
+                 chunks=4, max_parallel=4, mappers=None, configure=None,
+                 executor=execute_shell_command, job_executor=execute_shell_command_streaming):
+        """
+        :param source: source directory
+        :param destination: destination directory
+        :param manifest: path to the local manifest file
+        :param verify_checksums: compares checksums of files modified without changing size,
+            so files rewritten with the same content are not copied
+        :param delete_missing: deletes files from destination which were deleted from source
+        :param chunks: target number of distcp jobs
+        :param max_parallel: max number of distcp jobs running at the same time
+        :param mappers: number of mappers of every distcp job
+        :param configure: callback which takes DistCp job to set additional options, e.g. preserve
+        :param executor: the interface used to run hadoop fs commands
+        :param job_executor: the interface used to launch distcp jobs
+        """
+        super(ManifestSync, self).__init__()
+        self.source = source.rstrip('/')
+        self.destination = destination.rstrip('/')
+        self.manifest = manifest
+        self.verify_checksums = verify_checksums
+        self.delete_missing = delete_missing
+        self.chunks = chunks
+        self.max_parallel = max_parallel
+        self.mappers = mappers
+        self.configure = configure
+        self.executor = executor
+        self.job_executor = job_executor
+        self._previous = {}
+
+    def load_manifest(self):
+        """
+        :return: dictionary of path relative to source
+            and list of size, modification time and checksum
+        """
+        if not os.path.isfile(self.manifest):
+            return {}
+        with open(self.manifest) as _file:
+            return json.load(_file)
+
+    def save_manifest(self, files):
+        _dir = os.path.dirname(os.path.abspath(self.manifest))
+        if not os.path.isdir(_dir):
+            os.makedirs(_dir)
+        _fd, _tmp = tempfile.mkstemp(dir=_dir)
+        with os.fdopen(_fd, 'w') as _file:
+            json.dump(files, _file, indent=2, sort_keys=True)
+        os.rename(_tmp, self.manifest)
+
+    def changes(self, entries=None):
+        """
+        Compares source with manifest of the previous sync
+        :param entries: source listing. Source is listed if not specified
+        :return: list of FileEntry of new and modified files,
+            list of deleted paths relative to source and the new manifest
+        :rtype: tuple
+        """
+        _entries = entries if entries is not None \
+            else fs.listing([self.source], executor=self.executor)
+        _previous = self._previous = self.load_manifest()
+        _files = {}
+        _changed = []
+        _suspected = []
+        for _entry in _entries:
+            if _entry.is_dir or not _entry.path.startswith(self.source + '/'):
+                continue
+            _relative = _entry.path[len(self.source) + 1:]
+            _known = _previous.get(_relative)
+            if _known and _known[0] == _entry.size and _known[1] == _entry.modified:
+                _files[_relative] = _known
+                continue
+            _files[_relative] = [_entry.size, _entry.modified, None]
+            if self.verify_checksums and _known and _known[0] == _entry.size and _known[2]:
+                _suspected.append(_entry)
+            else:
+                _changed.append(_entry)
+        if self.verify_checksums:
+            _checksums = fs.checksums([_entry.path for _entry in _changed + _suspected],
+                                      executor=self.executor)
+            for _entry in _changed + _suspected:
+                _files[self._relative_(_entry)][2] = _checksums.get(_entry.path)
+            _changed.extend(_entry for _entry in _suspected
+                            if _checksums.get(_entry.path) != _previous[self._relative_(_entry)][2])
+        _deleted = sorted(set(_previous) - set(_files))
+        return _changed, _deleted, _files
+
+    def sync(self, entries=None, on_progress=None):
+        """
+        Copies files changed since the previous sync and saves the new manifest in case of success
+        :param entries: source listing. Source is listed if not specified
+        :param on_progress: callback which takes progress of the copy from 0 to 1
+        :return: list of FileEntry of copied files and list of deleted paths relative to source
+        :rtype: tuple
+        """
+        _changed, _deleted, _files = self.changes(entries)
+        ManifestSync.LOG.info("{0} files changed ({1} bytes), {2} files deleted in {3}".format(
+            len(_changed), sum(_entry.size for _entry in _changed), len(_deleted), self.source))
+        _outdated = ["{0}/{1}".format(self.destination, self._relative_(_entry))
+                     for _entry in _changed if self._previous.get(self._relative_(_entry))]
+        if _outdated:
+            _result = fs.rm_all(_outdated, recursive=False, skip_trash=True, force=True,
+                                executor=self.executor)
+            _result.if_failed_raise(DistCpError(
+                "Cannot delete outdated files from {0} : {1}".format(
+                    self.destination, ", ".join(_result.failed()))))
+        if _changed:
+            _planner = DistCpPlanner(self.source, self.destination, chunks=self.chunks,
+                                     max_parallel=self.max_parallel, mappers=self.mappers,
+                                     configure=self.configure, executor=self.executor,
+                                     job_executor=self.job_executor)
+            _planner.plan_files(_changed)
+            _planner.run(on_progress=on_progress)
+        if self.delete_missing and _deleted:
+            _result = fs.rm_all(["{0}/{1}".format(self.destination, _path) for _path in _deleted],
+                                recursive=False, skip_trash=False, force=True,
+                                executor=self.executor)
+            _result.if_failed_raise(DistCpError("Cannot delete files from {0} : {1}".format(
+                self.destination, ", ".join(_result.failed()))))
+        self.save_manifest(_files)
+        return _changed, _deleted
+
+    def _relative_(self, entry):
+        return entry.path[len(self.source) + 1:]
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+import hashlib
+import os
+import shutil
+import StringIO
+import tempfile
+
+from mock import MagicMock
+from unittest2 import TestCase
+
+from merlin.common.exceptions import ChecksumMismatchError, ChecksumUnavailableError
+from merlin.common.shell_command_executor import build_command, Result
+import merlin.fs.checksum as checksum
+from merlin.fs.checksum import ChecksumVerifier, ChecksumWriter, StreamingChecksum, file_checksum
+
+
+class TestChecksum(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.data = "".join(chr(i % 251) for i in range(100000))
+        self.path = os.path.join(self.dir, "data")
+        with open(self.path, "wb") as _file:
+            _file.write(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_crc32c(self):
+        self.assertEqual(0xE3069283, checksum.crc32c("123456789"))
+        self.assertEqual(0xE3069283, checksum.crc32c("6789", checksum.crc32c("12345")))
+
+    def test_file_checksum(self):
+        _whole = StreamingChecksum()
+        _whole.update(self.data)
+        self.assertEqual(_whole.value(), file_checksum(self.path, buffer_size=4096))
+        self.assertEqual("MD5:" + hashlib.md5(self.data).hexdigest(),
+                         file_checksum(self.path, algorithm="md5", buffer_size=1000))
+        self.assertTrue(file_checksum(self.path, algorithm="COMPOSITE-CRC32").startswith("COMPOSITE-CRC32:"))
+
+    def test_checksum_writer(self):
+        _stream = StringIO.StringIO()
+        _checksum = StreamingChecksum()
+        _writer = ChecksumWriter(_stream, _checksum)
+        _writer.write(self.data[:10])
+        _writer.write(self.data[10:])
+        self.assertEqual(self.data, _stream.getvalue())
+        self.assertEqual(file_checksum(self.path), _checksum.value())
+        self.assertEqual(len(self.data), _checksum.size)
+
+    def _executor_(self, commands, value):
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(spec=Result, stdout="{0}\t{1}\n".format(args[-1], value.replace(":", "\t")))
+
+        return executor
+
+    def test_verify_hdfs(self):
+        commands = []
+        _expected = file_checksum(self.path)
+        with ChecksumVerifier(max_parallel=2, executor=self._executor_(commands, _expected)) as verifier:
+            verifier.verify_hdfs(self.path, "/raw/data")
+            verifier.verify_hdfs(self.path, "/raw/copy", checksum=_expected)
+        self.assertTrue(all(_verification.is_ok() for _verification in verifier.verifications))
+        self.assertEqual(["hadoop fs -Ddfs.checksum.combine.mode=COMPOSITE_CRC -checksum /raw/copy",
+                          "hadoop fs -Ddfs.checksum.combine.mode=COMPOSITE_CRC -checksum /raw/data"],
+                         sorted(commands))
+
+    def test_corrupted_copy(self):
+        verifier = ChecksumVerifier(executor=self._executor_([], "COMPOSITE-CRC32C:00000000"))
+        verifier.verify_hdfs(self.path, "/raw/data")
+        verifier.verify(self.path, hashlib.md5(self.data).hexdigest(), algorithm="md5")
+        with self.assertRaises(ChecksumMismatchError):
+            verifier.wait()
+        self.assertEqual([False, True], [_verification.is_ok() for _verification in verifier.verifications])
+        verifier.close()
+
+    def test_composite_crc_not_available(self):
+        verifier = ChecksumVerifier(executor=self._executor_([], "MD5-of-0MD5-of-512CRC32C:0000"))
+        _verification = verifier.verify_hdfs(self.path, "/raw/data")
+        with self.assertRaises(ChecksumUnavailableError):
+            verifier.wait()
+        self.assertIsInstance(_verification.error, ChecksumUnavailableError)
+        verifier.close()
+
+    def test_pure_python_crc32c_limit(self):
+        _native, checksum._crc32c_module = checksum._crc32c_module, None
+        _limit, checksum.PURE_PYTHON_CRC32C_LIMIT = checksum.PURE_PYTHON_CRC32C_LIMIT, len(self.data) - 1
+        try:
+            with self.assertRaises(ChecksumUnavailableError):
+                file_checksum(self.path)
+            self.assertTrue(file_checksum(self.path, algorithm="md5").startswith("MD5:"))
+        finally:
+            checksum._crc32c_module = _native
+            checksum.PURE_PYTHON_CRC32C_LIMIT = _limit
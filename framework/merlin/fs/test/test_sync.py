@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+import os
+import shutil
+import tempfile
+
+from mock import MagicMock
+from unittest2 import TestCase
+
+from merlin.common.exceptions import DistCpError
+from merlin.common.shell_command_executor import build_command, Result
+from merlin.fs.cli.hdfs_commands import FileEntry
+from merlin.fs.sync import ManifestSync, SnapshotSync
+
+
+LISTING = [FileEntry("/src/a", 0, "2015-07-01 10:00", True),
+           FileEntry("/src/a/f1", 100, "2015-07-01 10:00", False),
+           FileEntry("/src/a/f2", 100, "2015-07-01 10:00", False),
+           FileEntry("/src/a/f3", 100, "2015-07-01 10:00", False),
+           FileEntry("/src/b", 0, "2015-07-01 10:00", True),
+           FileEntry("/src/b/f4", 50, "2015-07-01 10:00", False),
+           FileEntry("/src/c", 0, "2015-07-01 10:00", True),
+           FileEntry("/src/c/f5", 50, "2015-07-01 10:00", False),
+           FileEntry("/src/d", 10, "2015-07-01 10:00", False)]
+
+
+class TestSnapshotSync(TestCase):
+    def _executor_(self, commands, snapshots):
+        def executor(cmd, *args):
+            _command = build_command(cmd, *args)
+            commands.append(_command)
+            _stdout = ""
+            if _command.endswith("/.snapshot"):
+                _stdout = "\n".join("drwxr-xr-x   - hdfs supergroup          0 2015-07-01 10:00 {0}/{1}".format(
+                    args[-1], _name) for _name in snapshots)
+            elif _command.startswith("hdfs snapshotDiff"):
+                _stdout = "M\t.\n+\t./a\n"
+            return MagicMock(spec=Result, stdout=_stdout)
+
+        return executor
+
+    def test_first_sync(self):
+        commands = []
+        changes = SnapshotSync("/src", "/dst", executor=self._executor_(commands, [])).sync(name="s1")
+        self.assertIsNone(changes)
+        self.assertEqual(["hadoop fs -ls /src/.snapshot",
+                          "hadoop fs -ls /dst/.snapshot",
+                          "hadoop fs -createSnapshot /src s1",
+                          "hadoop distcp -p -update /src/.snapshot/s1 /dst",
+                          "hadoop fs -createSnapshot /dst s1"], commands)
+
+    def test_failed_sync_deletes_snapshot(self):
+        commands = []
+        executor = self._executor_(commands, ["distcp-sync-1"])
+
+        def failing_executor(cmd, *args):
+            if cmd == "hadoop distcp":
+                raise DistCpError("DistCp Job failed")
+            return executor(cmd, *args)
+
+        with self.assertRaises(DistCpError):
+            SnapshotSync("/src", "/dst", executor=failing_executor).sync(name="distcp-sync-2")
+        self.assertEqual(["hadoop fs -createSnapshot /src distcp-sync-2",
+                          "hdfs snapshotDiff /src distcp-sync-1 distcp-sync-2",
+                          "hadoop fs -deleteSnapshot /src distcp-sync-2"], commands[2:])
+
+    def test_incremental_sync(self):
+        commands = []
+        executor = self._executor_(commands, ["distcp-sync-1", "distcp-sync-2", "manual"])
+        changes = SnapshotSync("/src", "/dst", mappers=5, executor=executor).sync(name="distcp-sync-3")
+        self.assertEqual(["/src", "/src/a"], [_change.path for _change in changes])
+        self.assertEqual(["hadoop fs -createSnapshot /src distcp-sync-3",
+                          "hdfs snapshotDiff /src distcp-sync-2 distcp-sync-3",
+                          "hadoop distcp -p -m 5 -update -diff distcp-sync-2 distcp-sync-3 /src /dst",
+                          "hadoop fs -createSnapshot /dst distcp-sync-3",
+                          "hadoop fs -deleteSnapshot /src distcp-sync-2",
+                          "hadoop fs -deleteSnapshot /dst distcp-sync-2"], commands[2:])
+
+
+class TestManifestSync(TestCase):
+    def setUp(self):
+        self.manifest = os.path.join(tempfile.mkdtemp(), "manifest.json")
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.manifest))
+
+    def _sync_(self, entries, commands, checksums=None, **kwargs):
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            _stdout = ""
+            if args[:2] == ("fs", "-checksum"):
+                _stdout = "\n".join("{0}\tMD5\t{1}".format(_path, checksums[_path]) for _path in args[2:])
+            return MagicMock(spec=Result, stdout=_stdout)
+
+        def job_executor(cmd, *args):
+            commands.append(build_command(cmd, *args).split(" -f ")[0])
+            return MagicMock(spec=Result, stdout="")
+
+        return ManifestSync("/src", "/dst", self.manifest, executor=executor, job_executor=job_executor,
+                            **kwargs).sync(entries)
+
+    def test_sync(self):
+        commands = []
+        changed, deleted = self._sync_(LISTING, commands)
+        self.assertEqual(6, len(changed))
+        self.assertEqual([], deleted)
+        self.assertEqual("hadoop fs -mkdir -p /dst /dst/a /dst/b /dst/c", commands[0])
+        self.assertTrue(all(_command == "hadoop distcp -p -strategy dynamic" for _command in commands[1:]))
+
+        commands = []
+        listing = [_entry for _entry in LISTING if _entry.path != "/src/b/f4"]
+        listing[1] = FileEntry("/src/a/f1", 200, "2015-07-02 10:00", False)
+        changed, deleted = self._sync_(listing, commands, delete_missing=True)
+        self.assertEqual(["/src/a/f1"], [_entry.path for _entry in changed])
+        self.assertEqual(["b/f4"], deleted)
+        self.assertEqual(["hadoop fs -rm -f -skipTrash /dst/a/f1",
+                          "hadoop fs -mkdir -p /dst/a",
+                          "hadoop distcp -p -strategy dynamic",
+                          "hadoop fs -rm -f /dst/b/f4"], commands)
+
+        commands = []
+        self.assertEqual(([], []), self._sync_(listing, commands))
+        self.assertEqual([], commands)
+
+    def test_verify_checksums(self):
+        checksums = dict((_entry.path, "1") for _entry in LISTING)
+        self._sync_(LISTING, [], checksums, verify_checksums=True)
+
+        commands = []
+        checksums["/src/a/f2"] = "2"
+        listing = [_entry._replace(modified="2015-07-02 10:00") if _entry.path.startswith("/src/a/") else _entry
+                   for _entry in LISTING]
+        changed, _ = self._sync_(listing, commands, checksums, verify_checksums=True)
+        self.assertEqual(["/src/a/f2"], [_entry.path for _entry in changed])
+        self.assertEqual("hadoop fs -checksum /src/a/f1 /src/a/f2 /src/a/f3", commands[0])
@@ -98,11 +98,52 @@ Sets preserve replication number in next format -pr :
         .preserve_acl() Acl - 'a'
         .preserve_xattr() XAttr - 'x'
 
+
+Copies files listed in the file and splits them into chunks assigned to mappers dynamically :
+        DistCp().take_list("file:///tmp/sources.list").
+        copy_to("hdfs://localhost:8020/tmp/bar").
+        use_dynamic_strategy().with_blocks_per_chunk(128).run()
+
+    Will be transformed to next DistCp CLI command :
+    hadoop distcp -p -strategy dynamic -blocksperchunk 128
+        -f file:///tmp/sources.list hdfs://localhost:8020/tmp/bar
+
+
+Copies only changes made in source between snapshots 's1' and 's2'
+(destination must have snapshot 's1' and must not be changed since it was taken) :
+        DistCp().take("hdfs://localhost:8020/tmp/foo").
+        copy_to("hdfs://localhost:8020/tmp/bar").use_snapshot_diff("s1", "s2").run()
+
+    Will be transformed to next DistCp CLI command :
+    hadoop distcp -p -update -diff s1 s2 hdfs://localhost:8020/tmp/foo hdfs://localhost:8020/tmp/bar
+
+
+DISTCP PLANNER EXAMPLES :
+
+Copies directory with millions of small files by 8 distcp jobs,
+at most 4 jobs are running at the same time :
+        DistCpPlanner("hdfs://nn1:8020/data", "hdfs://nn2:8020/data", chunks=8, max_parallel=4,
+                      mappers=20).run(on_progress=lambda progress: log(progress))
+
+    Source directory is listed by a single 'hadoop fs -ls -R' command.
+    Its subdirectories are split into chunks of roughly equal size,
+    sources of every chunk are passed to distcp in a file list :
+    hadoop distcp -p -m 20 -strategy dynamic -f file:///tmp/distcp_0001.list hdfs://nn2:8020/data
+
 """
 
+import collections
+import heapq
+import os
+import re
+import tempfile
+import threading
+
 from merlin.common.exceptions import DistCpError
-from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.shell_command_executor import execute_shell_command, \
+    execute_shell_command_streaming
 from merlin.common.logger import get_logger
+from merlin.common.utils import run_parallel
 
 
 class DistCp(object):
@@ -120,6 +161,10 @@ class DistCp(object):
         self.strategy = None
         self.mappers = None
         self.synchronize = False
+        self.snapshot_diff = None
+        self.copy_strategy = None
+        self.blocks_per_chunk = None
+        self.source_list = None
         self.path_src = None
         self.path_dest = None
         self.__executor = executor
@@ -147,7 +192,15 @@ class DistCp(object):
             list_attributes.append(self.strategy)
         if self.synchronize:
             list_attributes.append("-delete")
-        if self.path_src:
+        if self.snapshot_diff:
+            list_attributes.append(self.snapshot_diff)
+        if self.copy_strategy:
+            list_attributes.append(self.copy_strategy)
+        if self.blocks_per_chunk:
+            list_attributes.append(self.blocks_per_chunk)
+        if self.source_list:
+            list_attributes.append(self.source_list)
+        elif self.path_src:
             list_attributes.append(self.path_src)
         else:
             raise DistCpError("You must specify source that will be copied")
@@ -170,6 +223,17 @@ class DistCp(object):
 
         return self
 
+    def take_list(self, path):
+        """
+        Specifies the file containing list of sources which will be copied, one path per line
+        :param path: URI of the file with list of sources
+        :type path: str
+        :rtype: DistCp
+        """
+        self.source_list = "-f {0}".format(path)
+
+        return self
+
     def copy_to(self, path):
         """
         Specifies the directory or file on file system into which the data should be copied.
@@ -218,6 +282,44 @@ class DistCp(object):
 
         return self
 
+    def use_snapshot_diff(self, from_snapshot, to_snapshot):
+        """
+        Copies only changes made in source between two snapshots instead of comparing all files.
+        Destination must have snapshot with name 'from_snapshot'
+        and must not be changed since it was taken.
+        Sets update strategy because snapshot diff cannot be used without it
+        :param from_snapshot: name of the snapshot the destination is synchronized with
+        :param to_snapshot: name of the source snapshot to synchronize destination with
+        :type from_snapshot: str
+        :type to_snapshot: str
+        :rtype: DistCp
+        """
+        self.strategy = "-update"
+        self.snapshot_diff = "-diff {0} {1}".format(from_snapshot, to_snapshot)
+
+        return self
+
+    def use_dynamic_strategy(self):
+        """
+        Splits files into many small chunks which are picked up by mappers as soon as they are free,
+        so faster mappers copy more data
+        :rtype: DistCp
+        """
+        self.copy_strategy = "-strategy dynamic"
+
+        return self
+
+    def with_blocks_per_chunk(self, blocks):
+        """
+        Splits files larger than the given number of blocks into chunks copied in parallel
+        :param blocks: number of blocks per chunk
+        :type blocks: str, int
+        :rtype: DistCp
+        """
+        self.blocks_per_chunk = "-blocksperchunk {0}".format(str(blocks))
+
+        return self
+
     def preserve_replication_number(self):
         """
         Sets replication number of file in destination equals
@@ -288,6 +390,256 @@ class DistCp(object):
             self.preserve = "{0}{1}".format(self.preserve, value)
 
 
+class DistCpChunk(object):
+    """
+    Part of the copy performed by a single distcp job
+    """
 
+    def __init__(self, target):
+        """
+        :param target: directory the sources are copied into
+        """
+        self.target = target
+        self.sources = []
+        self.size = 0
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+
+    def add(self, path, size):
+        self.sources.append(path)
+        self.size += size
+
+    def is_ok(self):
+        return self.error is None and self.result is not None
+
+    def __repr__(self):
+        return "DistCpChunk(target={0}, sources={1}, size={2})".format(
+            self.target, len(self.sources), self.size)
+
+
+class DistCpPlanner(object):
+    """
+    Copies directory by several distcp jobs running in parallel.
+    Source is listed once, its subdirectories are split into chunks of roughly equal size
+    and every chunk is copied by a separate distcp job reading sources from a file list.
+    Large subdirectories are split further,
+    so every chunk is copied into the matching target directory.
+    Jobs can't use -update or -overwrite : with these options distcp copies contents
+    of every listed directory into the target directory instead of the directory itself.
+    """
+    LOG = get_logger("DistCpPlanner")
+    PROGRESS_PATTERN = re.compile(r"map (\d+)%")
+    # number of the last lines of distcp output included into the error message
+    ERROR_LINES = 20
+
+    def __init__(self, source, destination, chunks=4, max_parallel=4, mappers=None,
+                 blocks_per_chunk=None, list_dir=None, configure=None,
+                 executor=execute_shell_command,
+                 job_executor=execute_shell_command_streaming):
+        """
+        :param source: source directory
+        :param destination: destination directory
+        :param chunks: target number of distcp jobs
+        :param max_parallel: max number of distcp jobs running at the same time
+        :param mappers: number of mappers of every distcp job
+        :param blocks_per_chunk: splits large files into chunks of the given number of blocks
+        :param list_dir: local directory for source lists
+        :param configure: callback which takes DistCp job to set additional options, e.g. preserve
+        :param executor: the interface used to list source and create target directories
+        :param job_executor: the interface used to launch distcp jobs.
+            Executor that streams command output allows to track progress while jobs are running
+        """
+        super(DistCpPlanner, self).__init__()
+        self.source = source.rstrip('/')
+        self.destination = destination.rstrip('/')
+        self.chunks = chunks
+        self.max_parallel = max_parallel
+        self.mappers = mappers
+        self.blocks_per_chunk = blocks_per_chunk
+        self.list_dir = list_dir
+        self.configure = configure
+        self.executor = executor
+        self.job_executor = job_executor
+        self._lock = threading.Lock()
+        self._plan = None
+
+    def listing(self):
+        """
+        Lists source directory recursively by a single command
+        :return: list of FileEntry
+        """
+        # imported lazily as hdfs_commands imports DistCp
+        import merlin.fs.cli.hdfs_commands as fs
+        return fs.listing([self.source], executor=self.executor)
 
-
+    def plan(self, entries=None):
+        """
+        Splits source into chunks
+        :param entries: source listing. Source is listed if not specified
+        :return: list of DistCpChunk
+        """
+        _entries = entries if entries is not None else self.listing()
+        _sizes = {}
+        _children = {}
+        _dirs = set()
+        for _entry in _entries:
+            _path = _entry.path.rstrip('/')
+            _children.setdefault(_path.rsplit('/', 1)[0], []).append(_path)
+            _sizes.setdefault(_path, 0)
+            if _entry.is_dir:
+                _dirs.add(_path)
+                continue
+            _sizes[_path] += _entry.size
+            _parent = _path.rsplit('/', 1)[0]
+            while len(_parent) > len(self.source) and _parent.startswith(self.source):
+                _sizes[_parent] = _sizes.get(_parent, 0) + _entry.size
+                _parent = _parent.rsplit('/', 1)[0]
+        _total = sum(_sizes[_path] for _path in _children.get(self.source, []))
+        _budget = float(_total) / self.chunks if _total else 0
+        _pending = [(_path, self.destination) for _path in _children.get(self.source, [])]
+        _units = {}
+        while _pending:
+            _path, _target = _pending.pop()
+            if _path in _dirs and _sizes[_path] > _budget and _children.get(_path):
+                _nested = "{0}/{1}".format(_target, _path.rsplit('/', 1)[1])
+                _pending.extend((_child, _nested) for _child in _children[_path])
+            else:
+                _units.setdefault(_target, []).append((_path, _sizes[_path]))
+        return self._assign_(_units, _total)
+
+    def plan_files(self, entries):
+        """
+        Splits the given files into chunks,
+        every file is copied into the matching directory of destination.
+        Used to copy only a part of source, e.g. files changed since the last copy.
+        Every target directory needs a separate distcp job,
+        so in case files are spread over more directories than the number of chunks,
+        the ancestor directories of the files are copied instead.
+        Distcp without -update and -overwrite skips files which already exist in destination,
+        so outdated copies of the given files must be deleted from destination before the copy
+        :param entries: list of FileEntry of files under source directory
+        :return: list of DistCpChunk
+        """
+        _files = [(self._relative_parts_(_entry.path), _entry.size)
+                  for _entry in entries if not _entry.is_dir]
+        _depth = max([len(_parts) - 1 for _parts, _ in _files] or [0])
+        while _depth and len(set(tuple(_parts[:_depth])
+                                 for _parts, _ in _files if len(_parts) > 1)) > self.chunks:
+            _depth -= 1
+        _units = {}
+        for _parts, _size in _files:
+            _parent = _parts[:min(_depth, len(_parts) - 1)]
+            _unit = _units.setdefault("/".join([self.destination] + _parent), {})
+            _path = "/".join([self.source] + _parts[:len(_parent) + 1])
+            _unit[_path] = _unit.get(_path, 0) + _size
+        return self._assign_(
+            dict((_target, _unit.items()) for _target, _unit in _units.iteritems()),
+            sum(_size for _, _size in _files))
+
+    def _relative_parts_(self, path):
+        if path.startswith(self.source + '/'):
+            return path[len(self.source) + 1:].split('/')
+        return [path.rsplit('/', 1)[-1]]
+
+    def _assign_(self, units, total):
+        self._plan = []
+        for _target, _group in sorted(units.iteritems()):
+            _group_size = sum(_size for _, _size in _group)
+            _share = int(round(self.chunks * float(_group_size) / total)) if total else 1
+            _count = min(len(_group), max(1, _share))
+            _chunks = [DistCpChunk(_target) for _ in range(_count)]
+            _heap = [(0, _index) for _index in range(_count)]
+            for _path, _size in sorted(_group, key=lambda _unit: (-_unit[1], _unit[0])):
+                _assigned, _index = heapq.heappop(_heap)
+                _chunks[_index].add(_path, _size)
+                heapq.heappush(_heap, (_assigned + _size, _index))
+            self._plan.extend(_chunks)
+        DistCpPlanner.LOG.info("Copy of {0} ({1} bytes) is split into {2} chunks".format(
+            self.source, total, len(self._plan)))
+        return self._plan
+
+    def progress(self):
+        """
+        :return: progress of the whole copy from 0 to 1 weighted by size of chunks
+        """
+        if not self._plan:
+            return 0.0
+        _total = sum(_chunk.size for _chunk in self._plan)
+        if not _total:
+            return sum(_chunk.progress for _chunk in self._plan) / len(self._plan)
+        return sum(_chunk.size * _chunk.progress for _chunk in self._plan) / _total
+
+    def run(self, on_progress=None, raise_on_failure=True):
+        """
+        Plans and runs distcp jobs
+        :param on_progress: callback which takes progress of the whole copy from 0 to 1
+        :param raise_on_failure: indicates that DistCpError should be raised in case any job failed
+        :return: list of DistCpChunk
+        """
+        _chunks = self._plan if self._plan is not None else self.plan()
+        if not _chunks:
+            return _chunks
+        if self._job_("file:///dev/null", self.destination).strategy:
+            raise DistCpError("-update and -overwrite are not supported by DistCpPlanner : "
+                              "distcp would copy contents of listed directories "
+                              "into the target directory")
+        _targets = sorted(set(_chunk.target for _chunk in _chunks))
+        import merlin.fs.cli.hdfs_commands as fs
+        fs.mkdir_all(_targets, executor=self.executor) \
+            .if_failed_raise(DistCpError("Cannot create target directories"))
+        run_parallel([lambda _chunk=_chunk: self._copy_(_chunk, on_progress) for _chunk in _chunks],
+                     self.max_parallel)
+        _failed = [_chunk for _chunk in _chunks if not _chunk.is_ok()]
+        if _failed and raise_on_failure:
+            raise DistCpError("{0} of {1} distcp jobs failed : {2}".format(
+                len(_failed), len(_chunks), "; ".join(str(_chunk.error) for _chunk in _failed)))
+        return _chunks
+
+    def _copy_(self, chunk, on_progress):
+        _list = tempfile.NamedTemporaryFile(prefix="distcp_", suffix=".list", dir=self.list_dir,
+                                            delete=False)
+        try:
+            with _list:
+                _list.write("\n".join(chunk.sources) + "\n")
+            _job = self._job_("file://{0}".format(os.path.abspath(_list.name)), chunk.target)
+            # distcp reports progress to stderr,
+            # so it's merged into the output consumed while job is running
+            result = self.job_executor("hadoop distcp", _job.build(), "2>&1")
+            _lines = result.lines() if hasattr(result, "lines") \
+                else str(result.stdout or "").splitlines()
+            _tail = collections.deque(maxlen=DistCpPlanner.ERROR_LINES)
+            for _line in _lines:
+                _tail.append(_line.rstrip('\n'))
+                _match = DistCpPlanner.PROGRESS_PATTERN.search(_line)
+                if _match:
+                    self._update_(chunk, int(_match.group(1)) / 100.0, on_progress)
+            if result.is_ok():
+                chunk.result = result
+                self._update_(chunk, 1.0, on_progress)
+            else:
+                chunk.error = DistCpError("DistCp of {0} failed : {1}".format(
+                    chunk, result.stderr or "\n".join(_tail)))
+        except Exception as e:
+            chunk.error = e
+        finally:
+            os.remove(_list.name)
+        if chunk.error:
+            DistCpPlanner.LOG.error(str(chunk.error))
+
+    def _job_(self, source_list, target):
+        _job = DistCp().take_list(source_list).copy_to(target).use_dynamic_strategy()
+        if self.mappers:
+            _job.use(mappers=self.mappers)
+        if self.blocks_per_chunk:
+            _job.with_blocks_per_chunk(self.blocks_per_chunk)
+        if self.configure:
+            self.configure(_job)
+        return _job
+
+    def _update_(self, chunk, progress, on_progress):
+        with self._lock:
+            chunk.progress = max(chunk.progress, progress)
+            _progress = self.progress()
+        if on_progress:
+            on_progress(_progress)
@@ -84,15 +84,40 @@ Will be transformed to next Flume CLI command :
 
     flume-ng agent --name a1 --conf-file path/to/file \
     -Djvm_property=test -Xjvm_option=test
+
+
+FLUME SUPERVISOR EXAMPLES :
+
+Runs two agents as child processes, restarts them with exponential backoff if they exit
+and warns when a channel is more than 80% full :
+
+    supervisor = FlumeSupervisor(fill_threshold=80.0, poll_interval=30)
+    supervisor.add(Flume.agent(agent="a1", conf_file="conf/a1.properties"), metrics_port=34545)
+    supervisor.add(Flume.agent(agent="a2", conf_file="conf/a2.properties"), metrics_port=34546)
+    supervisor.run()
+
+Agents are started with JSON reporting enabled, their output is appended to the log file
+in the given directory or discarded :
+
+    flume-ng agent --name a1 --conf-file conf/a1.properties \
+    -Dflume.monitoring.type=http -Dflume.monitoring.port=34545 >> /dev/null 2>&1
+
+Metrics of every channel are scraped from http://localhost:34545/metrics,
+see FlumeSupervisor.stats()
 """
 
+import os
+import time
 import uuid
+
+import requests
+
 from merlin.common.configurations import Configuration
 from merlin.common.exceptions import ConfigurationError
 
 from merlin.common.logger import get_logger
-from merlin.common.shell_command_executor import execute_shell_command
-from merlin.common.utils import ListUtility
+from merlin.common.shell_command_executor import execute_shell_command, execute_shell_command_async
+from merlin.common.utils import Backoff, ListUtility
 
 
 class Flume(object):
@@ -201,13 +226,14 @@ class FlumeAgent(object):
 
         return " ".join(params)
 
-    def run(self):
+    def run(self, executor=None):
         """
         Run Flume's agent in cmd
+        :param executor: overrides executor the agent was created with
         :rtype:
         """
         Flume.LOG.info("Running Flume Agent")
-        result = self._executor("flume-ng", self.__build())
+        result = (executor if executor else self._executor)("flume-ng", self.__build())
 
         return result
 
@@ -239,6 +265,16 @@ class FlumeAgent(object):
         self.__set_config(TaskOptions.CONFIG_KEY_D_OPTIONS, name=name, value=value)
         return self
 
+    def with_http_monitoring(self, port):
+        """
+        Enables reporting of agent metrics in JSON format over HTTP
+        :param port: port of the metrics endpoint
+        :return:
+        """
+        self.with_jvm_D_option(name="flume.monitoring.type", value="http")
+        self.with_jvm_D_option(name="flume.monitoring.port", value=port)
+        return self
+
     def load_configs_from_dir(self, path):
         """
         Add configuration directory to cmd
@@ -280,3 +316,237 @@ class TaskOptions(Flume):
     CONFIG_KEY_PLUGINS_PATH = 'plugins.path'
 
 
+def fetch_metrics(host, port, timeout=10):
+    """
+    Loads metrics reported by Flume agent in JSON format
+    :param host: agent host
+    :param port: port of the metrics endpoint
+    :return: metrics of every component, e.g. {'CHANNEL.c1': {'ChannelFillPercentage': '12.5', ...}}
+    :rtype: dict
+    """
+    response = requests.get("http://{0}:{1}/metrics".format(host, port), timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+class ChannelStats(object):
+    """
+    State of Flume channel calculated from two consecutive metrics samples
+    """
+
+    def __init__(self, agent, channel, fill_percentage, size, capacity, put_rate=None,
+                 take_rate=None):
+        self.agent = agent
+        self.channel = channel
+        self.fill_percentage = fill_percentage
+        self.size = size
+        self.capacity = capacity
+        self.put_rate = put_rate
+        self.take_rate = take_rate
+
+    def time_to_full(self):
+        """
+        :return: estimated number of seconds until the channel is full at the current rates,
+            None in case the channel is not filling up
+        """
+        if self.put_rate is None or self.take_rate is None or self.put_rate <= self.take_rate:
+            return None
+        return (self.capacity - self.size) / (self.put_rate - self.take_rate)
+
+    def __repr__(self):
+        return "ChannelStats({0}.{1}, fill={2:.1f}%, size={3}/{4}, put_rate={5}, " \
+               "take_rate={6})".format(self.agent, self.channel, self.fill_percentage, self.size,
+                                       self.capacity, self.put_rate, self.take_rate)
+
+
+class ManagedAgent(object):
+    """
+    Flume agent run by FlumeSupervisor
+    """
+
+    def __init__(self, agent, host, metrics_port, backoff):
+        self.agent = agent
+        self.host = host
+        self.metrics_port = metrics_port
+        self.backoff = backoff
+        self.process = None
+        self.restarts = 0
+        self.next_start = 0
+        self.started = None
+        self.stats = {}
+        self._sample = None
+
+    @property
+    def name(self):
+        return self.agent.name
+
+    def is_running(self):
+        return self.process is not None and self.process.is_running()
+
+
+class FlumeSupervisor(object):
+    """
+    Runs Flume agents as child processes.
+    Agents which exit are restarted with exponential backoff,
+    backoff is reset once agent keeps running for the stable uptime.
+    Channel metrics are scraped from JSON metrics endpoint of every agent
+    to detect backpressure before channels are full and events are dropped.
+    """
+    LOG = get_logger("FlumeSupervisor")
+
+    def __init__(self, fill_threshold=80.0, poll_interval=10, backoff=None, on_backpressure=None,
+                 fetch=fetch_metrics, executor=execute_shell_command_async, log_dir=None,
+                 stable_uptime=60):
+        """
+        :param fill_threshold: channel fill percentage treated as backpressure
+        :param poll_interval: interval in seconds between supervision rounds
+        :param backoff: factory of restart policies, e.g. lambda: Backoff(initial=1, maximum=300)
+        :param stable_uptime: seconds agent should keep running before its backoff is reset,
+            so agent which crashes shortly after start is not restarted in a tight loop
+        :param log_dir: directory of agent logs,
+            output of every agent is appended to <agent name>.log.
+            Output is discarded if not set,
+            Flume writes its own logs according to log4j configuration
+        :param on_backpressure: callback which takes ChannelStats of the channel under backpressure
+        :param fetch: metrics loader. Should accept host and port and return parsed JSON metrics
+        :param executor: the interface used to launch agents. Should run commands asynchronously
+        """
+        super(FlumeSupervisor, self).__init__()
+        self.fill_threshold = fill_threshold
+        self.poll_interval = poll_interval
+        self.on_backpressure = on_backpressure
+        self.agents = []
+        self._backoff = backoff if backoff else (lambda: Backoff(initial=1, maximum=300, factor=2))
+        self._fetch = fetch
+        self._executor = executor
+        self.log_dir = log_dir
+        self.stable_uptime = stable_uptime
+        self._stopped = False
+
+    def add(self, agent, metrics_port=None, host="localhost"):
+        """
+        Adds agent to supervise
+        :param agent: Flume agent
+        :type agent: FlumeAgent
+        :param metrics_port: port of the agent metrics endpoint. Metrics are not scraped if not set
+        :param host: host of the agent metrics endpoint
+        :rtype: ManagedAgent
+        """
+        if metrics_port:
+            agent.with_http_monitoring(metrics_port)
+        _managed = ManagedAgent(agent, host, metrics_port, self._backoff())
+        self.agents.append(_managed)
+        return _managed
+
+    def check(self):
+        """
+        Runs single supervision round: starts agents which are not running and scrapes metrics
+        :return: channels under backpressure
+        :rtype: list
+        """
+        _backpressure = []
+        for _managed in self.agents:
+            if not _managed.is_running():
+                self._restart_(_managed)
+                continue
+            if time.time() - _managed.started >= self.stable_uptime:
+                _managed.backoff.reset()
+            if _managed.metrics_port:
+                _backpressure.extend(self._scrape_(_managed))
+        return _backpressure
+
+    def _restart_(self, managed):
+        if managed.process is not None and managed.next_start == 0:
+            _delay = managed.backoff.delay()
+            managed.next_start = time.time() + _delay
+            FlumeSupervisor.LOG.warning(
+                "Agent {0} exited with status {1}, restarting in {2} second(s)".format(
+                    managed.name, managed.process.status, _delay))
+        if time.time() < managed.next_start:
+            return
+        if managed.process is not None:
+            managed.restarts += 1
+        managed.next_start = 0
+        managed._sample = None
+        _log = os.path.join(self.log_dir, "{0}.log".format(managed.name)) if self.log_dir \
+            else os.devnull
+        # output is redirected, so agent never blocks on a full pipe nobody reads
+        managed.process = managed.agent.run(
+            executor=lambda command, *args: self._executor(command, *(args + (">>", _log, "2>&1"))))
+        managed.started = time.time()
+
+    def _scrape_(self, managed):
+        try:
+            _metrics = self._fetch(managed.host, managed.metrics_port)
+        except Exception as e:
+            FlumeSupervisor.LOG.warning("Could not load metrics of agent {0} : {1}".format(
+                managed.name, e))
+            return []
+        _now = time.time()
+        _previous = managed._sample
+        managed._sample = (_now, _metrics)
+        _backpressure = []
+        for _component, _values in sorted(_metrics.iteritems()):
+            if not _component.startswith("CHANNEL."):
+                continue
+            _channel = _component[len("CHANNEL."):]
+            _stats = ChannelStats(managed.name, _channel,
+                                  fill_percentage=float(_values.get("ChannelFillPercentage", 0)),
+                                  size=long(_values.get("ChannelSize", 0)),
+                                  capacity=long(_values.get("ChannelCapacity", 0)))
+            if _previous and _component in _previous[1] and _now > _previous[0]:
+                _duration = _now - _previous[0]
+                _stats.put_rate = self._rate_(_previous[1][_component], _values,
+                                              "EventPutSuccessCount", _duration)
+                _stats.take_rate = self._rate_(_previous[1][_component], _values,
+                                               "EventTakeSuccessCount", _duration)
+            managed.stats[_channel] = _stats
+            if _stats.fill_percentage >= self.fill_threshold:
+                FlumeSupervisor.LOG.warning("Channel under backpressure : {0}".format(_stats))
+                _backpressure.append(_stats)
+                if self.on_backpressure:
+                    self.on_backpressure(_stats)
+        return _backpressure
+
+    @staticmethod
+    def _rate_(previous, current, counter, duration):
+        return (long(current.get(counter, 0)) - long(previous.get(counter, 0))) / duration
+
+    def stats(self):
+        """
+        :return: stats of every channel of every agent collected by the last scrape
+        :rtype: list
+        """
+        return [_stats for _managed in self.agents
+                for _, _stats in sorted(_managed.stats.iteritems())]
+
+    def run(self, duration=None):
+        """
+        Supervises agents until stop() is called or the given time elapses.
+        Agents are stopped on exit
+        :param duration: supervision time in seconds
+        """
+        _deadline = time.time() + duration if duration else None
+        self._stopped = False
+        try:
+            while not self._stopped and (not _deadline or time.time() < _deadline):
+                self.check()
+                time.sleep(self.poll_interval)
+        finally:
+            self.terminate()
+
+    def stop(self):
+        """
+        Makes run() return after the current supervision round
+        """
+        self._stopped = True
+
+    def terminate(self, timeout=30):
+        """
+        Terminates all running agents
+        :param timeout: seconds agent is given to shut down gracefully before it's killed
+        """
+        for _managed in self.agents:
+            if _managed.is_running():
+                FlumeSupervisor.LOG.info("Stopping agent {0}".format(_managed.name))
+                _managed.process.terminate(timeout=timeout)
@@ -96,6 +96,66 @@ Runs Hive Job with adds hivevar :
     hive -e "CREATE TABLE invites (foo INT, bar STRING)
     PARTITIONED BY (ds STRING);" --hivevar name=value
 
+Runs Hive Job over pooled HiveServer2 sessions :
+        pool = HiveSessionPool(host='hiveserver2.host', port=10000, username='hive', size=4)
+        Hive.load_queries_from_string("ALTER TABLE invites ADD PARTITION (ds='${ds}');") \
+            .add_hivevar('ds', '2015-01-01') \
+            .with_hive_conf('hive.exec.dynamic.partition', 'true') \
+            .via_hiveserver2(pool) \
+            .run()
+        pool.close()
+
+    Statements are executed one by one within a session borrowed from the pool,
+    so JVM start-up and session initialization are paid once per session
+    instead of once per job.
+    Variables are substituted on the client side,
+    --hiveconf options are applied with SET statements,
+    --database is applied with USE statement
+    and --auxpath jars are added with ADD JAR statements.
+    Session state is reset before the session is returned to the pool.
+    Default connection factory requires PyHive package.
+
+Streams query results :
+        for row in Hive.load_queries_from_string("SELECT id, name, score FROM users;") \
+                .fetch(types=['bigint', 'string', 'double']):
+            process(row)
+
+    Rows are parsed from Hive command line utility output as soon as they are written,
+    'NULL' values are converted to None. Rows can be grouped into chunks :
+        for ids, names, scores in Hive \
+                .load_queries_from_string("SELECT id, name, score FROM users;") \
+                .fetch_chunks(chunk_size=100000, types=['bigint', 'string', 'double'],
+                              columnar=True):
+            process(ids, names, scores)
+
+    Columns of numeric types are returned as array.array, other columns are returned as lists.
+
+Caches results of repeated metadata queries :
+        cache = HiveResultCache(path='/var/cache/merlin/hive.json', ttl=24 * 3600)
+        Hive.load_queries_from_string("SHOW PARTITIONS data;") \
+            .use_database('db') \
+            .with_cache(cache) \
+            .run()
+
+    Results of read-only jobs are cached by normalized statements, variables, options and database.
+    Jobs containing DDL or DML statements are never cached and invalidate cached results
+    of the queries referencing the same tables.
+
+Registers many partitions at once :
+        Hive.register_partitions(table='data', database='hive_monitoring') \
+            .add_path('/data/date=20150101/hour=01') \
+            .add(spec={'date': '20150102', 'hour': '01'}, location='/tmp/raw/20150102_01') \
+            .run(chunk_size=500)
+
+    Will be transformed to a single Hive CLI command executing
+    multi-partition statements, up to 500 partitions each :
+    ALTER TABLE data ADD IF NOT EXISTS
+    PARTITION (date='20150101', hour='01') LOCATION '/data/date=20150101/hour=01'
+    PARTITION (date='20150102', hour='01') LOCATION '/tmp/raw/20150102_01'
+
+    In case repair_threshold is specified and number of partitions exceeds it,
+    'MSCK REPAIR TABLE data' statement is executed instead.
+    Repair discovers partitions stored under the table directory only.
 
 
 --------------------------
@@ -112,11 +172,19 @@ hive -f "....path...." --define s=2 --database default  (file contains next quer
 """
 from merlin.common.configurations import Configuration
 
+from array import array
+import os
+import re
+import tempfile
+import urllib
 import uuid
 
 from merlin.common.logger import get_logger
 from merlin.common.exceptions import HiveCommandError
-from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.shell_command_executor import execute_shell_command, \
+    execute_shell_command_streaming
+from merlin.tools.hive_cache import HiveResultCache
+from merlin.tools.hive_session import HiveSession, HiveQueryResult, _cli_value_
 
 
 class Hive(object):
@@ -168,6 +236,17 @@ class Hive(object):
 
         return Hive(name=name, config=config, executor=executor)
 
+    @staticmethod
+    def register_partitions(table, database=None, executor=execute_shell_command):
+        """
+        Creates batch of partitions to be added to the table with multi-partition statements
+        :param table: name of the partitioned table
+        :param database: name of the database. Current database is used by default
+        :param executor: custom executor
+        :rtype: PartitionBatch
+        """
+        return PartitionBatch(table=table, database=database, executor=executor)
+
     def __init__(self, name=None, config=None, executor=execute_shell_command):
         """
         Creates wrapper for Hive command line utility
@@ -178,6 +257,8 @@ class Hive(object):
         super(Hive, self).__init__()
         self.name = name if name else "HIVE_TASK_{0}".format(uuid.uuid4())
         self.__executor = executor
+        self.__session_pool = None
+        self.__cache = None
         self._config = config if config else Configuration.create(
             readonly=False,
             accepts_nulls=True
@@ -304,16 +385,195 @@ class Hive(object):
         self.__set_config(key, None, jars)
         return self
 
+    def via_hiveserver2(self, pool):
+        """
+        Runs Hive Job over HiveServer2 session borrowed from the given pool
+        instead of launching Hive command line utility
+        :param pool: pool of HiveServer2 sessions
+        :type pool: HiveSessionPool
+        :rtype: Hive
+        """
+        self.__session_pool = pool
+        return self
+
     def run(self):
         """
         Runs Hive Job
         :rtype:
         """
         Hive.LOG.info("Executing Hive Job")
+        if not self.__cache:
+            return self._run_()
+        _statements = self.statements()
+        if not HiveResultCache.is_cacheable(_statements):
+            try:
+                return self._run_()
+            finally:
+                self.__cache.invalidate_for(_statements)
+        _key = self.__cache.key(_statements,
+                                database=self._config.get(self.name, TaskOptions.CONF_KEY_DATABASE)
+                                if self.has_option(TaskOptions.CONF_KEY_DATABASE) else None,
+                                options=self._options_(TaskOptions.CONF_KEY_HIVE_CONFIG))
+        _stdout = self.__cache.get(_key)
+        if _stdout is not None:
+            Hive.LOG.info("Hive Job result was taken from cache")
+            return HiveQueryResult(stdout=_stdout)
+        result = self._run_()
+        self.__cache.put(_key, result.stdout, HiveResultCache.tables(_statements))
+        return result
+
+    def with_cache(self, cache):
+        """
+        Enables result cache for the job.
+        Results of read-only jobs (SELECT, SHOW, DESCRIBE, ...) are taken from cache,
+        DDL and DML statements invalidate cached results for the affected tables
+        :param cache: result cache
+        :type cache: HiveResultCache
+        :rtype: Hive
+        """
+        self.__cache = cache
+        return self
+
+    def _run_(self):
+        if self.__session_pool:
+            return self._run_on_session_()
         result = self.__executor("hive", self.build())
         result.if_failed_raise(HiveCommandError("Hive Job failed"))
         return result
 
+    def fetch(self, types=None, delimiter='\t', null_value='NULL',
+              executor=execute_shell_command_streaming):
+        """
+        Runs Hive Job and yields rows as soon as Hive writes them.
+        Hive command line utility prints rows returned by every statement of the script,
+        while HiveServer2 session returns rows of the last statement only,
+        so the script is expected to end with the only statement which returns rows.
+        Both return the same rows : values are converted from the text Hive prints
+        :param types: list of column types :
+            Hive type names ('int', 'bigint', 'double', 'boolean', 'string', ...)
+            or callables converting string value. Values are returned as strings by default
+        :param delimiter: field delimiter of the query output
+        :param null_value: string which represents NULL value
+        :param executor: executor which allows to consume command output while command is running
+        :return: generator of tuples
+        """
+        Hive.LOG.info("Fetching results of Hive Job")
+        _converters = [_converter_(_type) for _type in types] if types else []
+
+        def _row_(values, null):
+            return tuple(None if _value == null
+                         else _converters[_index](_value) if _index < len(_converters) else _value
+                         for _index, _value in enumerate(values))
+
+        if self.__session_pool:
+            for row in self._fetch_on_session_():
+                yield _row_([_cli_value_(_value) for _value in row], None)
+            return
+        result = executor("hive", self.build())
+        try:
+            for line in result.lines():
+                yield _row_(line.rstrip('\n').split(delimiter), null_value)
+        finally:
+            # Hive is still running in case caller stopped iterating early
+            result.terminate()
+        result.if_failed_raise(HiveCommandError("Hive Job failed"))
+
+    def fetch_chunks(self, chunk_size, types=None, columnar=False, delimiter='\t',
+                     null_value='NULL', executor=execute_shell_command_streaming):
+        """
+        Runs Hive Job and yields rows grouped into chunks, see fetch
+        :param chunk_size: max number of rows per chunk
+        :param types: list of column types, see fetch
+        :param columnar: indicates that chunk should be returned as a list of columns
+            instead of a list of rows.
+            Columns of numeric types without NULL values are returned as array.array
+        :param delimiter: field delimiter of the query output
+        :param null_value: string which represents NULL value
+        :param executor: executor which allows to consume command output while command is running
+        :return: generator of lists
+        """
+        _chunk = []
+        for row in self.fetch(types=types, delimiter=delimiter, null_value=null_value,
+                              executor=executor):
+            _chunk.append(row)
+            if len(_chunk) >= chunk_size:
+                yield _to_columns_(_chunk, types) if columnar else _chunk
+                _chunk = []
+        if _chunk:
+            yield _to_columns_(_chunk, types) if columnar else _chunk
+
+    def _fetch_on_session_(self):
+        """
+        Executes job statements within pooled HiveServer2 session
+        and yields rows of the last statement batch by batch
+        """
+        _statements = self.statements()
+        with self.__session_pool.session() as session:
+            self._prepare_session_(session)
+            for _statement in _statements[:-1]:
+                session.execute(_statement)
+            for row in session.iterate(_statements[-1]):
+                yield row
+
+    def _prepare_session_(self, session):
+        if self.has_option(TaskOptions.CONF_KEY_AUXPATH):
+            for _jar in self._config.get(self.name, TaskOptions.CONF_KEY_AUXPATH).split(","):
+                session.add_jar(_jar.strip())
+        for _option in self._options_(TaskOptions.CONF_KEY_HIVE_CONFIG):
+            session.set(*_option)
+        session.use_database(self._config.get(self.name, TaskOptions.CONF_KEY_DATABASE)
+                             if self.has_option(TaskOptions.CONF_KEY_DATABASE)
+                             else HiveSession.DEFAULT_DATABASE)
+
+    def _run_on_session_(self):
+        """
+        Executes job statements one by one within pooled HiveServer2 session
+        :return: result of the last statement
+        :rtype: HiveQueryResult
+        """
+        _statements = self.statements()
+        _rows = []
+        with self.__session_pool.session() as session:
+            self._prepare_session_(session)
+            for _statement in _statements:
+                _rows = session.execute(_statement)
+        return HiveQueryResult(_rows)
+
+    def statements(self):
+        """
+        Splits job script into separate statements with Hive variables substituted
+        :return: list of statements
+        :rtype: list
+        """
+        if self.has_option(TaskOptions.CONFIG_KEY_QUERY_FILE):
+            _path = self._config.get(self.name, TaskOptions.CONFIG_KEY_QUERY_FILE).strip('"\'')
+            if not os.path.isfile(_path):
+                raise HiveCommandError("Hive script {0} does not exist".format(_path))
+            with open(_path) as script:
+                _script = script.read()
+        elif self.has_option(TaskOptions.CONFIG_KEY_COMMANDS_STRING):
+            _script = self._config.get(self.name, TaskOptions.CONFIG_KEY_COMMANDS_STRING)
+        else:
+            raise HiveCommandError(
+                "Failed to configure command : one of {0} or {1} is required".format(
+                    TaskOptions.CONFIG_KEY_QUERY_FILE,
+                    TaskOptions.CONFIG_KEY_COMMANDS_STRING))
+        _variables = dict(self._options_(TaskOptions.CONF_KEY_DEFINE))
+        _variables.update(self._options_(TaskOptions.CONF_KEY_HIVE_VAR))
+        _hiveconf = dict(self._options_(TaskOptions.CONF_KEY_HIVE_CONFIG))
+        return split_statements(substitute_variables(_script,
+                                                     hivevar=_variables,
+                                                     hiveconf=_hiveconf))
+
+    def _options_(self, key):
+        """
+        :return: list of (name, value) pairs configured at the given key
+        """
+        if not self.has_option(key):
+            return []
+        return [tuple(_option.split("=", 1))
+                for _option in self._config.get_list(self.name, key) if "=" in _option]
+
     def build(self):
         """
         Builds query params for hive's query
@@ -353,6 +613,26 @@ class Hive(object):
         """
         return self._config.has(section=self.name, key=key)
 
+    def get(self, key, required=False):
+        """
+        Gets the value of the attribute at the given key
+        in job specific section of the Configuration.
+        :param key: attribute name
+        :param required: True in case attribute is required
+        :return: attribute value or None in case attribute was not found
+            and attribute is not required.
+        ConfigurationError will be thrown in case required attribute was not found
+        """
+        if required:
+            return self._config.require(self.name, key)
+        return self._config.get(self.name, key)
+
+    def hive_conf(self):
+        """
+        :return: list of (name, value) pairs of Hive configuration variables set for the job
+        """
+        return self._options_(TaskOptions.CONF_KEY_HIVE_CONFIG)
+
 
 class TaskOptions(Hive):
     """
@@ -376,3 +656,254 @@ class TaskOptions(Hive):
     # of user defined functions and serdes
     CONF_KEY_AUXPATH = "auxpath"
 
+
+HIVE_TYPES = {
+    'tinyint': int,
+    'smallint': int,
+    'int': int,
+    'bigint': long,
+    'float': float,
+    'double': float,
+    'boolean': lambda value: value == 'true',
+    'string': str,
+    'varchar': str,
+    'char': str
+}
+
+# typecodes of array.array used to store columns of numeric types
+ARRAY_TYPECODES = {
+    'tinyint': 'l',
+    'smallint': 'l',
+    'int': 'l',
+    'bigint': 'l',
+    'float': 'd',
+    'double': 'd'
+}
+
+
+def _converter_(column_type):
+    """
+    :return: function which converts string value to the given type
+    """
+    if callable(column_type):
+        return column_type
+    if column_type and column_type.lower() in HIVE_TYPES:
+        return HIVE_TYPES[column_type.lower()]
+    return str
+
+
+def _to_columns_(rows, types=None):
+    """
+    Transposes list of rows to the list of columns.
+    Columns of numeric types without NULL values are stored in array.array
+    """
+    _columns = [list(_column) for _column in zip(*rows)]
+    for _index, _type in enumerate(types if types else []):
+        _typecode = ARRAY_TYPECODES.get(_type.lower()) if isinstance(_type, basestring) else None
+        if _typecode and _index < len(_columns) and None not in _columns[_index]:
+            _columns[_index] = array(_typecode, _columns[_index])
+    return _columns
+
+
+class PartitionBatch(object):
+    """
+    Accumulates partition specs and registers them with multi-partition
+    'ALTER TABLE ... ADD IF NOT EXISTS PARTITION ... PARTITION ...' statements
+    executed within a single Hive Job.
+    """
+
+    LOG = get_logger('PartitionBatch')
+    DEFAULT_CHUNK_SIZE = 500
+    # scripts longer than this are passed to Hive via file instead of command line
+    MAX_COMMANDS_LENGTH = 64 * 1024
+
+    def __init__(self, table, database=None, executor=execute_shell_command):
+        """
+        :param table: name of the partitioned table
+        :param database: name of the database. Current database is used by default
+        :param executor: custom executor
+        """
+        super(PartitionBatch, self).__init__()
+        self.table = table
+        self.database = database
+        self.partitions = []
+        self.__executor = executor
+        self.__session_pool = None
+        self.__cache = None
+
+    def add(self, spec, location=None):
+        """
+        Adds partition to the batch
+        :param spec: partition spec, list of (column, value) pairs or dict.
+            Use list or OrderedDict to preserve order of partition columns
+        :param location: location of partition data
+        :rtype: PartitionBatch
+        """
+        _spec = list(spec.items() if isinstance(spec, dict) else spec)
+        if not _spec:
+            raise HiveCommandError("Partition spec should not be empty")
+        self.partitions.append((_spec, location))
+        return self
+
+    def add_path(self, path, location=True):
+        """
+        Adds partition stored at the path with Hive-style directory names,
+        e.g. /data/table/date=20150101/hour=01
+        :param path: path to partition data
+        :param location: indicates that path should be used as partition location
+        :rtype: PartitionBatch
+        """
+        _spec = [tuple(urllib.unquote(_part) for _part in _directory.split('=', 1))
+                 for _directory in path.rstrip('/').split('/') if '=' in _directory]
+        if not _spec:
+            raise HiveCommandError("Cannot parse partition spec from path : {0}".format(path))
+        return self.add(_spec, path if location else None)
+
+    def via_hiveserver2(self, pool):
+        """
+        Executes statements over HiveServer2 session borrowed from the given pool
+        :type pool: HiveSessionPool
+        :rtype: PartitionBatch
+        """
+        self.__session_pool = pool
+        return self
+
+    def with_cache(self, cache):
+        """
+        Invalidates cached results of queries against the table once partitions are registered
+        :type cache: HiveResultCache
+        :rtype: PartitionBatch
+        """
+        self.__cache = cache
+        return self
+
+    def statements(self, chunk_size=None):
+        """
+        Builds multi-partition statements
+        :param chunk_size: max number of partitions per statement
+        :rtype: list
+        """
+        _chunk_size = chunk_size if chunk_size else PartitionBatch.DEFAULT_CHUNK_SIZE
+        return ["ALTER TABLE {0} ADD IF NOT EXISTS\n{1}".format(
+            self.table,
+            "\n".join(self._format_partition_(_spec, _location)
+                      for _spec, _location in self.partitions[_start:_start + _chunk_size]))
+            for _start in range(0, len(self.partitions), _chunk_size)]
+
+    def run(self, chunk_size=None, repair_threshold=None):
+        """
+        Registers all partitions of the batch within single Hive Job
+        :param chunk_size: max number of partitions per statement
+        :param repair_threshold: number of partitions above which 'MSCK REPAIR TABLE'
+            statement is executed instead of adding partitions one by one
+        :return: result of Hive Job or None in case batch is empty
+        """
+        if not self.partitions:
+            return None
+        if repair_threshold is not None and len(self.partitions) > repair_threshold:
+            PartitionBatch.LOG.info("Repairing table {0} to register {1} partitions".format(
+                self.table, len(self.partitions)))
+            _statements = ["MSCK REPAIR TABLE {0}".format(self.table)]
+        else:
+            PartitionBatch.LOG.info("Adding {0} partitions to table {1}".format(
+                len(self.partitions), self.table))
+            _statements = self.statements(chunk_size)
+        _commands = ";\n".join(_statements) + ";"
+        if self.__session_pool or len(_commands) <= PartitionBatch.MAX_COMMANDS_LENGTH:
+            return self._hive_(
+                Hive.load_queries_from_string(_commands, executor=self.__executor)).run()
+        _fd, _path = tempfile.mkstemp(suffix=".hql")
+        try:
+            with os.fdopen(_fd, 'w') as script:
+                script.write(_commands)
+            return self._hive_(Hive.load_queries_from_file(_path, executor=self.__executor)).run()
+        finally:
+            os.remove(_path)
+
+    def _hive_(self, hive):
+        if self.database:
+            hive.use_database(self.database)
+        if self.__cache:
+            hive.with_cache(self.__cache)
+        return hive.via_hiveserver2(self.__session_pool) if self.__session_pool else hive
+
+    @staticmethod
+    def _quote_(value):
+        return "'{0}'".format(str(value).replace('\\', '\\\\').replace("'", "\\'"))
+
+    def _format_partition_(self, spec, location):
+        _partition = "PARTITION ({0})".format(
+            ", ".join("{0}={1}".format(_column, self._quote_(_value)) for _column, _value in spec))
+        if location:
+            return "{0} LOCATION {1}".format(_partition, self._quote_(location))
+        return _partition
+
+
+VARIABLE_PATTERN = re.compile(r"\$\{(?:(hivevar|hiveconf|env|system):)?([^}]+)\}")
+
+
+def substitute_variables(script, hivevar=None, hiveconf=None):
+    """
+    Substitutes Hive variables the same way Hive command line utility does it.
+    Supports ${name}, ${hivevar:name}, ${hiveconf:name} and ${env:name} references.
+    Unknown variables are left as is.
+    :param script: HiveQL script
+    :param hivevar: variables defined with --hivevar or --define options
+    :param hiveconf: configuration options defined with --hiveconf option
+    :rtype: str
+    """
+    _namespaces = {
+        'hivevar': hivevar if hivevar else {},
+        'hiveconf': hiveconf if hiveconf else {},
+        'env': os.environ
+    }
+
+    def replace(match):
+        _namespace, _name = match.group(1), match.group(2)
+        if _namespace in _namespaces:
+            return _namespaces[_namespace].get(_name, match.group(0))
+        if _namespace is None:
+            for _variables in [_namespaces['hivevar'], _namespaces['hiveconf']]:
+                if _name in _variables:
+                    return _variables[_name]
+        return match.group(0)
+
+    return VARIABLE_PATTERN.sub(replace, script)
+
+
+def split_statements(script):
+    """
+    Splits HiveQL script into separate statements.
+    Semicolons within quoted strings and '--' comments are not considered as statement delimiters.
+    :param script: HiveQL script
+    :return: list of non-empty statements without trailing semicolons
+    :rtype: list
+    """
+    _statements = []
+    _current = []
+    _quote = None
+    _index = 0
+    while _index < len(script):
+        _char = script[_index]
+        if _quote:
+            _current.append(_char)
+            if _char == '\\' and _index + 1 < len(script):
+                _index += 1
+                _current.append(script[_index])
+            elif _char == _quote:
+                _quote = None
+        elif _char in ('"', "'", '`'):
+            _quote = _char
+            _current.append(_char)
+        elif script.startswith('--', _index):
+            _end = script.find('\n', _index)
+            _index = len(script) if _end < 0 else _end
+            continue
+        elif _char == ';':
+            _statements.append("".join(_current).strip())
+            _current = []
+        else:
+            _current.append(_char)
+        _index += 1
+    _statements.append("".join(_current).strip())
+    return [_statement for _statement in _statements if _statement]
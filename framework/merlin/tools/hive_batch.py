@@ -0,0 +1,210 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Bundling of several Hive Jobs into a single Hive process.
+
+Runs statements of several Hive Jobs within a single Hive process :
+        HiveBatch() \
+            .add(Hive.load_queries_from_string("ALTER TABLE data ADD PARTITION (date='${date}');")
+                 .add_hivevar('date', '20150101')
+                 .use_database('db')) \
+            .add(Hive.load_queries_from_file('/tmp/aggregate.hql')
+                 .with_hive_conf('hive.exec.dynamic.partition.mode', 'nonstrict')) \
+            .run()
+
+    Will be transformed to a single 'hive -f <script>' command, where script contains :
+    USE db;
+    ALTER TABLE data ADD PARTITION (date='20150101');
+    USE default;
+    SET hive.exec.dynamic.partition.mode=nonstrict;
+    <statements of /tmp/aggregate.hql>;
+    RESET;
+
+    Variables are substituted per job, options set by a job are reset before the next job starts.
+    Consecutive jobs sharing auxiliary jars are bundled into one process.
+    In case of failure HiveCommandError refers to the failed statement and the job it came from.
+
+"""
+
+import os
+import tempfile
+
+from merlin.common.logger import get_logger
+from merlin.common.exceptions import HiveCommandError
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.tools.hive import TaskOptions
+from merlin.tools.hive_session import HiveSession, HiveQueryResult
+
+
+class HiveBatch(object):
+    """
+    Bundles statements of several Hive Jobs into one script executed by a single Hive process.
+    Each job keeps its own variables, options and database.
+    """
+
+    LOG = get_logger('HiveBatch')
+    COMPLETED_MARKER = "Time taken:"
+    # statements processed by Hive CLI without query driver
+    CLI_COMMANDS = ['SET', 'RESET', 'ADD', 'DELETE', 'LIST', 'DFS', 'RELOAD', 'COMPILE']
+
+    def __init__(self, executor=execute_shell_command):
+        """
+        :param executor: custom executor
+        """
+        super(HiveBatch, self).__init__()
+        self.jobs = []
+        self.__executor = executor
+        self.__session_pool = None
+
+    def add(self, *jobs):
+        """
+        Adds jobs to the batch
+        :type jobs: Hive
+        :rtype: HiveBatch
+        """
+        self.jobs.extend(jobs)
+        return self
+
+    def via_hiveserver2(self, pool):
+        """
+        Executes statements over HiveServer2 session borrowed from the given pool
+        :type pool: HiveSessionPool
+        :rtype: HiveBatch
+        """
+        self.__session_pool = pool
+        return self
+
+    def statements(self):
+        """
+        Builds bundled script for every group of consecutive jobs sharing auxiliary jars
+        :return: list of (auxpath, [(job, statement), ...]) groups
+        :rtype: list
+        """
+        _groups = []
+        _database = HiveSession.DEFAULT_DATABASE
+        for job in self.jobs:
+            _auxpath = job.get(TaskOptions.CONF_KEY_AUXPATH)
+            if not _groups or _groups[-1][0] != _auxpath:
+                _groups.append((_auxpath, []))
+                _database = HiveSession.DEFAULT_DATABASE
+            _statements = _groups[-1][1]
+            _job_database = job.get(TaskOptions.CONF_KEY_DATABASE) \
+                if job.has_option(TaskOptions.CONF_KEY_DATABASE) else HiveSession.DEFAULT_DATABASE
+            if _job_database != _database:
+                _statements.append((job, "USE {0}".format(_job_database)))
+                _database = _job_database
+            _options = ["SET {0}={1}".format(*_option) for _option in job.hive_conf()]
+            _job_statements = job.statements()
+            _statements.extend((job, _statement) for _statement in _options + _job_statements)
+            if _options or any(_statement.split(None, 1)[0].upper() == 'SET'
+                               for _statement in _job_statements):
+                _statements.append((job, "RESET"))
+        return _groups
+
+    def run(self):
+        """
+        Runs all jobs of the batch
+        :return: list of results, one per Hive process
+        """
+        _results = []
+        for _auxpath, _statements in self.statements():
+            HiveBatch.LOG.info("Executing {0} statements within single Hive process".format(
+                len(_statements)))
+            if self.__session_pool:
+                _results.append(self._run_on_session_(_auxpath, _statements))
+            else:
+                _results.append(self._run_script_(_auxpath, _statements))
+        return _results
+
+    def _run_script_(self, auxpath, statements):
+        _fd, _path = tempfile.mkstemp(suffix=".hql")
+        try:
+            with os.fdopen(_fd, 'w') as script:
+                script.write(";\n".join(_statement for _, _statement in statements) + ";\n")
+            _args = ["--auxpath {0}".format(auxpath)] if auxpath else []
+            result = self.__executor("hive", *(_args + ["-f", _path]))
+            if not result.is_ok():
+                raise self._failure_(statements, self._failed_statement_(statements, result.stderr),
+                                     self._error_output_(result.stderr))
+            return result
+        finally:
+            os.remove(_path)
+
+    def _run_on_session_(self, auxpath, statements):
+        _rows = []
+        with self.__session_pool.session() as session:
+            # statements of the group are built relative to the default database,
+            # pooled session keeps the database selected by the job it ran before
+            session.use_database(HiveSession.DEFAULT_DATABASE)
+            for _jar in auxpath.split(",") if auxpath else []:
+                session.add_jar(_jar.strip())
+            for _index, (_, _statement) in enumerate(statements):
+                try:
+                    _rows = session.execute(_statement)
+                except HiveCommandError as e:
+                    raise self._failure_(statements, _index, e)
+        return HiveQueryResult(_rows)
+
+    @staticmethod
+    def _failed_statement_(statements, stderr):
+        """
+        Finds statement which failed the script.
+        Hive CLI reports 'Time taken' to stderr after every statement executed by the query driver.
+        Commands processed by the CLI itself (SET, RESET, ADD JAR, ...) are not reported,
+        so the failed statement is the first driver statement after the reported ones
+        :return: index of the failed statement or None in case it can not be found
+        """
+        _completed = str(stderr).count(HiveBatch.COMPLETED_MARKER) if stderr else 0
+        for _index, (_, _statement) in enumerate(statements):
+            if _statement.split(None, 1)[0].upper() in HiveBatch.CLI_COMMANDS:
+                continue
+            if not _completed:
+                return _index
+            _completed -= 1
+        return None
+
+    @staticmethod
+    def _error_output_(stderr):
+        """
+        :return: part of stderr reported after the last successfully executed statement
+        """
+        _lines = str(stderr).splitlines() if stderr else []
+        _last = max([_index for _index, _line in enumerate(_lines)
+                     if HiveBatch.COMPLETED_MARKER in _line] or [-1])
+        return "\n".join(_lines[_last + 1:])
+
+    @staticmethod
+    def _failure_(statements, index, details):
+        if index is None:
+            return HiveCommandError("Hive batch failed : {0}".format(details))
+        _job, _statement = statements[index]
+        return HiveCommandError("Hive batch failed at statement '{0}' of job {1} : {2}".format(
+            _statement, _job.name, details))
@@ -0,0 +1,201 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Cache of Hive Job results.
+"""
+
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from merlin.common.logger import get_logger
+
+
+class HiveResultCache(object):
+    """
+    Cache of Hive Job results persisted to the local file.
+    Results expire after the given time-to-live and are invalidated explicitly
+    by DDL and DML statements executed against tables referenced by cached queries.
+    Cache file can be shared by several processes : every change re-reads the file
+    under the file lock, so changes made by other processes are kept
+    """
+
+    LOG = get_logger('HiveResultCache')
+    READ_ONLY_STATEMENTS = ['SELECT', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN', 'WITH', 'SET', 'USE']
+    # statements starting with a read-only keyword can still modify data,
+    # e.g. WITH ... INSERT OVERWRITE
+    WRITE_PATTERN = re.compile(
+        r"\b(?:INSERT|LOAD|CREATE|ALTER|DROP|TRUNCATE|MSCK|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+    TABLE_PATTERN = re.compile(
+        r"\b(?:FROM|JOIN|(?:(?:OVERWRITE\s+)?INTO|OVERWRITE)(?:\s+TABLE)?|TABLE|PARTITIONS"
+        r"|(?:DESCRIBE|DESC)(?:\s+(?:EXTENDED|FORMATTED))?)"
+        r"(?:\s+IF(?:\s+NOT)?\s+EXISTS)?\s+([\w.`]+)", re.IGNORECASE)
+    LITERAL_PATTERN = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)""")
+
+    def __init__(self, path=None, ttl=3600):
+        """
+        :param path: path to the local file to persist cache to.
+            Cache is kept in memory only by default
+        :param ttl: time-to-live of cached results in seconds
+        """
+        super(HiveResultCache, self).__init__()
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._entries = self._load_()
+
+    @staticmethod
+    def is_cacheable(statements):
+        """
+        :return: True in case all statements are read-only
+        """
+        return all(_statement.split(None, 1)[0].upper() in HiveResultCache.READ_ONLY_STATEMENTS
+                   and not HiveResultCache.WRITE_PATTERN.search(_statement)
+                   for _statement in statements)
+
+    @staticmethod
+    def tables(statements):
+        """
+        :return: names of the tables referenced by statements, without database prefix
+        :rtype: list
+        """
+        return sorted(set(_match.strip('`').split('.')[-1].strip('`').lower()
+                          for _statement in statements
+                          for _match in HiveResultCache.TABLE_PATTERN.findall(_statement)))
+
+    @staticmethod
+    def key(statements, database=None, options=None):
+        """
+        Builds cache key from statements with normalized whitespace,
+        database and configuration options. Quoted literals are kept as is
+        :rtype: str
+        """
+        _normalized = ["".join(_part if _index % 2 else " ".join(_part.split())
+                               for _index, _part in
+                               enumerate(HiveResultCache.LITERAL_PATTERN.split(_statement)))
+                       .strip()
+                       for _statement in statements]
+        return hashlib.sha1(json.dumps([_normalized, database,
+                                        sorted(options if options else [])])).hexdigest()
+
+    def get(self, key):
+        """
+        :return: cached output or None in case there is no valid cached result
+        """
+        with self._lock:
+            _entry = self._entries.get(key)
+            if _entry and time.time() - _entry['time'] < self.ttl:
+                return _entry['stdout']
+        return None
+
+    def put(self, key, stdout, tables):
+        """
+        Caches job output
+        :param key: cache key
+        :param stdout: job output
+        :param tables: tables referenced by the job
+        """
+        with self._modify_():
+            self._entries[key] = {'time': time.time(), 'stdout': stdout, 'tables': tables}
+
+    def invalidate(self, *tables):
+        """
+        Drops cached results of queries referencing the given tables
+        and results of queries which do not reference any table.
+        Drops all cached results in case tables were not specified
+        """
+        _tables = set(_table.split('.')[-1].strip('`').lower() for _table in tables)
+        with self._modify_():
+            if _tables:
+                # results which do not reference tables, e.g. SHOW TABLES,
+                # can be affected by any DDL
+                self._entries = dict((_key, _entry) for _key, _entry in self._entries.iteritems()
+                                     if _entry['tables']
+                                     and not _tables.intersection(_entry['tables']))
+            else:
+                self._entries = {}
+
+    def invalidate_for(self, statements):
+        """
+        Drops cached results which can be affected by the given statements
+        """
+        _tables = HiveResultCache.tables(statements)
+        HiveResultCache.LOG.info("Invalidating cached results for tables : {0}".format(
+            _tables or 'all'))
+        self.invalidate(*_tables)
+
+    @contextmanager
+    def _modify_(self):
+        """
+        Reloads cached results from the file before modification and saves them after it.
+        File lock is held in the meantime, so concurrent changes of other processes
+        are neither lost nor overwritten
+        """
+        with self._lock:
+            if not self.path:
+                yield
+                return
+            _dir = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.isdir(_dir):
+                os.makedirs(_dir)
+            with open("{0}.lock".format(self.path), 'a') as _lock_file:
+                fcntl.flock(_lock_file, fcntl.LOCK_EX)
+                try:
+                    self._entries = self._load_()
+                    yield
+                    self._save_()
+                finally:
+                    fcntl.flock(_lock_file, fcntl.LOCK_UN)
+
+    def _load_(self):
+        if self.path and os.path.isfile(self.path):
+            try:
+                with open(self.path) as _file:
+                    return json.load(_file)
+            except ValueError:
+                HiveResultCache.LOG.warning(
+                    "Cannot read Hive result cache {0}, cache is reset".format(self.path))
+        return {}
+
+    def _save_(self):
+        _now = time.time()
+        self._entries = dict((_key, _entry) for _key, _entry in self._entries.iteritems()
+                             if _now - _entry['time'] < self.ttl)
+        _fd, _tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        with os.fdopen(_fd, 'w') as _file:
+            json.dump(self._entries, _file)
+        os.rename(_tmp, self.path)
@@ -0,0 +1,313 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+HiveServer2 sessions used to run Hive Jobs without launching Hive command line utility.
+"""
+
+from contextlib import contextmanager
+import threading
+
+from merlin.common.logger import get_logger
+from merlin.common.exceptions import HiveCommandError
+
+
+def _cli_value_(value):
+    """
+    :return: value of HiveServer2 result the way Hive command line utility prints it, None for NULL
+    """
+    if value is None or isinstance(value, basestring):
+        return value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+class HiveQueryResult(object):
+    """
+    Result of the Hive Job executed over HiveServer2 session or taken from the result cache.
+    Mimics result of the command submission : rows of the last statement are available
+    as tab-separated lines of stdout, the same way Hive command line utility prints them.
+    """
+
+    def __init__(self, rows=None, stdout=None):
+        """
+        :param rows: rows returned by the last statement
+        :type rows: list
+        :param stdout: output of Hive command line utility
+        :type stdout: str
+        """
+        self.rows = rows if rows else []
+        self._stdout = stdout
+        self.status = 0
+        self.stderr = ""
+
+    @property
+    def stdout(self):
+        """Rows of the last statement as tab-separated lines"""
+        if self._stdout is not None:
+            return self._stdout
+        return "\n".join("\t".join('NULL' if _value is None else _cli_value_(_value)
+                                   for _value in _row)
+                         for _row in self.rows)
+
+    def is_ok(self):
+        return True
+
+    def is_running(self):
+        return False
+
+    def if_failed_raise(self, exception):
+        pass
+
+
+class HiveSession(object):
+    """
+    HiveServer2 session. Wraps DB-API connection and keeps track of the session state
+    which should be reset before session is reused.
+    Session is marked as broken in case statement failed because of connection failure,
+    e.g. thrift transport error, rather than DB-API DatabaseError reported for invalid statement.
+    """
+
+    LOG = get_logger('HiveSession')
+    DEFAULT_DATABASE = 'default'
+
+    def __init__(self, connection):
+        """
+        :param connection: DB-API compatible connection to HiveServer2
+        """
+        super(HiveSession, self).__init__()
+        self._connection = connection
+        self.database = HiveSession.DEFAULT_DATABASE
+        self.broken = False
+        self._overridden = False
+
+    def execute(self, statement):
+        """
+        Executes single statement
+        :param statement: HiveQL statement
+        :return: list of rows returned by statement
+        :rtype: list
+        """
+        HiveSession.LOG.info("Executing statement : {0}".format(statement))
+        _command = statement.split(None, 1)[0].upper() if statement.strip() else None
+        if _command == 'SET':
+            self._overridden = True
+        _cursor = self._connection.cursor()
+        try:
+            _cursor.execute(statement)
+            if _command == 'RESET':
+                self._overridden = False
+            elif _command == 'USE':
+                self.database = statement.split()[1].strip('`')
+            return list(_cursor.fetchall()) if _cursor.description else []
+        except Exception as e:
+            raise self._error_(statement, e)
+        finally:
+            _cursor.close()
+
+    def iterate(self, statement, batch_size=10000):
+        """
+        Executes single statement and yields returned rows fetching them batch by batch
+        :param statement: HiveQL statement
+        :param batch_size: number of rows fetched at once
+        :return: generator of rows
+        """
+        HiveSession.LOG.info("Executing statement : {0}".format(statement))
+        _cursor = self._connection.cursor()
+        try:
+            try:
+                _cursor.execute(statement)
+            except Exception as e:
+                raise self._error_(statement, e)
+            if not _cursor.description:
+                return
+            while True:
+                try:
+                    _rows = _cursor.fetchmany(batch_size)
+                except Exception as e:
+                    raise self._error_(statement, e)
+                if not _rows:
+                    break
+                for _row in _rows:
+                    yield tuple(_row)
+        finally:
+            _cursor.close()
+
+    def _error_(self, statement, error):
+        # DB-API drivers report failed statements by subclasses of DatabaseError
+        if not any(_type.__name__ == 'DatabaseError' for _type in type(error).__mro__):
+            self.broken = True
+        return HiveCommandError("Hive statement failed : {0}\n{1}".format(statement, error))
+
+    def set(self, name, value):
+        """
+        Sets configuration option for the session
+        """
+        self.execute("SET {0}={1}".format(name, value))
+
+    def add_jar(self, path):
+        """
+        Adds jar to the session classpath
+        """
+        self.execute("ADD JAR {0}".format(path))
+
+    def use_database(self, database):
+        """
+        Switches session to the given database
+        """
+        if database != self.database:
+            self.execute("USE {0}".format(database))
+
+    def reset(self):
+        """
+        Drops configuration options set within session
+        """
+        if self._overridden:
+            self.execute("RESET")
+            self._overridden = False
+
+    def close(self):
+        self._connection.close()
+
+
+def _connect_with_pyhive_(host, port, username, **kwargs):
+    try:
+        from pyhive import hive
+    except ImportError:
+        raise HiveCommandError("PyHive package is required to connect to HiveServer2")
+    return hive.connect(host=host, port=port, username=username, **kwargs)
+
+
+class HiveSessionPool(object):
+    """
+    Thread-safe pool of HiveServer2 sessions.
+    Sessions are opened lazily, at most 'size' sessions are opened at the same time.
+    """
+
+    LOG = get_logger('HiveSessionPool')
+
+    def __init__(self, host='localhost', port=10000, username=None, size=1,
+                 connect=_connect_with_pyhive_, **kwargs):
+        """
+        :param host: HiveServer2 host
+        :param port: HiveServer2 port
+        :param username: user name
+        :param size: max number of simultaneously opened sessions
+        :param connect: connection factory. Should accept host, port, username and kwargs
+            and return DB-API compatible connection
+        :param kwargs: additional arguments passed to the connection factory
+        """
+        super(HiveSessionPool, self).__init__()
+        self.host = host
+        self.port = port
+        self.username = username
+        self.size = size
+        self._connect = connect
+        self._kwargs = kwargs
+        self._idle = []
+        self._opened = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Borrows session from the pool. Blocks in case all sessions are in use.
+        :rtype: HiveSession
+        """
+        with self._condition:
+            while not self._idle and self._opened >= self.size:
+                self._condition.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+        try:
+            HiveSessionPool.LOG.info("Opening HiveServer2 session : {0}:{1}".format(
+                self.host, self.port))
+            return HiveSession(self._connect(self.host, self.port, self.username,
+                                             **self._kwargs))
+        except Exception:
+            with self._condition:
+                self._opened -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, session, broken=False):
+        """
+        Returns session to the pool. Broken sessions are closed
+        :type session: HiveSession
+        """
+        broken = broken or session.broken
+        if not broken:
+            try:
+                session.reset()
+            except HiveCommandError:
+                broken = True
+        with self._condition:
+            if broken:
+                self._opened -= 1
+                self._close_(session)
+            else:
+                self._idle.append(session)
+            self._condition.notify()
+
+    @contextmanager
+    def session(self):
+        """
+        Borrows session for the duration of with-block.
+        Session is closed in case of connection failure
+        """
+        _session = self.acquire()
+        _broken = False
+        try:
+            yield _session
+        except HiveCommandError:
+            raise
+        except Exception:
+            _broken = True
+            raise
+        finally:
+            self.release(_session, _broken)
+
+    def close(self):
+        """
+        Closes all idle sessions
+        """
+        with self._condition:
+            for _session in self._idle:
+                self._opened -= 1
+                self._close_(_session)
+            self._idle = []
+
+    @staticmethod
+    def _close_(session):
+        try:
+            session.close()
+        except Exception as e:
+            HiveSessionPool.LOG.warning("Failed to close HiveServer2 session : {0}".format(e))
@@ -34,10 +34,34 @@ Kafka client.
 Kafka is a distributed, partitioned, replicated commit log service.
 It provides the functionality of a messaging system, but with a unique design.
 
+Command line scripts are wrapped by Kafka and Topic classes.
+Native protocol client, producer and consumer live in merlin.tools.kafka_client.
+
+ADMIN AND MONITORING EXAMPLES :
+
+Waits until consumer group 'indexer' consumes all but 1000 messages before starting batch job :
+        with KafkaClient("broker1:9092") as client:
+            monitor = ConsumerLagMonitor(client, group="indexer", topics=["ingest"])
+            monitor.wait_for_lag_below(1000, interval=30, timeout=3600)
+            print monitor.metrics()
+
+Provisions topics with a single admin session, only missing topics are created
+and only changed configs are altered :
+        with KafkaClient("broker1:9092") as client:
+            TopicAdmin(client).apply([TopicSpec("events_{0}".format(n), partitions=8,
+                                                replication_factor=3,
+                                                configs={"retention.ms": 86400000})
+                                      for n in range(200)])
+
 """
 
+import collections
+import time
+
+from merlin.common.exceptions import KafkaClientError, WaitTimeoutError
 from merlin.common.logger import get_logger
 from merlin.common.shell_command_executor import  execute_shell_command
+from merlin.tools.kafka_client import KafkaProtocol
 
 
 class Kafka():
@@ -248,3 +272,314 @@ class Topic():
                                 self.zookeeper_host, command)
         return result
 
+
+class TopicSpec(object):
+    """
+    Desired state of the topic
+    """
+
+    def __init__(self, name, partitions=1, replication_factor=1, configs=None):
+        """
+        :param name: topic name
+        :param partitions: number of partitions
+        :param replication_factor: number of replicas of every partition
+        :param configs: topic-level configs which differ from broker defaults
+        :type configs: dict
+        """
+        self.name = name
+        self.partitions = partitions
+        self.replication_factor = replication_factor
+        self.configs = dict((_key, str(_value)) for _key, _value in (configs or {}).iteritems())
+
+    def __repr__(self):
+        return "TopicSpec({0}, partitions={1}, replication_factor={2}, configs={3})".format(
+            self.name, self.partitions, self.replication_factor, self.configs)
+
+
+class TopicPlan(object):
+    """
+    Changes required to bring topics to the desired state
+    """
+
+    def __init__(self, create=None, alter=None, delete=None, mismatched=None):
+        """
+        :param create: list of TopicSpec to create
+        :param alter: new configs of existing topics
+        :param delete: list of topics to delete
+        :param mismatched: existing topics which have different number of partitions than desired.
+            Number of partitions is never changed automatically
+        """
+        self.create = create if create else []
+        self.alter = alter if alter else {}
+        self.delete = delete if delete else []
+        self.mismatched = mismatched if mismatched else []
+
+    def is_empty(self):
+        """
+        :return: True in case topics are already in the desired state
+        """
+        return not (self.create or self.alter or self.delete)
+
+    def __repr__(self):
+        return "TopicPlan(create={0}, alter={1}, delete={2}, mismatched={3})".format(
+            [_spec.name for _spec in self.create], sorted(self.alter), self.delete, self.mismatched)
+
+
+class TopicAdmin(object):
+    """
+    Applies declarative set of topics and their configs.
+    Existing topics are listed once and cached, changes are applied with at most
+    one create, one alter configs and one delete request regardless of the number of topics.
+    """
+    LOG = get_logger("TopicAdmin")
+
+    def __init__(self, client, timeout_ms=30000):
+        """
+        :param client: Kafka client
+        :type client: KafkaClient
+        :param timeout_ms: time the controller waits for topics to be created or deleted
+        """
+        super(TopicAdmin, self).__init__()
+        self.client = client
+        self.timeout_ms = timeout_ms
+        self._topics = None
+
+    def topics(self, refresh=False):
+        """
+        :param refresh: indicates that cached topic listing should be reloaded
+        :return: number of partitions of every existing topic
+        :rtype: dict
+        """
+        if self._topics is None or refresh:
+            self._topics = dict((_topic, len(_partitions))
+                                for _topic, _partitions in self.client.load_metadata().iteritems())
+        return self._topics
+
+    def exists(self, name):
+        """
+        Checks if topic exists using cached topic listing
+        """
+        return name in self.topics()
+
+    def plan(self, specs, delete_missing=False, prefix=None):
+        """
+        Compares topics with the desired state
+        :param specs: list of TopicSpec
+        :param delete_missing: indicates that existing topics missing in specs should be deleted
+        :param prefix: limits deletion to topics with the given prefix.
+            Internal topics are never deleted
+        :rtype: TopicPlan
+        """
+        _existing = self.topics()
+        _specs = dict((_spec.name, _spec) for _spec in specs)
+        _plan = TopicPlan(create=[_spec for _spec in specs if _spec.name not in _existing])
+        _present = [_spec.name for _spec in specs if _spec.name in _existing]
+        _configs = self.client.describe_configs(_present) if _present else {}
+        for _name in _present:
+            if _configs.get(_name, {}) != _specs[_name].configs:
+                _plan.alter[_name] = _specs[_name].configs
+            if _existing[_name] != _specs[_name].partitions:
+                _plan.mismatched.append(_name)
+        if delete_missing:
+            _plan.delete = sorted(_name for _name in _existing if _name not in _specs
+                                  and not _name.startswith("__")
+                                  and (not prefix or _name.startswith(prefix)))
+        return _plan
+
+    def apply(self, specs, delete_missing=False, prefix=None, validate_only=False):
+        """
+        Brings topics to the desired state
+        :param specs: list of TopicSpec
+        :param delete_missing: indicates that existing topics missing in specs should be deleted
+        :param prefix: limits deletion to topics with the given prefix
+        :param validate_only: indicates that changes should be planned but not applied
+        :return: applied changes
+        :rtype: TopicPlan
+        """
+        _plan = self.plan(specs, delete_missing=delete_missing, prefix=prefix)
+        for _name in _plan.mismatched:
+            TopicAdmin.LOG.warning("Number of partitions of topic {0} differs from desired".format(
+                _name))
+        TopicAdmin.LOG.info(str(_plan))
+        if validate_only or _plan.is_empty():
+            return _plan
+        _errors = {}
+        if _plan.create:
+            _errors.update(self.client.create_topics(_plan.create, timeout_ms=self.timeout_ms))
+        if _plan.alter:
+            _errors.update(self.client.alter_configs(_plan.alter))
+        if _plan.delete:
+            _errors.update(self.client.delete_topics(_plan.delete, timeout_ms=self.timeout_ms))
+        for _spec in _plan.create:
+            self._topics[_spec.name] = _spec.partitions
+        for _name in _plan.delete:
+            self._topics.pop(_name, None)
+        _failed = dict((_name, _error) for _name, _error in _errors.iteritems()
+                       if _error != KafkaProtocol.ERROR_NONE)
+        if _failed:
+            self._topics = None
+            raise KafkaClientError("Could not apply changes to topics : {0}".format(
+                ", ".join("{0} (error code {1})".format(_name, _error)
+                          for _name, _error in sorted(_failed.items()))))
+        return _plan
+
+
+class PartitionLag(object):
+    """
+    Lag of consumer group in a single partition
+    """
+    __slots__ = ('topic', 'partition', 'end_offset', 'committed_offset')
+
+    def __init__(self, topic, partition, end_offset, committed_offset):
+        self.topic = topic
+        self.partition = partition
+        self.end_offset = end_offset
+        self.committed_offset = committed_offset
+
+    @property
+    def lag(self):
+        return max(self.end_offset - self.committed_offset, 0)
+
+    def __repr__(self):
+        return "PartitionLag({0}:{1}, end={2}, committed={3}, lag={4})".format(
+            self.topic, self.partition, self.end_offset, self.committed_offset, self.lag)
+
+
+class LagSample(object):
+    """
+    End and committed offsets of all monitored partitions taken at the same time
+    """
+
+    def __init__(self, timestamp, partitions):
+        """
+        :param timestamp: time the sample was taken
+        :param partitions: list of PartitionLag
+        """
+        self.timestamp = timestamp
+        self.partitions = partitions
+
+    def lag(self, topic=None):
+        """
+        :param topic: returns lag of the given topic only
+        :return: total number of messages the group has not consumed yet
+        """
+        return sum(_partition.lag for _partition in self.partitions
+                   if topic in (None, _partition.topic))
+
+    def end_offset(self):
+        return sum(_partition.end_offset for _partition in self.partitions)
+
+    def committed_offset(self):
+        return sum(_partition.committed_offset for _partition in self.partitions)
+
+
+class ConsumerLagMonitor(object):
+    """
+    Samples lag of the consumer group: difference between the end offset of every partition
+    and the offset committed by the group.
+    Consumption and production rates are calculated over the last samples.
+    """
+    LOG = get_logger("ConsumerLagMonitor")
+
+    def __init__(self, client, group, topics, window=10):
+        """
+        :param client: Kafka client
+        :type client: KafkaClient
+        :param group: consumer group
+        :param topics: list of topics consumed by the group
+        :param window: number of samples used to calculate rates
+        """
+        super(ConsumerLagMonitor, self).__init__()
+        self.client = client
+        self.group = group
+        self.topics = topics if isinstance(topics, list) else [topics]
+        self.samples = collections.deque(maxlen=max(window, 2))
+
+    def sample(self):
+        """
+        Takes a sample of end and committed offsets.
+        Committed offset of partitions never consumed by the group is the earliest available offset
+        :rtype: LagSample
+        """
+        _partitions = [(_topic, _partition) for _topic in self.topics
+                       for _partition in self.client.partitions(_topic)]
+        _end = self.client.list_offsets(_partitions, KafkaProtocol.LATEST_OFFSET)
+        _committed = self.client.committed_offsets(self.group, _partitions)
+        _uncommitted = [_key for _key in _partitions if _committed.get(_key, -1) < 0]
+        if _uncommitted:
+            _committed.update(self.client.list_offsets(_uncommitted, KafkaProtocol.EARLIEST_OFFSET))
+        _sample = LagSample(time.time(),
+                            [PartitionLag(_topic, _partition, _end[(_topic, _partition)],
+                                          _committed[(_topic, _partition)])
+                             for _topic, _partition in _partitions])
+        self.samples.append(_sample)
+        ConsumerLagMonitor.LOG.debug("Lag of group {0} : {1}".format(self.group, _sample.lag()))
+        return _sample
+
+    def lag(self):
+        """
+        :return: total lag of the last sample. Takes a sample if there is none
+        """
+        return (self.samples[-1] if self.samples else self.sample()).lag()
+
+    def _rate_(self, offset):
+        if len(self.samples) < 2:
+            return None
+        _first, _last = self.samples[0], self.samples[-1]
+        _duration = _last.timestamp - _first.timestamp
+        return (offset(_last) - offset(_first)) / _duration if _duration > 0 else None
+
+    def consumption_rate(self):
+        """
+        :return: messages consumed per second over the sampling window,
+            None if there are less than 2 samples
+        """
+        return self._rate_(LagSample.committed_offset)
+
+    def production_rate(self):
+        """
+        :return: messages produced per second over the sampling window,
+            None if there are less than 2 samples
+        """
+        return self._rate_(LagSample.end_offset)
+
+    def metrics(self):
+        """
+        :return: lag of every partition, total lag, consumption and production rates
+            and estimated time in seconds to consume all messages at the current rates
+        :rtype: dict
+        """
+        _sample = self.samples[-1] if self.samples else self.sample()
+        _consumption, _production = self.consumption_rate(), self.production_rate()
+        _catch_up = None
+        if _consumption is not None and _consumption > _production:
+            _catch_up = _sample.lag() / (_consumption - _production)
+        return {'lag': _sample.lag(),
+                'partitions': dict(("{0}:{1}".format(_p.topic, _p.partition), _p.lag)
+                                   for _p in _sample.partitions),
+                'consumption_rate': _consumption,
+                'production_rate': _production,
+                'time_to_catch_up': _catch_up}
+
+    def wait_for_lag_below(self, threshold, interval=10, timeout=None):
+        """
+        Blocks until the group lag falls below the threshold
+        :param threshold: max number of messages the group may not have consumed
+        :param interval: sampling interval in seconds
+        :param timeout: maximum time to wait in seconds. Waits forever in case timeout is not set
+        :return: the last sample
+        :rtype: LagSample
+        :raise: WaitTimeoutError in case lag did not fall below the threshold within the given time
+        """
+        _deadline = time.time() + timeout if timeout else None
+        while True:
+            _sample = self.sample()
+            if _sample.lag() < threshold:
+                return _sample
+            ConsumerLagMonitor.LOG.info("Lag of group {0} is {1}, waiting for less than {2}".format(
+                self.group, _sample.lag(), threshold))
+            if _deadline and time.time() + interval > _deadline:
+                raise WaitTimeoutError(
+                    "Lag of group {0} is not below {1} within {2} second(s)".format(
+                        self.group, threshold, timeout))
+            time.sleep(interval)
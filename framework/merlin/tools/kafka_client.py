@@ -0,0 +1,968 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+
+"""
+Native Kafka client.
+KafkaClient speaks Kafka protocol directly, so messages can be sent and received
+without launching JVM for every operation.
+
+NATIVE CLIENT EXAMPLES :
+
+Sends messages in gzip-compressed batches of up to 64KB or 5ms :
+        with KafkaClient("broker1:9092,broker2:9092") as client:
+            with Producer(client, batch_size=64 * 1024, linger_ms=5) as producer:
+                for line in open("ingest.log"):
+                    producer.send("ingest", line)
+
+Reads all messages available in the topic. Values are memoryviews of the fetched buffer :
+        with KafkaClient("broker1:9092") as client:
+            for batch in Consumer(client, "ingest").batches():
+                for message in batch:
+                    process(message.value)
+
+merlin.common.kafka_test_utils.LocalBroker is an in-memory stand-in for Kafka broker
+which can be used in tests :
+        broker = LocalBroker()
+        client = KafkaClient(connect=broker.connect)
+
+"""
+
+import random
+import socket
+import struct
+import threading
+import time
+import zlib
+
+from merlin.common.exceptions import KafkaClientError
+from merlin.common.logger import get_logger
+
+
+class KafkaProtocol(object):
+    """
+    Constants of Kafka wire protocol.
+    Version 0 of the APIs and of the message format is used.
+    """
+    PRODUCE = 0
+    FETCH = 1
+    LIST_OFFSETS = 2
+    METADATA = 3
+    OFFSET_FETCH = 9
+    GROUP_COORDINATOR = 10
+    CREATE_TOPICS = 19
+    DELETE_TOPICS = 20
+    DESCRIBE_CONFIGS = 32
+    ALTER_CONFIGS = 33
+
+    RESOURCE_TOPIC = 2
+
+    CODEC_NONE = 0
+    CODEC_GZIP = 1
+    CODEC_MASK = 0x07
+
+    LATEST_OFFSET = -1
+    EARLIEST_OFFSET = -2
+
+    ERROR_NONE = 0
+    ERROR_OFFSET_OUT_OF_RANGE = 1
+    ERROR_UNKNOWN_TOPIC_OR_PARTITION = 3
+    ERROR_NOT_LEADER_FOR_PARTITION = 6
+    ERROR_GROUP_COORDINATOR_NOT_AVAILABLE = 15
+    ERROR_TOPIC_ALREADY_EXISTS = 36
+
+
+class _Writer(object):
+    """
+    Builds binary Kafka request or response
+    """
+
+    def __init__(self):
+        self._parts = []
+
+    def int8(self, value):
+        self._parts.append(struct.pack('>b', value))
+        return self
+
+    def int16(self, value):
+        self._parts.append(struct.pack('>h', value))
+        return self
+
+    def int32(self, value):
+        self._parts.append(struct.pack('>i', value))
+        return self
+
+    def int64(self, value):
+        self._parts.append(struct.pack('>q', value))
+        return self
+
+    def string(self, value):
+        if value is None:
+            return self.int16(-1)
+        self.int16(len(value))
+        self._parts.append(value)
+        return self
+
+    def bytes(self, value):
+        if value is None:
+            return self.int32(-1)
+        self.int32(len(value))
+        self._parts.append(value)
+        return self
+
+    def array(self, items, write):
+        self.int32(len(items))
+        for _item in items:
+            write(_item)
+        return self
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+
+class _Reader(object):
+    """
+    Reads binary Kafka request or response.
+    Byte fields are returned as memoryview slices of the underlying buffer
+    """
+
+    def __init__(self, buffer, position=0):
+        self.buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        self.position = position
+
+    def _unpack_(self, fmt, size):
+        _value = struct.unpack_from(fmt, self.buffer, self.position)[0]
+        self.position += size
+        return _value
+
+    def int8(self):
+        return self._unpack_('>b', 1)
+
+    def int16(self):
+        return self._unpack_('>h', 2)
+
+    def int32(self):
+        return self._unpack_('>i', 4)
+
+    def int64(self):
+        return self._unpack_('>q', 8)
+
+    def string(self):
+        _length = self.int16()
+        if _length < 0:
+            return None
+        self.position += _length
+        return self.buffer[self.position - _length:self.position].tobytes()
+
+    def bytes(self):
+        _length = self.int32()
+        if _length < 0:
+            return None
+        self.position += _length
+        return self.buffer[self.position - _length:self.position]
+
+    def array(self, read):
+        return [read() for _ in range(self.int32())]
+
+    def remaining(self):
+        return len(self.buffer) - self.position
+
+
+def _to_bytes_(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return str(value)
+
+
+def murmur2(data):
+    """
+    Murmur2 hash used by the default partitioner of Java producer,
+    so messages with the same key go to the same partition as messages sent by other clients
+    :param data: str or bytearray
+    :return: unsigned 32-bit hash
+    :rtype: int
+    """
+    _data = bytearray(data)
+    _length = len(_data)
+    _m = 0x5bd1e995
+    _hash = (0x9747b28c ^ _length) & 0xffffffff
+    for _index in range(0, _length - _length % 4, 4):
+        _k = _data[_index] | (_data[_index + 1] << 8) \
+            | (_data[_index + 2] << 16) | (_data[_index + 3] << 24)
+        _k = (_k * _m) & 0xffffffff
+        _k ^= _k >> 24
+        _k = (_k * _m) & 0xffffffff
+        _hash = ((_hash * _m) & 0xffffffff) ^ _k
+    _tail = _length - _length % 4
+    if _length % 4 >= 3:
+        _hash ^= _data[_tail + 2] << 16
+    if _length % 4 >= 2:
+        _hash ^= _data[_tail + 1] << 8
+    if _length % 4 >= 1:
+        _hash ^= _data[_tail]
+        _hash = (_hash * _m) & 0xffffffff
+    _hash ^= _hash >> 13
+    _hash = (_hash * _m) & 0xffffffff
+    _hash ^= _hash >> 15
+    return _hash
+
+
+def encode_message_set(messages, codec=KafkaProtocol.CODEC_NONE, compression_level=6):
+    """
+    Encodes messages to Kafka message set
+    :param messages: list of (key, value) pairs
+    :param codec: compression codec, see KafkaProtocol.CODEC_*
+    :return: encoded message set
+    :rtype: str
+    """
+    _writer = _Writer()
+    for _key, _value in messages:
+        _message = _encode_message_(_to_bytes_(_key), _to_bytes_(_value))
+        _writer.int64(0).bytes(_message)
+    _message_set = _writer.getvalue()
+    if codec == KafkaProtocol.CODEC_GZIP:
+        _compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 31)
+        _compressed = _compressor.compress(_message_set) + _compressor.flush()
+        _message_set = _Writer().int64(0).bytes(
+            _encode_message_(None, _compressed, attributes=KafkaProtocol.CODEC_GZIP)).getvalue()
+    return _message_set
+
+
+def _encode_message_(key, value, attributes=0):
+    _body = _Writer().int8(0).int8(attributes).bytes(key).bytes(value).getvalue()
+    return struct.pack('>I', zlib.crc32(_body) & 0xffffffff) + _body
+
+
+def decode_message_set(buffer):
+    """
+    Decodes Kafka message set. Keys and values of uncompressed messages are not copied,
+    they are returned as memoryview slices of the given buffer.
+    Incomplete message at the end of the buffer is skipped.
+    :param buffer: encoded message set
+    :return: list of messages
+    :rtype: list
+    """
+    _reader = _Reader(buffer)
+    _messages = []
+    while _reader.remaining() >= 12:
+        _offset = _reader.int64()
+        _size = _reader.int32()
+        if _size > _reader.remaining():
+            break
+        _reader.position += 4
+        _reader.int8()
+        _attributes = _reader.int8()
+        _key = _reader.bytes()
+        _value = _reader.bytes()
+        if _attributes & KafkaProtocol.CODEC_MASK == KafkaProtocol.CODEC_GZIP:
+            _messages.extend(decode_message_set(zlib.decompress(_value.tobytes(), 47)))
+        else:
+            _messages.append(Message(_offset, _key, _value))
+    return _messages
+
+
+class Message(object):
+    """
+    Message fetched from Kafka. Key and value are memoryviews
+    """
+    __slots__ = ('offset', 'key', 'value')
+
+    def __init__(self, offset, key, value):
+        self.offset = offset
+        self.key = key
+        self.value = value
+
+    def __repr__(self):
+        return "Message(offset={0}, key={1}, value={2})".format(
+            self.offset,
+            self.key.tobytes() if self.key is not None else None,
+            self.value.tobytes() if self.value is not None else None)
+
+
+class MessageBatch(object):
+    """
+    Messages fetched from a single partition by a single request
+    """
+
+    def __init__(self, topic, partition, messages, high_watermark):
+        self.topic = topic
+        self.partition = partition
+        self.messages = messages
+        self.high_watermark = high_watermark
+
+    def values(self):
+        """
+        :return: message values as memoryviews
+        :rtype: list
+        """
+        return [_message.value for _message in self.messages]
+
+    @property
+    def next_offset(self):
+        return self.messages[-1].offset + 1 if self.messages else None
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+
+class BrokerConnection(object):
+    """
+    TCP connection to Kafka broker
+    """
+
+    def __init__(self, host, port, timeout=30):
+        self.host = host
+        self.port = port
+        self._socket = socket.create_connection((host, port), timeout)
+
+    def send(self, payload):
+        """
+        Sends size-delimited request the broker doesn't respond to, e.g. produce request with acks=0
+        :param payload: encoded request
+        """
+        self._socket.sendall(struct.pack('>i', len(payload)) + payload)
+
+    def request(self, payload):
+        """
+        Sends size-delimited request and reads the response
+        :param payload: encoded request
+        :return: encoded response
+        :rtype: memoryview
+        """
+        self.send(payload)
+        _size = struct.unpack('>i', self._receive_(4))[0]
+        return memoryview(self._receive_(_size))
+
+    def _receive_(self, size):
+        _buffer = bytearray(size)
+        _view = memoryview(_buffer)
+        _received = 0
+        while _received < size:
+            _count = self._socket.recv_into(_view[_received:], size - _received)
+            if not _count:
+                raise KafkaClientError("Connection to {0}:{1} was closed".format(
+                    self.host, self.port))
+            _received += _count
+        return bytes(_buffer)
+
+    def close(self):
+        self._socket.close()
+
+
+class KafkaClient(object):
+    """
+    Native client speaking Kafka protocol.
+    Requests to partitions led by the same broker are combined into a single request.
+    """
+    LOG = get_logger("KafkaClient")
+
+    def __init__(self, bootstrap_servers='localhost:9092', client_id='merlin', timeout=30,
+                 connect=BrokerConnection):
+        """
+        :param bootstrap_servers: comma-separated list or list of 'host:port'
+            of the brokers used to load metadata
+        :param client_id: client identifier sent with every request
+        :param timeout: socket timeout in seconds
+        :param connect: connection factory. Should accept host, port and timeout and return
+            object with send(payload), request(payload) and close() methods,
+            e.g. merlin.common.kafka_test_utils.LocalBroker.connect
+        """
+        super(KafkaClient, self).__init__()
+        if isinstance(bootstrap_servers, basestring):
+            bootstrap_servers = bootstrap_servers.split(",")
+        self.bootstrap_servers = [self._address_(_server) for _server in bootstrap_servers]
+        self.client_id = client_id
+        self.timeout = timeout
+        self._connect = connect
+        self._connections = {}
+        self._brokers = {}
+        self._leaders = {}
+        self._partitions = {}
+        self._correlation_id = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _address_(server):
+        _host, _, _port = server.strip().partition(":")
+        return _host, int(_port) if _port else 9092
+
+    def _connection_(self, address):
+        with self._lock:
+            if address in self._connections:
+                return self._connections[address]
+        # connecting doesn't block requests to other brokers
+        _connection = (self._connect(address[0], address[1], self.timeout), threading.Lock())
+        with self._lock:
+            if address in self._connections:
+                _connection[0].close()
+            return self._connections.setdefault(address, _connection)
+
+    def _request_(self, address, api_key, body, api_version=0, expect_response=True):
+        with self._lock:
+            self._correlation_id += 1
+            _correlation_id = self._correlation_id
+        _header = _Writer().int16(api_key).int16(api_version).int32(_correlation_id) \
+            .string(self.client_id).getvalue()
+        _connection, _connection_lock = self._connection_(address)
+        # only requests to the same broker wait for each other
+        with _connection_lock:
+            try:
+                if not expect_response:
+                    _connection.send(_header + body)
+                    return None
+                _response = _connection.request(_header + body)
+            except Exception:
+                with self._lock:
+                    if self._connections.get(address, (None,))[0] is _connection:
+                        del self._connections[address]
+                _connection.close()
+                raise
+        _reader = _Reader(_response)
+        if _reader.int32() != _correlation_id:
+            raise KafkaClientError("Unexpected correlation id in response of {0}:{1}".format(
+                *address))
+        return _reader
+
+    def load_metadata(self, topics=None):
+        """
+        Loads brokers and partition leaders
+        :param topics: list of topics. Metadata of all topics is loaded by default
+        :return: partitions of every topic
+        :rtype: dict
+        """
+        _body = _Writer()
+        _body.array(topics if topics else [], _body.string)
+        _reader = self._bootstrap_request_(KafkaProtocol.METADATA, _body.getvalue())
+        with self._lock:
+            for _node, _host, _port in _reader.array(
+                    lambda: (_reader.int32(), _reader.string(), _reader.int32())):
+                self._brokers[_node] = (_host, _port)
+            for _ in range(_reader.int32()):
+                _topic_error = _reader.int16()
+                _topic = _reader.string()
+                _partitions = []
+                for _ in range(_reader.int32()):
+                    _reader.int16()
+                    _partition = _reader.int32()
+                    self._leaders[(_topic, _partition)] = _reader.int32()
+                    _reader.array(_reader.int32)
+                    _reader.array(_reader.int32)
+                    _partitions.append(_partition)
+                if _topic_error == KafkaProtocol.ERROR_NONE:
+                    self._partitions[_topic] = sorted(_partitions)
+        return dict(self._partitions)
+
+    def _bootstrap_request_(self, api_key, body, api_version=0):
+        _error = None
+        for _address in self.bootstrap_servers:
+            try:
+                return self._request_(_address, api_key, body, api_version=api_version)
+            except (socket.error, KafkaClientError) as e:
+                _error = e
+                KafkaClient.LOG.warning("Request to {0}:{1} failed : {2}".format(
+                    _address[0], _address[1], e))
+        raise KafkaClientError("None of bootstrap servers responded : {0}".format(_error))
+
+    def controller(self):
+        """
+        Finds controller broker which handles topic administration requests
+        :return: host and port of the controller
+        :rtype: tuple
+        """
+        _reader = self._bootstrap_request_(KafkaProtocol.METADATA, _Writer().int32(0).getvalue(),
+                                           api_version=1)
+        _brokers = dict((_node, (_host, _port)) for _node, _host, _port, _ in _reader.array(
+            lambda: (_reader.int32(), _reader.string(), _reader.int32(), _reader.string())))
+        return _brokers[_reader.int32()]
+
+    def create_topics(self, topics, timeout_ms=30000):
+        """
+        Creates topics with a single request to the controller
+        :param topics: list of TopicSpec
+        :param timeout_ms: time the controller waits for topics to be created
+        :return: error code of every topic
+        :rtype: dict
+        """
+        _body = _Writer().int32(len(topics))
+        for _topic in topics:
+            _body.string(_topic.name).int32(_topic.partitions) \
+                .int16(_topic.replication_factor).int32(0)
+            _body.int32(len(_topic.configs))
+            for _key, _value in sorted(_topic.configs.iteritems()):
+                _body.string(_key).string(str(_value))
+        _body.int32(timeout_ms)
+        return self._topic_errors_(
+            self._request_(self.controller(), KafkaProtocol.CREATE_TOPICS, _body.getvalue()))
+
+    def delete_topics(self, topics, timeout_ms=30000):
+        """
+        Deletes topics with a single request to the controller
+        :param topics: list of topic names
+        :param timeout_ms: time the controller waits for topics to be deleted
+        :return: error code of every topic
+        :rtype: dict
+        """
+        _body = _Writer()
+        _body.array(topics, _body.string).int32(timeout_ms)
+        return self._topic_errors_(
+            self._request_(self.controller(), KafkaProtocol.DELETE_TOPICS, _body.getvalue()))
+
+    @staticmethod
+    def _topic_errors_(reader):
+        return dict(reader.array(lambda: (reader.string(), reader.int16())))
+
+    def describe_configs(self, topics):
+        """
+        Gets configs of topics which differ from broker defaults, with a single request
+        :param topics: list of topic names
+        :return: configs of every topic
+        :rtype: dict
+        """
+        _body = _Writer().int32(len(topics))
+        for _topic in topics:
+            _body.int8(KafkaProtocol.RESOURCE_TOPIC).string(_topic).int32(-1)
+        _reader = self._bootstrap_request_(KafkaProtocol.DESCRIBE_CONFIGS, _body.getvalue())
+        _reader.int32()
+        _configs = {}
+        for _ in range(_reader.int32()):
+            _error, _message = _reader.int16(), _reader.string()
+            _reader.int8()
+            _topic = _reader.string()
+            if _error != KafkaProtocol.ERROR_NONE:
+                raise KafkaClientError("Could not describe configs of {0} : {1} {2}".format(
+                    _topic, _error, _message))
+            _configs[_topic] = {}
+            for _ in range(_reader.int32()):
+                _key, _value = _reader.string(), _reader.string()
+                _, _is_default, _ = _reader.int8(), _reader.int8(), _reader.int8()
+                if not _is_default:
+                    _configs[_topic][_key] = _value
+        return _configs
+
+    def alter_configs(self, configs, validate_only=False):
+        """
+        Replaces configs of topics with a single request.
+        Configs which are not listed are reverted to broker defaults
+        :param configs: configs of every topic
+        :type configs: dict
+        :param validate_only: indicates that configs should be only validated
+        :return: error code of every topic
+        :rtype: dict
+        """
+        _body = _Writer().int32(len(configs))
+        for _topic, _configs in sorted(configs.iteritems()):
+            _body.int8(KafkaProtocol.RESOURCE_TOPIC).string(_topic).int32(len(_configs))
+            for _key, _value in sorted(_configs.iteritems()):
+                _body.string(_key).string(str(_value))
+        _body.int8(1 if validate_only else 0)
+        _reader = self._bootstrap_request_(KafkaProtocol.ALTER_CONFIGS, _body.getvalue())
+        _reader.int32()
+        _errors = {}
+        for _ in range(_reader.int32()):
+            _error, _, _, _topic = \
+                _reader.int16(), _reader.string(), _reader.int8(), _reader.string()
+            _errors[_topic] = _error
+        return _errors
+
+    def coordinator(self, group):
+        """
+        Finds broker storing offsets of the consumer group
+        :param group: consumer group
+        :return: host and port of the coordinator
+        :rtype: tuple
+        """
+        _reader = self._bootstrap_request_(KafkaProtocol.GROUP_COORDINATOR,
+                                           _Writer().string(group).getvalue())
+        _error, _, _host, _port = \
+            _reader.int16(), _reader.int32(), _reader.string(), _reader.int32()
+        if _error != KafkaProtocol.ERROR_NONE:
+            raise KafkaClientError(
+                "Coordinator of group {0} is not available, error code {1}".format(group, _error))
+        return _host, _port
+
+    def committed_offsets(self, group, partitions):
+        """
+        Gets offsets committed by the consumer group
+        :param group: consumer group
+        :param partitions: list of (topic, partition)
+        :return: committed offset of every (topic, partition),
+            -1 if the group has no offset committed
+        :rtype: dict
+        """
+        _topics = {}
+        for _topic, _partition in partitions:
+            _topics.setdefault(_topic, []).append(_partition)
+        _body = _Writer().string(group).int32(len(_topics))
+        for _topic, _partitions in _topics.iteritems():
+            _body.string(_topic).array(_partitions, _body.int32)
+        _reader = self._request_(self.coordinator(group), KafkaProtocol.OFFSET_FETCH,
+                                 _body.getvalue(), api_version=1)
+        _offsets = {}
+        for _ in range(_reader.int32()):
+            _topic = _reader.string()
+            for _ in range(_reader.int32()):
+                _partition, _offset = _reader.int32(), _reader.int64()
+                _reader.string()
+                self._on_error_(_topic, _partition, _reader.int16())
+                _offsets[(_topic, _partition)] = _offset
+        return _offsets
+
+    def partitions(self, topic):
+        """
+        :return: sorted list of topic partitions
+        :rtype: list
+        """
+        if topic not in self._partitions:
+            self.load_metadata([topic])
+        if topic not in self._partitions:
+            raise KafkaClientError("Unknown topic {0}".format(topic))
+        return self._partitions[topic]
+
+    def _leader_(self, topic, partition):
+        if (topic, partition) not in self._leaders:
+            self.load_metadata([topic])
+        try:
+            return self._brokers[self._leaders[(topic, partition)]]
+        except KeyError:
+            raise KafkaClientError("Leader of {0}:{1} is unknown".format(topic, partition))
+
+    def _by_leader_(self, requests):
+        _grouped = {}
+        for (_topic, _partition), _request in requests.iteritems():
+            _grouped.setdefault(self._leader_(_topic, _partition), {}) \
+                .setdefault(_topic, []).append((_partition, _request))
+        return _grouped
+
+    @staticmethod
+    def _check_(topic, partition, error):
+        if error != KafkaProtocol.ERROR_NONE:
+            raise KafkaClientError("Request to {0}:{1} failed with error code {2}".format(
+                topic, partition, error))
+
+    def produce(self, message_sets, acks=1, timeout_ms=30000):
+        """
+        Sends message sets to partition leaders, one request per broker
+        :param message_sets: encoded message set for every (topic, partition)
+        :type message_sets: dict
+        :param acks: number of acknowledgements the leader should wait for.
+            0 - don't wait for response
+        :param timeout_ms: time the leader waits for acknowledgements
+        :return: offset assigned to the first message of every message set, empty in case acks is 0
+        :rtype: dict
+        """
+        _offsets = {}
+        for _address, _topics in self._by_leader_(message_sets).iteritems():
+            _body = _Writer().int16(acks).int32(timeout_ms).int32(len(_topics))
+            for _topic, _partitions in _topics.iteritems():
+                _body.string(_topic).int32(len(_partitions))
+                for _partition, _message_set in _partitions:
+                    _body.int32(_partition).bytes(_message_set)
+            if acks == 0:
+                # broker doesn't respond to requests which don't need acknowledgements
+                self._request_(_address, KafkaProtocol.PRODUCE, _body.getvalue(),
+                               expect_response=False)
+                continue
+            _reader = self._request_(_address, KafkaProtocol.PRODUCE, _body.getvalue())
+            for _ in range(_reader.int32()):
+                _topic = _reader.string()
+                for _ in range(_reader.int32()):
+                    _partition, _error, _offset = _reader.int32(), _reader.int16(), _reader.int64()
+                    self._on_error_(_topic, _partition, _error)
+                    _offsets[(_topic, _partition)] = _offset
+        return _offsets
+
+    def fetch(self, offsets, max_bytes=1024 ** 2, max_wait_ms=500, min_bytes=1):
+        """
+        Fetches messages from partition leaders, one request per broker
+        :param offsets: offset to fetch from for every (topic, partition)
+        :type offsets: dict
+        :param max_bytes: max number of bytes fetched from a single partition
+        :param max_wait_ms: max time the broker waits for min_bytes to be available
+        :param min_bytes: min number of bytes the broker should return
+        :return: message batch for every (topic, partition)
+        :rtype: dict
+        """
+        _batches = {}
+        for _address, _topics in self._by_leader_(offsets).iteritems():
+            _body = _Writer().int32(-1).int32(max_wait_ms).int32(min_bytes).int32(len(_topics))
+            for _topic, _partitions in _topics.iteritems():
+                _body.string(_topic).int32(len(_partitions))
+                for _partition, _offset in _partitions:
+                    _body.int32(_partition).int64(_offset).int32(max_bytes)
+            _reader = self._request_(_address, KafkaProtocol.FETCH, _body.getvalue())
+            for _ in range(_reader.int32()):
+                _topic = _reader.string()
+                for _ in range(_reader.int32()):
+                    _partition, _error, _high_watermark = \
+                        _reader.int32(), _reader.int16(), _reader.int64()
+                    _message_set = _reader.bytes()
+                    self._on_error_(_topic, _partition, _error)
+                    _start = offsets[(_topic, _partition)]
+                    _messages = [_message for _message in decode_message_set(_message_set)
+                                 if _message.offset >= _start]
+                    _batches[(_topic, _partition)] = \
+                        MessageBatch(_topic, _partition, _messages, _high_watermark)
+        return _batches
+
+    def list_offsets(self, partitions, time=KafkaProtocol.LATEST_OFFSET):
+        """
+        Gets offsets of the given partitions
+        :param partitions: list of (topic, partition)
+        :param time: KafkaProtocol.LATEST_OFFSET to get offset of the next message,
+            KafkaProtocol.EARLIEST_OFFSET to get offset of the first available message
+        :return: offset of every (topic, partition)
+        :rtype: dict
+        """
+        _offsets = {}
+        _leaders = self._by_leader_(dict((_key, time) for _key in partitions))
+        for _address, _topics in _leaders.iteritems():
+            _body = _Writer().int32(-1).int32(len(_topics))
+            for _topic, _partitions in _topics.iteritems():
+                _body.string(_topic).int32(len(_partitions))
+                for _partition, _time in _partitions:
+                    _body.int32(_partition).int64(_time).int32(1)
+            _reader = self._request_(_address, KafkaProtocol.LIST_OFFSETS, _body.getvalue())
+            for _ in range(_reader.int32()):
+                _topic = _reader.string()
+                for _ in range(_reader.int32()):
+                    _partition, _error = _reader.int32(), _reader.int16()
+                    _found = _reader.array(_reader.int64)
+                    self._on_error_(_topic, _partition, _error)
+                    _offsets[(_topic, _partition)] = _found[0] if _found else 0
+        return _offsets
+
+    def _on_error_(self, topic, partition, error):
+        if error == KafkaProtocol.ERROR_NOT_LEADER_FOR_PARTITION:
+            self._leaders.pop((topic, partition), None)
+        KafkaClient._check_(topic, partition, error)
+
+    def close(self):
+        """
+        Closes connections to brokers
+        """
+        with self._lock:
+            _connections = self._connections.values()
+            self._connections.clear()
+        for _connection, _ in _connections:
+            _connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class Producer(object):
+    """
+    Sends messages to Kafka in compressed batches.
+    Messages are accumulated per partition until the batch reaches batch_size bytes
+    or the oldest message waits longer than linger_ms, then all ready batches are sent
+    with one request per broker.
+    Linger is checked when the next message is sent, flush() or close() sends the rest.
+    """
+    LOG = get_logger("KafkaProducer")
+
+    def __init__(self, client, batch_size=64 * 1024, linger_ms=5,
+                 compression=KafkaProtocol.CODEC_GZIP, acks=1):
+        """
+        :param client: Kafka client
+        :type client: KafkaClient
+        :param batch_size: max number of value bytes accumulated for a single partition
+        :param linger_ms: max time in milliseconds message waits in the batch
+        :param compression: compression codec, see KafkaProtocol.CODEC_*
+        :param acks: number of acknowledgements the leader should wait for
+        """
+        super(Producer, self).__init__()
+        self.client = client
+        self.batch_size = batch_size
+        self.linger_ms = linger_ms
+        self.compression = compression
+        self.acks = acks
+        self.sent = 0
+        self._batches = {}
+        self._sizes = {}
+        self._oldest = None
+        self._sticky = {}
+
+    def send(self, topic, value, key=None, partition=None):
+        """
+        Adds message to the batch of its partition.
+        Messages with the same key go to the same partition, messages without key go
+        to the same partition until its batch is sent
+        :param topic: topic name
+        :param value: message value
+        :param key: message key
+        :param partition: explicit partition
+        :rtype: Producer
+        """
+        _partition = partition if partition is not None else self._partition_(topic, key)
+        _batch = self._batches.setdefault((topic, _partition), [])
+        _batch.append((key, value))
+        self._sizes[(topic, _partition)] = self._sizes.get((topic, _partition), 0) + len(value)
+        if self._oldest is None:
+            self._oldest = time.time()
+        _ready = [_key for _key, _size in self._sizes.iteritems() if _size >= self.batch_size]
+        if (time.time() - self._oldest) * 1000 >= self.linger_ms:
+            self.flush()
+        elif _ready:
+            self._send_(_ready)
+        return self
+
+    def _partition_(self, topic, key):
+        _partitions = self.client.partitions(topic)
+        if key is not None:
+            return _partitions[(murmur2(_to_bytes_(key)) & 0x7fffffff) % len(_partitions)]
+        if topic not in self._sticky:
+            self._sticky[topic] = random.choice(_partitions)
+        return self._sticky[topic]
+
+    def flush(self):
+        """
+        Sends all accumulated messages
+        :rtype: Producer
+        """
+        if self._batches:
+            self._send_(self._batches.keys())
+        self._oldest = None
+        return self
+
+    def _send_(self, keys):
+        _keys = list(keys)
+        _message_sets = dict((_key, encode_message_set(self._batches[_key], codec=self.compression))
+                             for _key in _keys)
+        # batches are kept until produce succeeds, so they are sent again by the next flush
+        self.client.produce(_message_sets, acks=self.acks)
+        _count = 0
+        for _key in _keys:
+            _count += len(self._batches.pop(_key))
+            self._sizes.pop(_key)
+            if self._sticky.get(_key[0]) == _key[1]:
+                del self._sticky[_key[0]]
+        self.sent += _count
+        Producer.LOG.debug("Sent {0} messages to {1} partitions".format(_count, len(_message_sets)))
+
+    def close(self):
+        """
+        Sends all accumulated messages
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not exc_type:
+            self.close()
+
+
+class Consumer(object):
+    """
+    Reads messages from Kafka topic in batches.
+    Each poll sends one fetch request per broker for all assigned partitions.
+    """
+
+    def __init__(self, client, topic, partitions=None, offsets=KafkaProtocol.EARLIEST_OFFSET,
+                 max_bytes=1024 ** 2, max_wait_ms=500, min_bytes=1):
+        """
+        :param client: Kafka client
+        :type client: KafkaClient
+        :param topic: topic name
+        :param partitions: partitions to read. All partitions of the topic are read by default
+        :param offsets: offset of every partition as a dict or
+            KafkaProtocol.EARLIEST_OFFSET / KafkaProtocol.LATEST_OFFSET
+            to start from the first or the next message
+        :param max_bytes: max number of bytes fetched from a single partition by one request
+        :param max_wait_ms: max time the broker waits for min_bytes to be available
+        :param min_bytes: min number of bytes the broker should return
+        """
+        super(Consumer, self).__init__()
+        self.client = client
+        self.topic = topic
+        self.partitions = partitions if partitions else client.partitions(topic)
+        self.max_bytes = max_bytes
+        self.max_wait_ms = max_wait_ms
+        self.min_bytes = min_bytes
+        if isinstance(offsets, dict):
+            self.positions = dict(offsets)
+        else:
+            _offsets = client.list_offsets([(topic, _p) for _p in self.partitions], offsets)
+            self.positions = dict((_partition, _offset)
+                                  for (_, _partition), _offset in _offsets.iteritems())
+        self.high_watermarks = {}
+
+    def poll(self):
+        """
+        Fetches the next batch of every partition
+        :return: non-empty batches
+        :rtype: list
+        """
+        _batches = self.client.fetch(dict(((self.topic, _partition), self.positions[_partition])
+                                          for _partition in self.partitions),
+                                     max_bytes=self.max_bytes, max_wait_ms=self.max_wait_ms,
+                                     min_bytes=self.min_bytes)
+        _result = []
+        for _partition in self.partitions:
+            _batch = _batches[(self.topic, _partition)]
+            self.high_watermarks[_partition] = _batch.high_watermark
+            if _batch.messages:
+                self.positions[_partition] = _batch.next_offset
+                _result.append(_batch)
+            elif self.positions[_partition] < _batch.high_watermark:
+                raise KafkaClientError("Message at {0}:{1}:{2} is larger than {3} bytes".format(
+                    self.topic, _partition, self.positions[_partition], self.max_bytes))
+        return _result
+
+    def is_caught_up(self):
+        """
+        :return: True in case all messages available at the last poll were consumed
+        """
+        return len(self.high_watermarks) == len(self.partitions) and all(
+            self.positions[_partition] >= self.high_watermarks[_partition]
+            for _partition in self.partitions)
+
+    def batches(self, stop_when_caught_up=True):
+        """
+        Yields message batches
+        :param stop_when_caught_up: stops once all messages available at the moment were consumed
+        :return: generator of MessageBatch
+        """
+        while True:
+            for _batch in self.poll():
+                yield _batch
+            if stop_when_caught_up and self.is_caught_up():
+                return
@@ -154,6 +154,42 @@ Pre-Configured Streaming MapReduce Job
         -input /raw/21102014 -input /raw/22102014 -output /core/20102014 -inputformat org.mr.CustomInputFormat \
         -outputformat org.mr.CustomOutputFormat -cmdenv JAVA_HOME=/java -cmdenv tmp.dir=/tmp/streaming_test_job_with_multiple_inputs
 
+Running Streaming MapReduce Job locally
+
+        MapReduce.prepare_streaming_job(
+            name='job_name'
+        ).take(
+            '/local/data'
+        ).process_with(
+            mapper='mapper.py',
+            reducer='reducer.py'
+        ).save(
+            '/local/output'
+        ).run_locally(workers=4, reducers=2)
+
+    Mapper and reducer are executed in a pool of local processes, map output is partitioned,
+    sorted and merged the same way Hadoop does it. Combiner is not applied.
+
+Sizing MapReduce Job tasks by input
+
+        MapReduce.prepare_streaming_job(
+            name='job_name'
+        ).take(
+            '/raw/20102014'
+        ).process_with(
+            mapper='mapper.py',
+            reducer='reducer.py'
+        ).size_tasks_by_input(
+            bytes_per_reducer=1024 ** 3,
+            bytes_per_mapper=256 * 1024 ** 2,
+            max_reducers=100
+        ).save(
+            'output.txt'
+        ).run()
+
+    Aggregate input size is calculated with a single 'hadoop fs -du -s' command.
+    Number of reducers and 'mapreduce.input.fileinputformat.split.*' options are derived from it.
+
 
 --------------------------
 ISSUE
@@ -162,13 +198,16 @@ ISSUE
 """
 
 
-import re
 import os
 import uuid
 from merlin.common.logger import get_logger
 from merlin.common.configurations import Configuration
 from merlin.common.shell_command_executor import execute_shell_command
-from merlin.common.exceptions import CommandException, MapReduceConfigurationError
+from merlin.common.exceptions import MapReduceConfigurationError
+from merlin.common.utils import number_of_tasks
+from merlin.tools.mapreduce_local import LocalStreamingRunner
+from merlin.tools.mapreduce_status import JobStatus
+import merlin.fs.cli.hdfs_commands as fs
 
 
 class MapReduce(object):
@@ -288,6 +327,70 @@ class MapReduce(object):
     def disable_reducers(self):
         return self.with_number_of_reducers(0)
 
+    def is_map_only_job(self):
+        """
+        :return: True in case reducers were disabled for the job
+        """
+        return "{0}=0".format(TaskOptions.CONFIG_KEY_MR_JOB_REDUCER_NUM) in \
+               (self.get_list(TaskOptions.CONFIG_KEY_MR_JOB_CONF_OPTION) or [])
+
+    def size_tasks_by_input(self,
+                            paths=None,
+                            bytes_per_reducer=None,
+                            bytes_per_mapper=None,
+                            max_reducers=None,
+                            block_size=None):
+        """
+        Picks number of reducers and input split size based on the aggregate size of job input.
+        Input size is calculated by a single 'hadoop fs -du -s' command.
+        Options set by the previous call are replaced, so the job can be sized again.
+        :param paths: list of input paths. Input directories configured for the job
+        (-input of streaming job or mapreduce.input.fileinputformat.inputdir option)
+        are used by default.
+        Jar jobs which read input paths from their own arguments should pass paths explicitly
+        :param bytes_per_reducer: target number of input bytes per reduce task
+        :param bytes_per_mapper: target number of input bytes per map task.
+        Split size is left unchanged in case this parameter was not specified
+        :param max_reducers: upper bound for number of reducers
+        :param block_size: HDFS block size of the input files, 128 MB by default.
+        Splits smaller than a block are capped with split.maxsize,
+        larger splits are forced with split.minsize
+        :return:
+        """
+        _paths = paths if paths else self._input_paths_()
+        if not _paths:
+            raise MapReduceConfigurationError(
+                "Cannot size tasks of the job {0} : input paths were not specified. "
+                "Pass paths explicitly in case the job takes input paths "
+                "as application arguments".format(self.name))
+        _size = fs.total_size(_paths, executor=self.executor)
+        MapReduce.LOG.info("Input size of the job {0} : {1} bytes".format(self.name, _size))
+        if bytes_per_mapper:
+            # split size = max(minsize, min(maxsize, block size)),
+            # so only one of the bounds is needed
+            if bytes_per_mapper < (block_size if block_size else TaskOptions.DEFAULT_BLOCK_SIZE):
+                self._remove_config_option_(TaskOptions.CONFIG_KEY_MR_SPLIT_MINSIZE)
+                self.with_config_option(TaskOptions.CONFIG_KEY_MR_SPLIT_MAXSIZE, bytes_per_mapper)
+            else:
+                self._remove_config_option_(TaskOptions.CONFIG_KEY_MR_SPLIT_MAXSIZE)
+                self.with_config_option(TaskOptions.CONFIG_KEY_MR_SPLIT_MINSIZE, bytes_per_mapper)
+        if not self.is_map_only_job():
+            self.with_number_of_reducers(
+                number_of_tasks(_size,
+                                bytes_per_reducer if bytes_per_reducer
+                                else TaskOptions.DEFAULT_BYTES_PER_REDUCER,
+                                max_reducers))
+        return self
+
+    def _input_paths_(self):
+        """
+        :return: list of input paths configured for the job
+        """
+        _prefix = "{0}=".format(TaskOptions.CONFIG_KEY_MR_INPUT_DIR)
+        _options = self.get_list(TaskOptions.CONFIG_KEY_MR_JOB_CONF_OPTION) or []
+        return [_path for _option in _options
+                if _option.startswith(_prefix) for _path in _option[len(_prefix):].split(",")]
+
     def __configure_command__(self):
         """Overrides this method to configure MR job"""
         if not os.path.isfile(self.executable):
@@ -387,9 +490,23 @@ class MapReduce(object):
         :param value: variable value
         :return:
         """
+        self._remove_config_option_(key)
         return self._update_list_config_(TaskOptions.CONFIG_KEY_MR_JOB_CONF_OPTION,
                                          "{0}={1}".format(key, value))
 
+    def _remove_config_option_(self, key):
+        """
+        Removes job configuration variable
+        :param key: variable name
+        """
+        _prefix = "{0}=".format(key)
+        _options = self.get_list(TaskOptions.CONFIG_KEY_MR_JOB_CONF_OPTION) or []
+        if any(_option.startswith(_prefix) for _option in _options):
+            self._update_config_option_(TaskOptions.CONFIG_KEY_MR_JOB_CONF_OPTION,
+                                        [_option for _option in _options
+                                         if not _option.startswith(_prefix)])
+        return self
+
     def use_jars(self, *libs):
         """
         Adds jar files to be included in the classpath
@@ -557,6 +674,9 @@ class StreamingJob(MapReduce):
         _key = TaskOptions.CONFIG_KEY_MR_JOB_REDUCER_CLASS
         return not self.has_option(_key) or self.get(_key, required=False) is 'NONE'
 
+    def _input_paths_(self):
+        return self.get_list(TaskOptions.CONFIG_KEY_MR_JOB_INPUT_DIR)
+
     def process_with(self, mapper, reducer=None, reducer_num=-1):
         """
 
@@ -665,6 +785,44 @@ class StreamingJob(MapReduce):
                          value=output)
         return self
 
+    def run_locally(self, workers=None, reducers=None, split_size=None, spill_size=None):
+        """
+        Runs configured mapper and reducer commands against local input without Hadoop cluster.
+        See LocalStreamingRunner
+        :param workers: number of worker processes. Number of CPUs is used by default
+        :param reducers: number of reduce tasks. Overrides configured number of reducers
+        :param split_size: maximum number of input bytes processed by a single map task
+        :param spill_size: size of map output buffer in bytes.
+            Buffer is sorted and spilled to disk when full
+        :return: job counters
+        :rtype: JobCounters
+        """
+        _environment = self.get_list(TaskOptions.CONFIG_KEY_ENVIRONMENT) or []
+        return LocalStreamingRunner(
+            name=self.name,
+            inputs=self.get_list(TaskOptions.CONFIG_KEY_MR_JOB_INPUT_DIR, required=True),
+            output_dir=self.get(TaskOptions.CONFIG_KEY_MR_JOB_OUTPUT_DIR, required=True),
+            mapper=self.get(TaskOptions.CONFIG_KEY_MR_JOB_MAPPER_CLASS, required=True),
+            reducer=self.get(TaskOptions.CONFIG_KEY_MR_JOB_REDUCER_CLASS),
+            reducers=self._local_reducers_(reducers),
+            cache_files=self.get_list(TaskOptions.CONFIG_KEY_MR_JOB_CACHE_FILE),
+            environment=dict(_variable.split('=', 1) for _variable in _environment),
+            workers=workers,
+            split_size=split_size,
+            spill_size=spill_size).run()
+
+    def _local_reducers_(self, reducers):
+        """
+        :return: number of reduce tasks to run locally
+        """
+        if self.is_map_only_job():
+            return 0
+        if reducers is not None:
+            return int(reducers)
+        if self.has_option(TaskOptions.CONFIG_KEY_MR_JOB_REDUCER_NUM):
+            return max(int(self.get(TaskOptions.CONFIG_KEY_MR_JOB_REDUCER_NUM)), 0)
+        return 1
+
 
 class MapReduceJob(MapReduce):
     def __init__(self, name, config, jar, main_class, executor):
@@ -695,6 +853,15 @@ class TaskOptions(MapReduce):
     CONFIG_KEY_MR_JOBTRACKER = "jobtracker"
     #specify the number of reducers
     CONFIG_KEY_MR_JOB_REDUCER_NUM = "mapreduce.job.reduces"
+    #bounds of input split size
+    CONFIG_KEY_MR_SPLIT_MINSIZE = "mapreduce.input.fileinputformat.split.minsize"
+    CONFIG_KEY_MR_SPLIT_MAXSIZE = "mapreduce.input.fileinputformat.split.maxsize"
+    #input directories of the job
+    CONFIG_KEY_MR_INPUT_DIR = "mapreduce.input.fileinputformat.inputdir"
+    #default HDFS block size
+    DEFAULT_BLOCK_SIZE = 128 * 1024 * 1024
+    #default target number of input bytes per reduce task
+    DEFAULT_BYTES_PER_REDUCER = 1024 * 1024 * 1024
     #specify comma-separated jar files to include in the classpath
     CONFIG_KEY_MR_JOB_LIBJARS = 'libjars'
     #specify comma-separated files to be copied to the Map/Reduce cluster
@@ -734,144 +901,3 @@ class TaskOptions(MapReduce):
                               CONFIG_KEY_MR_JOB_REDUCER_CLASS, CONFIG_KEY_MR_JOB_COMBINE_CLASS,
                               CONFIG_KEY_MR_JOB_INPUT_FORMAT, CONFIG_KEY_MR_JOB_OUTPUT_FORMAT,
                               CONFIG_KEY_MR_JOB_INPUT_DIR, CONFIG_KEY_MR_JOB_OUTPUT_DIR]
-
-
-class JobStatus(object):
-    """
-    Describes the current status of a job.
-    """
-
-    COUNTER_SECTION = 'COUNTER'
-    LOG = get_logger("MapReduceJobStatus")
-    CLI_COMMAND = 'hadoop job'
-
-    def __init__(self, job_id, executor=execute_shell_command):
-        super(JobStatus, self).__init__()
-        self.job_id = job_id
-        self._executor = executor
-        self.job_stats = None
-
-    def state(self):
-        """
-
-        Returns the current state of the Job.
-        :return: string value for job state.
-        Possible values : FAILED, KILLED, PREP, RUNNING, SUCCEEDED
-        """
-        return self.stats()['Job state']
-
-    @staticmethod
-    def job_id(stderr):
-        """
-        Parses MR job stderr to get job id.
-        :return: job id
-        """
-        _job_id = None
-        for line in stderr.splitlines():
-            if 'Running job:' in line:
-                _job_id = str(line).rsplit(':', 1)[1].strip()
-                JobStatus.LOG.info("Job id : {0}".format(_job_id))
-                break
-        if not _job_id:
-            JobStatus.LOG.info("Cannot get job id")
-        return _job_id
-
-    def counters(self):
-        """
-        Gets the counters for this job.
-
-        :return: all job counters in format {counter_group :{counter_name : counter_value}}
-        """
-        return self.stats()[JobStatus.COUNTER_SECTION]
-
-    def counter(self, group, counter):
-        """
-        Gets the value of the specific job counter.
-        :param group:
-        :param counter:
-        :return: the value for the specific counter
-        """
-        _counters = self.counters()
-        return int(_counters[group][counter]) if group in _counters and counter in _counters[group] else None
-
-    def stats(self):
-        """
-        Gets aggregate job statistics, which includes:
-        - job id
-        - job file
-        - job tracking URL
-        - number of maps/reduces
-        - map()/reduce() completion
-        - job state
-        - reason for failture
-        - job counters
-        - etc
-        :return: job details
-        """
-        if not self.job_stats:
-            _result = self._executor(self.CLI_COMMAND, '-status', self.job_id)
-            _result.if_failed_raise(CommandException("cannot get map reduce job status"))
-            self._parse_stdout_(_result.stdout)
-        return self.job_stats
-
-    def is_failed(self):
-        """
-        Checks if the job failed.
-
-        :return:
-        """
-        return 'FAILED' == self.state()
-
-    def is_killed(self):
-        """
-        Checks if the job process was killed.
-
-        :return:
-        """
-        return 'KILLED' == self.state()
-
-    def is_succeeded(self):
-        """
-        Checks if the job completed successfully.
-
-        :return:
-        """
-        return self.state() == 'SUCCEEDED'
-
-    def is_running(self):
-        """
-        Checks if the job is finished or not.
-
-        :return: True if the job has running or prep state
-        """
-        return self.state() in ['PREP', 'RUNNING']
-
-    def failure_reason(self):
-        """
-        Gets any available info on the reason of failure of the job.
-
-        :return:  diagnostic information on why a job might have failed.
-        """
-        return None if not self.is_failed() else self.stats()['reason for failure']
-
-    def _parse_stdout_(self, stream):
-        """
-        Parses hadoop jar -status <job_id> output stream to get job stats
-        :param stream: stream containing job stats data
-        :return: dictionary containing job stats
-        """
-        _counter_group = None
-        _job_metrics = {JobStatus.COUNTER_SECTION: {}}
-        for line in stream.splitlines():
-            is_counter = re.match('\A\t\t\w', line)
-            is_counter_header = not is_counter and re.match('\A\t\w', line)
-            key_value = [part.strip() for part in line.split("=" if is_counter else ":", 1)]
-            if is_counter_header:
-                _counter_group = line.strip()
-            elif is_counter:
-                if not _counter_group in _job_metrics[JobStatus.COUNTER_SECTION]:
-                    _job_metrics[JobStatus.COUNTER_SECTION][_counter_group] = {}
-                _job_metrics[JobStatus.COUNTER_SECTION][_counter_group][key_value[0]] = key_value[1]
-            elif len(key_value) > 1:
-                _job_metrics[key_value[0]] = key_value[1]
-        self.job_stats = _job_metrics
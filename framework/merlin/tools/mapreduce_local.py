@@ -0,0 +1,302 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Local runner of streaming MapReduce jobs.
+"""
+
+import heapq
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import zlib
+
+from merlin.common.logger import get_logger
+from merlin.common.exceptions import MapReduceConfigurationError, MapReduceJobException
+from merlin.tools.mapreduce_status import JobCounters
+
+
+class LocalStreamingRunner(object):
+    """
+    Runs streaming map-reduce job on the local machine.
+
+    Local input files are divided into splits, which are processed by mapper command
+    in a pool of worker processes. Mapper output is partitioned by key hash,
+    sorted in memory and spilled to disk. Each reduce task merges sorted spills of its partition
+    and streams them to reducer command.
+    Output is written to part-r-NNNNN (part-m-NNNNN for map-only jobs)
+    files in the local output directory.
+
+    Mapper and reducer commands are executed in the job working directory,
+    cached files (see MapReduce.cache_files) can be used as commands.
+    Streaming jobs are run with StreamingJob.run_locally.
+    Combiner, partitioner, input and output formats are not supported.
+    """
+
+    LOG = get_logger("LocalStreamingRunner")
+    DEFAULT_SPLIT_SIZE = 64 * 1024 * 1024
+    DEFAULT_SPILL_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, name, inputs, output_dir, mapper, reducer=None, reducers=1, cache_files=None,
+                 environment=None, workers=None, split_size=None, spill_size=None):
+        """
+        :param name: job name
+        :param inputs: local input files and directories
+        :param output_dir: local output directory. Must not exist
+        :param mapper: mapper command
+        :param reducer: reducer command
+        :param reducers: number of reduce tasks. Job is map-only in case it's 0
+        :param cache_files: files which can be used as mapper and reducer commands
+        :param environment: environment variables of mapper and reducer commands
+        :type environment: dict
+        :param workers: number of worker processes. Number of CPUs is used by default
+        :param split_size: maximum number of input bytes processed by a single map task
+        :param spill_size: size of map output buffer in bytes
+        """
+        super(LocalStreamingRunner, self).__init__()
+        self.name = name
+        self.inputs = inputs
+        self.output_dir = output_dir
+        self.mapper = mapper
+        self.reducer = reducer
+        self.reducers = reducers
+        self.cache_files = cache_files if cache_files else []
+        self.environment = environment if environment else {}
+        self.workers = workers if workers else multiprocessing.cpu_count()
+        self.split_size = split_size if split_size else LocalStreamingRunner.DEFAULT_SPLIT_SIZE
+        self.spill_size = spill_size if spill_size else LocalStreamingRunner.DEFAULT_SPILL_SIZE
+
+    def run(self):
+        """
+        Runs streaming job
+        :return: job counters
+        :rtype: JobCounters
+        """
+        _output_dir = self.output_dir
+        if os.path.exists(_output_dir):
+            raise MapReduceConfigurationError("Output directory {0} already exists".format(
+                _output_dir))
+        _mapper = self._resolve_command_(self.mapper)
+        _reducers = self.reducers
+        _splits = self._splits_()
+        _env = self._environment_()
+        _work_dir = tempfile.mkdtemp(prefix="{0}_".format(self.name))
+        os.makedirs(_output_dir)
+        _pool = multiprocessing.Pool(processes=self.workers)
+        try:
+            LocalStreamingRunner.LOG.info("Running {0} map task(s) locally".format(len(_splits)))
+            _map_results = _pool.map(_run_map_task_, [
+                (_task_id, _path, _start, _length, _mapper, _env, _work_dir,
+                 _output_dir, _reducers, self.spill_size)
+                for _task_id, (_path, _start, _length) in enumerate(_splits)])
+            _counters = JobCounters()
+            _counters.add('Job Counters', 'Launched map tasks', len(_splits))
+            _counters.add('Job Counters', 'Launched reduce tasks', _reducers)
+            for _name in ['Map input records', 'Map output records', 'Spilled Records']:
+                _counters.add('Map-Reduce Framework', _name,
+                              sum(_result[_name] for _result in _map_results))
+            if _reducers:
+                _reducer = self._resolve_command_(self.reducer)
+                LocalStreamingRunner.LOG.info("Running {0} reduce task(s) locally".format(
+                    _reducers))
+                _reduce_results = _pool.map(_run_reduce_task_, [
+                    (_partition,
+                     [_spill for _result in _map_results
+                      for _spill in _result['spills'][_partition]],
+                     _reducer, _env, _work_dir, _output_dir)
+                    for _partition in range(_reducers)])
+                for _name in ['Reduce input records', 'Reduce output records']:
+                    _counters.add('Map-Reduce Framework', _name,
+                                  sum(_result[_name] for _result in _reduce_results))
+            return _counters
+        finally:
+            _pool.terminate()
+            _pool.join()
+            shutil.rmtree(_work_dir, ignore_errors=True)
+
+    def _resolve_command_(self, command):
+        """Replaces name of the cached file with the path to that file"""
+        _cached = dict((os.path.basename(_file), os.path.abspath(_file))
+                       for _file in self.cache_files)
+        _parts = command.split(' ', 1)
+        if _parts[0] in _cached:
+            _parts[0] = _cached[_parts[0]]
+        return " ".join(_parts)
+
+    def _environment_(self):
+        _env = dict(os.environ)
+        _env.update(self.environment)
+        return _env
+
+    def _splits_(self):
+        """
+        Divides input files into splits
+        :return: list of splits in format (path, start, length)
+        """
+        _splits = []
+        for _input in self.inputs:
+            if os.path.isdir(_input):
+                _files = [os.path.join(_input, _name) for _name in sorted(os.listdir(_input))
+                          if not _name.startswith(('_', '.'))
+                          and os.path.isfile(os.path.join(_input, _name))]
+            elif os.path.isfile(_input):
+                _files = [_input]
+            else:
+                raise MapReduceConfigurationError("Input path {0} does not exist".format(_input))
+            for _file in _files:
+                _size = os.path.getsize(_file)
+                for _start in range(0, _size, self.split_size):
+                    _splits.append((_file, _start, min(self.split_size, _size - _start)))
+        return _splits
+
+
+def _partition_(line, partitions):
+    """Partitions map output record by hash of the key (text before the first tab)"""
+    return (zlib.crc32(line.split('\t', 1)[0].rstrip('\n')) & 0x7fffffff) % partitions
+
+
+def _feed_split_(stream, path, start, length, counter):
+    """
+    Writes lines of the input split to the stream.
+    Line which starts before split beginning belongs to the previous split,
+    line which starts before split end belongs to this split even if it ends beyond the split.
+    """
+    try:
+        with open(path, 'rb') as _file:
+            _file.seek(start)
+            _position = start
+            if start:
+                _position += len(_file.readline())
+            while _position <= start + length:
+                _line = _file.readline()
+                if not _line:
+                    break
+                _position += len(_line)
+                stream.write(_line if _line.endswith('\n') else _line + '\n')
+                counter[0] += 1
+    except IOError:
+        # command exited without reading the whole input
+        pass
+    finally:
+        try:
+            stream.close()
+        except IOError:
+            pass
+
+
+def _run_map_task_(task):
+    """
+    Runs mapper command against input split and spills partitioned and sorted output to disk
+    :return: map task counters and spill files per partition
+    """
+    task_id, path, start, length, command, env, work_dir, output_dir, reducers, spill_size = task
+    _process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                env=env, cwd=work_dir)
+    _input_records = [0]
+    _feeder = threading.Thread(target=_feed_split_,
+                               args=(_process.stdin, path, start, length, _input_records))
+    _feeder.start()
+    _output_records = 0
+    _spills = dict((_partition, []) for _partition in range(reducers))
+    if reducers:
+        _buffers = [[] for _ in range(reducers)]
+        _buffered = 0
+        for _line in iter(_process.stdout.readline, ''):
+            _output_records += 1
+            _buffers[_partition_(_line, reducers)].append(
+                _line if _line.endswith('\n') else _line + '\n')
+            _buffered += len(_line)
+            if _buffered >= spill_size:
+                _spill_(_buffers, _spills, work_dir, task_id)
+                _buffered = 0
+        _spill_(_buffers, _spills, work_dir, task_id)
+    else:
+        with open(os.path.join(output_dir, "part-m-{0:05d}".format(task_id)), 'wb') as _output:
+            for _line in iter(_process.stdout.readline, ''):
+                _output_records += 1
+                _output.write(_line)
+    _feeder.join()
+    if _process.wait() != 0:
+        raise MapReduceJobException("Map task {0} failed with exit status {1} : {2}".format(
+            task_id, _process.returncode, command))
+    return {'spills': _spills,
+            'Map input records': _input_records[0],
+            'Map output records': _output_records,
+            'Spilled Records': _output_records if reducers else 0}
+
+
+def _spill_(buffers, spills, work_dir, task_id):
+    """Sorts buffered map output and writes it to spill files, one file per partition"""
+    for _partition, _buffer in enumerate(buffers):
+        if _buffer:
+            _buffer.sort()
+            _path = os.path.join(work_dir, "map_{0:05d}_part_{1:05d}_spill_{2:05d}".format(
+                task_id, _partition, len(spills[_partition])))
+            with open(_path, 'wb') as _spill:
+                _spill.writelines(_buffer)
+            spills[_partition].append(_path)
+            del _buffer[:]
+
+
+def _run_reduce_task_(task):
+    """
+    Merges sorted spills of the partition and streams them to reducer command
+    :return: reduce task counters
+    """
+    partition, spills, command, env, work_dir, output_dir = task
+    _output_path = os.path.join(output_dir, "part-r-{0:05d}".format(partition))
+    _input_records = 0
+    _files = [open(_spill, 'rb') for _spill in spills]
+    try:
+        with open(_output_path, 'wb') as _output:
+            _process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, stdout=_output,
+                                        env=env, cwd=work_dir)
+            try:
+                for _line in heapq.merge(*_files):
+                    _process.stdin.write(_line)
+                    _input_records += 1
+                _process.stdin.close()
+            except IOError:
+                # command exited without reading the whole input
+                pass
+            if _process.wait() != 0:
+                raise MapReduceJobException(
+                    "Reduce task {0} failed with exit status {1} : {2}".format(
+                        partition, _process.returncode, command))
+    finally:
+        for _file in _files:
+            _file.close()
+    with open(_output_path, 'rb') as _output:
+        _output_records = sum(1 for _ in _output)
+    return {'Reduce input records': _input_records,
+            'Reduce output records': _output_records}
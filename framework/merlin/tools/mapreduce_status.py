@@ -0,0 +1,590 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Status of MapReduce jobs.
+
+JOB STATUS EXAMPLES :
+
+Waiting for MapReduce Job completion
+
+        JobStatus(job_id='job_1412153770896_0097').wait_for_completion(timeout=3600)
+
+    Job status is polled with 'hadoop job -status job_1412153770896_0097'.
+    Polling interval is reset to the minimum each time job progress changes
+    and grows exponentially while job stays in the same state.
+
+Waiting for several MapReduce Jobs
+
+        JobWatcher(['job_1412153770896_0097', 'job_1412153770896_0098']).watch(
+            on_change=lambda job_id, old_state, new_state: log(job_id, new_state)
+        )
+
+    States of all watched jobs are fetched with a single 'mapred job -list all' call per poll.
+
+Getting statuses of many MapReduce Jobs
+
+        statuses = JobStatus.bulk(['job_1412153770896_0097', 'job_1412153770896_0098'])
+        statuses['job_1412153770896_0097'].state()
+        statuses['job_1412153770896_0097'].counters()
+
+    Job states are fetched with a single 'mapred job -list all' call.
+    Job counters are requested with 'hadoop job -status' only for the jobs they were asked for.
+
+Sampling MapReduce Job counters
+
+        series = JobStatus(job_id='job_1412153770896_0097').sample_counters(interval=30)
+        series.rates('Map-Reduce Framework', 'Map input records')
+        with open('counters.csv', 'w') as _file:
+            series.to_csv(_file)
+
+    Counters are fetched every 30 seconds until the job is finished.
+    Rates are calculated in units per second between consecutive samples.
+
+"""
+
+import json
+import time
+from array import array
+
+from merlin.common.logger import get_logger
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import CommandException, WaitTimeoutError
+from merlin.common.utils import Backoff
+
+
+class JobStatus(object):
+    """
+    Describes the current status of a job.
+    """
+
+    COUNTER_SECTION = 'COUNTER'
+    LOG = get_logger("MapReduceJobStatus")
+    CLI_COMMAND = 'hadoop job'
+    LIST_COMMAND = 'mapred job'
+    # Hadoop 1.x reports job state as a number
+    STATE_CODES = {'1': 'RUNNING', '2': 'SUCCEEDED', '3': 'FAILED', '4': 'PREP', '5': 'KILLED'}
+    FINAL_STATES = ['SUCCEEDED', 'FAILED', 'KILLED']
+
+    def __init__(self, job_id, executor=execute_shell_command, state=None):
+        """
+        :param job_id: job identifier
+        :param executor: interface used by the client to run command.
+        :param state: already known job state. Job status won't be requested
+            until job statistics other than state are needed
+        """
+        super(JobStatus, self).__init__()
+        self.job_id = job_id
+        self._executor = executor
+        self._state = state
+        self.job_stats = None
+        self.job_counters = None
+
+    @staticmethod
+    def bulk(job_ids, executor=execute_shell_command):
+        """
+        Gets statuses of many jobs with a single 'mapred job -list all' call.
+        Job counters and other job statistics are fetched lazily, only when requested.
+        Jobs which were not found in the list (e.g. retired jobs)
+        will request their state via 'hadoop job -status' on first access.
+
+        :param job_ids: identifiers of the jobs
+        :param executor: interface used by the client to run command.
+        :return: job statuses in format {job_id : JobStatus}
+        """
+        _states = JobStatus.list_jobs(executor)
+        return dict((_job_id, JobStatus(_job_id, executor=executor, state=_states.get(_job_id)))
+                    for _job_id in job_ids)
+
+    @staticmethod
+    def list_jobs(executor=execute_shell_command):
+        """
+        Gets states of all jobs known to the cluster
+        :param executor: interface used by the client to run command.
+        :return: job states in format {job_id : state}
+        """
+        _result = executor(JobStatus.LIST_COMMAND, '-list', 'all')
+        _result.if_failed_raise(CommandException("cannot get list of map reduce jobs"))
+        return JobStatus.parse_job_list(_result.stdout)
+
+    @staticmethod
+    def parse_job_list(stream):
+        """
+        Parses 'mapred job -list all' output stream to get job states
+        :param stream: stream containing list of jobs
+        :return: job states in format {job_id : state}
+        """
+        _states = {}
+        for line in str(stream).splitlines():
+            _columns = line.split()
+            if len(_columns) > 1 and _columns[0].startswith('job_'):
+                _states[_columns[0]] = JobStatus.STATE_CODES.get(_columns[1], _columns[1])
+        return _states
+
+    def state(self):
+        """
+
+        Returns the current state of the Job.
+        :return: string value for job state.
+        Possible values : FAILED, KILLED, PREP, RUNNING, SUCCEEDED
+        """
+        if self._state and not self.job_stats:
+            return self._state
+        return self.stats()['Job state']
+
+    @staticmethod
+    def job_id(stderr):
+        """
+        Parses MR job stderr to get job id.
+        :return: job id
+        """
+        _job_id = None
+        for line in stderr.splitlines():
+            if 'Running job:' in line:
+                _job_id = str(line).rsplit(':', 1)[1].strip()
+                JobStatus.LOG.info("Job id : {0}".format(_job_id))
+                break
+        if not _job_id:
+            JobStatus.LOG.info("Cannot get job id")
+        return _job_id
+
+    def counters(self):
+        """
+        Gets the counters for this job.
+
+        :return: all job counters in format {counter_group :{counter_name : counter_value}}
+        """
+        return self.stats()[JobStatus.COUNTER_SECTION]
+
+    def counter(self, group, counter):
+        """
+        Gets the value of the specific job counter.
+        :param group:
+        :param counter:
+        :return: the value for the specific counter
+        """
+        self.stats()
+        return self.job_counters.get(group, counter)
+
+    def stats(self):
+        """
+        Gets aggregate job statistics, which includes:
+        - job id
+        - job file
+        - job tracking URL
+        - number of maps/reduces
+        - map()/reduce() completion
+        - job state
+        - reason for failture
+        - job counters
+        - etc
+        :return: job details
+        """
+        if not self.job_stats:
+            _result = self._executor(self.CLI_COMMAND, '-status', self.job_id)
+            _result.if_failed_raise(CommandException("cannot get map reduce job status"))
+            self._parse_stdout_(_result.stdout)
+        return self.job_stats
+
+    def is_failed(self):
+        """
+        Checks if the job failed.
+
+        :return:
+        """
+        return 'FAILED' == self.state()
+
+    def is_killed(self):
+        """
+        Checks if the job process was killed.
+
+        :return:
+        """
+        return 'KILLED' == self.state()
+
+    def is_succeeded(self):
+        """
+        Checks if the job completed successfully.
+
+        :return:
+        """
+        return self.state() == 'SUCCEEDED'
+
+    def is_running(self):
+        """
+        Checks if the job is finished or not.
+
+        :return: True if the job has running or prep state
+        """
+        return self.state() in ['PREP', 'RUNNING']
+
+    def failure_reason(self):
+        """
+        Gets any available info on the reason of failure of the job.
+
+        :return:  diagnostic information on why a job might have failed.
+        """
+        return None if not self.is_failed() else self.stats()['reason for failure']
+
+    def refresh(self):
+        """
+        Drops cached job statistics. Next call to stats() will fetch actual job status.
+
+        :return: self
+        :rtype: JobStatus
+        """
+        self._state = None
+        self.job_stats = None
+        self.job_counters = None
+        return self
+
+    def progress(self):
+        """
+        Gets job state and map()/reduce() completion
+
+        :return: tuple (job state, map() completion, reduce() completion)
+        """
+        _stats = self.stats()
+        return (_stats.get('Job state'),
+                _stats.get('map() completion'),
+                _stats.get('reduce() completion'))
+
+    def wait_for_completion(self, timeout=None, on_change=None, backoff=None):
+        """
+        Blocks until the job is finished.
+        Job status is polled with adaptive interval: interval is reset to the minimum
+        every time job progress changes and grows exponentially while job progress stays the same.
+
+        :param timeout: maximum time to wait in seconds. Waits forever in case timeout is not set
+        :param on_change: callback which takes JobStatus as argument.
+            Will be called every time job state or map()/reduce() completion changes
+        :param backoff: polling policy, see merlin.common.utils.Backoff
+        :return: self
+        :rtype: JobStatus
+        :raise: WaitTimeoutError in case job is not finished within the given time
+        """
+        _backoff = backoff if backoff else Backoff(initial=1, maximum=60, factor=2)
+        _deadline = time.time() + timeout if timeout else None
+        _progress = None
+        while True:
+            _current = self.refresh().progress()
+            if _current != _progress:
+                _progress = _current
+                _backoff.reset()
+                if on_change:
+                    on_change(self)
+            if not self.is_running():
+                return self
+            _delay = _backoff.delay()
+            if _deadline and time.time() + _delay > _deadline:
+                raise WaitTimeoutError("Job {0} is not finished within {1} second(s)".format(
+                    self.job_id, timeout))
+            time.sleep(_delay)
+
+    def sample_counters(self, interval=10, timeout=None, series=None):
+        """
+        Samples job counters every interval seconds until the job is finished.
+
+        :param interval: sampling interval in seconds
+        :param timeout: maximum time to sample in seconds.
+            Samples until job is finished in case timeout is not set
+        :param series: time-series to append samples to. New one will be created if not set
+        :return: collected samples
+        :rtype: CounterTimeSeries
+        :raise: WaitTimeoutError in case job is not finished within the given time
+        """
+        _series = series if series is not None else CounterTimeSeries()
+        _deadline = time.time() + timeout if timeout else None
+        while True:
+            self.refresh().stats()
+            _series.sample(self.job_counters)
+            if not self.is_running():
+                return _series
+            if _deadline and time.time() + interval > _deadline:
+                raise WaitTimeoutError("Job {0} is not finished within {1} second(s)".format(
+                    self.job_id, timeout))
+            time.sleep(interval)
+
+    def _parse_stdout_(self, stream):
+        """
+        Parses hadoop jar -status <job_id> output stream to get job stats.
+        Counter values are converted to integers once and stored into JobCounters
+        :param stream: stream containing job stats data
+        :return: dictionary containing job stats
+        """
+        _counter_group = None
+        _counters = JobCounters()
+        _job_metrics = {JobStatus.COUNTER_SECTION: {}}
+        for line in stream.splitlines():
+            if line[:2] == '\t\t' and _is_word_char(line[2:3]):
+                key, value = [part.strip() for part in line.split("=", 1)]
+                if _counter_group not in _job_metrics[JobStatus.COUNTER_SECTION]:
+                    _job_metrics[JobStatus.COUNTER_SECTION][_counter_group] = {}
+                _job_metrics[JobStatus.COUNTER_SECTION][_counter_group][key] = value
+                if value.lstrip('-').isdigit():
+                    _counters.add(_counter_group, key, int(value))
+            elif line[:1] == '\t' and _is_word_char(line[1:2]):
+                _counter_group = line.strip()
+            else:
+                key_value = [part.strip() for part in line.split(":", 1)]
+                if len(key_value) > 1:
+                    _job_metrics[key_value[0]] = key_value[1]
+        self.job_stats = _job_metrics
+        self.job_counters = _counters
+
+
+def _is_word_char(char):
+    """Checks if char matches regex '\\w'"""
+    return char.isalnum() or char == '_'
+
+
+class JobCounters(object):
+    """
+    Job counters converted to integers.
+    Counter names are kept in a list and counter values in a parallel list,
+    so lookup of the specific counter is a single dict access without any parsing.
+    """
+
+    def __init__(self):
+        super(JobCounters, self).__init__()
+        self.names = []
+        # counters may exceed 32-bit range of array('l') on some platforms
+        self.values = []
+        self._index = {}
+
+    def add(self, group, counter, value):
+        """
+        Adds or updates the value of the specific counter
+        :param group: counter group
+        :param counter: counter name
+        :param value: counter value
+        :type value: int
+        """
+        _key = (group, counter)
+        if _key in self._index:
+            self.values[self._index[_key]] = value
+        else:
+            self._index[_key] = len(self.names)
+            self.names.append(_key)
+            self.values.append(value)
+
+    def get(self, group, counter):
+        """
+        Gets the value of the specific counter
+        :param group: counter group
+        :param counter: counter name
+        :return: counter value or None in case counter was not found
+        """
+        _position = self._index.get((group, counter))
+        return None if _position is None else self.values[_position]
+
+    def __contains__(self, item):
+        return item in self._index
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(zip(self.names, self.values))
+
+
+class CounterTimeSeries(object):
+    """
+    Time-series of job counters.
+    Each sample is stored as a list of counter values aligned to the common list of columns.
+    Samples can be exported as CSV or JSON lines and used to calculate counter rates,
+    e.g. records/sec processed by map or reduce phase.
+    """
+
+    def __init__(self):
+        super(CounterTimeSeries, self).__init__()
+        self.columns = []
+        self.timestamps = array('d')
+        self.samples = []
+        self._index = {}
+
+    def sample(self, counters, timestamp=None):
+        """
+        Adds counters snapshot to time-series
+        :param counters: job counters
+        :type counters: JobCounters
+        :param timestamp: sample time in seconds since the epoch. Current time is used by default
+        """
+        _values = [0] * len(self.columns)
+        _known = array('b', [0] * len(self.columns))
+        for _name, _value in counters:
+            if _name not in self._index:
+                self._index[_name] = len(self.columns)
+                self.columns.append(_name)
+                _values.append(0)
+                _known.append(0)
+            _values[self._index[_name]] = _value
+            _known[self._index[_name]] = 1
+        self.timestamps.append(timestamp if timestamp is not None else time.time())
+        self.samples.append((_values, _known))
+
+    def values(self, group, counter):
+        """
+        Gets all sampled values of the specific counter
+        :param group: counter group
+        :param counter: counter name
+        :return: list of (timestamp, value) pairs.
+            Value is None if counter was not reported at that time
+        """
+        _position = self._index.get((group, counter))
+        return [(self.timestamps[i], self._value_(i, _position)) for i in range(len(self.samples))]
+
+    def rates(self, group, counter):
+        """
+        Calculates per-second rate of the specific counter between consecutive samples
+        :param group: counter group
+        :param counter: counter name
+        :return: list of (timestamp, rate) pairs
+        """
+        _rates = []
+        _values = [item for item in self.values(group, counter) if item[1] is not None]
+        for (_prev_ts, _prev), (_ts, _value) in zip(_values, _values[1:]):
+            if _ts > _prev_ts:
+                _rates.append((_ts, float(_value - _prev) / (_ts - _prev_ts)))
+        return _rates
+
+    def to_csv(self, stream, delimiter=','):
+        """
+        Writes samples to the stream in CSV format.
+        Header contains 'timestamp' column followed by '<group>:<counter>' columns
+        :param stream: file-like object
+        :param delimiter: column delimiter
+        """
+        stream.write(delimiter.join(['timestamp'] + [':'.join(_name) for _name in self.columns])
+                     + '\n')
+        for i in range(len(self.samples)):
+            _row = [repr(self.timestamps[i])]
+            for _position in range(len(self.columns)):
+                _value = self._value_(i, _position)
+                _row.append('' if _value is None else str(_value))
+            stream.write(delimiter.join(_row) + '\n')
+
+    def to_json_lines(self, stream):
+        """
+        Writes samples to the stream as JSON lines, one sample per line:
+        {"timestamp": 1413805835.0, "counters": {"<group>": {"<counter>": <value>}}}
+        :param stream: file-like object
+        """
+        for i in range(len(self.samples)):
+            _counters = {}
+            for _position, (_group, _counter) in enumerate(self.columns):
+                _value = self._value_(i, _position)
+                if _value is not None:
+                    _counters.setdefault(_group, {})[_counter] = _value
+            stream.write(json.dumps({'timestamp': self.timestamps[i], 'counters': _counters})
+                         + '\n')
+
+    def _value_(self, sample, position):
+        _values, _known = self.samples[sample]
+        if position is not None and position < len(_values) and _known[position]:
+            return _values[position]
+        return None
+
+
+class JobWatcher(object):
+    """
+    Watches a set of MapReduce jobs until all of them are finished.
+    States of all jobs are fetched with a single 'mapred job -list all' call per poll,
+    so the number of launched client processes doesn't depend on the number of watched jobs.
+    """
+
+    LOG = get_logger("MapReduceJobWatcher")
+
+    def __init__(self, job_ids, executor=execute_shell_command, backoff=None):
+        """
+        :param job_ids: identifiers of the jobs to watch
+        :param executor: interface used by the client to run command.
+        :param backoff: polling policy, see merlin.common.utils.Backoff
+        """
+        super(JobWatcher, self).__init__()
+        self.job_ids = list(job_ids)
+        self._executor = executor
+        self._backoff = backoff if backoff else Backoff(initial=1, maximum=60, factor=2)
+        self.states = dict((_job_id, None) for _job_id in self.job_ids)
+
+    def poll(self):
+        """
+        Fetches states of all watched jobs. See JobStatus.bulk
+
+        :return: job states in format {job_id : state}
+        """
+        _statuses = JobStatus.bulk(self.job_ids, self._executor)
+        return dict((_job_id, _status.state()) for _job_id, _status in _statuses.iteritems())
+
+    def watch(self, timeout=None, on_change=None):
+        """
+        Blocks until all watched jobs are finished.
+        Polling interval is reset to the minimum every time state of any job changes
+        and grows exponentially while all jobs stay in the same state.
+
+        :param timeout: maximum time to wait in seconds. Waits forever in case timeout is not set
+        :param on_change: callback which takes job id, previous state and new state as arguments.
+            Will be called every time job state changes
+        :return: final job states in format {job_id : state}
+        :raise: WaitTimeoutError in case jobs are not finished within the given time
+        """
+        _deadline = time.time() + timeout if timeout else None
+        while True:
+            _changed = False
+            for _job_id, _state in self.poll().iteritems():
+                if _state != self.states[_job_id]:
+                    JobWatcher.LOG.info("Job {0} : {1} -> {2}".format(
+                        _job_id, self.states[_job_id], _state))
+                    if on_change:
+                        on_change(_job_id, self.states[_job_id], _state)
+                    self.states[_job_id] = _state
+                    _changed = True
+            if self.is_finished():
+                return self.states
+            if _changed:
+                self._backoff.reset()
+            _delay = self._backoff.delay()
+            if _deadline and time.time() + _delay > _deadline:
+                raise WaitTimeoutError("Jobs {0} are not finished within {1} second(s)".format(
+                    ", ".join(self.running_jobs()), timeout))
+            time.sleep(_delay)
+
+    def running_jobs(self):
+        """
+        :return: identifiers of the watched jobs which are not finished yet
+        """
+        return [_job_id for _job_id in self.job_ids
+                if self.states[_job_id] not in JobStatus.FINAL_STATES]
+
+    def is_finished(self):
+        """
+        :return: True in case all watched jobs are finished
+        """
+        return not self.running_jobs()
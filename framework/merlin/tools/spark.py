@@ -122,12 +122,49 @@ Runs Spark job with config option :
     spark-submit --master local[5] --class Main --name Spark
     --conf "spark.app.name=test_app" application_jar
 
+Runs Spark job with resources sized by its input :
+        SparkApplication().master(SparkMaster.yarn_cluster()).\
+        application("application_jar", main_class="Main", app_name="Spark").\
+        with_auto_sizing(["/data/events/2015-07-01"], rules=SizingRules(max_executors=50)).run()
+
+    Number and size of input files are inspected by 'hadoop fs -count /data/events/2015-07-01'.
+    For 40 files of 40GB in total the next Spark CLI command will be executed :
+    spark-submit --master yarn-cluster --class Main --name Spark
+    --conf spark.executor.instances=40 --conf spark.executor.cores=4
+    --conf spark.executor.memory=8192m --conf spark.sql.shuffle.partitions=320 application_jar
+
+CONCURRENT SUBMISSION EXAMPLES :
+
+Runs Spark application for every partition, at most 4 applications are running at the same time :
+        pool = SparkSubmitPool(max_running=4)
+        for day in days:
+            pool.submit(SparkApplication().master(SparkMaster.yarn_cluster()).
+                        application("backfill.jar", main_class="Backfill",
+                                    app_name="backfill_" + day), day)
+        for submission in pool.wait():
+            print submission.application_id, submission.state
+
+    Submission output is parsed to get YARN / Spark application id and to track application state :
+    SUBMITTED -> ACCEPTED -> RUNNING -> FINISHED / FAILED / KILLED
+
+Applies cap to the number of applications running on the whole cluster, not only in this pool :
+        pool = SparkSubmitPool(
+            max_running=10,
+            running_applications=lambda: yarn_running_applications(queue="backfill"))
+
 """
 
+import re
+import threading
+import time
 import uuid
 from merlin.common.configurations import Configuration
-from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import SparkJobError
+from merlin.common.shell_command_executor import execute_shell_command, \
+    execute_shell_command_streaming_merged
 from merlin.common.logger import get_logger
+from merlin.common.utils import number_of_tasks
+import merlin.fs.cli.hdfs_commands as fs
 
 
 class SparkApplication(object):
@@ -174,6 +211,10 @@ class SparkApplication(object):
         return self._fire_job(verbose=False, args=args)
 
     def _fire_job(self, verbose=False, args=None):
+        return SparkJobStatus(self.executor(self.SHELL_COMMAND,
+                                            *self._submit_options(verbose=verbose, args=args)))
+
+    def _submit_options(self, verbose=False, args=None):
         _options = []
         _options.extend(self._configure_spark_options())
         if verbose:
@@ -181,8 +222,7 @@ class SparkApplication(object):
         _options.append(self._configs.require(self.name, TaskOptions.SPARK_APP_CONFIG_APPLICATION_JAR))
         if args:
             _options.extend(str(arg) for arg in args)
-
-        return SparkJobStatus(self.executor(self.SHELL_COMMAND, *_options))
+        return _options
 
     def debug(self, *args):
         """
@@ -246,6 +286,37 @@ class SparkApplication(object):
 
         return self
 
+    def with_auto_sizing(self, paths, rules=None):
+        """
+        Sets number of executors, executor cores and memory and number of shuffle partitions
+        according to the number of files and the aggregate size of application input.
+        Input is inspected by a single 'hadoop fs -count' command.
+        Options which were already configured explicitly are left unchanged.
+        :param paths: list of input files, directories or glob patterns
+        :param rules: sizing rules, default rules are used if not specified
+        :type rules: SizingRules
+        :return:
+        """
+        _files, _size = fs.content_summary(paths, executor=self.executor)
+        _options = (rules if rules else SizingRules()).size(total_size=_size, file_count=_files)
+        _configured = [_option.split("=", 1)[0]
+                       for _option in self._list_(TaskOptions.SPARK_APP_CONFIG_OPTIONS)]
+        SparkApplication.LOG.info(
+            "Input of the application {0} : {1} files, {2} bytes. Sizing : {3}".format(
+                self.name, _files, _size,
+                ", ".join("{0}={1}".format(_key, _value) for _key, _value in _options)))
+        _sizing = [_option for _option in self._list_(TaskOptions.SPARK_APP_CONFIG_SIZING)
+                   if _option.split("=", 1)[0] not in dict(_options)]
+        _sizing.extend("{0}={1}".format(_key, _value)
+                       for _key, _value in _options if _key not in _configured)
+        self._configs.set(self.name, TaskOptions.SPARK_APP_CONFIG_SIZING, _sizing)
+        return self
+
+    def _list_(self, key):
+        if self._configs.has(self.name, key):
+            return self._configs.get_list(self.name, key)
+        return []
+
     def main_class(self, main_class):
         """
         Sets spark application's main class (for Java / Scala apps).
@@ -369,6 +440,11 @@ class SparkApplication(object):
                                  self._configs.get_list(_section, TaskOptions.SPARK_APP_CONFIG_OPTIONS))
                              )])
 
+        if self._configs.has(_section, TaskOptions.SPARK_APP_CONFIG_SIZING):
+            # every property needs its own --conf flag
+            for _option in self._configs.get_list(_section, TaskOptions.SPARK_APP_CONFIG_SIZING):
+                _options.extend(["--conf", _option])
+
         return _options
 
 
@@ -379,6 +455,7 @@ class TaskOptions(SparkApplication):
     SPARK_APP_CONFIG_PROPERTIES_FILE = "properties-file"
     #arbitrary Spark configuration property PROP=VALUE.
     SPARK_APP_CONFIG_OPTIONS = "conf"
+    SPARK_APP_CONFIG_SIZING = "sizing"
     #Comma separated list of archives to be extracted into the
     #working directory of each executor.
     SPARK_APP_CONFIG_ARCHIVES = "archives"
@@ -399,8 +476,73 @@ class TaskOptions(SparkApplication):
     SPARK_APP_CONFIG_MASTER = "master"
 
     SPARK_APP_CONFIG_APPLICATION_JAR = "application.jar"
+
+    #spark configuration properties set by auto-sizing
+    SPARK_CONF_EXECUTOR_INSTANCES = "spark.executor.instances"
+    SPARK_CONF_EXECUTOR_CORES = "spark.executor.cores"
+    SPARK_CONF_EXECUTOR_MEMORY = "spark.executor.memory"
+    SPARK_CONF_SHUFFLE_PARTITIONS = "spark.sql.shuffle.partitions"
     
 
+class SizingRules(object):
+    """
+    Rules used to size Spark application resources by its input
+    """
+
+    def __init__(self,
+                 bytes_per_task=128 * 1024 ** 2,
+                 tasks_per_core=2,
+                 cores_per_executor=4,
+                 memory_per_core_mb=2048,
+                 min_executors=1,
+                 max_executors=100,
+                 bytes_per_shuffle_partition=128 * 1024 ** 2,
+                 max_shuffle_partitions=2000):
+        """
+        :param bytes_per_task: expected number of input bytes processed by a single task
+        :param tasks_per_core: number of input tasks a single core processes one after another
+        :param cores_per_executor: max number of cores per executor
+        :param memory_per_core_mb: executor memory in megabytes reserved for every executor core
+        :param min_executors: lower bound for the number of executors
+        :param max_executors: upper bound for the number of executors
+        :param bytes_per_shuffle_partition: expected number of input bytes per shuffle partition
+        :param max_shuffle_partitions: upper bound for the number of shuffle partitions
+        """
+        super(SizingRules, self).__init__()
+        self.bytes_per_task = bytes_per_task
+        self.tasks_per_core = tasks_per_core
+        self.cores_per_executor = cores_per_executor
+        self.memory_per_core_mb = memory_per_core_mb
+        self.min_executors = min_executors
+        self.max_executors = max_executors
+        self.bytes_per_shuffle_partition = bytes_per_shuffle_partition
+        self.max_shuffle_partitions = max_shuffle_partitions
+
+    def size(self, total_size, file_count=0):
+        """
+        Calculates application resources.
+        Every input file is processed by at least one task, so many small files require more cores
+        than the same amount of data in a few large files.
+        :param total_size: aggregate size of input in bytes
+        :param file_count: number of input files
+        :return: list of spark configuration options as (key, value) pairs
+        :rtype: list
+        """
+        _tasks = max(number_of_tasks(total_size, self.bytes_per_task), file_count)
+        _cores_needed = number_of_tasks(_tasks, self.tasks_per_core)
+        _cores = min(self.cores_per_executor, _cores_needed)
+        _executors = max(min(number_of_tasks(_cores_needed, _cores), self.max_executors),
+                         self.min_executors)
+        _shuffle_partitions = min(max(number_of_tasks(total_size, self.bytes_per_shuffle_partition),
+                                      _executors * _cores),
+                                  self.max_shuffle_partitions)
+        return [(TaskOptions.SPARK_CONF_EXECUTOR_INSTANCES, _executors),
+                (TaskOptions.SPARK_CONF_EXECUTOR_CORES, _cores),
+                (TaskOptions.SPARK_CONF_EXECUTOR_MEMORY,
+                 "{0}m".format(_cores * self.memory_per_core_mb)),
+                (TaskOptions.SPARK_CONF_SHUFFLE_PARTITIONS, _shuffle_partitions)]
+
+
 class SparkMaster(object):
     def __init__(self, url):
         super(SparkMaster, self).__init__()
@@ -467,4 +609,275 @@ class SparkJobStatus(object):
         return self.joboutput.stdout
 
     def stderr(self):
-        return self.joboutput.stderr
\ No newline at end of file
+        return self.joboutput.stderr
+
+
+class SparkApplicationState(object):
+    """
+    States of Spark application submitted by SparkSubmitPool
+    """
+    QUEUED = "QUEUED"
+    SUBMITTED = "SUBMITTED"
+    ACCEPTED = "ACCEPTED"
+    RUNNING = "RUNNING"
+    FINISHED = "FINISHED"
+    FAILED = "FAILED"
+    KILLED = "KILLED"
+
+    FINAL_STATES = (FINISHED, FAILED, KILLED)
+
+
+class SparkSubmission(object):
+    """
+    Spark application submitted by SparkSubmitPool.
+    Application id and state are updated as spark-submit reports them.
+    """
+    APPLICATION_ID_PATTERN = re.compile(
+        r"\b(application_\d+_\d+|app-\d+-\d+|driver-\d+-\d+|local-\d+)\b")
+    # YARN client : 'Application report for application_1_1 (state: RUNNING)'
+    # standalone cluster : 'State of driver-20150101-0001 is RUNNING'
+    STATE_PATTERN = re.compile(r"\(state: (\w+)\)|State of \S+ is (\w+)")
+    FINAL_STATUS_PATTERN = re.compile(r"final status: (\w+)")
+
+    def __init__(self, application, args=None):
+        """
+        :param application: application to submit
+        :type application: SparkApplication
+        :param args: arguments passed to the main method of the application
+        """
+        super(SparkSubmission, self).__init__()
+        self.application = application
+        self.args = args if args else []
+        self.application_id = None
+        self.state = SparkApplicationState.QUEUED
+        self.history = [(time.time(), SparkApplicationState.QUEUED)]
+        self.result = None
+        self.error = None
+        self._final_status = None
+        self._done = threading.Event()
+
+    @property
+    def name(self):
+        return self.application.name
+
+    def is_done(self):
+        """
+        :return: True in case spark-submit completed
+        """
+        return self._done.is_set()
+
+    def is_ok(self):
+        """
+        :return: True in case application completed successfully
+        """
+        return self.state == SparkApplicationState.FINISHED
+
+    def wait(self, timeout=None):
+        """
+        Waits for the application to complete
+        :param timeout: max number of seconds to wait
+        :return: True in case the application completed
+        """
+        self._done.wait(timeout)
+        return self.is_done()
+
+    def status(self):
+        """
+        :return: spark-submit output
+        :rtype: SparkJobStatus
+        """
+        return SparkJobStatus(self.result) if self.result else None
+
+    def _transition_(self, state):
+        if state and state != self.state:
+            self.state = state
+            self.history.append((time.time(), state))
+            SparkApplication.LOG.info("Spark application {0} ({1}) is {2}".format(
+                self.name, self.application_id, state))
+
+    def _consume_(self, line):
+        """
+        Parses line of spark-submit output
+        """
+        if not self.application_id:
+            _match = SparkSubmission.APPLICATION_ID_PATTERN.search(line)
+            if _match:
+                self.application_id = _match.group(1)
+                self._transition_(SparkApplicationState.SUBMITTED)
+        _match = SparkSubmission.FINAL_STATUS_PATTERN.search(line)
+        if _match:
+            self._final_status = _match.group(1).upper()
+        _match = SparkSubmission.STATE_PATTERN.search(line)
+        if _match:
+            _state = (_match.group(1) or _match.group(2)).upper()
+            if _state in (SparkApplicationState.ACCEPTED, SparkApplicationState.RUNNING):
+                self._transition_(_state)
+
+    def _complete_(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        if error or not result.is_ok():
+            self._transition_(SparkApplicationState.KILLED
+                              if self._final_status == SparkApplicationState.KILLED
+                              else SparkApplicationState.FAILED)
+        elif self._final_status in (SparkApplicationState.FAILED, SparkApplicationState.KILLED):
+            self._transition_(self._final_status)
+        else:
+            self._transition_(SparkApplicationState.FINISHED)
+        self._done.set()
+
+    def __repr__(self):
+        return "SparkSubmission(name={0}, application_id={1}, state={2})".format(
+            self.name, self.application_id, self.state)
+
+
+class SparkSubmitPool(object):
+    """
+    Submits many Spark applications in parallel.
+    Number of applications running at the same time is limited by the pool
+    and, optionally, by the number of applications already running on the cluster.
+    """
+    LOG = get_logger("SparkSubmitPool")
+
+    def __init__(self, max_running=4, running_applications=None, poll_interval=10,
+                 executor=execute_shell_command_streaming_merged):
+        """
+        :param max_running: max number of applications running at the same time
+        :param running_applications: callable returning number of applications running
+            on the cluster, see yarn_running_applications.
+            Applications submitted by this pool are counted by the pool itself when it's not set
+        :param poll_interval: interval in seconds between checks
+            of the cluster-wide number of applications
+        :param executor: the interface used to launch spark-submit.
+            Executor that streams command output allows to track application state while it runs.
+            spark-submit reports application progress to stderr,
+            so the default executor merges it into stdout
+        """
+        super(SparkSubmitPool, self).__init__()
+        self.max_running = max_running
+        self.running_applications = running_applications
+        self.poll_interval = poll_interval
+        self.executor = executor
+        self.submissions = []
+        self._running = 0
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._threads = []
+
+    def submit(self, application, *args):
+        """
+        Queues application for submission. Application is submitted as soon as there is a free slot
+        :param application: application to submit
+        :type application: SparkApplication
+        :param args: arguments passed to the main method of the application
+        :rtype: SparkSubmission
+        """
+        _submission = SparkSubmission(application, args)
+        self.submissions.append(_submission)
+        _thread = threading.Thread(target=self._submit_, args=(_submission,))
+        _thread.daemon = True
+        self._threads.append(_thread)
+        _thread.start()
+        return _submission
+
+    def states(self):
+        """
+        :return: current state of every submitted application
+        :rtype: dict
+        """
+        return dict((_submission.name, _submission.state) for _submission in self.submissions)
+
+    def wait(self, raise_on_failure=False):
+        """
+        Waits for all submitted applications to complete
+        :param raise_on_failure: indicates that SparkJobError should be raised
+            in case any application failed
+        :return: submissions in the order applications were submitted
+        :rtype: list
+        """
+        for _thread in list(self._threads):
+            _thread.join()
+        _failed = [_submission for _submission in self.submissions if not _submission.is_ok()]
+        if _failed and raise_on_failure:
+            raise SparkJobError("{0} of {1} Spark applications failed : {2}".format(
+                len(_failed), len(self.submissions),
+                ", ".join(_submission.name for _submission in _failed)))
+        return list(self.submissions)
+
+    def _acquire_(self):
+        """
+        Reserves a slot for the submission.
+        Cluster-wide number of applications is checked under the lock
+        and includes applications this pool has launched but YARN does not report yet
+        """
+        with self._condition:
+            while not self._has_free_slot_():
+                self._condition.wait(self.poll_interval if self.running_applications else None)
+            self._running += 1
+            self._pending += 1
+
+    def _has_free_slot_(self):
+        if self._running >= self.max_running:
+            return False
+        if self.running_applications \
+                and self.running_applications() + self._pending >= self.max_running:
+            SparkSubmitPool.LOG.debug("Cluster is busy, waiting {0} seconds".format(
+                self.poll_interval))
+            return False
+        return True
+
+    def _submitted_(self):
+        with self._condition:
+            self._pending -= 1
+            self._condition.notify_all()
+
+    def _release_(self):
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+
+    def _submit_(self, submission):
+        self._acquire_()
+        _pending = True
+        try:
+            submission._transition_(SparkApplicationState.SUBMITTED)
+            result = self.executor(SparkApplication.SHELL_COMMAND,
+                                   *submission.application._submit_options(args=submission.args))
+            _lines = result.lines() if hasattr(result, "lines") \
+                else "{0}\n{1}".format(result.stdout or "", result.stderr or "").splitlines()
+            for _line in _lines:
+                submission._consume_(_line)
+                if _pending and submission.application_id:
+                    # application is reported by YARN from now on
+                    _pending = False
+                    self._submitted_()
+            submission._complete_(result=result)
+        except Exception as e:
+            SparkSubmitPool.LOG.error("Submission of {0} failed : {1}".format(submission.name, e))
+            submission._complete_(error=e)
+        finally:
+            if _pending:
+                self._submitted_()
+            self._release_()
+
+
+def yarn_running_applications(queue=None, executor=execute_shell_command):
+    """
+    Counts applications running or waiting for resources on YARN cluster
+    :param queue: counts only applications in the given queue
+    :param executor: the interface used to launch yarn CLI
+    :rtype: int
+    """
+    result = executor("yarn", "application", "-list", "-appStates", "RUNNING,ACCEPTED")
+    result.if_failed_raise(SparkJobError("Could not list YARN applications"))
+    _count = 0
+    # queue is the fifth column unless the header says otherwise
+    _queue_column = 4
+    for _line in (result.stdout or "").splitlines():
+        _columns = [_column.strip() for _column in _line.split("\t")]
+        if "Queue" in _columns:
+            _queue_column = _columns.index("Queue")
+        elif _columns[0].startswith("application_") and \
+                (not queue or (len(_columns) > _queue_column and _columns[_queue_column] == queue)):
+            _count += 1
+    return _count
@@ -0,0 +1,377 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Apache Sqoop is a tool designed for efficiently transferring bulk data between Apache Hadoop and structured datastores
+such as relational databases, enterprise data warehouses and NoSQL systems.
+
+This client provides Python wrapper for Sqoop related tools:
+    - sqoop-import - hadoopframework.tools.sqoop_client.SqoopImport  - imports an individual table from an RDBMS to HDFS.
+    - sqoop-export - hadoopframework.tools.sqoop_client.SqoopExport  - exports a set of files from HDFS to an RDBMS.
+                                                    The target table must already exist in the database.
+
+SQOOP IMPORT EXAMPLES:
+The following examples illustrate how to use the import tool in a variety of situations.
+
+A basic import of a table named EMPLOYEES in the corp database
+        Sqoop.import_data().from_rdbms(
+            rdbms="mysql",
+            host="db.foo.com",
+            database="corp",
+            username="mysql_user",
+            password_file=".mysql.pwd"
+        ).table("EMPLOYEES").to_hdfs(target_dir="/data/EMPLOYEES").run()
+
+    Will be transformed to next Sqoop CLI command :
+        sqoop-import \
+        --connect jdbc:mysql://db.foo.com/corp \
+        --username mysql_user \
+        --password-file .mysql.pwd \
+        --table EMPLOYEES \
+        --target-dir /data/EMPLOYEES \
+        --as-textfile
+
+
+Selecting specific columns from the EMPLOYEES table:
+        Sqoop.import_data().from_rdbms(
+            rdbms="mysql",
+            host="db.foo.com",
+            database="corp",
+            username="mysql_user",
+            password_file=".mysql.pwd"
+        ).table(table="EMPLOYEES",
+                columns=['id','name', 'department']
+        ).to_hdfs(target_dir="/data/EMPLOYEES").run()
+
+    Will be transformed to next Sqoop CLI command :
+        sqoop-import \
+        --connect jdbc:mysql://db.foo.com/corp \
+        --username mysql_user \
+        --password-file .mysql.pwd \
+        --table EMPLOYEES \
+        --columns 'id,name,department' \
+        --target-dir /data/EMPLOYEES \
+        --as-textfile
+
+Importing employees which where hired after 01/01/2010
+    Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table(table="EMPLOYEES",
+            where="start_date > '2010-01-01'"
+    ).to_hdfs(target_dir="/data/EMPLOYEES").
+
+     Will be transformed to next Sqoop CLI command :
+     sqoop-import \
+     --connect jdbc:mysql://db.foo.com/corp \
+     --username mysql_user \
+     --password-file .mysql.pwd \
+     --table EMPLOYEES \
+     --where "start_date > '2010-01-01'" \
+     --target-dir /data/EMPLOYEES \
+     --as-textfile
+
+
+Controlling the import parallelism (using 8 parallel tasks):
+    Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table('EMPLOYEES').use_num_mappers(8).to_hdfs(target_dir="/data/EMPLOYEES")
+
+    Will be transformed to next Sqoop CLI command :
+    sqoop-import \
+    --connect jdbc:mysql://db.foo.com/corp \
+    --username mysql_user \
+    --password-file .mysql.pwd \
+    --table EMPLOYEES \
+    --target-dir /data/EMPLOYEES \
+    --num-mappers 8 \
+    --as-textfile
+
+Staring data in SequenceFiles
+    Sqoop.import_data().from_rdbms(
+            rdbms="mysql",
+            host="db.foo.com",
+            database="corp",
+            username="mysql_user",
+            password_file=".mysql.pwd"
+        ).table(table="EMPLOYEES",
+                columns=['id','name', 'department']
+        ).use_file_format("sequencefile").to_hdfs(target_dir="/data/EMPLOYEES").run()
+
+    Will be transformed to next Sqoop CLI command :
+        sqoop-import \
+        --connect jdbc:mysql://db.foo.com/corp \
+        --username mysql_user \
+        --password-file .mysql.pwd \
+        --table EMPLOYEES \
+        --columns 'id',name,department' \
+        --target-dir /data/EMPLOYEES \
+        --as-sequencefile
+
+
+Specifying the delimiters to use in a text-mode import:
+        Sqoop.import_data().from_rdbms(
+            rdbms="mysql",
+            host="db.foo.com",
+            database="corp",
+            username="mysql_user",
+            password_file=".mysql.pwd"
+        ).table(table="EMPLOYEES").with_input_parsing(
+            optionally_enclosed_by='\\"',
+            fields_terminated_by='|',
+            lines_terminated_by='\\n'
+        ).to_hdfs(target_dir="/data/EMPLOYEES").run()
+
+    Will be transformed to next Sqoop CLI command :
+        sqoop-import \
+        --connect jdbc:mysql://db.foo.com/corp \
+        --username mysql_user \
+        --password-file .mysql.pwd \
+        --table EMPLOYEES \
+        --target-dir /data/EMPLOYEES \
+        --as-textfile \
+        --input-fields-terminated-by '|' \
+        --input-lines-terminated-by '\n' \
+        --input-optionally-enclosed-by '\"'
+
+
+Free-form query import
+     Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).query(
+        query='SELECT a.*, b.* FROM a JOIN b on (a.id == b.id)',
+        split_by='a.id'
+    ).to_hdfs(target_dir="/data/EMPLOYEES").run()
+
+    Will be transformed to next Sqoop CLI command :
+    sqoop-import \
+    --connect jdbc:mysql://db.foo.com/corp \
+    --username mysql_user \
+    --password-file .mysql.pwd \
+    --query 'SELECT a.*, b.* FROM a JOIN b on (a.id == b.id) WHERE $CONDITIONS' \
+    --split-by a.id --target-dir /data/EMPLOYEES \
+    --as-textfile
+
+Incremental import. Load all records from Employees tables which were modified after 2014-11-20 15:27
+    Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table('EMPLOYEES').with_incremental(
+        incremental='append',
+        check_column='create_date',
+        last_value='2014-11-20 15:27'
+    ).to_hdfs(target_dir="/data/EMPLOYEES").run()
+
+    Will be transformed to next Sqoop CLI command :
+    sqoop-import \
+    --connect jdbc:mysql://db.foo.com/corp \
+    --username mysql_user \
+    --password-file .mysql.pwd \
+    --table EMPLOYEES \
+    --target-dir /data/EMPLOYEES \
+    --as-textfile \
+    --incremental append \
+    --check-column create_date \
+    --last-value '2014-11-20 15:27'
+
+Importing the data to Hive
+    Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table('EMPLOYEES',
+            where="start_date > '2010-01-01'"
+    ).use_num_mappers(8).to_hive().run()
+
+     Will be transformed to next Sqoop CLI command :
+     sqoop-import \
+     --connect jdbc:mysql://db.foo.com/corp \
+     --username mysql_user \
+     --password-file .mysql.pwd \
+     --table EMPLOYEES \
+     --where "start_date > '2010-01-01'" \
+     --num-mappers 8 \
+     --as-textfile \
+     --hive-import
+
+Importing the data to HBase
+    Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table('EMPLOYEES',
+            where="start_date > '2010-01-01'"
+    ).to_hbase(
+        hbase_table='htable',
+        column_family='h_family').run()
+
+    Will be transformed to next Sqoop CLI command :
+    sqoop-import \
+    --connect jdbc:mysql://db.foo.com/corp \
+    --username mysql_user \
+    --password-file .mysql.pwd \
+    --table EMPLOYEES \
+    --where "start_date > '2010-01-01'" \
+    --as-textfile \
+    --hbase-table htable \
+    --column-family h_family
+
+
+SQOOP EXPORT EXAMPLES:
+    Sqoop.export_data().from_hdfs(
+        export_dir='/user/data'
+    ).to_rdbms(
+        rdbms='mysql',
+        database='CompanyDB',
+        username='mysqluser').table(
+        table="Employees"
+    ).run()
+
+
+INCREMENTAL IMPORT WITH PERSISTED STATE EXAMPLES:
+    Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table("EMPLOYEES").to_hdfs(
+        target_dir="/data/EMPLOYEES"
+    ).with_incremental_state(
+        store=LocalFileStateStore('/var/lib/merlin/sqoop_state.json'),
+        incremental='append',
+        check_column='id',
+        key='employees'
+    ).run()
+
+    Last value of the check column is read from the store before import
+    and is updated with the value reported by Sqoop after successful import.
+    State can also be kept on HDFS (HdfsStateStore)
+    or in Hive table properties (TablePropertiesStateStore).
+
+
+SKEWED TABLE IMPORT EXAMPLES:
+    job = Sqoop.import_data().from_rdbms(
+        rdbms="mysql",
+        host="db.foo.com",
+        database="corp",
+        username="mysql_user",
+        password_file=".mysql.pwd"
+    ).table("ORDERS").to_hdfs(target_dir="/data/ORDERS").with_attr(split_by="customer_id")
+    planner = SplitPlanner(job, buckets=100)
+    if planner.skew(num_mappers=8) > 2:
+        planner.run(num_mappers=8, ranges=4, max_parallel=4)
+    else:
+        job.use_num_mappers(8).run()
+
+    Histogram of the split column is evaluated with sqoop-eval.
+    Table is imported with 4 range imports holding roughly the same number of rows,
+    all of them appending into /data/ORDERS.
+    Pass subdirectories=True to give every range import its own sub-directory
+    /data/ORDERS/range_NNNNN instead.
+    Incremental state of the job (see with_incremental_state) is loaded once
+    and saved only after all range imports succeeded.
+
+
+EXPORT THROUGHPUT PROFILES EXAMPLES:
+    Sqoop.export_data().from_hdfs(
+        export_dir='/user/data'
+    ).to_rdbms(
+        rdbms='mysql',
+        database='CompanyDB',
+        username='mysqluser').table(
+        table="Employees"
+    ).with_profile('multirow').run()
+
+    Will be transformed to next Sqoop CLI command :
+        sqoop-export -Dsqoop.export.records.per.statement=100 \
+            -Dsqoop.export.statements.per.transaction=100 ...
+
+    Profiles predefined for the target RDBMS are listed in EXPORT_PROFILES.
+    The best profile can be measured on a sample dataset :
+        profile = ExportBenchmark(job, sample_dir='/user/data/sample',
+                                  table='Employees_benchmark').best()
+        job.with_profile(profile).run()
+
+
+PARALLEL IMPORT EXAMPLES:
+    scheduler = SqoopImportScheduler(max_parallel=8, connections_per_database=2)
+    for table, rows in [("EMPLOYEES", 10000000), ("DEPARTMENTS", 100)]:
+        scheduler.add(
+            Sqoop.import_data().from_rdbms(
+                rdbms="mysql",
+                host="db.foo.com",
+                database="corp",
+                username="mysql_user",
+                password_file=".mysql.pwd"
+            ).table(table).to_hdfs(target_dir="/data/{0}".format(table)),
+            size=rows)
+    for report in scheduler.run():
+        print report.name, report.duration, report.rows
+
+    Up to 8 imports run concurrently, at most 2 of them against the same database.
+    Imports of larger tables are started first.
+    Jobs can also be loaded from configuration sections :
+        SqoopImportScheduler() \
+            .add_preconfigured(config, 'employees_import', 'departments_import') \
+            .run()
+
+
+KNOWN BUGS AND LIMITATION:
+
+"""
+
+from merlin.tools.sqoop.base import Sqoop, TaskOptions
+from merlin.tools.sqoop.import_job import SqoopImport
+from merlin.tools.sqoop.export_job import SqoopExport
+from merlin.tools.sqoop.planner import SplitPlanner
+from merlin.tools.sqoop.profiles import ExportProfile, EXPORT_PROFILES, BenchmarkResult, \
+    ExportBenchmark
+from merlin.tools.sqoop.state import LocalFileStateStore, HdfsStateStore, \
+    TablePropertiesStateStore
+from merlin.tools.sqoop.scheduler import ImportReport, SqoopImportScheduler
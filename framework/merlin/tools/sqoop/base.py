@@ -0,0 +1,705 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Base class of Sqoop tools and names of their configuration options.
+"""
+
+import os
+
+from merlin.common.configurations import Configuration
+from merlin.common.metastores import IniFileMetaStore
+from merlin.common.logger import get_logger
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import SqoopCommandError, ConfigurationError
+from merlin.common.utils import number_of_tasks
+
+
+class Sqoop(object):
+    """          
+    Base class for SQOOP related tools.
+    """
+
+    LOG = get_logger("Sqoop")
+
+    @staticmethod
+    def import_data(executor=execute_shell_command):
+        """
+        Creates wrapper for sqoop-import command line utility
+        :param executor: The interface used by the client to run command.
+        :rtype: SqoopImport
+
+        """
+        # imported lazily as the import job extends Sqoop
+        from merlin.tools.sqoop.import_job import SqoopImport
+        path_to_config = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                      'resources', 'sqoop-default.ini')
+        metastore = IniFileMetaStore(file=path_to_config)
+        config = Configuration.load(metastore, readonly=False, accepts_nulls=True)
+        return SqoopImport(config=config, executor=executor)
+
+    @staticmethod
+    def export_data(executor=execute_shell_command):
+        """
+        Creates wrapper for sqoop-export command line utility
+        :param executor: The interface used by the client to run command.
+        :rtype: SqoopExport
+
+        """
+        # imported lazily as the export job extends Sqoop
+        from merlin.tools.sqoop.export_job import SqoopExport
+        path_to_config = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                      'resources', 'sqoop-default.ini')
+        metastore = IniFileMetaStore(file=path_to_config)
+        config = Configuration.load(metastore, readonly=False, accepts_nulls=True)
+        return SqoopExport(config=config, executor=executor)
+
+    def __require_attr__(self, key):
+        """
+        Loads required attribute from job configuration and converts it to command specific argument
+        ConfigurationError will be thrown in case option was not found
+        :param key: config option name
+        :type key: str
+        :rtype: list
+
+        """
+
+        return ["--{0} {1}".format(self.__format_attr__(key),
+                                   self.get(key=key, required=True))]
+
+    def __optional_attr__(self, key):
+        """
+        Loads attribute from job configuration and converts it to command specific argument
+        Command argument won't be added in case config option was not found
+        :param key: config option name
+        :type key: str
+        :rtype: list
+
+        """
+        list_command = []
+        if self.has_option(key):
+            list_command.append("--{0} {1}".format(self.__format_attr__(key), self.get(key)))
+        return list_command
+
+    def __config_marker__(self, key):
+        """
+        Looks for specific configuration option and adds argument to command in case option was found
+        :type key: str
+        :rtype: list
+
+        """
+        list_command = []
+        if self.has_option(key) and (self.get(key) == 'enabled'):
+            list_command.append("--{0}".format(self.__format_attr__(key)))
+        return list_command
+
+    def __format_attr__(self, command=None):
+        """
+        Format name attribute
+        :type command: str
+        :rtype: str
+
+        """
+        command = command.replace("_", "-")
+        return command
+
+    def __format_prop__(self, command=None):
+        """
+        Format name property
+        :type command: str
+        :rtype: str
+
+        """
+        command = command.replace("_", ".")
+        return command
+
+    def __set_attr__(self, key=None, value=None):
+        """
+        Configuration method for set attribute
+        :type key: str
+
+        """
+        if value:
+            self._config.set(self.name, key, value)
+
+    def __set_marker_enabled__(self, key=None, value=False):
+        """
+        Configuration method for set marker to enable mod
+        :type key: str
+
+        """
+        if value:
+            self._config.set(self.name, key, 'enabled')
+
+    def __config_hadoop_properties__(self):
+        """
+        Adds Hadoop generic arguments to command
+        :rtype: list
+
+        """
+        list_command = []
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_HADOOP_PROPERTIES):
+            _list = self.get_list(TaskOptions.CONFIG_KEY_SQOOP_HADOOP_PROPERTIES)
+            for value in _list:
+                list_command.append("-D{0}".format(value))
+
+        return list_command
+
+    def __config_jar__(self):
+        """
+        Configuration method for jar's path
+        :rtype: list
+
+        """
+        list_command = []
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_LIBJARS):
+            list_command.append("-libjars={0}".format(self.get(TaskOptions.CONFIG_KEY_SQOOP_LIBJARS)))
+
+        return list_command
+
+    def __config_direct_mode__(self):
+        """
+        Configuration method for direct mode
+        :rtype: list
+
+        """
+        list_command = []
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_MODE_PROPERTIES):
+            list_command.append('--')
+            _list = self.get_list(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_MODE_PROPERTIES)
+            for value in _list:
+                list_command.append("--{0}".format(value))
+
+        return list_command
+
+    def __config_rdbms__(self):
+        """
+        Configuration method for RDBMS
+        :rtype: list
+
+        """
+        host = self.get(key=TaskOptions.CONFIG_KEY_SQOOP_HOST, required=True)
+        if 'jdbc' in host:
+            return ["--connect {0}".format(host)]
+        else:
+            return ["--connect jdbc:{0}://{1}/{2}".format(
+                self.get(key=TaskOptions.CONFIG_KEY_SQOOP_RDBMS, required=True),
+                host, self.get(key=TaskOptions.CONFIG_KEY_SQOOP_DATABASE, required=True))]
+
+    def __config_credentials__(self):
+        """
+        Configuration method for credentials
+        :rtype: list
+
+        """
+        list_command = []
+        list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_USERNAME))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_PASSWORD_FILE))
+
+        return list_command
+
+    def __config_parse__(self):
+        """
+        Configuration method for parsing
+        :rtype: list
+
+        """
+        list_command = []
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_ENCLOSED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_ESCAPED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_FIELDS_TERMINATED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_LINES_TERMINATED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_OPTIONALLY_ENCLOSED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_ENCLOSED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_ESCAPED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_FIELDS_TERMINATED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_LINES_TERMINATED_BY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_OPTIONALLY_ENCLOSED_BY))
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_MYSQL_DELIMITERS))
+
+        return list_command
+
+    def __config_specific__(self):
+        """
+        Configuration method for specific attributes
+        :rtype: list
+
+        """
+        list_command = []
+        for key in self.specific_attributes:
+            list_command.append("--{0} {1}".format(self.__format_attr__(key),
+                                                   self.specific_attributes[key]))
+
+        return list_command
+
+    @staticmethod
+    def __quotes_wrapper__(attr=None):
+        """
+        :type attr: str
+        :rtype: str
+
+        """
+        if attr:
+            if attr[0] != "'":
+                return "'{0}'".format(attr)
+        return attr
+
+    @staticmethod
+    def __double_quotes_wrapper__(attr=None):
+        """
+        :type attr: str
+        :rtype: str
+
+        """
+        if attr:
+            if attr[0] != "\"":
+                return "\"{0}\"".format(attr)
+        return attr
+
+    def build(self):
+        """
+        Build any Sqoop's command
+        :rtype: str
+
+        """
+        list_command = []
+        list_command.extend(self.__config_hadoop_properties__())
+        list_command.extend(self.__config_jar__())
+        list_command.extend(self.__config_rdbms__())
+        list_command.extend(self.__config_credentials__())
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_DRIVER))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_CONNECTION_MANAGER))
+
+        if self.command == "sqoop.import":
+            list_command.extend(self.__config_import__())
+
+        if self.command == "sqoop.export":
+            list_command.extend(self.__config_export__())
+
+        list_command.extend(self.__config_parse__())
+        list_command.extend(self.__config_specific__())
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_DIRECT))
+        list_command.extend(self.__config_direct_mode__())
+
+        return " ".join(list_command)
+
+    def with_hadoop_properties(self, **properties):
+        """
+        Specify hadoop properties. Properties which are already set are replaced
+        :type properties: dict
+
+        """
+        _properties = []
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_HADOOP_PROPERTIES):
+            _properties = list(self.get_list(TaskOptions.CONFIG_KEY_SQOOP_HADOOP_PROPERTIES))
+        _names = [_property.split('=', 1)[0].strip() for _property in _properties]
+        for key, value in properties.iteritems():
+            _name = self.__format_prop__(key)
+            _property = "{0}={1}".format(_name, value)
+            if _name in _names:
+                _properties[_names.index(_name)] = _property
+            else:
+                _properties.append(_property)
+                _names.append(_name)
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HADOOP_PROPERTIES, "\n".join(_properties))
+
+        return self
+
+    def with_direct_mode(self, direct_split_size=None, **direct_arguments):
+        """
+        Set Sqoop to use direct import channel.
+        :param direct_split_size: Split size.
+            Sqoop will split the input stream every 'n' bytes when importing in direct mode.
+        :param direct_arguments:
+        :type direct_split_size: int
+        :type direct_arguments: dict
+
+        """
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_DIRECT, True)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_SPLIT_SIZE, direct_split_size)
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_MODE_PROPERTIES):
+            command = self.get(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_MODE_PROPERTIES)
+        else:
+            command = ""
+        for key, value in direct_arguments.iteritems():
+            if command == "":
+                command = "{0}={1}".format(self.__format_attr__(key), value)
+            else:
+                command = "{0}\n{1}={2}".format(command, self.__format_attr__(key), value)
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_MODE_PROPERTIES, command)
+
+        return self
+
+    def with_input_parsing(self, enclosed_by=None, escaped_by=None, fields_terminated_by=None,
+                           lines_terminated_by=None, optionally_enclosed_by=None):
+        """
+        Configure input data formatting arguments
+        :param enclosed_by:  required field enclosing character
+        :param escaped_by:  escape character
+        :param fields_terminated_by: field separator character
+        :param lines_terminated_by: end-of-line character
+        :param optionally_enclosed_by:  field enclosing character
+        :type enclosed_by: str
+        :type escaped_by: str
+        :type fields_terminated_by: str
+        :type lines_terminated_by: str
+        :type optionally_enclosed_by: str
+
+        """
+        enclosed_by = Sqoop.__quotes_wrapper__(enclosed_by)
+        escaped_by = Sqoop.__quotes_wrapper__(escaped_by)
+        fields_terminated_by = Sqoop.__quotes_wrapper__(fields_terminated_by)
+        lines_terminated_by = Sqoop.__quotes_wrapper__(lines_terminated_by)
+        optionally_enclosed_by = Sqoop.__quotes_wrapper__(optionally_enclosed_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_ENCLOSED_BY, enclosed_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_ESCAPED_BY, escaped_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_FIELDS_TERMINATED_BY, fields_terminated_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_LINES_TERMINATED_BY, lines_terminated_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_OPTIONALLY_ENCLOSED_BY, optionally_enclosed_by)
+
+        return self
+
+    def with_output_parsing(self, enclosed_by=None, escaped_by=None, fields_terminated_by=None,
+                            lines_terminated_by=None, optionally_enclosed_by=None,
+                            mysql_delimiters=False):
+        """
+        Configure output line formatting arguments
+        :param enclosed_by: required field enclosing character
+        :param escaped_by: escape character
+        :param fields_terminated_by:  field separator character
+        :param lines_terminated_by: end-of-line character
+        :param optionally_enclosed_by: enclosing character
+        :param mysql_delimiters:
+        :type enclosed_by: str
+        :type escaped_by: str
+        :type fields_terminated_by: str
+        :type lines_terminated_by: str
+        :type optionally_enclosed_by: str
+        :type mysql_delimiters: bool
+        
+        """
+        enclosed_by = Sqoop.__quotes_wrapper__(enclosed_by)
+        escaped_by = Sqoop.__quotes_wrapper__(escaped_by)
+        fields_terminated_by = Sqoop.__quotes_wrapper__(fields_terminated_by)
+        lines_terminated_by = Sqoop.__quotes_wrapper__(lines_terminated_by)
+        optionally_enclosed_by = Sqoop.__quotes_wrapper__(optionally_enclosed_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_ENCLOSED_BY, enclosed_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_ESCAPED_BY, escaped_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_FIELDS_TERMINATED_BY, fields_terminated_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_LINES_TERMINATED_BY, lines_terminated_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_OPTIONALLY_ENCLOSED_BY, optionally_enclosed_by)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_MYSQL_DELIMITERS, mysql_delimiters)
+
+        return self
+
+    def with_lib_jar(self, libjars=None):
+        """
+        Add libs to application's classpath
+        :param libjars: comma-separated list of jar files to be added to application classpath
+        :type libjars: str
+        
+        """
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_LIBJARS, libjars)
+
+        return self
+
+    def with_specific_attr(self, **attributes):
+        """
+        Specify specific attributes
+        :type attributes: dict
+
+        """
+        for key, value in attributes.iteritems():
+            self.specific_attributes[key] = value
+        return self
+
+    def with_attr(self, **attributes):
+        """
+        Specify common attributes
+
+        """
+
+        for key, value in attributes.iteritems():
+            self.__set_attr__(key, value)
+        return self
+
+    def use_num_mappers(self, num_mappers):
+        """
+        Specify number of mappers
+        :param num_mappers:  number of map tasks (parallel processes) to use
+        :type num_mappers: int
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_NUM_MAPPERS, str(num_mappers))
+        return self
+
+    def use_num_mappers_for_size(self, size, bytes_per_mapper=None, max_mappers=None):
+        """
+        Specify number of mappers so that every map task transfers roughly bytes_per_mapper bytes
+
+        :param size: expected amount of data to transfer in bytes
+        :type size: int
+        :param bytes_per_mapper: target number of bytes per map task
+        :type bytes_per_mapper: int
+        :param max_mappers: upper bound for number of mappers,
+            e.g. max number of database connections
+        :type max_mappers: int
+        """
+        return self.use_num_mappers(
+            number_of_tasks(size,
+                            bytes_per_mapper if bytes_per_mapper
+                            else TaskOptions.DEFAULT_BYTES_PER_MAPPER,
+                            max_mappers))
+
+    def evaluate(self, query):
+        """
+        Evaluates SQL query against configured database with sqoop-eval tool
+        :param query: SQL query
+        :return: rows of the query result
+        :rtype: list
+        """
+        _arguments = self.__config_rdbms__() + self.__config_credentials__()
+        _arguments.append("--query {0}".format(Sqoop.__double_quotes_wrapper__(query)))
+        result = self._executor_()('sqoop-eval', " ".join(_arguments))
+        result.if_failed_raise(SqoopCommandError("Cannot evaluate query : {0}".format(query)))
+        # sqoop-eval prints result as a table :
+        # header row followed by data rows, all enclosed with '|'
+        _rows = [[_value.strip() for _value in _line.strip()[1:-1].split('|')]
+                 for _line in str(result.stdout).splitlines()
+                 if _line.strip().startswith('|')]
+        return _rows[1:]
+
+    def _copy_config_(self, name):
+        """
+        Copies job specific configuration to the section with the given name
+        """
+        for _key in self._config.options(self.name):
+            self._config.set(name, _key, self._config.get(self.name, _key))
+
+    def has_option(self, key):
+        """
+        Check if attribute at the given key exists in  job specific or sqoop.common section of the Configuration.
+
+        :param key: attribute name
+        :return:  True in case attribute was found otherwise False
+        """
+        if not self._config.has(section=self.name, key=key):
+            if not self._config.has(section=self.command, key=key):
+                return self._config.has(section="sqoop.common", key=key)
+            else:
+                return True
+        else:
+            return True
+
+    def get(self, key, required=False):
+        """
+        Get value at the given key from Configuration.
+        Throws an ConfigurationError when a required property is not found.
+        :param key: config option name
+        :param required:
+        :type key: str
+        :type required: bool
+        :rtype str
+
+        """
+        # try to load config option from job speciofic section
+        _value = self._config.get(self.name, key)
+        if not _value:
+            # try to load option from command specific section
+            _value = self._config.get(self.command, key)
+        if not _value:
+            # try to load option from sqoop common section
+            _value = self._config.get("sqoop.common", key)
+
+        if not _value and required:
+            raise ConfigurationError("Configuration option '{0}' is required".format(key))
+        else:
+            return _value
+
+    def get_list(self, key, required=False):
+        """
+        Get value at the given key from Configuration.
+        Throws an ConfigurationError when a required property is not found.
+        :param key: config option name
+        :param required:
+        :type key: str
+        :type required: bool
+        :rtype str
+
+        """
+        # try to load config option from job speciofic section
+        _value = self._config.get_list(self.name, key)
+        if not _value:
+            # try to load option from command specific section
+            _value = self._config.get_list(self.command, key)
+        if not _value:
+            # try to load option from sqoop common section
+            _value = self._config.get_list("sqoop.common", key)
+
+        if not _value and required:
+            raise ConfigurationError("Configuration option '{0}' is required".format(key))
+        else:
+            return _value
+
+
+class TaskOptions(Sqoop):
+    """
+    Option names used to configure Sqoop job
+    """
+    #specify rdbms
+    CONFIG_KEY_SQOOP_RDBMS = "rdbms"
+    #specify host where rdbms exist
+    CONFIG_KEY_SQOOP_HOST = "host"
+    #specify database
+    CONFIG_KEY_SQOOP_DATABASE = "database"
+    #specify connection manager class name
+    CONFIG_KEY_SQOOP_CONNECTION_MANAGER = "connection_manager"
+    #manually specify JDBC driver class to use
+    CONFIG_KEY_SQOOP_DRIVER = "driver"
+    #set authentication password file path
+    CONFIG_KEY_SQOOP_PASSWORD_FILE = "password_file"
+    #set authentication username
+    CONFIG_KEY_SQOOP_USERNAME = "username"
+    #use value for given property
+    CONFIG_KEY_SQOOP_HADOOP_PROPERTIES = "hadoop_properties"
+    #specify comma separated jar files to include in the classpath.
+    CONFIG_KEY_SQOOP_LIBJARS = "libjars"
+    #columns to import from table
+    CONFIG_KEY_SQOOP_COLUMNS = "columns"
+    #table to read
+    CONFIG_KEY_SQOOP_TABLE = "table"
+    #Use 'n' map tasks to import in parallel
+    CONFIG_KEY_SQOOP_NUM_MAPPERS = "num_mappers"
+    #default target number of bytes transferred by a single map task
+    DEFAULT_BYTES_PER_MAPPER = 256 * 1024 * 1024
+
+    #output line formatting arguments:
+    CONFIG_KEY_SQOOP_ENCLOSED_BY = "enclosed_by"
+    CONFIG_KEY_SQOOP_ESCAPED_BY = "escaped_by"
+    CONFIG_KEY_SQOOP_FIELDS_TERMINATED_BY = "fields_terminated_by"
+    CONFIG_KEY_SQOOP_LINES_TERMINATED_BY = "lines_terminated_by"
+    CONFIG_KEY_SQOOP_MYSQL_DELIMITERS = "mysql_delimiters"
+    CONFIG_KEY_SQOOP_OPTIONALLY_ENCLOSED_BY = "optionally_enclosed_by"
+
+    #input parsing arguments:
+    CONFIG_KEY_SQOOP_INPUT_ENCLOSED_BY = "input_enclosed_by"
+    CONFIG_KEY_SQOOP_INPUT_ESCAPED_BY = "input_escaped_by"
+    CONFIG_KEY_SQOOP_INPUT_FIELDS_TERMINATED_BY = "input_fields_terminated_by"
+    CONFIG_KEY_SQOOP_INPUT_LINES_TERMINATED_BY = "input_lines_terminated_by"
+    CONFIG_KEY_SQOOP_INPUT_OPTIONALLY_ENCLOSED_BY = "input_optionally_enclosed_by"
+
+    #use direct import fast path
+    CONFIG_KEY_SQOOP_DIRECT = "direct"
+    #split the input stream every 'n' bytes when importing in direct mode
+    CONFIG_KEY_SQOOP_DIRECT_SPLIT_SIZE = "direct_split_size"
+    CONFIG_KEY_SQOOP_DIRECT_MODE_PROPERTIES = "direct_mode_properties"
+
+    #imports data in append mode
+    CONFIG_KEY_SQOOP_APPEND = "append"
+    #imports data to specific format data file
+    CONFIG_KEY_SQOOP_AS = "as"
+
+    #set the maximum size for an inline LOB
+    CONFIG_KEY_SQOOP_INLINE_LOB_LIMIT = "inline_lob_limit"
+
+    #WHERE clause to use during import
+    CONFIG_KEY_SQOOP_WHERE = "where"
+
+    #import results of SQL 'statement'
+    CONFIG_KEY_SQOOP_QUERY = "query"
+    #HDFS plain table destination
+    CONFIG_KEY_SQOOP_TARGET_DIR = "target_dir"
+    #column of the table used to split work units
+    CONFIG_KEY_SQOOP_SPLIT_BY = "split_by"
+    #set boundary query for retrieving max and min value of the primary key
+    CONFIG_KEY_SQOOP_BOUNDARY_QUERY = "boundary_query"
+
+    #enable compression
+    CONFIG_KEY_SQOOP_COMPRESS = "compress"
+    #compression codec to use for import
+    CONFIG_KEY_SQOOP_COMPRESSION_CODEC = "compression_codec"
+
+    #null string representation
+    CONFIG_KEY_SQOOP_NULL_STRING = "null_string"
+    #null non-string representation
+    CONFIG_KEY_SQOOP_NULL_NON_STRING = "null_non_string"
+
+    #override mapping for specific columns to java types
+    CONFIG_KEY_SQOOP_MAP_COLUMN_JAVA = "map_column_java"
+
+    #incremental import arguments
+    CONFIG_KEY_SQOOP_INCREMENTAL = "incremental"
+    CONFIG_KEY_SQOOP_CHECK_COLUMN = "check_column"
+    CONFIG_KEY_SQOOP_LAST_VALUE = "last_value"
+
+    #Hive arguments:
+    CONFIG_KEY_SQOOP_HIVE_IMPORT = "hive_import"
+    CONFIG_KEY_SQOOP_CREATE_HIVE_TABLE = "create_hive_table"
+    CONFIG_KEY_SQOOP_HIVE_TABLE = "hive_table"
+    CONFIG_KEY_SQOOP_MAP_COLUMN_HIVE = "map_column_hive"
+    CONFIG_KEY_SQOOP_HIVE_OVERWRITE = "hive_overwrite"
+    CONFIG_KEY_SQOOP_HIVE_PARTITION_KEY = "hive_partition_key"
+    CONFIG_KEY_SQOOP_HIVE_PARTITION_VALUE = "hive_partition_value"
+    CONFIG_KEY_SQOOP_HIVE_DROP_IMPORT_DELIMS = "hive_drop_import_delims"
+    CONFIG_KEY_SQOOP_HIVE_DELIMS_REPLACEMENT = "hive_delims_replacement"
+
+    #HBase arguments
+    CONFIG_KEY_SQOOP_HBASE_TABLE = "hbase_table"
+    CONFIG_KEY_SQOOP_COLUMN_FAMILY = "column_family"
+    CONFIG_KEY_SQOOP_HBASE_ROW_KEY = "hbase_row_key"
+    CONFIG_KEY_SQOOP_HBASE_CREATE_TABLE = "hbase_create_table"
+
+    #HDFS source path for the export
+    CONFIG_KEY_SQOOP_EXPORT_DIR = "export_dir"
+
+    #indicates underlying statements to be executed in batch mode
+    CONFIG_KEY_SQOOP_BATCH = "batch"
+
+    #intermediate staging table
+    CONFIG_KEY_SQOOP_STAGING_TABLE = "staging_table"
+    #indicates that any data in staging table can be deleted
+    CONFIG_KEY_SQOOP_CLEAR_STAGING_TABLE = "clear_staging_table"
+
+    #update records by specified key column
+    CONFIG_KEY_SQOOP_UPDATE_KEY = "update_key"
+    #specifies how updates are performed
+    # when new rows are found with non-matching keys in database
+    CONFIG_KEY_SQOOP_UPDATE_MODE = "update_mode"
+
+    #populate the table using this stored procedure (one call per row)
+    CONFIG_KEY_SQOOP_CALL = "call"
+
+    #input null string representation
+    CONFIG_KEY_SQOOP_INPUT_NULL_STRING = "input_null_string"
+    #input null non-string representation
+    CONFIG_KEY_SQOOP_INPUT_NULL_NON_STRING = "input_null_non_string"
@@ -0,0 +1,354 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Wrapper for sqoop-export command line utility.
+"""
+
+import uuid
+
+from merlin.common.configurations import Configuration
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import SqoopCommandError
+from merlin.common.utils import ListUtility
+from merlin.tools.sqoop.base import Sqoop, TaskOptions
+from merlin.tools.sqoop.profiles import ExportProfile
+import merlin.fs.cli.hdfs_commands as fs
+
+
+class SqoopExport(Sqoop):
+    """
+    Sqoop export command
+
+    Tool to export a set of files from HDFS back to an RDBMS.
+    The target table must already exist in the database.
+    The input files are read and parsed into a set of records according to the user-specified delimiters.
+
+    Sqoop export job configuration can be loaded from external Ini file.
+    Job name is used as a name of the configuration section containing job specific options.
+    Allowed configuration keys are listed in hadoopframework.tools.sqoop.TaskOptions
+
+    Alternatively, you can also use provided API to configure and run export job.
+
+    """
+
+    def __init__(self, name=None, config=None, executor=execute_shell_command):
+        """
+
+        :param name: Job name is used as a name of the configuration section containing job specific options.
+        :param config: Job configuration
+        :param executor: The interface used by the client to launch Sqoop export job.
+        """
+        self.name = name if name else "SQOOP_TASK_{0}".format(uuid.uuid4())
+        self.__executor = executor
+        self.specific_attributes = {}
+        self.command = "sqoop.export"
+        self._config = config if config else Configuration.create(
+            readonly=False,
+            accepts_nulls=True
+        )
+        self._process = None
+
+    @staticmethod
+    def load_preconfigured_job(name=None, config=None, executor=execute_shell_command):
+        """
+        Creates instance of SqoopExport. Configure it with options
+        :param config: sqoop job configurations
+        :param name: sqoop job identifier.
+             Will be used as a name of the section with job-specific configurations.
+        :param executor:
+        """
+        if name:
+            Sqoop.LOG.info("Load Sqoop Export attributes from section's in configuration "
+                           "[sqoop], [sqoop.export] and [{0}]".format(name))
+        else:
+            Sqoop.LOG.info("Load Sqoop Export attributes from section's in configuration "
+                           "[sqoop] and [sqoop.export]")
+        return SqoopExport(name, config, executor)
+
+    def __config_export__(self):
+        """
+        Configuration method for export from HDFS
+        :rtype: list
+
+        """
+        list_command = []
+
+        list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_EXPORT_DIR))
+
+        if not self.has_option(TaskOptions.CONFIG_KEY_SQOOP_CALL):
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_TABLE))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_COLUMNS))
+        elif not self.has_option(TaskOptions.CONFIG_KEY_SQOOP_TABLE):
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_CALL))
+        else:
+            raise SqoopCommandError("You must specify table or call.\
+                            You can't use table and call together")
+
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_BATCH))
+        list_command.extend(self.__config_staging_table__())
+        list_command.extend(self.__config_update())
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_NULL_STRING))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_NULL_NON_STRING))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_NUM_MAPPERS))
+
+        return list_command
+
+    def __config_staging_table__(self):
+        """
+        Configuration method for staging table
+        :rtype: list
+
+        """
+
+        list_command = []
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_STAGING_TABLE))
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_CLEAR_STAGING_TABLE))
+        return list_command
+
+    def __config_update(self):
+        """
+        Configuration method for export update
+        :rtype: list
+
+        """
+
+        list_command = []
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_UPDATE_KEY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_UPDATE_MODE))
+        return list_command
+
+    def run(self):
+        """
+        Launches Sqoop Export job
+        :rtype:
+
+        """
+        Sqoop.LOG.info("Running Sqoop Export Job")
+        self._process = self.__executor('sqoop-export', self.build())
+        self._process.if_failed_raise(SqoopCommandError("Sqoop Job failed"))
+        return self._process
+
+    def copy(self, name):
+        """
+        Creates export job with the same configuration
+        :param name: name of the new job
+        :rtype: SqoopExport
+        """
+        self._copy_config_(name)
+        return SqoopExport(name=name, config=self._config, executor=self.__executor)
+
+    def _executor_(self):
+        return self.__executor
+
+    def with_profile(self, profile):
+        """
+        Applies throughput profile to the export.
+        :param profile: profile or name of the profile predefined for the target RDBMS,
+            see EXPORT_PROFILES
+        :type profile: ExportProfile, str
+        :rtype: SqoopExport
+        """
+        if not isinstance(profile, ExportProfile):
+            profile = ExportProfile.for_rdbms(self.get(TaskOptions.CONFIG_KEY_SQOOP_RDBMS), profile)
+        return profile.apply(self)
+
+    def from_hdfs(self, export_dir=None):
+        """
+        Specifies export directory
+        :param export_dir: HDFS source path to be exported to RDBMS
+        :type export_dir: str
+        :type: str
+        :rtype: SqoopExport
+
+        """
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_EXPORT_DIR, export_dir)
+
+        return self
+
+    def use_num_mappers_by_input(self, bytes_per_mapper=None, max_mappers=None):
+        """
+        Specify number of mappers based on the aggregate size of the export directory.
+
+        :param bytes_per_mapper: target number of bytes per map task
+        :type bytes_per_mapper: int
+        :param max_mappers: upper bound for number of mappers,
+            e.g. max number of database connections
+        :type max_mappers: int
+        """
+        _size = fs.total_size([self.get(TaskOptions.CONFIG_KEY_SQOOP_EXPORT_DIR, required=True)],
+                              executor=self.__executor)
+        return self.use_num_mappers_for_size(_size, bytes_per_mapper, max_mappers)
+
+    def to_rdbms(self, rdbms=None, host=None, database=None, username=None, password_file=None):
+        """
+        Configures JDBC connection to target database.
+
+        :param rdbms: the name of the datasource driver which will be used to access to the database.
+            E.g.: mysql, microsoft:sqlserver, oracle:thin, etc.
+            Parameter is required in case host param doesn't contain complete jdbc connection string
+        :param host: host name and port number of the computer hosting your database.
+            Jdbc connection string can be passed as host param.
+        :param database: the name of the database or service to connect to.
+        :param username: the database user on whose behalf the connection is being made
+        :param password_file: path for a file containing the authentication password
+
+        :type rdbms: str
+        :type host: str
+        :type database: str
+        :type username: str
+        :type password_file: str
+        :rtype: SqoopExport
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_RDBMS, rdbms)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HOST, host)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_DATABASE, database)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_USERNAME, username)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_PASSWORD_FILE, password_file)
+
+        return self
+
+    def with_batch(self):
+        """
+        Sets sqoop-export to use batch mode for underlying statement execution.
+        By default, Sqoop uses a separate insert statement for each row.
+        Batch mode can be used to batch multiple insert statements together.
+
+        Alternatively you can override value of the sqoop.export.records.per.statement
+        to specify multiple rows inside one single insert statement.
+        :rtype: SqoopExport
+
+        """
+
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_BATCH, True)
+
+        return self
+
+    def with_staging_table(self, staging_table=None, clear_staging_table=False):
+        """
+        Specifies staging table's attributes.
+        Sqoop will load all data to a temporary(staging) table before making changes to the real table.
+        Sqoop requires that the structure of the staging table be the same as that of the target table.
+        The number of columns and their types must be the same; otherwise, the export operation will fail
+
+        Such approach can be used to guarantee all-or-nothing semantics for the export operation:
+        Sqoop opens a new transaction to move data from the staging table to the final destination,
+        if and only if all parallel tasks successfully transfer data.
+
+        :param staging_table: staging table name
+        :param clear_staging_table: If True, indicates that any data present in the staging table can be deleted.
+        :type staging_table: str
+        :type clear_staging_table: bool
+        :rtype: SqoopExport
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_STAGING_TABLE, staging_table)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_CLEAR_STAGING_TABLE, clear_staging_table)
+
+        return self
+
+    def with_update(self, update_key=None, update_mode=None):
+        """
+        Configures sqoop-export command to conditionally insert a new row or update an existing one.
+
+        N.B.! : This feature is not available on all database systems nor supported by all Sqoop connectors.
+        Currently it's available only for Oracle and nondirect MySQL exports.
+
+        :param update_key: Anchor column to use for updates.
+            Use a comma separated list of columns if there are more than one column.
+        :param update_mode: Specify how updates are performed when
+            new rows are found with non-matching keys in database.
+            Legal values for mode include updateonly (default) and allowinsert.
+        :type update_key: str
+        :type update_mode: str
+        :rtype: SqoopExport
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_UPDATE_KEY, update_key)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_UPDATE_MODE, update_mode)
+
+        return self
+
+    def table(self, table=None, columns=None):
+        """
+        Configures sqoop-export destination table.
+
+        In case subset of columns is exported, Sqoop assumes that HDFS data contains the same number
+        and ordering of columns as the destination table.
+
+        :param table: table to populate
+        :param columns: comma-separated list of column names which should be exported to destination database
+        :type table: str
+        :type columns: list, str
+        :rtype: SqoopExport
+
+        """
+        if isinstance(columns, list):
+            columns = ListUtility.to_string(columns)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_TABLE, table)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_COLUMNS, columns)
+
+        return self
+
+    def with_encoding(self, input_null_string=None, input_null_non_string=None):
+        """
+        Overrides the default string constant used for encoding missing values in the database.
+
+        :param input_null_string: constant used for encoding missing values for text-based columns
+        :param input_null_non_string: constant used for encoding missing values for not text-based columns
+        :type input_null_string: str
+        :type input_null_non_string: str
+        :rtype: SqoopExport
+
+        """
+        input_null_string = Sqoop.__quotes_wrapper__(input_null_string)
+        input_null_non_string = Sqoop.__quotes_wrapper__(input_null_non_string)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_NULL_STRING, input_null_string)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INPUT_NULL_NON_STRING, input_null_non_string)
+
+        return self
+
+    def call(self, stored_procedure=None):
+        """
+        Configures sqoop-export job to use store procedure to populate target table.
+
+        :param stored_procedure: Stored Procedure to call
+        :type stored_procedure: str
+        :rtype: SqoopExport
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_CALL, stored_procedure)
+
+        return self
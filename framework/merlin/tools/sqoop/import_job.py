@@ -0,0 +1,583 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Wrapper for sqoop-import command line utility.
+"""
+
+from string import Template
+import re
+import uuid
+
+from merlin.common.configurations import Configuration
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import SqoopCommandError
+from merlin.common.utils import ListUtility
+from merlin.tools.sqoop.base import Sqoop, TaskOptions
+
+
+class SqoopImport(Sqoop):
+    """
+    Sqoop's import command.
+    Provides logic to load  an individual table from an RDBMS to HDFS.
+    Each row from a table is represented as a separate record in HDFS.
+    Records can be stored as text files (one record per line), or in binary representation as Avro or SequenceFiles.
+
+    Sqoop Import job configuration can be loaded from external Ini file.
+    Job name is used as a name of the configuration section containing job specific options.
+    Allowed configuration keys are listed in hadoopframework.tools.sqoop.TaskOptions
+
+    Alternatively, you can also use provided API to configure and run import job.
+
+    """
+
+    # Sqoop reports arguments for the next incremental import,
+    # e.g. 'tool.ImportTool:   --last-value 1000'
+    LAST_VALUE_PATTERN = re.compile(r"--last-value\s+(.+)$", re.MULTILINE)
+
+    def __init__(self, name=None, config=None, executor=execute_shell_command):
+        """
+
+        :param name: job name. used to store/load job specific settings from configurations
+        :param config: job configurations
+        :param executor: The interface used by the client to launch Sqoop import job.
+        """
+        self.name = name if name else "SQOOP_TASK_{0}".format(uuid.uuid4())
+        self.__executor = executor
+        self.specific_attributes = {}
+        self._state = None
+        self.command = "sqoop.import"
+        self._config = config if config else Configuration.create(
+            readonly=False,
+            accepts_nulls=True
+        )
+        self._process = None
+
+    @staticmethod
+    def load_preconfigured_job(name=None, config=None, executor=execute_shell_command):
+        """
+        Creates instance of SqoopImport. Configure it with options
+        :param config: sqoop job configurations
+        :param name: sqoop job identifier.
+             Will be used as a name of the section with job-specific configurations.
+        :param executor:
+        """
+        if name:
+            Sqoop.LOG.info("Load Sqoop Import attributes from section's in configuration "
+                           "[sqoop], [sqoop.import] and [{0}]".format(name))
+        else:
+            Sqoop.LOG.info("Load Sqoop Import attributes from section's in configuration "
+                           "[sqoop] and [sqoop.import]")
+        return SqoopImport(name, config, executor)
+
+    def __config_import__(self):
+        """
+        Prepare command attributes to launch sqoop-import to HDFS
+        :rtype: list
+
+        """
+        list_command = []
+
+        if not self.has_option(TaskOptions.CONFIG_KEY_SQOOP_QUERY):
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_TABLE))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_COLUMNS))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_WHERE))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_TARGET_DIR))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_SPLIT_BY))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_NUM_MAPPERS))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_BOUNDARY_QUERY))
+        elif not self.has_option(TaskOptions.CONFIG_KEY_SQOOP_TABLE):
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_QUERY))
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_SPLIT_BY))
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_TARGET_DIR))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_NUM_MAPPERS))
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_BOUNDARY_QUERY))
+        else:
+            raise SqoopCommandError("You can't use table and query together")
+
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_AS):
+            list_command.append(self.get(TaskOptions.CONFIG_KEY_SQOOP_AS))
+
+        list_command.extend(self.__config_compress__())
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_APPEND))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_INLINE_LOB_LIMIT))
+
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_INCREMENTAL):
+            list_command.extend(self.__config_incremental__())
+
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_NULL_STRING))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_NULL_NON_STRING))
+
+        if self.has_option(TaskOptions.CONFIG_KEY_SQOOP_HIVE_IMPORT):
+            list_command.extend(self.__config_hive__())
+        else:
+            list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_MAP_COLUMN_JAVA))
+
+        if self.has_option('hbase_import'):
+            list_command.extend(self.__config_hbase__())
+
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_DIRECT_SPLIT_SIZE))
+
+        return list_command
+
+    def __config_hive__(self):
+        """
+        Prepare command attributes to launch sqoop-import to Hive
+        :rtype: list
+
+        """
+        list_command = []
+
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_IMPORT))
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_OVERWRITE))
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_CREATE_HIVE_TABLE))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_TABLE))
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_DROP_IMPORT_DELIMS))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_DELIMS_REPLACEMENT))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_PARTITION_KEY))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_PARTITION_VALUE))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_MAP_COLUMN_HIVE))
+
+        return list_command
+
+    def __config_hbase__(self):
+        """
+        Prepare command attributes to launch sqoop-import to HBase
+        :rtype: list
+
+        """
+
+        list_command = []
+        list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_HBASE_TABLE))
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_HBASE_CREATE_TABLE))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_HBASE_ROW_KEY))
+        list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_COLUMN_FAMILY))
+
+        return list_command
+
+    def __config_compress__(self):
+        """
+        Configuration method for compress data
+        :rtype: list
+
+        """
+        list_command = []
+        list_command.extend(self.__config_marker__(TaskOptions.CONFIG_KEY_SQOOP_COMPRESS))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_COMPRESSION_CODEC))
+
+        return list_command
+
+    def __config_incremental__(self):
+        """
+        Prepare command arguments required for incremental import
+        :rtype: list
+
+        """
+        list_command = []
+        if self.get(TaskOptions.CONFIG_KEY_SQOOP_INCREMENTAL) == 'append' \
+                or self.get(TaskOptions.CONFIG_KEY_SQOOP_INCREMENTAL) == 'lastmodified':
+            list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_INCREMENTAL))
+        else:
+            raise SqoopCommandError("You must specify one incremental mode from list: "
+                                    "'append', 'lastmodified'")
+        list_command.extend(self.__require_attr__(TaskOptions.CONFIG_KEY_SQOOP_CHECK_COLUMN))
+        list_command.extend(self.__optional_attr__(TaskOptions.CONFIG_KEY_SQOOP_LAST_VALUE))
+
+        return list_command
+
+    def run(self):
+        """
+        Runs Sqoop Import command
+        :rtype:
+
+        """
+        Sqoop.LOG.info("Running Sqoop Import Job")
+        self.load_incremental_state()
+        self._process = self.__executor('sqoop-import', self.build())
+        self._process.if_failed_raise(SqoopCommandError("Sqoop Job failed"))
+        self.save_incremental_state(SqoopImport.last_value(self._process))
+        return self._process
+
+    def load_incremental_state(self):
+        """
+        Reads last value of the check column from the store configured by with_incremental_state
+        and passes it to the import as --last-value
+        :return: last value or None in case incremental state is not configured
+        """
+        if not self._state:
+            return None
+        _store, _key, _initial_value = self._state
+        _last_value = _store.load(_key)
+        _last_value = _last_value if _last_value is not None else _initial_value
+        Sqoop.LOG.info("Last value of incremental import {0} : {1}".format(_key, _last_value))
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_LAST_VALUE,
+                          Sqoop.__quotes_wrapper__(_last_value))
+        return _last_value
+
+    def save_incremental_state(self, last_value):
+        """
+        Saves last value of the check column into the store configured by with_incremental_state
+        :param last_value: last value reported by Sqoop. Nothing is saved in case it's None
+        """
+        if self._state and last_value is not None:
+            self._state[0].save(self._state[1], last_value)
+
+    def with_incremental_state(self, store, incremental='append', check_column=None, key=None,
+                               initial_value=None):
+        """
+        Configures incremental import which keeps last value of the check column in the given store.
+        Last value is read from the store before import and updated only after successful import.
+
+        :param store: store of the last values,
+            e.g. LocalFileStateStore, HdfsStateStore, TablePropertiesStateStore
+        :param incremental: incremental import mode, 'append' or 'lastmodified'
+        :param check_column: Specifies the column to be examined
+            when determining which rows to import
+        :param key: name of the import state within the store. Job name is used by default
+        :param initial_value: last value used in case store does not contain import state yet
+
+        :type incremental: str
+        :type check_column: str
+        :type key: str
+        :type initial_value: str
+        :rtype: SqoopImport
+
+        """
+        self.with_incremental(incremental=incremental, check_column=check_column,
+                              last_value=initial_value)
+        self._state = (store, key if key else self.name, initial_value)
+        return self
+
+    @staticmethod
+    def last_value(result):
+        """
+        Parses last value of the check column reported by Sqoop after incremental import
+        :param result: result of Sqoop Import command
+        :return: last value or None in case it was not reported
+        """
+        _values = SqoopImport.LAST_VALUE_PATTERN.findall("{0}\n{1}".format(
+            result.stdout or "", result.stderr or ""))
+        return _values[-1].strip() if _values else None
+
+    def copy(self, name):
+        """
+        Creates import job with the same configuration.
+        Incremental state is not copied : the copy imports from the last value
+        configured at the moment of the copy and doesn't update the store
+        :param name: name of the new job
+        :rtype: SqoopImport
+        """
+        self._copy_config_(name)
+        return SqoopImport(name=name, config=self._config, executor=self.__executor)
+
+    def _executor_(self):
+        return self.__executor
+
+    def from_rdbms(self, rdbms=None, host=None, database=None, username=None, password_file=None):
+        """
+        Configures JDBC connection to datasource.
+
+        :param rdbms: the name of the datasource driver which will be used to accessed to database.
+            E.g.: mysql, microsoft:sqlserver, oracle:thin, etc.
+            Parameter is required in case host param doesn't contain complete jdbc connection string
+        :param host: host name and port number of the computer hosting your database.
+            Jdbc connection string can be passed as host param.
+        :param database: the name of the database or service to connect to.
+        :param username: the database user on whose behalf the connection is being made
+        :param password_file: path for a file containing the authentication password
+
+        :type rdbms: str
+        :type host: str
+        :type database: str
+        :type username: str
+        :type password_file: str
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_RDBMS, rdbms)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HOST, host)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_DATABASE, database)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_USERNAME, username)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_PASSWORD_FILE, password_file)
+
+        return self
+
+    def table(self, table=None, columns=None, where=None):
+        """
+        Configures select query which will be used to import data from database
+
+        :param table: Table to read. This argument can also identify a VIEW or other table-like entity in a database.
+        :param columns: Columns to import from table. By default, all columns within a table are selected for import.
+        :param where: WHERE clause to use during import
+
+        :type table: str
+        :type columns: str
+        :type where: str
+        :rtype: SqoopImport
+
+        """
+        where = Sqoop.__double_quotes_wrapper__(where)
+        if isinstance(columns, list):
+            columns = ListUtility.to_string(columns)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_TABLE, table)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_COLUMNS, columns)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_WHERE, where)
+
+        return self
+
+    def query(self, query=None, split_by=None, boundary_query=None, **attr):
+        """
+        Configures free-form import query
+
+        :param query: sql query which will be used to import data from database.
+            Can contain placeholders : a variable consists of a leading "$" character followed by variable name.
+            Query placeholders will be replaced with specific values provided as function arguments
+        :param split_by: column of the table used to split work.
+            If split column is not specified, Sqoop will try to identify the primary key column,
+            if any, of the source table.
+        :param boundary_query: boundary query to use for creating splits
+        :param attr: properties which can be used to substitute placeholders in query.
+
+        :type query: str
+        :type split_by: str
+        :type target_dir: str
+        :rtype: SqoopImport
+
+        """
+        query = Template(query).safe_substitute(attr)
+        if query[0] == "'" or query[0] == "\"":
+            query = query[1:query.__len__() - 1]
+        if "\$CONDITIONS" not in query:
+            query = query.replace("$CONDITIONS", "\$CONDITIONS")
+        if "\$CONDITIONS" not in query:
+            if "where" in query.lower():
+                query = "{0} AND \$CONDITIONS".format(query)
+            else:
+                query = "{0} WHERE \$CONDITIONS".format(query)
+
+        query = Sqoop.__double_quotes_wrapper__(query)
+        boundary_query = Sqoop.__quotes_wrapper__(boundary_query)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_QUERY, query)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_SPLIT_BY, split_by)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_BOUNDARY_QUERY, boundary_query)
+
+        return self
+
+    def to_hdfs(self, target_dir=None):
+        """
+        Specifies the directory on HDFS into which the data should be imported.
+        Exception will be raised in case the destination directory is already exists in HDFS,
+
+        :param target_dir: destination directory
+        :type target_dir: str
+        :rtype: SqoopImport
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_TARGET_DIR, target_dir)
+
+        return self
+
+    def with_incremental(self, incremental=None, check_column=None, last_value=None):
+        """
+        Configures incremental import.
+
+        :param incremental: incremental import mode.
+            Legal values for mode include 'append' and 'lastmodified'.
+            Use 'append' mode for numerical data that is incrementing over time, such as auto-increment keys,
+            "lastmodified" works on time-stamped data
+        :param check_column: Specifies the column to be examined when determining which rows to import.
+            The column should not be of type CHAR/NCHAR/VARCHAR/VARNCHAR/ LONGVARCHAR/LONGNVARCHAR
+        :param last_value: the maximum value of the check column from the previous import.
+
+        :type incremental: str
+        :type check_column: str
+        :type last_value: str
+        :rtype: SqoopImport
+
+        """
+
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_INCREMENTAL, incremental)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_CHECK_COLUMN, check_column)
+        last_value = Sqoop.__quotes_wrapper__(last_value)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_LAST_VALUE, last_value)
+
+        return self
+
+    def with_compress(self, compression_codec=None):
+        """
+        Enables compression
+        By default, data is not compressed.
+        :param compression_codec: compression codec that can be used for data compression/decompression.
+        :type compression_codec: str
+        :rtype: SqoopImport
+
+        """
+
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_COMPRESS, True)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_COMPRESSION_CODEC, compression_codec)
+
+        return self
+
+    def with_encoding(self, null_string=None, null_non_string=None):
+        """
+        Configures NULL values encoding
+
+        :param null_string: The string to be written for a null value for string columns
+            If not specified, then the string "null" will be used.
+        :param null_non_string: The string to be written for a null value for non-string columns
+            If not specified, then the string "null" will be used.
+        :type null_string: str
+        :type null_non_string: str
+        :rtype: SqoopImport
+
+        """
+        null_string = Sqoop.__quotes_wrapper__(null_string)
+        null_non_string = Sqoop.__quotes_wrapper__(null_non_string)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_NULL_STRING, null_string)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_NULL_NON_STRING, null_non_string)
+
+        return self
+
+    def to_hbase(self, hbase_table=None, hbase_create_table=False, hbase_row_key=None,
+                 column_family=None):
+        """
+        Imports data into HBase
+
+        :param hbase_table: HBase table to use as the target
+        :param hbase_create_table: If specified, create missing HBase tables
+        :param hbase_row_key: Specifies which input column to use as the row key
+            In case, if input table contains composite  key, then <col> must be in the form of a
+            comma-separated list of composite key attributes
+        :param column_family: the target column family for the import
+
+        :type hbase_table: str
+        :type hbase_create_table: bool
+        :type hbase_row_key: str
+        :type column_family: str
+        :rtype: SqoopImport
+
+        """
+        self.__set_attr__('hbase_import', 'hbase_import')
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HBASE_TABLE, hbase_table)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_HBASE_CREATE_TABLE, hbase_create_table)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HBASE_ROW_KEY, hbase_row_key)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_COLUMN_FAMILY, column_family)
+
+        return self
+
+    def to_hive(self, hive_overwrite=False, create_hive_table=None, hive_table=None,
+                hive_drop_import_delims=None, hive_delims_replacement=None,
+                hive_partition_key=None, hive_partition_value=None, map_column_hive=None):
+        """
+        Imports data into Hive
+
+        :param hive_overwrite: overwrite existing data in the Hive table.
+        :param create_hive_table: create Hive table.
+            If set, then the job will fail if the target hive table exits.
+            By default this property is false.
+        :param hive_table: destination table name
+        :param hive_drop_import_delims: Drops \n, \r, and \01 from string fields when importing to Hive.
+        :param hive_delims_replacement: Replace \n, \r, and \01 from string fields with user defined string
+            when importing to Hive.
+        :param hive_partition_key: name of the hive partition
+        :param hive_partition_value: partition value
+        :param map_column_hive: SQL type to Hive type mapping.
+            Mapping format should be the next "id=STRING,price=DECIMAL"
+
+        :type hive_overwrite: bool
+        :type create_hive_table: bool
+        :type hive_table: str
+        :type hive_drop_import_delims: bool
+        :type hive_delims_replacement: str
+        :type hive_partition_key: str
+        :type hive_partition_value: str
+        :type map_column_hive: str
+
+        :rtype: SqoopImport
+
+        """
+        hive_partition_value = Sqoop.__quotes_wrapper__(hive_partition_value)
+        hive_delims_replacement = Sqoop.__quotes_wrapper__(hive_delims_replacement)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_IMPORT, True)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_OVERWRITE, hive_overwrite)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_CREATE_HIVE_TABLE, create_hive_table)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_TABLE, hive_table)
+        self.__set_marker_enabled__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_DROP_IMPORT_DELIMS, hive_drop_import_delims)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_DELIMS_REPLACEMENT, hive_delims_replacement)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_PARTITION_KEY, hive_partition_key)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_HIVE_PARTITION_VALUE, hive_partition_value)
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_MAP_COLUMN_HIVE, map_column_hive)
+
+        return self
+
+    def use_file_format(self, file_format=None):
+        """
+        Specifies file format
+        :type file_format: str
+        :rtype: SqoopImport
+
+        """
+        if file_format not in ["--as-avrodatafile", "--as-sequencefile", "--as-textfile"]:
+            Sqoop.LOG.warning("You use your custom format {0}. You must be sure that "
+                              "sqoop support this file format. "
+                              "Framework knows next formats: "
+                              "'--as-avrodatafile', '--as-sequencefile' or '--as-textfile'"
+                              .format(file_format))
+        self.__set_attr__(TaskOptions.CONFIG_KEY_SQOOP_AS, file_format)
+
+        return self
+
+    def as_textfile(self):
+        """
+        Imports data as plain text (default)
+        :rtype: SqoopImport
+        """
+        self.use_file_format('--as-textfile')
+
+        return self
+
+    def as_sequencefile(self):
+        """
+        Imports data to SequenceFiles
+        :rtype: SqoopImport
+        """
+        self.use_file_format('--as-sequencefile')
+
+        return self
+
+    def as_avrofile(self):
+        """
+        Imports data to Avro Data Files
+        :rtype: SqoopImport
+        """
+        self.use_file_format('--as-avrodatafile')
+
+        return self
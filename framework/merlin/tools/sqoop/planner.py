@@ -0,0 +1,227 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Planning of balanced range-partitioned imports.
+"""
+
+from merlin.common.logger import get_logger
+from merlin.tools.sqoop.base import TaskOptions
+from merlin.tools.sqoop.import_job import SqoopImport
+from merlin.tools.sqoop.scheduler import SqoopImportScheduler
+
+
+class SplitPlanner(object):
+    """
+    Plans balanced import of the table which split column values are distributed unevenly.
+
+    Sqoop divides [min, max] range of the split column into equal intervals, one per mapper,
+    so mappers importing densely populated intervals take most of the time.
+    Planner evaluates histogram of the split column (equal-height buckets calculated with NTILE)
+    and divides the import into several range-partitioned imports
+    holding roughly the same number of rows.
+    Every import gets its own --boundary-query
+    and appends into the target directory of the original job,
+    so the data lands in the same place as with a single import
+    (optionally, into per-range sub-directories).
+    The import can not be balanced beyond a single value of the split column.
+    """
+
+    LOG = get_logger("SplitPlanner")
+    HISTOGRAM_QUERY = "SELECT MIN({column}), MAX({column}), COUNT(*) FROM " \
+                      "(SELECT {column}, " \
+                      "NTILE({buckets}) OVER (ORDER BY {column}) AS merlin_bucket " \
+                      "FROM {source} WHERE {column} IS NOT NULL AND {where}) merlin_histogram " \
+                      "GROUP BY merlin_bucket ORDER BY 1"
+
+    def __init__(self, job, split_column=None, buckets=100, histogram_query=None):
+        """
+        :param job: import job to plan
+        :type job: SqoopImport
+        :param split_column: numeric column used to split work. Job split column is used by default
+        :param buckets: number of histogram buckets
+        :param histogram_query: custom query returning (min, max, count) rows ordered by min.
+            NTILE-based query is used by default, database should support window functions
+        """
+        super(SplitPlanner, self).__init__()
+        self.job = job
+        self.split_column = split_column if split_column \
+            else job.get(TaskOptions.CONFIG_KEY_SQOOP_SPLIT_BY, required=True)
+        self.buckets = buckets
+        self.histogram_query = histogram_query
+        self._histogram = None
+
+    def histogram(self):
+        """
+        Evaluates histogram of the split column
+        :return: list of (min, max, count) buckets ordered by min
+        """
+        if self._histogram is None:
+            _query = self.histogram_query if self.histogram_query \
+                else self._default_histogram_query_()
+            self._histogram = [(_low, _high, long(_count))
+                               for _low, _high, _count in self.job.evaluate(_query)
+                               if _count and long(_count)]
+        return self._histogram
+
+    def skew(self, num_mappers):
+        """
+        Estimates how unbalanced default Sqoop split would be
+        :param num_mappers: number of mappers
+        :return: ratio of the largest split size to the average split size
+        """
+        _histogram = self.histogram()
+        if not _histogram:
+            return 1.0
+        _low, _high = float(_histogram[0][0]), float(_histogram[-1][1])
+        _width = (_high - _low) / num_mappers
+        _splits = [0.0] * num_mappers
+        for _bucket_low, _bucket_high, _count in _histogram:
+            _bucket_low, _bucket_high = float(_bucket_low), float(_bucket_high)
+            if not _width or _bucket_high == _bucket_low:
+                _split = min(int((_bucket_low - _low) / _width), num_mappers - 1) if _width else 0
+                _splits[_split] += _count
+                continue
+            # rows are assumed to be distributed uniformly within the bucket
+            for _split in range(num_mappers):
+                _overlap = min(_bucket_high, _low + (_split + 1) * _width) \
+                    - max(_bucket_low, _low + _split * _width)
+                if _overlap > 0:
+                    _splits[_split] += _count * _overlap / (_bucket_high - _bucket_low)
+        return max(_splits) / (sum(_splits) / num_mappers)
+
+    def plan(self, ranges):
+        """
+        Groups histogram buckets into ranges holding roughly the same number of rows
+        :param ranges: number of ranges
+        :return: list of (low, high, count) ranges
+        """
+        _histogram = self.histogram()
+        _total = float(sum(_count for _, _, _count in _histogram))
+        _plan = []
+        _accumulated = 0
+        for _low, _high, _count in _histogram:
+            # bucket is added to the current range until the range gets its share of rows.
+            # Buckets starting with the same value can not be split between ranges
+            if _plan and (_accumulated < _total * len(_plan) / ranges or _plan[-1][1] == _low):
+                _plan[-1] = (_plan[-1][0], _high, _plan[-1][2] + _count)
+            else:
+                _plan.append((_low, _high, _count))
+            _accumulated += _count
+        return _plan
+
+    def imports(self, num_mappers, ranges=None, subdirectories=False):
+        """
+        Creates range-partitioned import jobs.
+        Mappers are distributed among ranges proportionally to range size.
+        By default every range import runs with --append
+        into the target directory of the original job.
+        Incremental state of the original job is loaded once and passed to every range import
+        as --last-value, range imports don't update it : use run() to save the state
+        after all range imports succeeded.
+        :param num_mappers: total number of mappers
+        :param ranges: number of ranges. Equals to number of mappers by default
+        :param subdirectories: indicates that every range import should write into its own
+            sub-directory range_NNNNN of the target directory instead of appending into it
+        :return: list of import jobs, one per range
+        """
+        _target_dir = self.job.get(TaskOptions.CONFIG_KEY_SQOOP_TARGET_DIR, required=True)
+        self.job.load_incremental_state()
+        _plan = self.plan(ranges if ranges else num_mappers)
+        _total = float(sum(_count for _, _, _count in _plan))
+        _jobs = []
+        for _index, (_low, _high, _count) in enumerate(_plan):
+            _job = self.job.copy("{0}_range_{1}".format(self.job.name, _index))
+            if subdirectories:
+                _job.to_hdfs(target_dir="{0}/range_{1:05d}".format(_target_dir.rstrip('/'), _index))
+            else:
+                _job.with_attr(**{TaskOptions.CONFIG_KEY_SQOOP_APPEND: 'enabled'})
+            _job.use_num_mappers(max(1, int(round(num_mappers * _count / _total))))
+            _job.with_attr(split_by=self.split_column,
+                           boundary_query="\"SELECT {0}, {1}\"".format(self._literal_(_low),
+                                                                      self._literal_(_high)))
+            _jobs.append(_job)
+        SplitPlanner.LOG.info("Import {0} was split into {1} range imports".format(
+            self.job.name, len(_jobs)))
+        return _jobs
+
+    def run(self, num_mappers, ranges=None, subdirectories=False, max_parallel=4):
+        """
+        Runs range-partitioned imports concurrently, see imports().
+        Incremental state of the original job is saved once, after all range imports succeeded
+        :param num_mappers: total number of mappers
+        :param ranges: number of ranges. Equals to number of mappers by default
+        :param subdirectories: see imports()
+        :param max_parallel: max number of range imports running at the same time
+        :return: reports of range imports
+        :rtype: list
+        """
+        _scheduler = SqoopImportScheduler(max_parallel=max_parallel,
+                                          connections_per_database=max_parallel)
+        for _job in self.imports(num_mappers, ranges=ranges, subdirectories=subdirectories):
+            _scheduler.add(_job)
+        _reports = _scheduler.run(raise_on_failure=True)
+        self.job.save_incremental_state(SplitPlanner._latest_(
+            [SqoopImport.last_value(_report.result) for _report in _reports]))
+        return _reports
+
+    @staticmethod
+    def _latest_(values):
+        """
+        :return: the latest of last values reported by range imports, numeric values are compared
+            as numbers, timestamps of 'lastmodified' imports are compared as strings
+        """
+        _values = [_value for _value in values if _value is not None]
+        if not _values:
+            return None
+        try:
+            return max(_values, key=float)
+        except ValueError:
+            return max(_values)
+
+    @staticmethod
+    def _literal_(value):
+        try:
+            float(value)
+            return value
+        except ValueError:
+            return "'{0}'".format(value)
+
+    def _default_histogram_query_(self):
+        if self.job.has_option(TaskOptions.CONFIG_KEY_SQOOP_QUERY):
+            _query = self.job.get(TaskOptions.CONFIG_KEY_SQOOP_QUERY).strip('"') \
+                .replace("\\$CONDITIONS", "1=1")
+            _source, _where = "({0}) merlin_source".format(_query), "1=1"
+        else:
+            _source = self.job.get(TaskOptions.CONFIG_KEY_SQOOP_TABLE, required=True)
+            _where = self.job.get(TaskOptions.CONFIG_KEY_SQOOP_WHERE).strip('"') \
+                if self.job.has_option(TaskOptions.CONFIG_KEY_SQOOP_WHERE) else "1=1"
+        return SplitPlanner.HISTOGRAM_QUERY.format(column=self.split_column, buckets=self.buckets,
+                                                   source=_source, where=_where)
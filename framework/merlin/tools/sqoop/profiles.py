@@ -0,0 +1,230 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Export throughput profiles and the benchmark picking the fastest one.
+"""
+
+import re
+import time
+
+from merlin.common.logger import get_logger
+from merlin.common.exceptions import SqoopCommandError
+from merlin.tools.sqoop.base import TaskOptions
+
+
+class ExportProfile(object):
+    """
+    Set of Sqoop export options affecting throughput
+    """
+
+    def __init__(self, name, records_per_statement=None, statements_per_transaction=None,
+                 batch=False, direct=False, num_mappers=None, staging_suffix=None):
+        """
+        :param name: profile name
+        :param records_per_statement: number of rows inserted
+            by a single multi-row INSERT statement
+        :param statements_per_transaction: number of statements committed
+            within a single transaction
+        :param batch: indicates that JDBC batch mode should be used
+        :param direct: indicates that database-specific direct channel should be used
+        :param num_mappers: number of map tasks
+        :param staging_suffix: indicates that data should be loaded through the staging table
+            named as the target table with the given suffix.
+            The staging table is cleared before export
+        """
+        self.name = name
+        self.records_per_statement = records_per_statement
+        self.statements_per_transaction = statements_per_transaction
+        self.batch = batch
+        self.direct = direct
+        self.num_mappers = num_mappers
+        self.staging_suffix = staging_suffix
+
+    @staticmethod
+    def for_rdbms(rdbms, name):
+        """
+        Looks for the profile predefined for the given RDBMS
+        :param rdbms: RDBMS name, e.g. mysql
+        :param name: profile name
+        :rtype: ExportProfile
+        """
+        for _profile in EXPORT_PROFILES.get(rdbms, EXPORT_PROFILES['default']):
+            if _profile.name == name:
+                return _profile
+        raise SqoopCommandError("Export profile {0} is not defined for {1}".format(name, rdbms))
+
+    def apply(self, job):
+        """
+        Configures export job with profile options
+        :type job: SqoopExport
+        :rtype: SqoopExport
+        """
+        if self.records_per_statement:
+            job.with_hadoop_properties(
+                sqoop_export_records_per_statement=self.records_per_statement)
+        if self.statements_per_transaction:
+            job.with_hadoop_properties(
+                sqoop_export_statements_per_transaction=self.statements_per_transaction)
+        if self.batch:
+            job.with_batch()
+        if self.direct:
+            job.with_direct_mode()
+        if self.num_mappers:
+            job.use_num_mappers(self.num_mappers)
+        if self.staging_suffix:
+            _table = job.get(TaskOptions.CONFIG_KEY_SQOOP_TABLE, required=True)
+            job.with_staging_table(staging_table=_table + self.staging_suffix,
+                                   clear_staging_table=True)
+        return job
+
+    def __repr__(self):
+        return "ExportProfile({0})".format(self.name)
+
+
+# Export profiles known to work well for the specific databases.
+# Oracle does not support multi-row INSERT statements,
+# SQL Server limits number of statement parameters
+EXPORT_PROFILES = {
+    'default': [ExportProfile('row'),
+                ExportProfile('batch', batch=True, statements_per_transaction=100)],
+    'mysql': [ExportProfile('row'),
+              ExportProfile('multirow', records_per_statement=100, statements_per_transaction=100),
+              ExportProfile('batch', batch=True, statements_per_transaction=100),
+              ExportProfile('direct', direct=True)],
+    'postgresql': [ExportProfile('row'),
+                   ExportProfile('multirow', records_per_statement=100,
+                                 statements_per_transaction=100),
+                   ExportProfile('batch', batch=True, statements_per_transaction=100),
+                   ExportProfile('direct', direct=True)],
+    'oracle:thin': [ExportProfile('row'),
+                    ExportProfile('batch', batch=True, statements_per_transaction=1000),
+                    ExportProfile('direct', direct=True)],
+    'microsoft:sqlserver': [ExportProfile('row'),
+                            ExportProfile('multirow', records_per_statement=10,
+                                          statements_per_transaction=100),
+                            ExportProfile('batch', batch=True, statements_per_transaction=100)]
+}
+
+
+class BenchmarkResult(object):
+    """
+    Throughput of the export measured by ExportBenchmark
+    """
+
+    def __init__(self, profile, duration, rows=None, error=None):
+        self.profile = profile
+        self.duration = duration
+        self.rows = rows
+        self.error = error
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.duration if self.rows and self.duration else 0.0
+
+    def __repr__(self):
+        return "BenchmarkResult(profile={0}, rows={1}, duration={2:.1f}, " \
+               "rows_per_second={3:.1f})".format(self.profile.name, self.rows, self.duration,
+                                                 self.rows_per_second)
+
+
+class ExportBenchmark(object):
+    """
+    Exports sample dataset with every profile and measures throughput to pick the best profile
+    """
+
+    LOG = get_logger("ExportBenchmark")
+    RECORDS_PATTERN = re.compile(r"Exported (\d+) records")
+
+    def __init__(self, job, sample_dir, table, profiles=None, cleanup=True):
+        """
+        :param job: export job to benchmark
+        :type job: SqoopExport
+        :param sample_dir: HDFS directory with sample dataset
+        :param table: dedicated table to export sample dataset to.
+            Must differ from the job target table
+        :param profiles: profiles to benchmark.
+            Profiles predefined for the target RDBMS are used by default
+        :param cleanup: indicates that all rows should be deleted from the benchmark table
+            before each run, so runs export the sample into the empty table
+        """
+        super(ExportBenchmark, self).__init__()
+        if not table:
+            raise SqoopCommandError("Benchmark table is required")
+        if table == job.get(TaskOptions.CONFIG_KEY_SQOOP_TABLE):
+            raise SqoopCommandError(
+                "Benchmark table must differ from the target table '{0}'".format(table))
+        self.job = job
+        self.sample_dir = sample_dir
+        self.table = table
+        self.profiles = profiles if profiles else EXPORT_PROFILES.get(
+            job.get(TaskOptions.CONFIG_KEY_SQOOP_RDBMS), EXPORT_PROFILES['default'])
+        self.cleanup = cleanup
+
+    def run(self):
+        """
+        Runs benchmark
+        :return: results ordered by throughput, the best first
+        :rtype: list
+        """
+        _results = [self._measure_(_index, _profile)
+                    for _index, _profile in enumerate(self.profiles)]
+        return sorted(_results, key=lambda _result: -_result.rows_per_second)
+
+    def best(self):
+        """
+        :return: profile with the highest throughput among profiles the export succeeded with
+        :rtype: ExportProfile
+        """
+        _succeeded = [_result for _result in self.run() if _result.error is None and _result.rows]
+        if not _succeeded:
+            raise SqoopCommandError("Export failed with all profiles")
+        return _succeeded[0].profile
+
+    def _measure_(self, index, profile):
+        _job = self.job.copy("{0}_benchmark_{1}".format(self.job.name, index))
+        # profile is applied after switching to benchmark table, so staging table is named after it
+        profile.apply(_job.from_hdfs(export_dir=self.sample_dir).with_attr(table=self.table))
+        if self.cleanup:
+            _job.evaluate("DELETE FROM {0}".format(self.table))
+        _started = time.time()
+        try:
+            result = _job.run()
+        except SqoopCommandError as e:
+            ExportBenchmark.LOG.warning("Export with profile {0} failed : {1}".format(
+                profile.name, e))
+            return BenchmarkResult(profile, time.time() - _started, error=e)
+        _duration = time.time() - _started
+        _match = ExportBenchmark.RECORDS_PATTERN.search("{0}\n{1}".format(
+            result.stdout or "", result.stderr or ""))
+        _result = BenchmarkResult(profile, _duration,
+                                  rows=int(_match.group(1)) if _match else None)
+        ExportBenchmark.LOG.info(str(_result))
+        return _result
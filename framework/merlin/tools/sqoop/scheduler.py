@@ -0,0 +1,195 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Concurrent execution of many Sqoop imports.
+"""
+
+import re
+import threading
+import time
+
+from merlin.common.logger import get_logger
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import SqoopCommandError
+from merlin.tools.sqoop.base import TaskOptions
+from merlin.tools.sqoop.import_job import SqoopImport
+
+
+class ImportReport(object):
+    """
+    Outcome of the import scheduled by SqoopImportScheduler
+    """
+
+    def __init__(self, name, duration, rows=None, error=None, result=None):
+        """
+        :param name: import job name
+        :param duration: import duration in seconds
+        :param rows: number of imported records reported by Sqoop
+        :param error: exception which failed the import
+        :param result: result of Sqoop Import command
+        """
+        self.name = name
+        self.duration = duration
+        self.rows = rows
+        self.error = error
+        self.result = result
+
+    def is_ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "ImportReport(name={0}, duration={1:.1f}, rows={2}, error={3})".format(
+            self.name, self.duration, self.rows, self.error)
+
+
+class SqoopImportScheduler(object):
+    """
+    Runs many Sqoop Import jobs concurrently.
+    Number of simultaneous imports from the same database is limited,
+    imports of larger tables are started first to minimize total import time.
+    """
+
+    LOG = get_logger("SqoopImportScheduler")
+    RECORDS_PATTERN = re.compile(r"Retrieved (\d+) records")
+
+    def __init__(self, max_parallel=4, connections_per_database=2):
+        """
+        :param max_parallel: max number of imports running at the same time
+        :param connections_per_database: max number of imports running
+            against the same database at the same time
+        """
+        super(SqoopImportScheduler, self).__init__()
+        self.max_parallel = max_parallel
+        self.connections_per_database = connections_per_database
+        self.jobs = []
+
+    def add(self, job, size=None):
+        """
+        Schedules import job
+        :param job: import job
+        :type job: SqoopImport
+        :param size: estimated size of the table, e.g. number of rows or bytes.
+            Jobs of unknown size are started after jobs of known size
+        :rtype: SqoopImportScheduler
+        """
+        self.jobs.append((job, size))
+        return self
+
+    def add_preconfigured(self, config, *names, **kwargs):
+        """
+        Schedules import jobs loaded from the configuration sections with the given names
+        :param config: sqoop jobs configuration
+        :param names: names of the sections with job-specific configurations
+        :param kwargs: executor - the interface used by the client to launch Sqoop import jobs
+        :rtype: SqoopImportScheduler
+        """
+        _executor = kwargs.get('executor', execute_shell_command)
+        for _name in names:
+            self.add(SqoopImport.load_preconfigured_job(name=_name, config=config,
+                                                        executor=_executor))
+        return self
+
+    @staticmethod
+    def database(job):
+        """
+        :return: identifier of the database the job imports from
+        """
+        return "{0}/{1}/{2}".format(job.get(TaskOptions.CONFIG_KEY_SQOOP_RDBMS),
+                                    job.get(TaskOptions.CONFIG_KEY_SQOOP_HOST),
+                                    job.get(TaskOptions.CONFIG_KEY_SQOOP_DATABASE))
+
+    def run(self, raise_on_failure=True):
+        """
+        Runs all scheduled imports and waits for them to complete
+        :param raise_on_failure: indicates that SqoopCommandError should be raised
+            in case any import failed
+        :return: reports in the order jobs were scheduled
+        :rtype: list
+        """
+        _pending = sorted(range(len(self.jobs)),
+                          key=lambda _index: (self.jobs[_index][1] is None,
+                                              -(self.jobs[_index][1] or 0), _index))
+        _running = {}
+        _reports = [None] * len(self.jobs)
+        _condition = threading.Condition()
+
+        def next_job():
+            with _condition:
+                while _pending:
+                    for _position, _index in enumerate(_pending):
+                        _database = self.database(self.jobs[_index][0])
+                        if _running.get(_database, 0) < self.connections_per_database:
+                            _running[_database] = _running.get(_database, 0) + 1
+                            del _pending[_position]
+                            return _index, _database
+                    _condition.wait()
+                return None, None
+
+        def worker():
+            while True:
+                _index, _database = next_job()
+                if _index is None:
+                    return
+                try:
+                    _reports[_index] = self._import_(self.jobs[_index][0])
+                finally:
+                    with _condition:
+                        _running[_database] -= 1
+                        _condition.notify_all()
+
+        _workers = [threading.Thread(target=worker)
+                    for _ in range(min(self.max_parallel, len(self.jobs)))]
+        for _worker in _workers:
+            _worker.daemon = True
+            _worker.start()
+        for _worker in _workers:
+            _worker.join()
+        _failed = [_report for _report in _reports if not _report.is_ok()]
+        if _failed and raise_on_failure:
+            raise SqoopCommandError("{0} of {1} imports failed : {2}".format(
+                len(_failed), len(_reports), ", ".join(_report.name for _report in _failed)))
+        return _reports
+
+    def _import_(self, job):
+        SqoopImportScheduler.LOG.info("Starting import {0}".format(job.name))
+        _started = time.time()
+        try:
+            result = job.run()
+        except Exception as e:
+            SqoopImportScheduler.LOG.error("Import {0} failed : {1}".format(job.name, e))
+            return ImportReport(name=job.name, duration=time.time() - _started, error=e)
+        _duration = time.time() - _started
+        _match = SqoopImportScheduler.RECORDS_PATTERN.search(str(result.stderr)) \
+            if result.stderr else None
+        _rows = int(_match.group(1)) if _match else None
+        SqoopImportScheduler.LOG.info("Import {0} completed in {1:.1f} seconds, {2} records".format(
+            job.name, _duration, _rows))
+        return ImportReport(name=job.name, duration=_duration, rows=_rows, result=result)
@@ -0,0 +1,148 @@
+#
+# Copyright (c) 2015 EPAM Systems, Inc. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+# Redistributions in binary form must reproduce the above copyright notice, this
+# list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+# Neither the name of the EPAM Systems, Inc. nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# See the NOTICE file and the LICENSE file distributed with this work
+# for additional information regarding copyright ownership and licensing.
+#
+
+"""
+Stores of the last values imported by incremental imports.
+"""
+
+import json
+import os
+import tempfile
+
+from merlin.common.shell_command_executor import execute_shell_command
+from merlin.common.exceptions import SqoopCommandError
+
+
+class LocalFileStateStore(object):
+    """
+    Keeps last values of incremental imports in the local JSON file
+    """
+
+    def __init__(self, path):
+        """
+        :param path: path to the local file
+        """
+        self.path = path
+
+    def load(self, key):
+        """
+        :return: last value stored at the given key or None
+        """
+        return self._values_().get(key)
+
+    def save(self, key, value):
+        """
+        Stores last value at the given key
+        """
+        _values = self._values_()
+        _values[key] = value
+        _dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(_dir):
+            os.makedirs(_dir)
+        _fd, _tmp = tempfile.mkstemp(dir=_dir)
+        with os.fdopen(_fd, 'w') as _file:
+            json.dump(_values, _file, indent=2)
+        os.rename(_tmp, self.path)
+
+    def _values_(self):
+        if not os.path.isfile(self.path):
+            return {}
+        with open(self.path) as _file:
+            return json.load(_file)
+
+
+class HdfsStateStore(object):
+    """
+    Keeps last values of incremental imports on HDFS, one file per import
+    """
+
+    def __init__(self, path, executor=execute_shell_command):
+        """
+        :param path: HDFS directory to keep state files in
+        :param executor: The interface used by the client to run command.
+        """
+        self.path = path
+        self.__executor = executor
+
+    def load(self, key):
+        """
+        :return: last value stored at the given key or None in case nothing was stored yet
+        :raise SqoopCommandError: in case state file exists but cannot be read
+        """
+        result = self.__executor('hadoop', 'fs', '-cat', self._file_(key))
+        if not result.is_ok():
+            if "No such file" in str(result.stderr):
+                return None
+            # importing everything again because of transient failure could duplicate the data
+            raise SqoopCommandError("Cannot load state of incremental import {0} : {1}".format(
+                key, result.stderr))
+        return str(result.stdout).strip() or None
+
+    def save(self, key, value):
+        """
+        Stores last value at the given key
+        """
+        self.__executor('hadoop', 'fs', '-mkdir', '-p', self.path).if_failed_raise(
+            SqoopCommandError("Cannot create state directory {0}".format(self.path)))
+        self.__executor("printf '%s' '{0}' |".format(value.replace("'", "'\\''")),
+                        'hadoop', 'fs', '-put', '-f', '-', self._file_(key)).if_failed_raise(
+            SqoopCommandError("Cannot save state of incremental import {0}".format(key)))
+
+    def _file_(self, key):
+        return "{0}/{1}".format(self.path.rstrip('/'), key)
+
+
+class TablePropertiesStateStore(object):
+    """
+    Keeps last values of incremental imports in Hive table properties
+    """
+
+    PROPERTY = "merlin.sqoop.{0}.last_value"
+
+    def __init__(self, table_properties):
+        """
+        :param table_properties: properties of the Hive table, see WebHCatalog.table_properties
+        :type table_properties: merlin.tools.webhcat.TableProperties
+        """
+        self.table_properties = table_properties
+
+    def load(self, key):
+        """
+        :return: last value stored at the given key or None
+        """
+        return self.table_properties.get_property(TablePropertiesStateStore.PROPERTY.format(key))
+
+    def save(self, key, value):
+        """
+        Stores last value at the given key
+        """
+        _property = TablePropertiesStateStore.PROPERTY.format(key)
+        if not self.table_properties.set_property(_property, value):
+            raise SqoopCommandError("Cannot save state of incremental import {0}".format(key))
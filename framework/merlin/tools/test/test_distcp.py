@@ -28,9 +28,26 @@
 # for additional information regarding copyright ownership and licensing.
 #
 
+import threading
+
+from mock import MagicMock
 from unittest2 import TestCase
 
-from merlin.tools.distcp import DistCp
+from merlin.common.exceptions import DistCpError
+from merlin.common.shell_command_executor import build_command, Result
+from merlin.fs.cli.hdfs_commands import FileEntry
+from merlin.tools.distcp import DistCp, DistCpPlanner
+
+
+LISTING = [FileEntry("/src/a", 0, "2015-07-01 10:00", True),
+           FileEntry("/src/a/f1", 100, "2015-07-01 10:00", False),
+           FileEntry("/src/a/f2", 100, "2015-07-01 10:00", False),
+           FileEntry("/src/a/f3", 100, "2015-07-01 10:00", False),
+           FileEntry("/src/b", 0, "2015-07-01 10:00", True),
+           FileEntry("/src/b/f4", 50, "2015-07-01 10:00", False),
+           FileEntry("/src/c", 0, "2015-07-01 10:00", True),
+           FileEntry("/src/c/f5", 50, "2015-07-01 10:00", False),
+           FileEntry("/src/d", 10, "2015-07-01 10:00", False)]
 
 
 class TestDistCpClient(TestCase):
@@ -44,3 +61,85 @@ class TestDistCpClient(TestCase):
                           preserve_user().build(),
                           "-prbcgu -m 12 -update -delete hdfs://localhost:8020/tmp/foo hdfs://localhost:8020/tmp/bar")
 
+    def test_copy_file_list(self):
+        self.assertEquals(DistCp().take_list("file:///tmp/sources.list").copy_to("hdfs://localhost:8020/tmp/bar")
+                          .use_dynamic_strategy().with_blocks_per_chunk(128).build(),
+                          "-p -strategy dynamic -blocksperchunk 128 -f file:///tmp/sources.list "
+                          "hdfs://localhost:8020/tmp/bar")
+
+
+class TestDistCpPlanner(TestCase):
+    def test_plan(self):
+        chunks = DistCpPlanner("/src/", "/dst", chunks=4).plan(LISTING)
+        self.assertEqual([("/dst", ["/src/b", "/src/c", "/src/d"], 110),
+                          ("/dst/a", ["/src/a/f1"], 100),
+                          ("/dst/a", ["/src/a/f2"], 100),
+                          ("/dst/a", ["/src/a/f3"], 100)],
+                         sorted((_chunk.target, sorted(_chunk.sources), _chunk.size) for _chunk in chunks))
+
+    def test_run(self):
+        commands = []
+        lists = {}
+        progress = []
+        lock = threading.Lock()
+
+        def job_executor(cmd, *args):
+            _command = build_command(cmd, *args)
+            with lock:
+                commands.append(_command)
+                lists[_command.split()[-3]] = open(_command.split()[-3][len("file://"):]).read().split()
+            return MagicMock(spec=Result, stdout="INFO mapreduce.Job:  map 50% reduce 0%\n"
+                                                 "INFO mapreduce.Job:  map 100% reduce 0%\n")
+
+        fs_commands = []
+
+        def executor(cmd, *args):
+            fs_commands.append(build_command(cmd, *args))
+            return MagicMock(spec=Result)
+
+        planner = DistCpPlanner("/src", "/dst", chunks=2, max_parallel=2, mappers=10, executor=executor,
+                                job_executor=job_executor,
+                                configure=lambda job: job.preserve_user())
+        planner.plan(LISTING)
+        chunks = planner.run(on_progress=progress.append)
+        self.assertEqual(["hadoop fs -mkdir -p /dst /dst/a"], fs_commands)
+        self.assertEqual(2, len(commands))
+        self.assertTrue(all(_command.startswith("hadoop distcp -pu -m 10 -strategy dynamic -f file://")
+                            for _command in commands))
+        self.assertEqual(sorted(_chunk.sources for _chunk in chunks), sorted(lists.values()))
+        self.assertEqual(1.0, progress[-1])
+        self.assertEqual(sorted(progress), progress)
+
+    def test_plan_files(self):
+        planner = DistCpPlanner("/src", "/dst", chunks=2)
+        chunks = planner.plan_files(LISTING)
+        self.assertEqual([("/dst", ["/src/a"], 300), ("/dst", ["/src/b", "/src/c", "/src/d"], 110)],
+                         sorted((_chunk.target, sorted(_chunk.sources), _chunk.size) for _chunk in chunks))
+        partitions = [FileEntry("/src/t/dt={0:04d}/part-0".format(_index), 10, "2015-07-01 10:00", False)
+                      for _index in range(1000)]
+        self.assertEqual(["/dst/t"], sorted(set(_chunk.target for _chunk in planner.plan_files(partitions))))
+        self.assertEqual(2, len(planner.plan_files(partitions)))
+        chunks = DistCpPlanner("/src", "/dst", chunks=4).plan_files(LISTING)
+        self.assertEqual([("/dst", ["/src/d"]), ("/dst/a", ["/src/a/f1"]), ("/dst/a", ["/src/a/f2"]),
+                          ("/dst/a", ["/src/a/f3"]), ("/dst/b", ["/src/b/f4"]), ("/dst/c", ["/src/c/f5"])],
+                         sorted((_chunk.target, _chunk.sources) for _chunk in chunks))
+
+    def test_failed_job(self):
+        def job_executor(cmd, *args):
+            result = MagicMock(spec=Result, stdout="INFO tools.DistCp: Input Options\n"
+                                                    "ERROR tools.DistCp: Exception encountered\n", stderr="")
+            result.is_ok.return_value = False
+            return result
+
+        planner = DistCpPlanner("/src", "/dst", executor=lambda cmd, *args: MagicMock(spec=Result),
+                                job_executor=job_executor)
+        planner.plan(LISTING[-1:])
+        with self.assertRaisesRegexp(DistCpError, "Exception encountered"):
+            planner.run()
+
+    def test_update_not_supported(self):
+        planner = DistCpPlanner("/src", "/dst", executor=lambda cmd, *args: MagicMock(spec=Result),
+                                job_executor=lambda cmd, *args: MagicMock(spec=Result, stdout=""),
+                                configure=lambda job: job.overwrite_destination())
+        planner.plan(LISTING)
+        self.assertRaises(DistCpError, planner.run)
@@ -28,11 +28,20 @@
 # for additional information regarding copyright ownership and licensing.
 #
 
+import BaseHTTPServer
+import json
+import os
+import tempfile
+import threading
+import time
+
 import unittest2
 from unittest2.case import expectedFailure
 
-from merlin.tools.flume import Flume
+from merlin.tools.flume import Flume, FlumeSupervisor, fetch_metrics
+from merlin.common.shell_command_executor import build_command, execute_shell_command_async
 from merlin.common.test_utils import mock_executor
+from merlin.common.utils import Backoff
 
 
 class TestFlume(unittest2.TestCase):
@@ -61,4 +70,165 @@ class TestFlume(unittest2.TestCase):
                             executor=mock_executor(expected_command=command))
         flume.with_jvm_X_option(value="test", name=4).load_configs_from_dir("path/to/dir")
         flume.load_plugins_from_dirs(pathes=["path/to/plugins1,path/to/plugins2", "path/to/plugins3"])
-        flume.run()
\ No newline at end of file
+        flume.run()
+
+
+class FakeAgentProcess(object):
+    def __init__(self, running=True):
+        self.running = running
+        self.status = None if running else 1
+
+    def is_running(self):
+        return self.running
+
+    def terminate(self, timeout=None):
+        self.running = False
+
+
+class FakeMetrics(object):
+    def __init__(self):
+        self.puts = 0
+        self.takes = 0
+        self.size = 0
+
+    def advance(self, puts, takes):
+        self.puts += puts
+        self.takes += takes
+        self.size += puts - takes
+
+    def __call__(self, host, port):
+        return {"CHANNEL.c1": {"ChannelFillPercentage": str(100.0 * self.size / 1000), "ChannelSize": str(self.size),
+                               "ChannelCapacity": "1000", "EventPutSuccessCount": str(self.puts),
+                               "EventTakeSuccessCount": str(self.takes)},
+                "SOURCE.r1": {"EventReceivedCount": str(self.puts)}}
+
+
+class TestFlumeSupervisor(unittest2.TestCase):
+    def test_restart_with_backoff(self):
+        commands = []
+        processes = []
+
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            processes.append(FakeAgentProcess())
+            return processes[-1]
+
+        supervisor = FlumeSupervisor(backoff=lambda: Backoff(initial=0.05, maximum=1), executor=executor,
+                                     log_dir="/var/log/flume")
+        agent = supervisor.add(Flume.agent(agent="restarted", conf_file="a1.properties"))
+        supervisor.check()
+        self.assertEqual(["flume-ng agent --name restarted --conf-file a1.properties "
+                          ">> /var/log/flume/restarted.log 2>&1"], commands)
+        processes[-1].running = False
+        supervisor.check()
+        self.assertEqual(1, len(commands))
+        time.sleep(0.06)
+        supervisor.check()
+        self.assertEqual(2, len(commands))
+        self.assertEqual(1, agent.restarts)
+        supervisor.terminate()
+        self.assertFalse(processes[-1].running)
+
+    def test_backoff_reset_after_stable_uptime(self):
+        processes = []
+
+        def executor(cmd, *args):
+            processes.append(FakeAgentProcess())
+            return processes[-1]
+
+        supervisor = FlumeSupervisor(backoff=lambda: Backoff(initial=0.05, maximum=1), executor=executor,
+                                     stable_uptime=0.2)
+        agent = supervisor.add(Flume.agent(agent="crashing", conf_file="a1.properties"))
+        supervisor.check()
+        for _ in range(2):
+            processes[-1].running = False
+            supervisor.check()
+            supervisor.check()
+            time.sleep(agent.next_start - time.time() + 0.01)
+            supervisor.check()
+        self.assertEqual(0.2, agent.backoff.current)
+        time.sleep(0.2)
+        supervisor.check()
+        self.assertEqual(0.05, agent.backoff.current)
+
+    def test_terminate_kills_hanging_agent(self):
+        result = execute_shell_command_async("trap '' TERM; exec sleep 10")
+        time.sleep(0.2)
+        started = time.time()
+        result.terminate(timeout=0.3)
+        self.assertFalse(result.is_running())
+        self.assertTrue(time.time() - started < 5)
+
+    def test_terminate_kills_processes_forked_by_shell(self):
+        pidfile = tempfile.mktemp()
+        result = execute_shell_command_async("sleep 30 & echo $! > {0}; wait".format(pidfile))
+        try:
+            time.sleep(0.3)
+            with open(pidfile) as _file:
+                pid = int(_file.read())
+            started = time.time()
+            result.terminate(timeout=1)
+            self.assertFalse(result.is_running())
+            self.assertFalse(self._is_alive_(pid))
+            self.assertTrue(time.time() - started < 5)
+        finally:
+            os.remove(pidfile)
+
+    @staticmethod
+    def _is_alive_(pid):
+        try:
+            with open("/proc/{0}/stat".format(pid)) as _file:
+                # zombie processes are not running any more
+                return _file.read().split()[2] != 'Z'
+        except IOError:
+            return False
+
+    def test_backpressure(self):
+        metrics = FakeMetrics()
+        detected = []
+        supervisor = FlumeSupervisor(fill_threshold=80.0, fetch=metrics, on_backpressure=detected.append,
+                                     executor=lambda cmd, *args: FakeAgentProcess())
+        supervisor.add(Flume.agent(agent="monitored", conf_file="a1.properties"), metrics_port=34545)
+        supervisor.check()
+        supervisor.check()
+        time.sleep(0.01)
+        metrics.advance(puts=500, takes=100)
+        self.assertEqual([], supervisor.check())
+        stats = supervisor.stats()[0]
+        self.assertEqual(("monitored", "c1", 40.0), (stats.agent, stats.channel, stats.fill_percentage))
+        self.assertTrue(stats.put_rate > stats.take_rate > 0)
+        self.assertTrue(stats.time_to_full() > 0)
+        time.sleep(0.01)
+        metrics.advance(puts=500, takes=50)
+        self.assertEqual(["c1"], [_stats.channel for _stats in supervisor.check()])
+        self.assertEqual(["c1"], [_stats.channel for _stats in detected])
+
+    def test_agent_command_with_monitoring(self):
+        _command = "flume-ng agent --name with_monitoring --conf-file a1.properties " \
+                   "-Dflume.monitoring.type=http -Dflume.monitoring.port=34545 >> /dev/null 2>&1"
+        supervisor = FlumeSupervisor(executor=mock_executor(expected_command=_command), fetch=FakeMetrics())
+        supervisor.add(Flume.agent(agent="with_monitoring", conf_file="a1.properties"), metrics_port=34545)
+        supervisor.check()
+
+    def test_fetch_metrics(self):
+        _metrics = FakeMetrics()
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):
+                _body = json.dumps(_metrics(None, None))
+                self.send_response(200 if self.path == "/metrics" else 404)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(_body)
+
+            def log_message(self, *args):
+                pass
+
+        server = BaseHTTPServer.HTTPServer(("localhost", 0), Handler)
+        _thread = threading.Thread(target=server.handle_request)
+        _thread.start()
+        try:
+            self.assertEqual("1000", fetch_metrics("localhost", server.server_address[1])["CHANNEL.c1"]["ChannelCapacity"])
+        finally:
+            _thread.join()
+            server.server_close()
@@ -29,13 +29,21 @@
 #
 
 import os
+import shutil
+import tempfile
+from array import array
 
 import unittest2
 from merlin.common.configurations import Configuration
 from merlin.common.metastores import IniFileMetaStore
 
-from merlin.tools.hive import Hive
+from merlin.common.exceptions import HiveCommandError
+from merlin.tools.hive import Hive, split_statements, substitute_variables
+from merlin.tools.hive_batch import HiveBatch
+from merlin.tools.hive_cache import HiveResultCache
+from merlin.tools.hive_session import HiveSessionPool
 from merlin.common.test_utils import mock_executor
+from merlin.common.shell_command_executor import build_command, execute_shell_command_streaming
 
 
 class TestHive(unittest2.TestCase):
@@ -100,4 +108,400 @@ class TestHive(unittest2.TestCase):
         hive.run()
 
 
+class DatabaseError(Exception):
+    pass
 
+
+class FakeCursor(object):
+    def __init__(self, server):
+        self.server = server
+        self.description = None
+        self.rows = []
+
+    def execute(self, statement):
+        self.server.statements.append(statement)
+        if statement.startswith('FAIL'):
+            raise DatabaseError("ParseException")
+        if statement.startswith('DISCONNECT'):
+            raise IOError("TTransportException: TSocket read 0 bytes")
+        self.rows = self.server.results.get(statement, [])
+        self.description = [('column', 'STRING_TYPE')] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeHiveServer(object):
+    """Stand-in for HiveServer2 : records executed statements and returns predefined results"""
+
+    def __init__(self, results=None):
+        self.statements = []
+        self.results = results if results else {}
+        self.connections = 0
+
+    def connect(self, host, port, username, **kwargs):
+        self.connections += 1
+        server = self
+
+        class Connection(object):
+            def cursor(self):
+                return FakeCursor(server)
+
+            def close(self):
+                pass
+
+        return Connection()
+
+
+class TestHiveServer2(unittest2.TestCase):
+    def test_split_statements(self):
+        self.assertEqual(["SELECT ';' FROM t", "SELECT `a;b` FROM t", "SHOW TABLES"],
+                         split_statements("SELECT ';' FROM t; -- comment;\nSELECT `a;b` FROM t;\n\nSHOW TABLES"))
+
+    def test_substitute_variables(self):
+        self.assertEqual("SELECT * FROM t WHERE ds = '1' AND x = 2 AND y = ${z}",
+                         substitute_variables("SELECT * FROM t WHERE ds = '${ds}' AND x = ${hiveconf:x} AND y = ${z}",
+                                              hivevar={'ds': '1'}, hiveconf={'x': '2'}))
+
+    def test_run_commands_over_session(self):
+        server = FakeHiveServer(results={"SELECT * FROM t WHERE ds = 'world'": [('a', 1), ('b', None)]})
+        pool = HiveSessionPool(connect=server.connect)
+        result = Hive.load_queries_from_string("SELECT * FROM t WHERE ds = '${hello}';") \
+            .add_hivevar("hello", "world") \
+            .with_hive_conf("hive.exec.parallel", "true") \
+            .use_database("db") \
+            .via_hiveserver2(pool) \
+            .run()
+        self.assertEqual("a\t1\nb\tNULL", result.stdout)
+        self.assertEqual(["SET hive.exec.parallel=true",
+                          "USE db",
+                          "SELECT * FROM t WHERE ds = 'world'",
+                          "RESET"], server.statements)
+
+    def test_print_session_values_as_hive_cli(self):
+        server = FakeHiveServer(results={"SELECT * FROM t": [(True, 1.5, None), (False, 2, 'a')]})
+        result = Hive.load_queries_from_string("SELECT * FROM t") \
+            .via_hiveserver2(HiveSessionPool(connect=server.connect)) \
+            .run()
+        self.assertEqual("true\t1.5\tNULL\nfalse\t2\ta", result.stdout)
+
+    def test_reuse_pooled_session(self):
+        server = FakeHiveServer()
+        pool = HiveSessionPool(connect=server.connect, size=2)
+        _, path = tempfile.mkstemp()
+        try:
+            with open(path, 'w') as script:
+                script.write("SHOW TABLES;\nDESCRIBE ${t};")
+            for _ in range(3):
+                Hive.load_queries_from_file(path).define_variable("t", "t").via_hiveserver2(pool).run()
+        finally:
+            os.remove(path)
+        self.assertEqual(1, server.connections)
+        self.assertEqual(["SHOW TABLES", "DESCRIBE t"] * 3, server.statements)
+        pool.close()
+
+    def test_failed_statement(self):
+        server = FakeHiveServer()
+        pool = HiveSessionPool(connect=server.connect)
+        hive = Hive.load_queries_from_string("FAIL; SHOW TABLES").use_database("db").via_hiveserver2(pool)
+        self.assertRaises(HiveCommandError, hive.run)
+        self.assertEqual(["USE db", "FAIL"], server.statements)
+        Hive.load_queries_from_string("SHOW TABLES").via_hiveserver2(pool).run()
+        self.assertEqual(["USE db", "FAIL", "USE default", "SHOW TABLES"], server.statements)
+        self.assertEqual(1, server.connections)
+
+    def test_lost_connection(self):
+        server = FakeHiveServer()
+        pool = HiveSessionPool(connect=server.connect)
+        hive = Hive.load_queries_from_string("DISCONNECT").use_database("db").via_hiveserver2(pool)
+        self.assertRaises(HiveCommandError, hive.run)
+        Hive.load_queries_from_string("SHOW TABLES").via_hiveserver2(pool).run()
+        self.assertEqual(["USE db", "DISCONNECT", "SHOW TABLES"], server.statements)
+        self.assertEqual(2, server.connections)
+
+
+class TestPartitionBatch(unittest2.TestCase):
+    def test_add_partitions_in_chunks(self):
+        _command = "hive -e \"ALTER TABLE data ADD IF NOT EXISTS\n" \
+                   "PARTITION (date='20150101', hour='01') LOCATION '/data/date=20150101/hour=01'\n" \
+                   "PARTITION (date='20150102', hour='01') LOCATION '/tmp/raw/20150102_01';\n" \
+                   "ALTER TABLE data ADD IF NOT EXISTS\n" \
+                   "PARTITION (date='it\\'s', hour='02');\" --database db"
+        Hive.register_partitions(table='data', database='db', executor=mock_executor(expected_command=_command)) \
+            .add_path('/data/date=20150101/hour=01') \
+            .add(spec=[('date', '20150102'), ('hour', '01')], location='/tmp/raw/20150102_01') \
+            .add(spec=[('date', "it's"), ('hour', '02')]) \
+            .run(chunk_size=2)
+
+    def test_repair_table(self):
+        _command = "hive -e \"MSCK REPAIR TABLE data;\""
+        batch = Hive.register_partitions(table='data', executor=mock_executor(expected_command=_command))
+        for _hour in range(10):
+            batch.add_path('/data/date=20150101/hour={0:02d}'.format(_hour))
+        batch.run(repair_threshold=5)
+
+    def test_register_partitions_over_session(self):
+        server = FakeHiveServer()
+        batch = Hive.register_partitions(table='data') \
+            .via_hiveserver2(HiveSessionPool(connect=server.connect))
+        for _day in range(1, 6):
+            batch.add_path('/data/date=201501{0:02d}'.format(_day), location=False)
+        batch.run(chunk_size=3)
+        self.assertEqual(["ALTER TABLE data ADD IF NOT EXISTS\n"
+                          "PARTITION (date='20150101')\nPARTITION (date='20150102')\nPARTITION (date='20150103')",
+                          "ALTER TABLE data ADD IF NOT EXISTS\n"
+                          "PARTITION (date='20150104')\nPARTITION (date='20150105')"], server.statements)
+
+    def test_invalid_partition_path(self):
+        self.assertRaises(HiveCommandError, Hive.register_partitions(table='data').add_path, '/data/20150101')
+
+
+def streaming_executor(expected_command, output, status=0):
+    """
+    Mock streaming executor : validates command and streams given output by means of printf
+    """
+
+    def executor(cmd, *args):
+        _actual_cmd = build_command(cmd, *args)
+        if expected_command != _actual_cmd:
+            raise AssertionError("ERROR: expected and actual command are different: \n\tEXPECTED: "
+                                 "{0}\n\tACTUAL:   {1}".format(expected_command, _actual_cmd))
+        return execute_shell_command_streaming("printf", "'{0}'; exit {1}".format(output, status))
+
+    return executor
+
+
+class TestHiveFetch(unittest2.TestCase):
+    OUTPUT = "1\\ta\\t0.5\\ttrue\\n2\\tNULL\\t1.5\\tfalse\\n3\\tc\\t2.5\\ttrue\\n"
+
+    def test_fetch_typed_rows(self):
+        hive = Hive.load_queries_from_string("SELECT * FROM t")
+        rows = hive.fetch(types=['bigint', 'string', 'double', 'boolean'],
+                          executor=streaming_executor('hive -e "SELECT * FROM t"', self.OUTPUT))
+        self.assertEqual([(1, 'a', 0.5, True), (2, None, 1.5, False), (3, 'c', 2.5, True)], list(rows))
+
+    def test_fetch_with_custom_delimiter(self):
+        hive = Hive.load_queries_from_string("SELECT * FROM t")
+        rows = hive.fetch(delimiter=',', null_value='\\N',
+                          executor=streaming_executor('hive -e "SELECT * FROM t"', "a,\\\\N\\n"))
+        self.assertEqual([('a', None)], list(rows))
+
+    def test_fetch_columnar_chunks(self):
+        hive = Hive.load_queries_from_string("SELECT * FROM t")
+        chunks = list(hive.fetch_chunks(chunk_size=2, types=['int', 'string', 'double', 'boolean'], columnar=True,
+                                        executor=streaming_executor('hive -e "SELECT * FROM t"', self.OUTPUT)))
+        self.assertEqual(2, len(chunks))
+        self.assertEqual(array('l', [1, 2]), chunks[0][0])
+        self.assertEqual(['a', None], chunks[0][1])
+        self.assertEqual(array('d', [0.5, 1.5]), chunks[0][2])
+        self.assertEqual([array('l', [3]), ['c'], array('d', [2.5]), [True]], chunks[1])
+
+    def test_fetch_failed_job(self):
+        hive = Hive.load_queries_from_string("SELECT * FROM t")
+        rows = hive.fetch(executor=streaming_executor('hive -e "SELECT * FROM t"', "a\\n", status=1))
+        self.assertEqual(('a',), next(rows))
+        self.assertRaises(HiveCommandError, list, rows)
+
+    def test_fetch_over_session(self):
+        server = FakeHiveServer(results={"SELECT * FROM t": [(_id, 'name') for _id in range(5)]})
+        hive = Hive.load_queries_from_string("SET x=1; SELECT * FROM t") \
+            .via_hiveserver2(HiveSessionPool(connect=server.connect))
+        self.assertEqual([[(0, 'name'), (1, 'name')], [(2, 'name'), (3, 'name')], [(4, 'name')]],
+                         list(hive.fetch_chunks(chunk_size=2, types=['int'])))
+        self.assertEqual(["SET x=1", "SELECT * FROM t", "RESET"], server.statements)
+
+    def test_fetch_same_rows_over_session(self):
+        server = FakeHiveServer(results={"SELECT * FROM t": [(1, 'a', 0.5, True), (2, None, 1.5, False)]})
+        hive = Hive.load_queries_from_string("SELECT * FROM t").via_hiveserver2(HiveSessionPool(connect=server.connect))
+        self.assertEqual([(1, 'a', 0.5, True), (2, None, 1.5, False)],
+                         list(hive.fetch(types=['bigint', 'string', 'double', 'boolean'])))
+        self.assertEqual([('1', 'a', '0.5', 'true'), ('2', None, '1.5', 'false')], list(hive.fetch()))
+
+    def test_stop_fetching_early(self):
+        results = []
+
+        def executor(cmd, *args):
+            results.append(execute_shell_command_streaming("yes", "a"))
+            return results[-1]
+
+        rows = Hive.load_queries_from_string("SELECT * FROM t").fetch(executor=executor)
+        self.assertEqual(('a',), next(rows))
+        rows.close()
+        self.assertFalse(results[0].is_running())
+
+
+def counting_executor(stdout):
+    """Mock executor which counts invocations"""
+
+    def executor(cmd, *args):
+        executor.calls.append(build_command(cmd, *args))
+        return mock_executor(expected_command=executor.calls[-1], stdout=stdout)(cmd, *args)
+
+    executor.calls = []
+    return executor
+
+
+class TestHiveResultCache(unittest2.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.work_dir, 'cache', 'hive.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_cache_read_only_query(self):
+        cache = HiveResultCache(path=self.path)
+        executor = counting_executor(stdout="date=20150101\n")
+        for query in ["SHOW PARTITIONS data", "SHOW  PARTITIONS\n data;"]:
+            result = Hive.load_queries_from_string(query, executor=executor).use_database('db') \
+                .with_cache(cache).run()
+            self.assertEqual("date=20150101\n", result.stdout)
+        self.assertEqual(1, len(executor.calls))
+        Hive.load_queries_from_string("SHOW PARTITIONS data", executor=executor).with_cache(cache).run()
+        self.assertEqual(2, len(executor.calls))
+
+    def test_cache_key_includes_variables(self):
+        cache = HiveResultCache()
+        executor = counting_executor(stdout="1")
+        for value in ['1', '2', '1']:
+            Hive.load_queries_from_string("SELECT * FROM t WHERE x = ${x}", executor=executor) \
+                .add_hivevar('x', value).with_cache(cache).run()
+        self.assertEqual(2, len(executor.calls))
+
+    def test_persist_cache(self):
+        executor = counting_executor(stdout="a\tstring\n")
+        Hive.load_queries_from_string("DESCRIBE data", executor=executor).with_cache(HiveResultCache(self.path)).run()
+        result = Hive.load_queries_from_string("DESCRIBE data", executor=executor) \
+            .with_cache(HiveResultCache(self.path)).run()
+        self.assertEqual("a\tstring\n", result.stdout)
+        self.assertEqual(1, len(executor.calls))
+        result = Hive.load_queries_from_string("DESCRIBE data", executor=executor) \
+            .with_cache(HiveResultCache(self.path, ttl=0)).run()
+        self.assertEqual(2, len(executor.calls))
+
+    def test_keep_changes_of_shared_cache(self):
+        first = HiveResultCache(path=self.path)
+        first.put('a', "1", ['t'])
+        first.put('b', "2", ['other'])
+        second = HiveResultCache(path=self.path)
+        first.invalidate('t')
+        second.put('c', "3", ['other'])
+        cache = HiveResultCache(path=self.path)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual("2", cache.get('b'))
+        self.assertEqual("3", cache.get('c'))
+        self.assertIsNone(second.get('a'))
+
+    def test_invalidate_on_ddl(self):
+        cache = HiveResultCache(path=self.path)
+        executor = counting_executor(stdout="")
+        for query in ["SHOW PARTITIONS db.data", "SELECT COUNT(*) FROM other"]:
+            Hive.load_queries_from_string(query, executor=executor).with_cache(cache).run()
+        Hive.register_partitions(table='data', executor=executor).with_cache(cache) \
+            .add_path('/data/date=20150101').run()
+        self.assertEqual(3, len(executor.calls))
+        for query in ["SHOW PARTITIONS db.data", "SELECT COUNT(*) FROM other"]:
+            Hive.load_queries_from_string(query, executor=executor).with_cache(cache).run()
+        self.assertEqual(4, len(executor.calls))
+        self.assertEqual('hive -e "SHOW PARTITIONS db.data"', executor.calls[-1])
+
+    def test_referenced_tables(self):
+        self.assertEqual(['a', 'b', 'c', 'd'],
+                         HiveResultCache.tables(["SELECT * FROM db.a JOIN `b` ON a.x = b.x",
+                                                 "DESCRIBE FORMATTED c",
+                                                 "DROP TABLE IF EXISTS d"]))
+        self.assertEqual(['bar', 'foo'], HiveResultCache.tables(["INSERT INTO TABLE foo SELECT * FROM bar"]))
+        self.assertEqual(['foo'], HiveResultCache.tables(["LOAD DATA INPATH '/data' INTO TABLE foo"]))
+        self.assertEqual(['foo'], HiveResultCache.tables(["LOAD DATA INPATH '/data' OVERWRITE INTO TABLE foo"]))
+        self.assertEqual(['bar', 'foo'], HiveResultCache.tables(["INSERT OVERWRITE TABLE foo SELECT * FROM bar"]))
+
+    def test_write_statements_are_not_cacheable(self):
+        self.assertTrue(HiveResultCache.is_cacheable(["WITH x AS (SELECT 1) SELECT * FROM x"]))
+        self.assertFalse(HiveResultCache.is_cacheable(["WITH x AS (SELECT * FROM a) INSERT OVERWRITE TABLE t "
+                                                       "SELECT * FROM x"]))
+        self.assertFalse(HiveResultCache.is_cacheable(["SET a=1", "DROP TABLE t"]))
+
+    def test_key_keeps_literals(self):
+        self.assertEqual(HiveResultCache.key(["SELECT *  FROM t\nWHERE n='Foo'"]),
+                         HiveResultCache.key(["SELECT * FROM t WHERE n='Foo'"]))
+        self.assertNotEqual(HiveResultCache.key(["SELECT * FROM t WHERE n='Foo'"]),
+                            HiveResultCache.key(["SELECT * FROM t WHERE n='foo'"]))
+        self.assertNotEqual(HiveResultCache.key(["SELECT * FROM t WHERE n='a  b'"]),
+                            HiveResultCache.key(["SELECT * FROM t WHERE n='a b'"]))
+
+
+def script_executor(status=0, stdout=None, stderr=None):
+    """Mock executor which captures content of the executed script"""
+
+    def executor(cmd, *args):
+        executor.commands.append(build_command(cmd, *args))
+        with open(args[-1]) as script:
+            executor.scripts.append(script.read())
+        result = mock_executor(expected_command=executor.commands[-1], status=status,
+                               stdout=stdout, stderr=stderr)(cmd, *args)
+        result.is_ok.return_value = status == 0
+        return result
+
+    executor.commands = []
+    executor.scripts = []
+    return executor
+
+
+class TestHiveBatch(unittest2.TestCase):
+    def jobs(self):
+        return [Hive.load_queries_from_string("ALTER TABLE data ADD PARTITION (date='${date}')")
+                .add_hivevar('date', '20150101').use_database('db'),
+                Hive.load_queries_from_string("INSERT INTO TABLE agg SELECT * FROM db.data")
+                .with_hive_conf('hive.exec.parallel', 'true'),
+                Hive.load_queries_from_string("SHOW TABLES").with_auxillary_jars('udf.jar')]
+
+    def test_bundle_jobs(self):
+        executor = script_executor()
+        HiveBatch(executor=executor).add(*self.jobs()).run()
+        self.assertEqual(2, len(executor.commands))
+        self.assertTrue(executor.commands[0].startswith("hive -f "))
+        self.assertTrue(executor.commands[1].startswith("hive --auxpath udf.jar -f "))
+        self.assertEqual("USE db;\n"
+                         "ALTER TABLE data ADD PARTITION (date='20150101');\n"
+                         "USE default;\n"
+                         "SET hive.exec.parallel=true;\n"
+                         "INSERT INTO TABLE agg SELECT * FROM db.data;\n"
+                         "RESET;\n", executor.scripts[0])
+        self.assertEqual("SHOW TABLES;\n", executor.scripts[1])
+
+    def test_map_error_to_statement(self):
+        jobs = self.jobs()
+        executor = script_executor(status=1,
+                                   stdout="",
+                                   stderr="OK\nTime taken: 0.1 seconds\n" * 3 + "FAILED: SemanticException")
+        with self.assertRaisesRegexp(HiveCommandError, "INSERT INTO TABLE agg .* of job {0} : FAILED".format(
+                jobs[1].name)):
+            HiveBatch(executor=executor).add(*jobs).run()
+
+    def test_bundle_jobs_over_session(self):
+        server = FakeHiveServer()
+        jobs = self.jobs()
+        jobs[1].execute_commands("FAIL")
+        with self.assertRaisesRegexp(HiveCommandError, "'FAIL' of job {0}".format(jobs[1].name)):
+            HiveBatch().add(*jobs).via_hiveserver2(HiveSessionPool(connect=server.connect)).run()
+        self.assertEqual(["USE db",
+                          "ALTER TABLE data ADD PARTITION (date='20150101')",
+                          "USE default",
+                          "SET hive.exec.parallel=true",
+                          "FAIL",
+                          "RESET"], server.statements)
+
+    def test_bundle_jobs_over_reused_session(self):
+        server = FakeHiveServer()
+        pool = HiveSessionPool(connect=server.connect)
+        Hive.load_queries_from_string("SHOW TABLES").use_database("db").via_hiveserver2(pool).run()
+        HiveBatch().add(Hive.load_queries_from_string("DROP TABLE t")).via_hiveserver2(pool).run()
+        self.assertEqual(["USE db", "SHOW TABLES", "USE default", "DROP TABLE t"], server.statements)
+        self.assertEqual(1, server.connections)
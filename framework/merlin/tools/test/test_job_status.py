@@ -28,13 +28,16 @@
 # for additional information regarding copyright ownership and licensing.
 #
 
+import json
 import os
+from StringIO import StringIO
 
 import mock
 from unittest2 import TestCase
 
+from merlin.common.exceptions import WaitTimeoutError
 from merlin.common.shell_command_executor import build_command, Result
-from merlin.tools.mapreduce import JobStatus
+from merlin.tools.mapreduce_status import JobStatus, JobWatcher, JobCounters, CounterTimeSeries
 
 
 class TestJobStatus(TestCase):
@@ -177,6 +180,148 @@ class TestJobStatus(TestCase):
 
         return executor
 
+    def read_resource(self, name):
+        with open(os.path.join(os.path.dirname(__file__), 'resources', 'mapreduce', name)) as _file:
+            return _file.read()
 
+    def sequence_executor(self, *responses):
+        """Returns given (command, stdout) responses one by one"""
+        _responses = list(responses)
 
+        def executor(cmd, *args):
+            expected_command, stdout = _responses.pop(0)
+            self.assertEqual(expected_command, build_command(cmd, *args))
+            return mock.Mock(spec=Result, status=0, stdout=stdout, stderr='')
+
+        return executor
+
+    @mock.patch('time.sleep')
+    def test_wait_for_completion(self, sleep):
+        _running = self.read_resource('running_job_status')
+        _command = "hadoop job -status job_1412153770896_0097"
+        job = JobStatus("job_1412153770896_0097",
+                        executor=self.sequence_executor((_command, _running),
+                                                        (_command, _running),
+                                                        (_command, _running),
+                                                        (_command, self.read_resource('succeeded_job_status'))))
+        _changes = []
+        job.wait_for_completion(on_change=lambda status: _changes.append(status.state()))
+        self.assertTrue(job.is_succeeded())
+        self.assertEqual(['RUNNING', 'SUCCEEDED'], _changes)
+        self.assertEqual([mock.call(1), mock.call(2), mock.call(4)], sleep.call_args_list)
+
+    @mock.patch('time.sleep')
+    def test_wait_for_completion_timeout(self, sleep):
+        _running = self.read_resource('running_job_status')
+        _command = "hadoop job -status job_1412153770896_0097"
+        job = JobStatus("job_1412153770896_0097",
+                        executor=self.sequence_executor(*[(_command, _running)] * 3))
+        with self.assertRaises(WaitTimeoutError):
+            job.wait_for_completion(timeout=3)
+        self.assertEqual([mock.call(1), mock.call(2)], sleep.call_args_list)
+
+    def test_parse_job_list(self):
+        self.assertEqual({'job_1412153770896_0097': 'RUNNING',
+                          'job_1412153770896_0098': 'PREP',
+                          'job_1412153770896_0092': 'FAILED'},
+                         JobStatus.parse_job_list(self.read_resource('job_list')))
+        self.assertEqual({'job_201410201150_0001': 'SUCCEEDED'},
+                         JobStatus.parse_job_list("1 jobs submitted\n"
+                                                   "States are:\n"
+                                                   "JobId\tState\tStartTime\tUserName\tPriority\n"
+                                                   "job_201410201150_0001\t2\t1413805835084\tvagrant\tNORMAL"))
+
+    @mock.patch('time.sleep')
+    def test_watch_jobs(self, sleep):
+        _job_list = self.read_resource('job_list')
+        _finished = _job_list.replace('RUNNING', 'SUCCEEDED').replace('PREP', 'KILLED')
+        watcher = JobWatcher(['job_1412153770896_0097', 'job_1412153770896_0098'],
+                             executor=self.sequence_executor(("mapred job -list all", _job_list),
+                                                             ("mapred job -list all", _job_list),
+                                                             ("mapred job -list all", _finished)))
+        _changes = []
+        states = watcher.watch(on_change=lambda job_id, old, new: _changes.append((job_id, old, new)))
+        self.assertEqual({'job_1412153770896_0097': 'SUCCEEDED',
+                          'job_1412153770896_0098': 'KILLED'}, states)
+        self.assertEqual(4, len(_changes))
+        self.assertTrue(('job_1412153770896_0098', 'PREP', 'KILLED') in _changes)
+        self.assertEqual([mock.call(1), mock.call(2)], sleep.call_args_list)
+
+    def test_watch_retired_job(self):
+        watcher = JobWatcher(['job_1412153770896_0092', 'job_1412153770896_0099'],
+                             executor=self.sequence_executor(
+                                 ("mapred job -list all", self.read_resource('job_list')),
+                                 ("hadoop job -status job_1412153770896_0099",
+                                  self.read_resource('killed_job_status'))))
+        self.assertEqual({'job_1412153770896_0092': 'FAILED',
+                          'job_1412153770896_0099': 'KILLED'}, watcher.watch())
+
+    def test_bulk_job_statuses(self):
+        statuses = JobStatus.bulk(['job_1412153770896_0097', 'job_1412153770896_0092'],
+                                  executor=self.sequence_executor(
+                                      ("mapred job -list all", self.read_resource('job_list')),
+                                      ("hadoop job -status job_1412153770896_0097",
+                                       self.read_resource('succeeded_job_status'))))
+        self.assertEqual(2, len(statuses))
+        self.assertTrue(statuses['job_1412153770896_0097'].is_running())
+        self.assertTrue(statuses['job_1412153770896_0092'].is_failed())
+        # counters are requested only on demand
+        self.assertEqual(2, statuses['job_1412153770896_0097'].counter(group='Job Counters',
+                                                                        counter='Launched map tasks'))
+        self.assertTrue(statuses['job_1412153770896_0097'].is_succeeded())
+
+    def test_typed_job_counters(self):
+        job = JobStatus("test_job")
+        job._parse_stdout_(stream=self.read_resource('succeeded_job_status'))
+        self.assertEqual(49, len(job.job_counters))
+        self.assertEqual(1529, job.job_counters.get('File System Counters', 'FILE: Number of bytes read'))
+        self.assertTrue(('Job Counters', 'Launched map tasks') in job.job_counters)
+        self.assertEqual(None, job.job_counters.get('Dummy Group', 'Dummy Counter'))
+
+    @mock.patch('time.sleep')
+    def test_sample_counters(self, sleep):
+        _command = "hadoop job -status job_1412153770896_0097"
+        job = JobStatus("job_1412153770896_0097",
+                        executor=self.sequence_executor((_command, self.read_resource('running_job_status')),
+                                                        (_command, self.read_resource('succeeded_job_status'))))
+        series = job.sample_counters(interval=5)
+        self.assertEqual([mock.call(5)], sleep.call_args_list)
+        self.assertEqual(2, len(series.samples))
+        self.assertEqual(49, len(series.columns))
+        self.assertEqual([2, 2], [value for _, value in series.values('Job Counters', 'Launched map tasks')])
+        self.assertEqual([None, 11], [value for _, value in series.values('Map-Reduce Framework',
+                                                                          'Map input records')])
+
+    def test_large_counters(self):
+        counters = JobCounters()
+        counters.add('File System Counters', 'HDFS: Number of bytes read', 2 ** 62)
+        series = CounterTimeSeries()
+        series.sample(counters, timestamp=100.0)
+        self.assertEqual(2 ** 62, counters.get('File System Counters', 'HDFS: Number of bytes read'))
+        self.assertEqual([(100.0, 2 ** 62)], series.values('File System Counters', 'HDFS: Number of bytes read'))
 
+    def test_counters_time_series_export(self):
+        series = CounterTimeSeries()
+        for timestamp, records in [(100.0, 0), (110.0, 500), (120.0, 1500)]:
+            counters = JobCounters()
+            counters.add('Map-Reduce Framework', 'Map input records', records)
+            if records:
+                counters.add('Map-Reduce Framework', 'Map output records', records * 2)
+            series.sample(counters, timestamp=timestamp)
+        self.assertEqual([(110.0, 50.0), (120.0, 100.0)],
+                         series.rates('Map-Reduce Framework', 'Map input records'))
+        _csv = StringIO()
+        series.to_csv(_csv)
+        self.assertEqual(['timestamp,Map-Reduce Framework:Map input records,Map-Reduce Framework:Map output records',
+                          '100.0,0,',
+                          '110.0,500,1000',
+                          '120.0,1500,3000'],
+                         _csv.getvalue().splitlines())
+        _json = StringIO()
+        series.to_json_lines(_json)
+        _lines = [json.loads(line) for line in _json.getvalue().splitlines()]
+        self.assertEqual(3, len(_lines))
+        self.assertEqual({'timestamp': 110.0,
+                          'counters': {'Map-Reduce Framework': {'Map input records': 500,
+                                                                'Map output records': 1000}}},
+                         _lines[1])
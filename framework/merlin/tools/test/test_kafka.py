@@ -31,7 +31,15 @@
 import unittest2
 from unittest2.case import expectedFailure
 
-from merlin.tools.kafka import Kafka, Topic
+import socket
+import threading
+import time
+
+from merlin.common.exceptions import KafkaClientError, WaitTimeoutError
+from merlin.common.kafka_test_utils import LocalBroker
+from merlin.tools.kafka import Kafka, Topic, ConsumerLagMonitor, TopicAdmin, TopicSpec
+from merlin.tools.kafka_client import KafkaClient, KafkaProtocol, Producer, Consumer, encode_message_set, \
+    decode_message_set, murmur2
 from merlin.common.test_utils import mock_executor
 
 
@@ -80,4 +88,200 @@ class TestKafka(unittest2.TestCase):
     def test_delete_config(self):
         _command = "kafka-run-class.sh kafka.admin.TopicCommand --zookeeper localhost:2181 --topic Topic --alter deleteConfig kye1=value1"
         topic = Topic(name="Topic", zookeeper_host="localhost:2181", executor=mock_executor(expected_command=_command))
-        topic.delete_config(key="kye1", value="value1")
\ No newline at end of file
+        topic.delete_config(key="kye1", value="value1")
+
+
+class TestKafkaClient(unittest2.TestCase):
+    def test_message_set_encoding(self):
+        _messages = [(None, "value1"), ("key2", u"value2")]
+        for _codec in (KafkaProtocol.CODEC_NONE, KafkaProtocol.CODEC_GZIP):
+            _decoded = decode_message_set(encode_message_set(_messages, codec=_codec))
+            self.assertEqual([None, "key2"], [_m.key.tobytes() if _m.key is not None else None for _m in _decoded])
+            self.assertEqual(["value1", "value2"], [_m.value.tobytes() for _m in _decoded])
+        _encoded = encode_message_set(_messages)
+        self.assertEqual(1, len(decode_message_set(_encoded[:-1])))
+        self.assertIsInstance(decode_message_set(_encoded)[0].value, memoryview)
+
+    def test_produce_and_consume(self):
+        broker = LocalBroker().create_topic("ingest", partitions=3)
+        client = KafkaClient(connect=broker.connect)
+        self.assertEqual({"ingest": [0, 1, 2]}, client.load_metadata())
+        with Producer(client, batch_size=100, linger_ms=60000) as producer:
+            for _index in range(100):
+                producer.send("ingest", "message{0:03d}".format(_index), key=str(_index))
+        self.assertEqual(100, producer.sent)
+        self.assertTrue(broker.requests.count(KafkaProtocol.PRODUCE) < 20)
+        consumer = Consumer(client, "ingest", max_bytes=256)
+        _values = [_value.tobytes() for _batch in consumer.batches() for _value in _batch.values()]
+        self.assertEqual(sorted(broker.messages("ingest")), sorted(_values))
+        self.assertEqual(100, len(_values))
+        self.assertTrue(consumer.is_caught_up())
+        self.assertEqual([], list(Consumer(client, "ingest", offsets=KafkaProtocol.LATEST_OFFSET).batches()))
+
+    def test_same_key_same_partition(self):
+        broker = LocalBroker().create_topic("ingest", partitions=4)
+        with Producer(KafkaClient(connect=broker.connect), compression=KafkaProtocol.CODEC_NONE) as producer:
+            for _index in range(10):
+                producer.send("ingest", str(_index), key="user1")
+        self.assertEqual(1, len([_p for _p in range(4) if broker.messages("ingest", _p)]))
+
+    def test_murmur2(self):
+        self.assertEqual([-973932308, -790332482, 479470107, 275646681],
+                         [_hash - (1 << 32) if _hash & 0x80000000 else _hash
+                          for _hash in [murmur2(_data) for _data in ["21", "foobar", "abc", ""]]])
+        broker = LocalBroker().create_topic("ingest", partitions=3)
+        with Producer(KafkaClient(connect=broker.connect)) as producer:
+            producer.send("ingest", "value", key="foobar")
+        self.assertEqual(["value"], broker.messages("ingest", (murmur2("foobar") & 0x7fffffff) % 3))
+
+    def test_acks_zero(self):
+        broker = LocalBroker().create_topic("ingest")
+        client = KafkaClient(connect=broker.connect)
+        self.assertEqual({}, client.produce({("ingest", 0): encode_message_set([(None, "value")])}, acks=0))
+        self.assertEqual(["value"], broker.messages("ingest"))
+        broker = LocalBroker(port=0).create_topic("ingest").start()
+        try:
+            with KafkaClient("localhost:{0}".format(broker.port), timeout=5) as client:
+                Producer(client, acks=0).send("ingest", "hello").flush()
+                self.assertEqual(1, client.produce({("ingest", 0): encode_message_set([(None, "acked")])})[
+                    ("ingest", 0)])
+        finally:
+            broker.stop()
+
+    def test_failed_produce_keeps_batches(self):
+        broker = LocalBroker().create_topic("ingest")
+        _failures = [socket.error("connection reset")]
+
+        class _FlakyConnection(object):
+            def request(self, payload):
+                _response = broker.handle(payload)
+                if broker.requests[-1] == KafkaProtocol.PRODUCE and _failures:
+                    raise _failures.pop()
+                return memoryview(_response)
+
+            def close(self):
+                pass
+
+        producer = Producer(KafkaClient(connect=lambda host, port, timeout: _FlakyConnection()))
+        producer.send("ingest", "value")
+        with self.assertRaises(socket.error):
+            producer.flush()
+        self.assertEqual(0, producer.sent)
+        producer.flush()
+        self.assertEqual(1, producer.sent)
+        self.assertEqual(["value", "value"], broker.messages("ingest"))
+
+    def test_controller_fallback(self):
+        broker = LocalBroker()
+
+        def _connect(host, port, timeout):
+            if port == 9091:
+                raise socket.error("connection refused")
+            return broker.connect(host, port, timeout)
+
+        self.assertEqual(("localhost", 9092), KafkaClient("localhost:9091,localhost:9092", connect=_connect).controller())
+
+    def test_unknown_topic(self):
+        broker = LocalBroker(auto_create_partitions=0)
+        with self.assertRaises(KafkaClientError):
+            KafkaClient(connect=broker.connect).partitions("missing")
+
+    def test_over_tcp(self):
+        broker = LocalBroker(port=0).create_topic("ingest").start()
+        try:
+            with KafkaClient("localhost:{0}".format(broker.port)) as client:
+                Producer(client).send("ingest", "hello").flush()
+                self.assertEqual(["hello"], [_message.value.tobytes()
+                                             for _batch in Consumer(client, "ingest").batches() for _message in _batch])
+        finally:
+            broker.stop()
+
+
+class TestConsumerLagMonitor(unittest2.TestCase):
+    def setUp(self):
+        super(TestConsumerLagMonitor, self).setUp()
+        self.broker = LocalBroker().create_topic("ingest", partitions=2)
+        self.client = KafkaClient(connect=self.broker.connect)
+        with Producer(self.client, compression=KafkaProtocol.CODEC_NONE) as producer:
+            for _index in range(100):
+                producer.send("ingest", str(_index), partition=_index % 2)
+
+    def test_lag(self):
+        self.broker.commit("indexer", "ingest", 0, 30)
+        monitor = ConsumerLagMonitor(self.client, group="indexer", topics="ingest")
+        sample = monitor.sample()
+        self.assertEqual(70, sample.lag())
+        self.assertEqual([20, 50], [_partition.lag for _partition in sample.partitions])
+        self.assertEqual({"ingest:0": 20, "ingest:1": 50}, monitor.metrics()['partitions'])
+        self.assertIsNone(monitor.consumption_rate())
+
+    def test_rates(self):
+        monitor = ConsumerLagMonitor(self.client, group="indexer", topics=["ingest"])
+        monitor.sample()
+        time.sleep(0.05)
+        self.broker.commit("indexer", "ingest", 0, 50).commit("indexer", "ingest", 1, 50)
+        monitor.sample()
+        metrics = monitor.metrics()
+        self.assertEqual(0, metrics['lag'])
+        self.assertTrue(metrics['consumption_rate'] > 0)
+        self.assertEqual(0, metrics['production_rate'])
+        self.assertEqual(0, metrics['time_to_catch_up'])
+
+    def test_wait_for_lag_below(self):
+        def consume():
+            for _offset in range(10, 51, 10):
+                time.sleep(0.01)
+                self.broker.commit("indexer", "ingest", 0, _offset).commit("indexer", "ingest", 1, _offset)
+
+        _consumer = threading.Thread(target=consume)
+        _consumer.start()
+        monitor = ConsumerLagMonitor(self.client, group="indexer", topics=["ingest"])
+        self.assertTrue(monitor.wait_for_lag_below(30, interval=0.005, timeout=10).lag() < 30)
+        _consumer.join()
+
+    def test_wait_timeout(self):
+        monitor = ConsumerLagMonitor(self.client, group="indexer", topics=["ingest"])
+        with self.assertRaises(WaitTimeoutError):
+            monitor.wait_for_lag_below(10, interval=0.01, timeout=0.03)
+
+
+class TestTopicAdmin(unittest2.TestCase):
+    def setUp(self):
+        super(TestTopicAdmin, self).setUp()
+        self.broker = LocalBroker(auto_create_partitions=0).create_topic("events_0", partitions=4) \
+            .create_topic("events_old").create_topic("__consumer_offsets")
+        self.broker.configs["events_0"] = {"retention.ms": "1000"}
+        self.admin = TopicAdmin(KafkaClient(connect=self.broker.connect))
+
+    def test_bulk_provisioning(self):
+        specs = [TopicSpec("events_{0}".format(_n), partitions=4, configs={"retention.ms": 86400000})
+                 for _n in range(200)]
+        plan = self.admin.apply(specs, delete_missing=True)
+        self.assertEqual(199, len(plan.create))
+        self.assertEqual({"events_0": {"retention.ms": "86400000"}}, plan.alter)
+        self.assertEqual(["events_old"], plan.delete)
+        self.assertEqual(200, len([_name for _name in self.broker._topics_() if _name.startswith("events_")]))
+        self.assertEqual({"retention.ms": "86400000"}, self.broker.configs["events_199"])
+        self.assertEqual({"retention.ms": "86400000"}, self.broker.configs["events_0"])
+        self.assertTrue(self.broker._topics_().get("__consumer_offsets"))
+        self.assertEqual(1, self.broker.requests.count(KafkaProtocol.CREATE_TOPICS))
+        self.assertEqual(1, self.broker.requests.count(KafkaProtocol.ALTER_CONFIGS))
+        self.assertEqual(1, self.broker.requests.count(KafkaProtocol.DELETE_TOPICS))
+        self.assertTrue(self.admin.exists("events_199"))
+        self.assertFalse(self.admin.exists("events_old"))
+        self.assertTrue(self.admin.apply(specs, delete_missing=True).is_empty())
+
+    def test_plan_only(self):
+        plan = self.admin.apply([TopicSpec("events_0", partitions=8, configs={"retention.ms": 1000}),
+                                 TopicSpec("events_1")], validate_only=True)
+        self.assertEqual(["events_1"], [_spec.name for _spec in plan.create])
+        self.assertEqual({}, plan.alter)
+        self.assertEqual(["events_0"], plan.mismatched)
+        self.assertFalse(self.admin.exists("events_1"))
+        self.assertEqual(0, self.broker.requests.count(KafkaProtocol.CREATE_TOPICS))
+
+    def test_failed_changes(self):
+        self.admin.topics()
+        self.broker.create_topic("events_1")
+        with self.assertRaises(KafkaClientError):
+            self.admin.apply([TopicSpec("events_1")])
@@ -29,6 +29,8 @@
 #
 
 import os
+import shutil
+import tempfile
 import uuid
 
 from unittest2 import TestCase
@@ -36,6 +38,8 @@ from merlin.common.configurations import Configuration
 from merlin.common.metastores import IniFileMetaStore
 
 from merlin.common.shell_command_executor import build_command
+from merlin.common.exceptions import MapReduceConfigurationError, MapReduceJobException
+from merlin.common.test_utils import mock_executor
 from merlin.tools.mapreduce import MapReduce
 
 
@@ -419,3 +423,133 @@ class TestMapReduceCommandGenerationFromIni(TestMapReduceCommandGeneration):
             name='simple_mr_job',
             executor=self.assert_generated_command(_expected_command)
         ).run()
+
+
+class TestTaskSizing(TestCase):
+    def test_size_streaming_job_by_input(self):
+        _job = MapReduce.prepare_streaming_job(
+            name="test_size_streaming_job",
+            config=Configuration.create(),
+            executor=mock_executor(expected_command='hadoop fs -du -s /raw/1 /raw/2',
+                                   stdout='1000  3000  /raw/1\n1500  4500  /raw/2\n')
+        ).take("/raw/1").take("/raw/2").process_with(mapper="mapper.py", reducer="reducer.py")
+        _job.size_tasks_by_input(bytes_per_reducer=1000, bytes_per_mapper=128)
+        self.assertEqual('3', _job.get('mapreduce.job.reduces'))
+        self.assertEqual(['mapreduce.input.fileinputformat.split.maxsize=128'], _job.get_list('job.config'))
+
+    def test_repeated_sizing_replaces_options(self):
+        _job = MapReduce.prepare_streaming_job(
+            name="test_repeated_sizing",
+            config=Configuration.create(),
+            executor=mock_executor(expected_command='hadoop fs -du -s /raw/1',
+                                   stdout='1000  3000  /raw/1\n')
+        ).take("/raw/1").process_with(mapper="mapper.py", reducer="reducer.py")
+        _job.size_tasks_by_input(bytes_per_reducer=100, bytes_per_mapper=128)
+        _job.size_tasks_by_input(bytes_per_reducer=500, bytes_per_mapper=512, block_size=256)
+        self.assertEqual('2', _job.get('mapreduce.job.reduces'))
+        self.assertEqual(['mapreduce.input.fileinputformat.split.minsize=512'], _job.get_list('job.config'))
+
+    def test_size_map_only_job_by_input(self):
+        _job = MapReduce.prepare_streaming_job(
+            name="test_size_map_only_job",
+            config=Configuration.create(),
+            executor=mock_executor(expected_command='hadoop fs -du -s /raw/1',
+                                   stdout='1000  3000  /raw/1\n')
+        ).take("/raw/1").map_with(mapper="mapper.py")
+        _job.size_tasks_by_input(bytes_per_reducer=100)
+        self.assertFalse(_job.has_option('mapreduce.job.reduces'))
+
+    def test_size_mapreduce_job_by_input(self):
+        _job = MapReduce.prepare_mapreduce_job(
+            jar="{0}/resources/mapreduce/hadoop-mapreduce-examples.jar"
+            .format(os.path.dirname(os.path.realpath(__file__))),
+            main_class="wordcount",
+            name="test_size_mapreduce_job",
+            executor=mock_executor(expected_command='hadoop fs -du -s /raw/*',
+                                   stdout='5000  15000  /raw/*\n')
+        ).size_tasks_by_input(paths=['/raw/*'], bytes_per_reducer=1000, max_reducers=2)
+        self.assertEqual(['mapreduce.job.reduces=2'], _job.get_list('job.config'))
+
+    def test_size_mapreduce_job_by_configured_input(self):
+        _job = MapReduce.prepare_mapreduce_job(
+            jar="{0}/resources/mapreduce/hadoop-mapreduce-examples.jar"
+            .format(os.path.dirname(os.path.realpath(__file__))),
+            main_class="wordcount",
+            name="test_size_mapreduce_job_by_configured_input",
+            executor=mock_executor(expected_command='hadoop fs -du -s /raw/1 /raw/2',
+                                   stdout='5000  15000  /raw/1\n5000  15000  /raw/2\n')
+        ).with_config_option('mapreduce.input.fileinputformat.inputdir', '/raw/1,/raw/2') \
+            .with_number_of_reducers(1).size_tasks_by_input(bytes_per_reducer=1000)
+        self.assertEqual(['mapreduce.input.fileinputformat.inputdir=/raw/1,/raw/2', 'mapreduce.job.reduces=10'],
+                         _job.get_list('job.config'))
+
+    def test_size_job_without_input(self):
+        _job = MapReduce.prepare_mapreduce_job(
+            jar="{0}/resources/mapreduce/hadoop-mapreduce-examples.jar"
+            .format(os.path.dirname(os.path.realpath(__file__))),
+            main_class="wordcount",
+            name="test_size_job_without_input")
+        self.assertRaises(MapReduceConfigurationError, _job.size_tasks_by_input)
+
+
+class TestLocalStreamingJob(TestCase):
+    WORDS_MAPPER = "awk '{for (i = 1; i <= NF; i++) print $i \"\\t1\"}'"
+    WORDS_REDUCER = "awk -F '\\t' '{s[$1] += $2} END {for (k in s) print k \"\\t\" s[k]}'"
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.work_dir, 'input')
+        os.makedirs(self.input_dir)
+        with open(os.path.join(self.input_dir, 'part-00000'), 'w') as _file:
+            _file.write("a b c\nb c\nc\n" * 100)
+        with open(os.path.join(self.input_dir, 'part-00001'), 'w') as _file:
+            _file.write("d a\nd")
+        with open(os.path.join(self.input_dir, '_SUCCESS'), 'w') as _file:
+            _file.write("ignored")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def read_output(self, output, prefix):
+        _result = {}
+        for _name in sorted(os.listdir(output)):
+            self.assertTrue(_name.startswith(prefix))
+            with open(os.path.join(output, _name)) as _file:
+                for _line in _file:
+                    _key, _value = _line.rstrip('\n').split('\t')
+                    _result[_key] = _result.get(_key, 0) + int(_value)
+        return _result
+
+    def prepare_job(self, reducer=WORDS_REDUCER):
+        return MapReduce.prepare_streaming_job(
+            name="test_local_streaming_job_%s" % uuid.uuid4(),
+            config=Configuration.create()
+        ).take(self.input_dir).process_with(
+            mapper=self.WORDS_MAPPER,
+            reducer=reducer
+        ).save(os.path.join(self.work_dir, 'output'))
+
+    def test_run_locally(self):
+        _counters = self.prepare_job().run_locally(workers=2, reducers=3, split_size=100, spill_size=64)
+        self.assertEqual({'a': 101, 'b': 200, 'c': 300, 'd': 2},
+                         self.read_output(os.path.join(self.work_dir, 'output'), 'part-r-'))
+        self.assertEqual(302, _counters.get('Map-Reduce Framework', 'Map input records'))
+        self.assertEqual(603, _counters.get('Map-Reduce Framework', 'Map output records'))
+        self.assertEqual(603, _counters.get('Map-Reduce Framework', 'Reduce input records'))
+        self.assertEqual(4, _counters.get('Map-Reduce Framework', 'Reduce output records'))
+        self.assertEqual(3, _counters.get('Job Counters', 'Launched reduce tasks'))
+        self.assertTrue(_counters.get('Job Counters', 'Launched map tasks') > 2)
+
+    def test_run_map_only_job_locally(self):
+        _counters = self.prepare_job(reducer=None).run_locally(workers=2)
+        self.assertEqual({'a': 101, 'b': 200, 'c': 300, 'd': 2},
+                         self.read_output(os.path.join(self.work_dir, 'output'), 'part-m-'))
+        self.assertEqual(2, _counters.get('Job Counters', 'Launched map tasks'))
+        self.assertEqual(0, _counters.get('Job Counters', 'Launched reduce tasks'))
+
+    def test_run_locally_fails_on_existing_output(self):
+        os.makedirs(os.path.join(self.work_dir, 'output'))
+        self.assertRaises(MapReduceConfigurationError, self.prepare_job().run_locally)
+
+    def test_run_locally_fails_on_command_error(self):
+        self.assertRaises(MapReduceJobException, self.prepare_job(reducer='exit 1').run_locally, workers=1)
@@ -29,12 +29,18 @@
 #
 
 import os
+import threading
+import time
 
+from mock import MagicMock
 from unittest2 import TestCase
 from merlin.common.configurations import Configuration
 from merlin.common.metastores import IniFileMetaStore
 from merlin.common.test_utils import mock_executor
-from merlin.tools.spark import SparkApplication, SparkMaster
+from merlin.common.exceptions import SparkJobError
+from merlin.common.shell_command_executor import build_command, Result, execute_shell_command_streaming_merged
+from merlin.tools.spark import SparkApplication, SparkMaster, SparkSubmitPool, SparkApplicationState, \
+    yarn_running_applications, SizingRules
 
 
 class TestSpark(TestCase):
@@ -79,4 +85,147 @@ class TestSpark(TestCase):
                                        readonly=False),
             name="test_spark_app",
             executor=mock_executor(expected_command=_command)).application_jar("application.jar")
-        spark.run(10, "test")
\ No newline at end of file
+        spark.run(10, "test")
+
+
+YARN_OUTPUT = "INFO Client: Submitting application 7 to ResourceManager\n" \
+              "INFO YarnClientImpl: Submitted application application_1436000000000_0007\n" \
+              "INFO Client: Application report for application_1436000000000_0007 (state: ACCEPTED)\n" \
+              "INFO Client: Application report for application_1436000000000_0007 (state: RUNNING)\n" \
+              "INFO Client: Application report for application_1436000000000_0007 (state: FINISHED)\n" \
+              "\t final status: {0}\n"
+
+
+class ConcurrentSubmitExecutor(object):
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.commands = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, cmd, *args):
+        with self._lock:
+            self.commands.append(build_command(cmd, *args))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return MagicMock(spec=Result, stdout=YARN_OUTPUT.format("SUCCEEDED"))
+
+
+class TestSparkSubmitPool(TestCase):
+    def application(self, name):
+        return SparkApplication(name=name).master(SparkMaster.yarn_cluster()) \
+            .application("backfill.jar", main_class="Backfill")
+
+    def test_application_state_tracking(self):
+        _command = "spark-submit --master yarn-cluster --class Backfill backfill.jar 2015-07-01"
+        pool = SparkSubmitPool(executor=mock_executor(expected_command=_command,
+                                                      stdout=YARN_OUTPUT.format("SUCCEEDED")))
+        submission = pool.submit(self.application("backfill"), "2015-07-01")
+        self.assertEqual([submission], pool.wait(raise_on_failure=True))
+        self.assertEqual("application_1436000000000_0007", submission.application_id)
+        self.assertEqual([SparkApplicationState.QUEUED, SparkApplicationState.SUBMITTED,
+                          SparkApplicationState.ACCEPTED, SparkApplicationState.RUNNING,
+                          SparkApplicationState.FINISHED], [_state for _, _state in submission.history])
+        self.assertTrue(submission.is_ok())
+        self.assertEqual({"backfill": SparkApplicationState.FINISHED}, pool.states())
+
+    def test_failed_application(self):
+        pool = SparkSubmitPool(executor=lambda cmd, *args: MagicMock(spec=Result, stdout=YARN_OUTPUT.format("FAILED")))
+        submission = pool.submit(self.application("backfill"))
+        submission.wait()
+        self.assertEqual(SparkApplicationState.FAILED, submission.state)
+        with self.assertRaises(SparkJobError):
+            pool.wait(raise_on_failure=True)
+
+    def test_max_running_applications(self):
+        executor = ConcurrentSubmitExecutor()
+        pool = SparkSubmitPool(max_running=2, executor=executor)
+        for _day in range(6):
+            pool.submit(self.application("backfill_{0}".format(_day)), _day)
+        submissions = pool.wait()
+        self.assertEqual(2, executor.max_running)
+        self.assertEqual(6, len(executor.commands))
+        self.assertTrue(all(_submission.is_ok() for _submission in submissions))
+
+    def test_cluster_wide_cap(self):
+        _cluster = [3, 2, 1]
+        pool = SparkSubmitPool(max_running=2, running_applications=lambda: _cluster.pop(0), poll_interval=0,
+                               executor=ConcurrentSubmitExecutor(delay=0))
+        pool.submit(self.application("backfill")).wait()
+        self.assertEqual([], _cluster)
+
+    def test_cluster_wide_cap_counts_launched_applications(self):
+        executor = ConcurrentSubmitExecutor(delay=0.05)
+        # cluster does not report applications launched by the pool
+        pool = SparkSubmitPool(max_running=4, running_applications=lambda: 2, poll_interval=0.01,
+                               executor=executor)
+        for _day in range(6):
+            pool.submit(self.application("backfill_{0}".format(_day)), _day)
+        pool.wait()
+        self.assertEqual(2, executor.max_running)
+        self.assertEqual(6, len(executor.commands))
+
+    def test_merged_output_streaming(self):
+        result = execute_shell_command_streaming_merged("echo out; echo err >&2")
+        self.assertEqual(["out\n", "err\n"], list(result.lines()))
+        self.assertTrue(result.is_ok())
+
+    def test_yarn_running_applications(self):
+        _stdout = "Total number of applications (application-types: [] and states: [RUNNING, ACCEPTED]):3\n" \
+                  "Application-Id\tApplication-Name\tApplication-Type\tUser\tQueue\tState\n" \
+                  "application_1_0001\tetl\tSPARK\tetl\tbackfill\tRUNNING\n" \
+                  "application_1_0002\tetl\tSPARK\tetl\tdefault\tRUNNING\n" \
+                  "application_1_0003\tetl\tMAPREDUCE\tetl\tbackfill\tACCEPTED\n" \
+                  "application_1_0004\tbackfill\tSPARK\tbackfill\tbackfill.daily\tRUNNING\n"
+        _executor = mock_executor(expected_command="yarn application -list -appStates RUNNING,ACCEPTED",
+                                  stdout=_stdout)
+        self.assertEqual(4, yarn_running_applications(executor=_executor))
+        self.assertEqual(2, yarn_running_applications(queue="backfill", executor=_executor))
+
+
+class TestSparkAutoSizing(TestCase):
+    def executor(self, count_output, commands):
+        def _executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(spec=Result, stdout=count_output if cmd == "hadoop" else None)
+
+        return _executor
+
+    def test_large_input(self):
+        commands = []
+        SparkApplication(executor=self.executor("  1  40  42949672960 /data/in", commands)) \
+            .master(SparkMaster.yarn_cluster()).application("app.jar", main_class="App") \
+            .with_auto_sizing(["/data/in"]).run()
+        self.assertEqual(["hadoop fs -count /data/in",
+                          "spark-submit --master yarn-cluster --class App "
+                          "--conf spark.executor.instances=40 --conf spark.executor.cores=4 "
+                          "--conf spark.executor.memory=8192m --conf spark.sql.shuffle.partitions=320 app.jar"],
+                         commands)
+
+    def test_small_input_with_many_files(self):
+        self.assertEqual([("spark.executor.instances", 25), ("spark.executor.cores", 4),
+                          ("spark.executor.memory", "8192m"), ("spark.sql.shuffle.partitions", 100)],
+                         SizingRules().size(total_size=10 * 1024 ** 2, file_count=200))
+        self.assertEqual([("spark.executor.instances", 1), ("spark.executor.cores", 1),
+                          ("spark.executor.memory", "2048m"), ("spark.sql.shuffle.partitions", 1)],
+                         SizingRules().size(total_size=10 * 1024 ** 2, file_count=1))
+        self.assertEqual(10, SizingRules(max_executors=10).size(total_size=1024 ** 4)[0][1])
+
+    def test_explicit_options_are_not_overridden(self):
+        commands = []
+        SparkApplication(executor=self.executor("1 2 1024 /data/a\n1 3 2048 /data/b", commands)) \
+            .application("app.jar").with_config_option("spark.executor.memory", "1g") \
+            .with_auto_sizing(["/data/a", "/data/b"], rules=SizingRules(memory_per_core_mb=512)).run()
+        self.assertEqual(["hadoop fs -count /data/a /data/b",
+                          "spark-submit --conf \"spark.executor.memory=1g\" --conf spark.executor.instances=1 "
+                          "--conf spark.executor.cores=3 --conf spark.sql.shuffle.partitions=3 app.jar"], commands)
+
+    def test_repeated_sizing_replaces_options(self):
+        commands = []
+        SparkApplication(executor=self.executor("  1  40  42949672960 /data/in", commands)) \
+            .application("app.jar").with_auto_sizing(["/data/in"]).with_auto_sizing(["/data/in"]).run()
+        self.assertEqual(1, commands[-1].count("spark.executor.instances="))
@@ -29,11 +29,20 @@
 #
 
 import os
+import shutil
+import tempfile
+import threading
+import time
+from mock import MagicMock
 from unittest2 import TestCase
 from merlin.common.configurations import Configuration
 from merlin.common.metastores import IniFileMetaStore
 
-from merlin.tools.sqoop import Sqoop, SqoopImport
+from merlin.common.shell_command_executor import build_command
+from merlin.common.test_utils import mock_executor
+from merlin.common.exceptions import SqoopCommandError
+from merlin.tools.sqoop import Sqoop, SqoopImport, SqoopImportScheduler, LocalFileStateStore, HdfsStateStore, \
+    TablePropertiesStateStore, SplitPlanner, ExportProfile, ExportBenchmark
 
 
 class TestSqoopClient(TestCase):
@@ -199,7 +208,362 @@ class TestSqoopClient(TestCase):
             ).build(),
             '-Dsome.properties=10 --connect jdbc:mysql://localhost/sqoop_tests --username root --password-file /user/cloudera/password --export-dir some --table table_name --batch')
 
+    def test_import_with_num_mappers_for_size(self):
+        self.assertEquals(
+            Sqoop.import_data().from_rdbms(rdbms="mysql", username="root", password_file="/user/cloudera/password",
+                                           host="localhost", database="sqoop_tests").table(
+                table="table_name").to_hdfs().use_num_mappers_for_size(size=1000, bytes_per_mapper=300).build(),
+            '--connect jdbc:mysql://localhost/sqoop_tests --username root --password-file /user/cloudera/password '
+            '--table table_name --num-mappers 4 --as-textfile')
+
+    def test_export_with_num_mappers_by_input(self):
+        self.assertEquals(
+            Sqoop.export_data(
+                executor=mock_executor(expected_command='hadoop fs -du -s some',
+                                       stdout='2048  6144  some\n')
+            ).to_rdbms(
+                rdbms="mysql",
+                username="root",
+                password_file="/user/cloudera/password",
+                host="localhost",
+                database="sqoop_tests"
+            ).table(table="table_name").from_hdfs(
+                export_dir="some"
+            ).use_num_mappers_by_input(bytes_per_mapper=512, max_mappers=3).build(),
+            '--connect jdbc:mysql://localhost/sqoop_tests --username root --password-file /user/cloudera/password '
+            '--export-dir some --table table_name --num-mappers 3')
+
+
+class ConcurrentImportExecutor(object):
+    """Mock executor which tracks number of concurrent imports per database"""
+
+    def __init__(self, failed_tables=()):
+        self.failed_tables = failed_tables
+        self.started = []
+        self.running = {}
+        self.max_running = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd, *args):
+        _command = " ".join(args)
+        _database = _command.split()[1]
+        _table = _command.split("--table ")[1].split()[0]
+        with self.lock:
+            self.started.append(_table)
+            self.running[_database] = self.running.get(_database, 0) + 1
+            self.max_running[_database] = max(self.max_running.get(_database, 0), self.running[_database])
+        time.sleep(0.05)
+        with self.lock:
+            self.running[_database] -= 1
+        if _table in self.failed_tables:
+            raise SqoopCommandError("Sqoop Job failed")
+        result = mock_executor(expected_command=build_command(cmd, *args),
+                               stderr="INFO mapreduce.ImportJobBase: Retrieved {0} records.".format(len(_table)))
+        return result(cmd, *args)
+
+
+class TestSqoopImportScheduler(TestCase):
+    def import_job(self, executor, database, table):
+        return Sqoop.import_data(executor=executor).from_rdbms(
+            rdbms="mysql", username="root", password_file="/user/cloudera/password",
+            host="localhost", database=database).table(table=table).to_hdfs()
+
+    def test_parallel_imports(self):
+        executor = ConcurrentImportExecutor()
+        scheduler = SqoopImportScheduler(max_parallel=4, connections_per_database=2)
+        tables = [('db1', 'a', 1), ('db1', 'bb', 100), ('db1', 'ccc', 10), ('db2', 'dddd', None), ('db2', 'e', 5)]
+        jobs = [self.import_job(executor, _db, _table) for _db, _table, _ in tables]
+        for _job, (_, _, _size) in zip(jobs, tables):
+            scheduler.add(_job, size=_size)
+        reports = scheduler.run()
+        self.assertEqual([_job.name for _job in jobs], [_report.name for _report in reports])
+        self.assertEqual([1, 2, 3, 4, 1], [_report.rows for _report in reports])
+        self.assertTrue(all(_report.duration > 0 for _report in reports))
+        self.assertEqual({'jdbc:mysql://localhost/db1': 2, 'jdbc:mysql://localhost/db2': 2}, executor.max_running)
+        # 'a' waits for a free db1 connection while 'dddd' of unknown size is started
+        self.assertEqual({'bb', 'ccc', 'e', 'dddd'}, set(executor.started[:4]))
+        self.assertEqual('a', executor.started[-1])
+
+    def test_failed_import(self):
+        executor = ConcurrentImportExecutor(failed_tables=['b'])
+        scheduler = SqoopImportScheduler(max_parallel=2)
+        for _table in ['a', 'b', 'c']:
+            scheduler.add(self.import_job(executor, 'db', _table))
+        self.assertRaises(SqoopCommandError, scheduler.run)
+        reports = scheduler.run(raise_on_failure=False)
+        self.assertEqual([True, False, True], [_report.is_ok() for _report in reports])
+
+
+class TestIncrementalState(TestCase):
+    COMMAND = "sqoop-import --connect jdbc:mysql://localhost/db --username root " \
+              "--password-file /user/cloudera/password --table t --as-textfile " \
+              "--incremental append --check-column id --last-value '{0}'"
+    OUTPUT = "INFO tool.ImportTool: Incremental import complete! To run another incremental import " \
+             "of all data following this import, supply the following arguments:\n" \
+             "INFO tool.ImportTool:  --incremental append\n" \
+             "INFO tool.ImportTool:   --check-column id\n" \
+             "INFO tool.ImportTool:   --last-value {0}\n"
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def import_job(self, store, last_value, new_value):
+        return Sqoop.import_data(executor=mock_executor(expected_command=self.COMMAND.format(last_value),
+                                                        stderr=self.OUTPUT.format(new_value))).from_rdbms(
+            rdbms="mysql", username="root", password_file="/user/cloudera/password",
+            host="localhost", database="db").table(table="t").to_hdfs() \
+            .with_incremental_state(store=store, check_column='id', key='t_import', initial_value='0')
+
+    def test_local_file_state(self):
+        store = LocalFileStateStore(os.path.join(self.work_dir, 'state', 'sqoop.json'))
+        self.import_job(store, last_value='0', new_value='100').run()
+        self.assertEqual('100', store.load('t_import'))
+        self.import_job(store, last_value='100', new_value='250').run()
+        self.assertEqual('250', LocalFileStateStore(store.path).load('t_import'))
+
+    def test_keep_state_on_failure(self):
+        store = LocalFileStateStore(os.path.join(self.work_dir, 'sqoop.json'))
+        store.save('t_import', '100')
+        job = self.import_job(store, last_value='100', new_value='250')
+        job._SqoopImport__executor = MagicMock(side_effect=SqoopCommandError("Sqoop Job failed"))
+        self.assertRaises(SqoopCommandError, job.run)
+        self.assertEqual('100', store.load('t_import'))
+
+    def test_parse_last_modified_value(self):
+        result = MagicMock(stdout=None, stderr=self.OUTPUT.format('2015-01-01 10:00:00.0'))
+        self.assertEqual('2015-01-01 10:00:00.0', SqoopImport.last_value(result))
+        self.assertIsNone(SqoopImport.last_value(MagicMock(stdout=None, stderr="No new rows detected")))
+
+    def test_hdfs_state(self):
+        commands = []
+
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(stdout='42\n', is_ok=MagicMock(return_value=True))
+
+        store = HdfsStateStore('/state/', executor=executor)
+        self.assertEqual('42', store.load('t_import'))
+        store.save('t_import', "it's")
+        self.assertEqual(['hadoop fs -cat /state/t_import',
+                          'hadoop fs -mkdir -p /state/',
+                          "printf '%s' 'it'\\''s' | hadoop fs -put -f - /state/t_import"], commands)
+
+    def test_hdfs_state_errors(self):
+        missing = MagicMock(stdout='', stderr="cat: `/state/t_import': No such file or directory",
+                            is_ok=MagicMock(return_value=False))
+        self.assertIsNone(HdfsStateStore('/state', executor=lambda *args: missing).load('t_import'))
+        failed = MagicMock(stdout='', stderr="cat: Call to namenode failed on connection exception",
+                           is_ok=MagicMock(return_value=False))
+        self.assertRaises(SqoopCommandError, HdfsStateStore('/state', executor=lambda *args: failed).load, 't_import')
+
+    def test_table_properties_state(self):
+        properties = MagicMock()
+        properties.get_property.return_value = None
+        properties.set_property.return_value = True
+        store = TablePropertiesStateStore(properties)
+        self.import_job(store, last_value='0', new_value='7').run()
+        properties.get_property.assert_called_with('merlin.sqoop.t_import.last_value')
+        properties.set_property.assert_called_with('merlin.sqoop.t_import.last_value', '7')
+
+
+class TestSplitPlanner(TestCase):
+    CONNECTION = "--connect jdbc:mysql://localhost/db --username root --password-file /user/cloudera/password"
+    HISTOGRAM = "---------------------------------------\n" \
+                "| MIN(id)  | MAX(id)  | COUNT(*)  |\n" \
+                "---------------------------------------\n" \
+                "| 1        | 2        | 100       |\n" \
+                "| 3        | 5        | 100       |\n" \
+                "| 6        | 10       | 100       |\n" \
+                "| 11       | 1000     | 100       |\n" \
+                "---------------------------------------\n"
+
+    def import_job(self, executor):
+        return Sqoop.import_data(executor=executor).from_rdbms(
+            rdbms="mysql", username="root", password_file="/user/cloudera/password",
+            host="localhost", database="db").table(table="t", where="ds = 1").to_hdfs(target_dir="/data/t") \
+            .with_attr(split_by="id")
+
+    def test_histogram(self):
+        _command = 'sqoop-eval {0} --query "SELECT MIN(id), MAX(id), COUNT(*) FROM (SELECT id, NTILE(4) ' \
+                   'OVER (ORDER BY id) AS merlin_bucket FROM t WHERE id IS NOT NULL AND ds = 1) merlin_histogram ' \
+                   'GROUP BY merlin_bucket ORDER BY 1"'.format(self.CONNECTION)
+        planner = SplitPlanner(self.import_job(mock_executor(expected_command=_command, stdout=self.HISTOGRAM)),
+                               buckets=4)
+        self.assertEqual([('1', '2', 100), ('3', '5', 100), ('6', '10', 100), ('11', '1000', 100)],
+                         planner.histogram())
+        self.assertTrue(planner.skew(num_mappers=4) > 2.5)
+        self.assertEqual([('1', '5', 200), ('6', '1000', 200)], planner.plan(ranges=2))
+
+    def test_range_imports(self):
+        commands = []
+
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(stdout=self.HISTOGRAM)
+
+        planner = SplitPlanner(self.import_job(executor), histogram_query="SELECT 1")
+        for _job in planner.imports(num_mappers=4, ranges=2):
+            _job.run()
+        self.assertEqual(['sqoop-eval {0} --query "SELECT 1"'.format(self.CONNECTION),
+                          'sqoop-import {0} --table t --where "ds = 1" --target-dir /data/t '
+                          '--split-by id --num-mappers 2 --boundary-query "SELECT 1, 5" --as-textfile --append'
+                          .format(self.CONNECTION),
+                          'sqoop-import {0} --table t --where "ds = 1" --target-dir /data/t '
+                          '--split-by id --num-mappers 2 --boundary-query "SELECT 6, 1000" --as-textfile --append'
+                          .format(self.CONNECTION)], commands)
+
+    def test_range_imports_into_subdirectories(self):
+        commands = []
+
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(stdout=self.HISTOGRAM)
+
+        planner = SplitPlanner(self.import_job(executor), histogram_query="SELECT 1")
+        for _job in planner.imports(num_mappers=4, ranges=2, subdirectories=True):
+            _job.run()
+        self.assertEqual(['sqoop-eval {0} --query "SELECT 1"'.format(self.CONNECTION),
+                          'sqoop-import {0} --table t --where "ds = 1" --target-dir /data/t/range_00000 '
+                          '--split-by id --num-mappers 2 --boundary-query "SELECT 1, 5" --as-textfile'
+                          .format(self.CONNECTION),
+                          'sqoop-import {0} --table t --where "ds = 1" --target-dir /data/t/range_00001 '
+                          '--split-by id --num-mappers 2 --boundary-query "SELECT 6, 1000" --as-textfile'
+                          .format(self.CONNECTION)], commands)
+
+    def test_copy_drops_incremental_state(self):
+        store = MagicMock()
+        job = self.import_job(MagicMock()).with_incremental_state(store, check_column='id', key='orders')
+        self.assertIsNone(job.copy("orders_range_0")._state)
+
+    def test_range_imports_with_incremental_state(self):
+        commands = []
+
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(stdout=self.HISTOGRAM, stderr=TestIncrementalState.OUTPUT.format('1000'))
+
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, True)
+        store = LocalFileStateStore(os.path.join(self.work_dir, 'sqoop.json'))
+        store.save('t_import', '100')
+        job = self.import_job(executor).with_incremental_state(store, check_column='id', key='t_import')
+        SplitPlanner(job, histogram_query="SELECT 1").run(num_mappers=4, ranges=2, max_parallel=1)
+        self.assertEqual(3, len(commands))
+        for _command in commands[1:]:
+            self.assertTrue("--incremental append --check-column id --last-value '100'" in _command, _command)
+        self.assertEqual('1000', store.load('t_import'))
+
+    def test_keep_state_when_range_import_failed(self):
+        def executor(cmd, *args):
+            _failed = "SELECT 6, 1000" in build_command(cmd, *args)
+            return MagicMock(stdout=self.HISTOGRAM, stderr=TestIncrementalState.OUTPUT.format('1000'),
+                             if_failed_raise=MagicMock(
+                                 side_effect=SqoopCommandError("Sqoop Job failed") if _failed else None))
+
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, True)
+        store = LocalFileStateStore(os.path.join(self.work_dir, 'sqoop.json'))
+        store.save('t_import', '100')
+        job = self.import_job(executor).with_incremental_state(store, check_column='id', key='t_import')
+        self.assertRaises(SqoopCommandError,
+                          SplitPlanner(job, histogram_query="SELECT 1").run, num_mappers=4, ranges=2)
+        self.assertEqual('100', store.load('t_import'))
+
+
+class TestExportProfiles(TestCase):
+    CONNECTION = "--connect jdbc:mysql://localhost/db --username root --password-file /user/cloudera/password"
+
+    def export_job(self, executor=None):
+        return Sqoop.export_data(executor=executor).to_rdbms(
+            rdbms="mysql", username="root", password_file="/user/cloudera/password",
+            host="localhost", database="db").table(table="t").from_hdfs(export_dir="/data/t")
+
+    def test_predefined_profile(self):
+        self.assertEqual("-Dsqoop.export.records.per.statement=100 -Dsqoop.export.statements.per.transaction=100 "
+                         "{0} --export-dir /data/t --table t".format(self.CONNECTION),
+                         self.export_job().with_profile('multirow').build())
+
+    def test_custom_profile(self):
+        profile = ExportProfile('custom', batch=True, num_mappers=8, staging_suffix='_stage')
+        self.assertEqual("{0} --export-dir /data/t --table t --batch "
+                         "--staging-table t_stage --clear-staging-table --num-mappers 8".format(self.CONNECTION),
+                         self.export_job().with_profile(profile).build())
+
+    def test_unknown_profile(self):
+        with self.assertRaises(SqoopCommandError):
+            self.export_job().with_profile('multirow').to_rdbms(rdbms="oracle:thin").with_profile('multirow')
+
+    def test_benchmark(self):
+        commands = []
+
+        def executor(cmd, *args):
+            _command = build_command(cmd, *args)
+            commands.append(_command)
+            if 'sqoop-export' in _command:
+                time.sleep(0.01 if '--batch' in _command else 0.1)
+            return MagicMock(stdout="", stderr="Exported 1000 records.")
+
+        fast = ExportProfile('fast', batch=True)
+        slow = ExportProfile('slow')
+        benchmark = ExportBenchmark(self.export_job(executor), sample_dir="/data/sample", table="t_benchmark",
+                                    profiles=[slow, fast])
+        results = benchmark.run()
+        self.assertEqual([fast, slow], [_result.profile for _result in results])
+        self.assertEqual(1000, results[0].rows)
+        self.assertTrue(results[0].rows_per_second > results[1].rows_per_second)
+        self.assertEqual(['sqoop-eval {0} --query "DELETE FROM t_benchmark"'.format(self.CONNECTION),
+                          'sqoop-export {0} --export-dir /data/sample --table t_benchmark'.format(self.CONNECTION)],
+                         commands[:2])
+
+    def test_repeated_benchmark(self):
+        commands = []
+
+        def executor(cmd, *args):
+            commands.append(build_command(cmd, *args))
+            return MagicMock(stdout="", stderr="Exported 1000 records.")
+
+        job = self.export_job(executor).with_hadoop_properties(sqoop_export_records_per_statement=10)
+        benchmark = ExportBenchmark(job, sample_dir="/data/sample", table="t_benchmark",
+                                    profiles=[ExportProfile('multirow', records_per_statement=100)])
+        benchmark.run()
+        benchmark.run()
+        exports = [_command for _command in commands if _command.startswith('sqoop-export')]
+        self.assertEqual(2, len(exports))
+        self.assertEqual(exports[0], exports[1])
+        self.assertEqual(1, exports[0].count('-Dsqoop.export.records.per.statement='))
+        self.assertTrue('-Dsqoop.export.records.per.statement=100 ' in exports[0])
+
+    def test_replace_hadoop_properties(self):
+        self.assertEqual("-Dsqoop.export.records.per.statement=100 -Dmapreduce.job.queuename=etl "
+                         "{0} --export-dir /data/t --table t".format(self.CONNECTION),
+                         self.export_job().with_hadoop_properties(sqoop_export_records_per_statement=10)
+                         .with_hadoop_properties(mapreduce_job_queuename="etl")
+                         .with_hadoop_properties(sqoop_export_records_per_statement=100).build())
 
+    def test_benchmark_requires_dedicated_table(self):
+        with self.assertRaises(SqoopCommandError):
+            ExportBenchmark(self.export_job(), sample_dir="/data/sample", table=None)
+        with self.assertRaises(SqoopCommandError):
+            ExportBenchmark(self.export_job(), sample_dir="/data/sample", table="t")
 
+    def test_benchmark_staging_table_and_best(self):
+        commands = []
 
+        def executor(cmd, *args):
+            _command = build_command(cmd, *args)
+            commands.append(_command)
+            result = MagicMock(stdout="", stderr="Exported 1000 records.")
+            if '--batch' in _command:
+                result.if_failed_raise.side_effect = SqoopCommandError("failed")
+            return result
 
+        staged = ExportProfile('staged', staging_suffix='_stage')
+        failing = ExportProfile('failing', batch=True)
+        benchmark = ExportBenchmark(self.export_job(executor), sample_dir="/data/sample", table="t_benchmark",
+                                    profiles=[failing, staged], cleanup=False)
+        self.assertEqual(staged, benchmark.best())
+        self.assertFalse(any('DELETE FROM' in _command for _command in commands))
+        self.assertTrue(any('--staging-table t_benchmark_stage' in _command for _command in commands))
@@ -78,6 +78,10 @@ setup(
     requires=[
     ],
     tests_require=test_requires,
+    extras_require={
+        # native CRC32C used to verify checksums of local files
+        'crc32c': ['crc32c'],
+    },
     setup_requires=test_requires+['pylint',
                     'setuptools-lint',
                     'configparser',